@@ -8,7 +8,7 @@ git push origin main
 
 git push heroku main
 
-heroku run python niner_repo/init_all_db.py
+heroku run "cd niner_repo && flask --app app db upgrade"
 
 heroku open
 
@@ -1,145 +1,141 @@
+"""
+Niner Finance application factory
+`create_app()` sets up the extensions and registers the blueprints listed in
+BLUEPRINTS. Blueprint modules are imported by the factory, not when this module
+is imported, and the module-level `app` (what `gunicorn app:app` loads) is only
+built on first access. CLI tools, benchmarks and tests that just need
+`create_app` therefore do not pay for the whole application.
+
+scripts/check_import_time.py keeps the cold start within a budget.
+"""
+
+import importlib
+import logging
 import os
-from flask import Flask, render_template, redirect, url_for, g, flash, request
+from collections import namedtuple
 from datetime import datetime
-from werkzeug.middleware.proxy_fix import ProxyFix
-
-# Create Flask app
-app = Flask(__name__)
-
-# Use instance folder for database
-instance_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance')
-os.makedirs(instance_path, exist_ok=True)
-
-app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'your-secret-key-change-in-production')
-app.config['DATABASE'] = os.path.join(instance_path, 'niner_finance.sqlite')
-app.config['WTF_CSRF_ENABLED'] = False
-
-app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_prefix=1)
-
-# Initialize database
-import db
-db.init_app(app)
-
-# Import and register auth blueprint
-import auth
-app.register_blueprint(auth.bp)
 
-# Import and register your existing blueprints
-import income
-app.register_blueprint(income.bp)
-
-import budget
-app.register_blueprint(budget.bp)
-
-import transactions
-app.register_blueprint(transactions.bp)
-
-# Import and register expenses API blueprint
-try:
-    import expenses_api
-    app.register_blueprint(expenses_api.bp)
-except ImportError as e:
-    print(f"Expenses API module not found: {e}, skipping...")
-
-# Import and register notification blueprint
-try:
-    import notification_routes
-    app.register_blueprint(notification_routes.bp)
-except ImportError as e:
-    print(f"Notification module not found: {e}, skipping...")
-
-# Try to import finance if it exists
-try:
-    import finance
-    app.register_blueprint(finance.bp)
-except ImportError:
-    print("Finance module not found, skipping...")
-
-# Import the priorities blueprint
-from priorities import bp as priorities_bp
-app.register_blueprint(priorities_bp)
+from flask import Flask, render_template, redirect, url_for, g, flash, request
+from werkzeug.middleware.proxy_fix import ProxyFix
 
-# Optional blueprints: try to register additional modules if present
-def try_register(module_name, attr='bp'):
-    try:
-        mod = __import__(module_name)
-        bp = getattr(mod, attr, None)
-        if bp is not None:
-            app.register_blueprint(bp)
-            return True
-    except Exception:
-        pass
-    return False
-
-# portfolio (may be a UI prototype)
-if not try_register('portfolio'):
-    try:
-        import portfolio as _p
-        app.register_blueprint(_p.bp)
-    except Exception:
-        print('Portfolio module not found: skipping...')
+from dates import days_until
+
+logger = logging.getLogger(__name__)
+
+# Modules whose init_app(app) runs first, in order (logging first so the rest can log)
+EXTENSIONS = [
+    'logging_setup',    # structured, queue-backed logging with request IDs
+    'profiling',        # sampled / on-demand cProfile capture at /admin/profiles
+    'rows',             # JSON provider for row records
+    'db',
+    'migrations',       # versioned schema; one version check at startup
+    'data_versions',    # per-user data versions (ETags on read APIs)
+    'sync',             # change log behind /api/sync
+    'metrics',          # request/DB metrics and the /metrics endpoint
+    'digest',           # flask send-daily-digest
+]
+
+BlueprintSpec = namedtuple('BlueprintSpec', 'module attr optional', defaults=('bp', False))
+
+# Optional blueprints are skipped, with a warning, when their module cannot be imported
+BLUEPRINTS = [
+    BlueprintSpec('auth'),
+    BlueprintSpec('income'),
+    BlueprintSpec('budget'),
+    BlueprintSpec('transactions'),
+    BlueprintSpec('expenses_api', optional=True),
+    BlueprintSpec('notification_routes', optional=True),
+    BlueprintSpec('finance', optional=True),
+    BlueprintSpec('priorities'),
+    BlueprintSpec('portfolio', optional=True),
+    BlueprintSpec('subscriptions', optional=True),
+    BlueprintSpec('investments', optional=True),
+    BlueprintSpec('gamification', optional=True),
+    BlueprintSpec('sync'),
+]
+
+
+def create_app(test_config=None):
+    """Create and configure the Niner Finance app"""
+    app = Flask(__name__, instance_relative_config=True)
+    os.makedirs(app.instance_path, exist_ok=True)
+
+    app.config.from_mapping(
+        SECRET_KEY=os.environ.get('SECRET_KEY', 'your-secret-key-change-in-production'),
+        DATABASE=os.path.join(app.instance_path, 'niner_finance.sqlite'),
+        WTF_CSRF_ENABLED=False,
+        PROFILE_SAMPLE_RATE=float(os.environ.get('PROFILE_SAMPLE_RATE', 0)),
+        PROFILE_TOKEN=os.environ.get('PROFILE_TOKEN'),
+    )
+    if test_config is None:
+        # Load the instance config, if it exists, when not testing
+        app.config.from_pyfile('config.py', silent=True)
+    else:
+        app.config.update(test_config)
+
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_prefix=1)
+
+    for name in EXTENSIONS:
+        importlib.import_module(name).init_app(app)
+
+    register_blueprints(app)
+    register_core_routes(app)
+    return app
+
+
+def register_blueprints(app, specs=BLUEPRINTS):
+    for spec in specs:
+        try:
+            module = importlib.import_module(spec.module)
+        except ImportError as e:
+            if not spec.optional:
+                raise
+            logger.warning('%s module not available (%s): skipping...', spec.module, e)
+            continue
+        app.register_blueprint(getattr(module, spec.attr))
 
-# subscriptions
-if not try_register('subscriptions'):
-    try:
-        from subscriptions import bp as subscriptions_bp
-        app.register_blueprint(subscriptions_bp)
-    except Exception:
-        print('Subscriptions module not found: skipping...')
 
-# investments (support different import styles)
-if not try_register('investments'):
-    try:
-        from investments import bp as investments_bp
-        app.register_blueprint(investments_bp)
-    except Exception:
-        print('Investments module not found: skipping...')
+def __getattr__(name):
+    # `app` is built on first access (gunicorn app:app), not at import
+    if name == 'app':
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
-# gamification
-if not try_register('gamification'):
-    try:
-        import gamification as _g
-        app.register_blueprint(_g.bp)
-    except Exception:
-        print('Gamification module not found: skipping...')
 
 # Main Routes
-@app.route('/')
 def index():
     """Home page"""
     if g.user:
         return redirect(url_for('dashboard'))
     return render_template('home/index.html')
 
-@app.route('/dashboard')
-@auth.login_required
 def dashboard():
     """Main dashboard page with real financial data"""
+    import budget
+
     # Use the get_financial_summary function from budget.py
     financial_summary = budget.get_financial_summary(g.user['id'])
     return render_template('home/dashboard.html', **financial_summary)
 
-@app.route('/quick-expense')
-@auth.login_required
 def quick_expense():
     """Quick expense entry page"""
     return render_template('home/quick-expense.html')
 
-@app.route('/profile')
-@auth.login_required
 def profile():
     """users profile page"""
     return redirect(url_for('auth.profile'))
 
+def healthz():
+    """Liveness probe; skips the user lookup (auth.ANONYMOUS_ENDPOINTS)"""
+    return {'status': 'ok'}
+
 # Financial Goals routes - REDIRECT TO FINANCE BLUEPRINT
-@app.route('/goals')
-@auth.login_required
 def financial_goals():
     """Redirect to finance blueprint goals page"""
     return redirect(url_for('finance.goals'))
 
-@app.route('/goals/create', methods=['GET', 'POST'])
-@auth.login_required
 def create_goal():
     """Redirect to finance blueprint create goal"""
     if request.method == 'POST':
@@ -147,121 +143,84 @@ def create_goal():
         return redirect(url_for('finance.create_goal'), code=307)
     return redirect(url_for('finance.create_goal'))
 
-@app.route('/goals/<int:goal_id>/edit', methods=['GET', 'POST'])
-@auth.login_required
 def edit_goal(goal_id):
     """Redirect to finance blueprint edit goal"""
     if request.method == 'POST':
         return redirect(url_for('finance.edit_goal', goal_id=goal_id), code=307)
     return redirect(url_for('finance.edit_goal', goal_id=goal_id))
 
-@app.route('/goals/<int:goal_id>/contribute', methods=['POST'])
-@auth.login_required
 def add_contribution(goal_id):
     """Redirect to finance blueprint contribution"""
     return redirect(url_for('finance.add_contribution', goal_id=goal_id), code=307)
 
-@app.route('/goals/<int:goal_id>/delete', methods=['POST'])
-@auth.login_required
 def delete_goal(goal_id):
     """Redirect to finance blueprint delete goal"""
     return redirect(url_for('finance.delete_goal', goal_id=goal_id), code=307)
 
-@app.route('/goals/<int:goal_id>/toggle', methods=['POST'])
-@auth.login_required
 def toggle_goal_completion(goal_id):
     """Redirect to finance blueprint toggle completion"""
     return redirect(url_for('finance.toggle_goal_completion', goal_id=goal_id), code=307)
 
 # Error handlers
-@app.errorhandler(404)
 def not_found(error):
     flash('Page not found', 'error')
     return redirect(url_for('index'))
 
-@app.errorhandler(500)
 def internal_error(error):
     flash('Internal server error', 'error')
     return redirect(url_for('index'))
 
 # Context processor
-@app.context_processor
 def inject_user():
     return dict(user=g.user, now=datetime.now)  # Changed from g.user to g.user
 
-@app.template_filter('date_diff')
-def date_diff_filter(date_str):
-    """Calculate days until date"""
+def date_diff_filter(value):
+    """Calculate days until a date (a date from the DB, or ISO text)"""
     try:
-        target_date = datetime.fromisoformat(date_str)
-        today = datetime.now()
-        delta = (target_date - today).days
-        return delta
-    except:
+        return days_until(value)
+    except (TypeError, ValueError):
         return 0
 
+def register_core_routes(app):
+    """Top-level pages, goal redirects, error handlers and template helpers"""
+    # auth is a blueprint module; importing it here keeps `import app` light
+    from auth import login_required
+
+    app.add_url_rule('/', view_func=index)
+    app.add_url_rule('/dashboard', view_func=login_required(dashboard))
+    app.add_url_rule('/quick-expense', view_func=login_required(quick_expense))
+    app.add_url_rule('/profile', view_func=login_required(profile))
+    app.add_url_rule('/healthz', view_func=healthz)
+    app.add_url_rule('/goals', view_func=login_required(financial_goals))
+    app.add_url_rule('/goals/create', view_func=login_required(create_goal), methods=['GET', 'POST'])
+    app.add_url_rule('/goals/<int:goal_id>/edit', view_func=login_required(edit_goal), methods=['GET', 'POST'])
+    app.add_url_rule('/goals/<int:goal_id>/contribute', view_func=login_required(add_contribution), methods=['POST'])
+    app.add_url_rule('/goals/<int:goal_id>/delete', view_func=login_required(delete_goal), methods=['POST'])
+    app.add_url_rule('/goals/<int:goal_id>/toggle', view_func=login_required(toggle_goal_completion), methods=['POST'])
+
+    app.register_error_handler(404, not_found)
+    app.register_error_handler(500, internal_error)
+    app.context_processor(inject_user)
+    app.add_template_filter(date_diff_filter, 'date_diff')
+
 if __name__ == '__main__':
+    import auth
+    import db
+
+    app = create_app()
     with app.app_context():
         try:
             print("\n🔧 Initializing Niner Finance Database...")
             print("=" * 50)
             
-            # Initialize main database
-            db.init_db()
-            print("✓ Main database initialized")
+            # Bring the schema up to date
+            applied = db.init_db()
+            print(f"✓ Database schema up to date ({len(applied)} migrations applied)")
             
             # Create demo users
             auth.create_demo_user()
             print("✓ Demo users created/verified")
             
-            # Initialize subscriptions database
-            print("\n🔄 Initializing subscriptions module...")
-            try:
-                from init_subscriptions_db import init_subscriptions_db
-                success = init_subscriptions_db()
-                if not success:
-                    print("⚠️  WARNING: Subscriptions tables may not have been created properly")
-            except Exception as sub_error:
-                print(f"❌ Subscriptions initialization error: {sub_error}")
-            
-            # Initialize investments database
-            print("\n💼 Initializing investments module...")
-            try:
-                from init_investments_db import init_investments_db
-                success = init_investments_db()
-                if not success:
-                    print("⚠️  WARNING: Investments tables may not have been created properly")
-            except Exception as inv_error:
-                print(f"❌ Investments initialization error: {inv_error}")
-            
-            # Initialize gamification database
-            print("\n🎮 Initializing gamification module...")
-            try:
-                from init_gamification_db import init_gamification_db
-                success = init_gamification_db()
-                if not success:
-                    print("⚠️  WARNING: Gamification tables may not have been created properly")
-                    print("   Try running: python init_gamification_db.py")
-            except Exception as game_error:
-                print(f"❌ Gamification initialization error: {game_error}")
-                print("   To fix: python init_gamification_db.py")
-                import traceback
-                traceback.print_exc()
-            
-            # Initialize notifications database
-            print("\n🔔 Initializing notifications module...")
-            try:
-                from init_notifications_db import init_notifications_db
-                success = init_notifications_db()
-                if not success:
-                    print("⚠️  WARNING: Notifications tables may not have been created properly")
-                    print("   Try running: python init_notifications_db.py")
-            except Exception as notif_error:
-                print(f"❌ Notifications initialization error: {notif_error}")
-                print("   To fix: python init_notifications_db.py")
-                import traceback
-                traceback.print_exc()
-            
             print("\n" + "=" * 50)
             print("✓ App initialization complete")
             
@@ -1,14 +1,21 @@
 import functools
+import logging
+import os
 import secrets
 from datetime import datetime, timedelta
-from flask import Blueprint, flash, g, redirect, render_template, request, session, url_for
-from werkzeug.security import check_password_hash, generate_password_hash
+from flask import Blueprint, abort, current_app, flash, g, redirect, render_template, request, session, url_for
 from db import get_db
+import identity
+from hashing import HashingBusy, check_secret, hash_secret, verify
+from rate_limit import rate_limited
 
 # Blueprint must be defined FIRST before any routes
 bp = Blueprint('auth', __name__, url_prefix='/auth')
 
+logger = logging.getLogger(__name__)
+
 @bp.route('/register', methods=('GET', 'POST'))
+@rate_limited('register')
 def register():
     if request.method == 'POST':
         username = request.form.get('username', '').strip()
@@ -25,9 +32,10 @@ def register():
         
         error = None
 
-        # Debug: Print form data
-        print(f"Registration attempt - Username: {username}, Email: {email}")
-        print(f"Security questions provided: {bool(security_question_1 and security_answer_1)}")
+        logger.debug('Registration attempt', extra={
+            'username': username,
+            'security_questions': bool(security_question_1 and security_answer_1)
+        })
 
         # Basic validation
         if not username:
@@ -60,7 +68,6 @@ def register():
         if error is None:
             try:
                 db = get_db()
-                print(f"Database connection successful")
                 
                 # Check if users already exists
                 existing_user = db.execute(
@@ -79,32 +86,31 @@ def register():
                         error = f"Email '{email}' is already registered."
                 else:
                     # Hash security answers for storage
-                    hashed_answer_1 = generate_password_hash(security_answer_1.lower())
-                    hashed_answer_2 = generate_password_hash(security_answer_2.lower())
+                    hashed_answer_1 = hash_secret(security_answer_1.lower(), 'security_answer')
+                    hashed_answer_2 = hash_secret(security_answer_2.lower(), 'security_answer')
                     
                     # Insert new users with security questions
-                    print(f"Inserting new users: {username}, {email}")
                     db.execute('''
                         INSERT INTO users (username, email, password, security_question_1, security_answer_1, security_question_2, security_answer_2) 
                         VALUES (?, ?, ?, ?, ?, ?, ?)
                     ''', (
                         username, 
                         email, 
-                        generate_password_hash(password),
+                        hash_secret(password),
                         security_question_1,
                         hashed_answer_1,
                         security_question_2,
                         hashed_answer_2
                     ))
                     db.commit()
-                    print("users inserted successfully")
+                    logger.info('User registered', extra={'username': username})
                     flash('Registration successful! Please log in.', 'success')
                     return redirect(url_for("auth.login"))
                     
+            except HashingBusy:
+                raise
             except Exception as e:
-                print(f"Registration error details: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception('Registration error', extra={'username': username})
                 
                 error_str = str(e).lower()
                 if 'username' in error_str or 'unique' in error_str:
@@ -118,12 +124,13 @@ def register():
                     error = f"Registration failed: {str(e)}"
 
         if error:
-            print(f"Registration error: {error}")
+            logger.info('Registration rejected: %s', error)
             return render_template('auth/register.html', error=error)
 
     return render_template('auth/register.html')
 
 @bp.route('/login', methods=('GET', 'POST'))
+@rate_limited('login', 'username')
 def login():
     if request.method == 'POST':
         username = request.form.get('username', '').strip()
@@ -141,18 +148,27 @@ def login():
                     'SELECT * FROM users WHERE username = ?', (username,)
                 ).fetchone()
 
+                matches, new_hash = verify(users['password'], password) if users else (False, None)
                 if users is None:
                     error = 'Username not found.'
-                elif not check_password_hash(users['password'], password):
+                elif not matches:
                     error = 'Incorrect password.'
                 else:
+                    if new_hash:
+                        # Hashing parameters changed since this hash was made; re-read
+                        # the row because the update bumped identity_version
+                        db.execute('UPDATE users SET password = ? WHERE id = ?', (new_hash, users['id']))
+                        db.commit()
+                        users = db.execute('SELECT * FROM users WHERE id = ?', (users['id'],)).fetchone()
                     session.clear()
-                    session['user_id'] = users['id']
+                    identity.remember(users)
                     flash('Welcome back!', 'success')
                     return redirect(url_for('dashboard'))
                     
+            except HashingBusy:
+                raise
             except Exception as e:
-                print(f"Login error: {e}")
+                logger.exception('Login error')
                 error = 'Login failed. Please try again.'
 
         if error:
@@ -171,7 +187,7 @@ def demo_login():
         
         if users:
             session.clear()
-            session['user_id'] = users['id']
+            identity.remember(users)
             flash('Welcome to the demo!', 'success')
             return redirect(url_for('dashboard'))
         else:
@@ -179,11 +195,12 @@ def demo_login():
             return redirect(url_for('auth.login'))
             
     except Exception as e:
-        print(f"Demo login error: {e}")
+        logger.exception('Demo login error')
         flash(f'Error accessing demo account: {str(e)}', 'error')
         return redirect(url_for('auth.login'))
 
 @bp.route('/forgot-password-questions', methods=('GET', 'POST'))
+@rate_limited('recovery', 'identifier', 'user_id')
 def forgot_password_questions():
     """Password recovery using security questions"""
     if request.method == 'POST':
@@ -222,7 +239,7 @@ def forgot_password_questions():
                     return render_template('auth/forgot_password_questions.html', step=1)
                     
             except Exception as e:
-                print(f"Error in password recovery step 1: {e}")
+                logger.exception('Error in password recovery step 1')
                 flash('An error occurred. Please try again.', 'error')
                 return render_template('auth/forgot_password_questions.html', step=1)
         
@@ -260,14 +277,15 @@ def forgot_password_questions():
                     return redirect(url_for('auth.forgot_password_questions'))
                 
                 # Verify security answers (compare lowercase)
-                if (check_password_hash(users['security_answer_1'], answer_1.lower()) and 
-                    check_password_hash(users['security_answer_2'], answer_2.lower())):
+                if (check_secret(users['security_answer_1'], answer_1.lower()) and 
+                    check_secret(users['security_answer_2'], answer_2.lower())):
                     
                     # Reset password
-                    new_password_hash = generate_password_hash(new_password)
+                    new_password_hash = hash_secret(new_password)
                     db.execute('UPDATE users SET password = ? WHERE id = ?', 
                               (new_password_hash, user_id))
                     db.commit()
+                    identity.forget(int(user_id))
                     
                     flash('Password reset successful! You can now log in with your new password.', 'success')
                     return redirect(url_for('auth.login'))
@@ -275,8 +293,10 @@ def forgot_password_questions():
                     flash('Security answers are incorrect. Please try again.', 'error')
                     return redirect(url_for('auth.forgot_password_questions'))
                     
+            except HashingBusy:
+                raise
             except Exception as e:
-                print(f"Error in password recovery step 2: {e}")
+                logger.exception('Error in password recovery step 2')
                 flash('An error occurred. Please try again.', 'error')
                 return redirect(url_for('auth.forgot_password_questions'))
     
@@ -322,15 +342,18 @@ def reset_password():
             
             # Update password and delete token
             db.execute('UPDATE users SET password = ? WHERE id = ?',
-                      (generate_password_hash(new_password), reset_record['user_id']))
+                      (hash_secret(new_password), reset_record['user_id']))
             db.execute('DELETE FROM password_resets WHERE token = ?', (token,))
             db.commit()
+            identity.forget(reset_record['user_id'])
             
             flash('Password reset successful! You can now log in.', 'success')
             return redirect(url_for('auth.login'))
             
+        except HashingBusy:
+            raise
         except Exception as e:
-            print(f"Reset password error: {e}")
+            logger.exception('Reset password error')
             flash('An error occurred. Please try again.', 'error')
     
     return render_template('auth/reset_password.html', token=token)
@@ -353,9 +376,13 @@ def profile():
             error = 'Valid email is required.'
         
         if new_password:
+            # g.user carries no hashes (see identity.py)
+            password_hash = get_db().execute(
+                'SELECT password FROM users WHERE id = ?', (g.user['id'],)
+            ).fetchone()['password']
             if not current_password:
                 error = 'Current password is required to change password.'
-            elif not check_password_hash(g.user['password'], current_password):
+            elif not check_secret(password_hash, current_password):
                 error = 'Current password is incorrect.'
             elif len(new_password) < 8:
                 error = 'New password must be at least 8 characters.'
@@ -369,12 +396,17 @@ def profile():
                 
                 if new_password:
                     db.execute('UPDATE users SET password = ? WHERE id = ?',
-                              (generate_password_hash(new_password), g.user['id']))
+                              (hash_secret(new_password), g.user['id']))
                 
                 db.commit()
+                identity.remember(db.execute(
+                    'SELECT id, username, email, identity_version FROM users WHERE id = ?', (g.user['id'],)
+                ).fetchone())
                 flash('Profile updated successfully!', 'success')
                 return redirect(url_for('auth.profile'))
                 
+            except HashingBusy:
+                raise
             except Exception as e:
                 error = 'Email already in use by another account.' if 'email' in str(e).lower() else 'An error occurred updating your profile.'
         
@@ -383,16 +415,19 @@ def profile():
     
     return render_template('auth/profile.html')
 
+# Endpoints that never look at the user skip the identity lookup entirely
+ANONYMOUS_ENDPOINTS = {'static', 'healthz', 'metrics.metrics_endpoint'}
+
 @bp.before_app_request
 def load_logged_in_user():
-    user_id = session.get('user_id')
+    user_id = session.get('user_id') if request.endpoint not in ANONYMOUS_ENDPOINTS else None
     if user_id is None:
         g.user = None
     else:
         try:
-            g.user = get_db().execute('SELECT * FROM users WHERE id = ?', (user_id,)).fetchone()
+            g.user = identity.load(user_id)
         except Exception as e:
-            print(f"Error loading users: {e}")
+            logger.exception('Error loading user %s', user_id)
             g.user = None
 
 @bp.route('/logout')
@@ -410,6 +445,24 @@ def login_required(view):
         return view(**kwargs)
     return wrapped_view
 
+def is_admin(user):
+    """True if the user is listed in ADMIN_USERNAMES (config list or comma-separated string)"""
+    if user is None:
+        return False
+    admins = current_app.config.get('ADMIN_USERNAMES') or os.environ.get('ADMIN_USERNAMES', '')
+    if isinstance(admins, str):
+        admins = [name.strip() for name in admins.split(',')]
+    return user['username'] in admins
+
+def admin_required(view):
+    @functools.wraps(view)
+    @login_required
+    def wrapped_view(**kwargs):
+        if not is_admin(g.user):
+            abort(403)
+        return view(**kwargs)
+    return wrapped_view
+
 def create_demo_user():
     """Create a demo users for testing purposes"""
     try:
@@ -418,8 +471,8 @@ def create_demo_user():
         
         if not existing_user:
             # Hash security answers for demo users
-            demo_answer_1 = generate_password_hash('fluffy')
-            demo_answer_2 = generate_password_hash('rover')
+            demo_answer_1 = hash_secret('fluffy', 'security_answer')
+            demo_answer_2 = hash_secret('rover', 'security_answer')
             
             db.execute('''
                 INSERT INTO users (username, email, password, security_question_1, security_answer_1, security_question_2, security_answer_2) 
@@ -427,16 +480,16 @@ def create_demo_user():
             ''', (
                 'demo', 
                 'demo@ninerfinance.com', 
-                generate_password_hash('demo123'),
+                hash_secret('demo123'),
                 "What was the name of your first pet?",
                 demo_answer_1,
                 "What was the name of your childhood best friend?",
                 demo_answer_2
             ))
             db.commit()
-            print("Demo users created successfully")
+            logger.info('Demo user created')
         else:
-            print("Demo users already exists")
+            logger.debug('Demo user already exists')
             
     except Exception as e:
-        print(f"Error creating demo users: {e}")
\ No newline at end of file
+        logger.exception('Error creating demo user')
\ No newline at end of file
@@ -0,0 +1,15 @@
+"""
+Benchmark suite for Niner Finance.
+
+    datagen.py    deterministic synthetic database (users x transactions, income,
+                  subscriptions, investment trades, gamification state, notifications)
+    scenarios.py  scripted request mixes (dashboard, quick expense, transactions, ...)
+    runner.py     runs scenarios against the Flask test client or a running server
+                  and reports p50/p95/p99 latency and queries per request
+
+Run from niner_repo/:
+
+    python -m benchmarks.runner --users 20 --transactions 500 --save results.json
+    python -m benchmarks.runner --compare results.json
+    python -m benchmarks.runner --url http://localhost:8000 --db instance/niner_finance.sqlite
+"""
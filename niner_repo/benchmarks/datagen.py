@@ -0,0 +1,205 @@
+"""
+Synthetic data generator for benchmarks.
+
+The same (users, transactions, seed, today) always produces the same database.
+Dates are laid out relative to `today` so the "current week/month" views the app
+renders always have data in them.
+"""
+
+import os
+import random
+import sqlite3
+from datetime import date, timedelta
+
+from flask import Flask
+from werkzeug.security import generate_password_hash
+
+import db as db_module
+
+PASSWORD = 'benchpass'
+
+EXPENSE_CATEGORIES = ['Food', 'Transportation', 'Entertainment', 'Other']
+MERCHANTS = {
+    'Food': ['Campus Dining', 'Chipotle', 'Harris Teeter', 'Starbucks', 'Food Lion'],
+    'Transportation': ['Shell', 'CATS Transit', 'Uber', 'Parking Services'],
+    'Entertainment': ['AMC Theatres', 'Steam', 'Spotify', 'Bowling'],
+    'Other': ['Amazon', 'Target', 'Bookstore', 'Walgreens'],
+}
+INCOME_SOURCES = ['Part-time job', 'Scholarship', 'Freelance', 'Family support']
+SUBSCRIPTIONS = [
+    ('Netflix', 15.49, 'monthly', 'Entertainment'),
+    ('Spotify', 10.99, 'monthly', 'Entertainment'),
+    ('Gym', 25.00, 'monthly', 'Health'),
+    ('iCloud', 2.99, 'monthly', 'Utilities'),
+    ('Amazon Prime', 139.00, 'yearly', 'Shopping'),
+    ('Phone plan', 45.00, 'monthly', 'Utilities'),
+]
+TICKERS = [
+    ('AAPL', 'Apple Inc.', 'Stock', 180.0), ('MSFT', 'Microsoft', 'Stock', 400.0),
+    ('VOO', 'Vanguard S&P 500 ETF', 'ETF', 450.0), ('VTI', 'Vanguard Total Market', 'ETF', 240.0),
+    ('BTC', 'Bitcoin', 'Crypto', 60000.0), ('ETH', 'Ethereum', 'Crypto', 3000.0),
+    ('TSLA', 'Tesla', 'Stock', 200.0), ('NVDA', 'NVIDIA', 'Stock', 800.0),
+    ('BND', 'Vanguard Total Bond', 'Bond', 72.0), ('QQQ', 'Invesco QQQ', 'ETF', 430.0),
+]
+GOALS = [
+    ('Emergency Fund', 'emergency', 1000.0), ('Laptop', 'technology', 1200.0),
+    ('Spring Break', 'travel', 800.0), ('Tuition', 'education', 3000.0),
+]
+
+
+def create_schema(path):
+    """Create an empty database at the current schema version"""
+    app = Flask(__name__)
+    app.config.update(DATABASE=path, QUERY_INSTRUMENTATION=False)
+    with app.app_context():
+        db_module.init_db()
+        db_module.close_db()
+
+
+def generate(path, users=10, transactions=200, seed=0, today=None):
+    """Build a synthetic database at `path` and return a summary dict
+
+    `transactions` is per user, spread over the last 90 days; each user also
+    gets income, a weekly budget, goals, subscriptions, 5 investment positions
+    with trades, gamification progress and a few notifications.
+    """
+    today = today or date.today()
+    rng = random.Random(seed)
+
+    if os.path.exists(path):
+        os.unlink(path)
+    create_schema(path)
+
+    # Hashing is deliberately slow; every synthetic user shares one hash
+    password_hash = generate_password_hash(PASSWORD)
+    week_start = today - timedelta(days=today.weekday())
+
+    conn = sqlite3.connect(path)
+    try:
+        conn.executemany(
+            'INSERT INTO users (id, username, email, password) VALUES (?, ?, ?, ?)',
+            [(uid, f'bench{uid}', f'bench{uid}@uncc.edu', password_hash) for uid in range(1, users + 1)]
+        )
+
+        asset_types = {}
+        for name in sorted({t[2] for t in TICKERS}):
+            conn.execute('INSERT OR IGNORE INTO asset_types (name) VALUES (?)', (name,))
+            asset_types[name] = conn.execute('SELECT id FROM asset_types WHERE name = ?', (name,)).fetchone()[0]
+        investment_ids = []
+        for ticker, name, kind, _ in TICKERS:
+            cur = conn.execute(
+                'INSERT INTO investments (ticker, name, asset_type_id) VALUES (?, ?, ?)',
+                (ticker, name, asset_types[kind])
+            )
+            investment_ids.append(cur.lastrowid)
+
+        transaction_rows, expense_rows, income_rows = [], [], []
+        budgets, goals, subscriptions = [], [], []
+        positions, trades = [], []
+        progress, streaks, activities = [], [], []
+        settings, notifications = [], []
+
+        for uid in range(1, users + 1):
+            for _ in range(transactions):
+                day = (today - timedelta(days=rng.randrange(90))).isoformat()
+                if rng.random() < 0.85:
+                    category = rng.choice(EXPENSE_CATEGORIES)
+                    description = rng.choice(MERCHANTS[category])
+                    amount = round(rng.lognormvariate(2.7, 0.8), 2) or 1.0
+                    transaction_rows.append((uid, 'expense', category, amount, description, day))
+                    expense_rows.append((uid, category.lower(), amount, description, day, uid))
+                else:
+                    amount = round(rng.uniform(50, 600), 2)
+                    source = rng.choice(INCOME_SOURCES)
+                    transaction_rows.append((uid, 'income', 'Income', amount, source, day))
+                    income_rows.append((uid, rng.randrange(1, 6), amount, source, day, uid))
+
+            total = rng.choice([150, 200, 250, 300, 400])
+            budgets.append((uid, total, total * 0.4, total * 0.25, total * 0.2, total * 0.15,
+                            week_start.isoformat()))
+
+            for name, category, target in rng.sample(GOALS, 2):
+                goals.append((uid, name, target, round(target * rng.random(), 2), category,
+                              (today + timedelta(days=rng.randrange(30, 365))).isoformat()))
+
+            for name, amount, frequency, category in rng.sample(SUBSCRIPTIONS, 3):
+                subscriptions.append((uid, name, amount, frequency, category,
+                                      (today + timedelta(days=rng.randrange(1, 30))).isoformat(),
+                                      (today - timedelta(days=rng.randrange(30, 365))).isoformat()))
+
+            for inv_index in rng.sample(range(len(investment_ids)), 5):
+                investment_id = investment_ids[inv_index]
+                base_price = TICKERS[inv_index][3]
+                quantity = 0.0
+                for _ in range(rng.randrange(2, 8)):
+                    qty = round(rng.uniform(0.1, 5.0), 4)
+                    price = round(base_price * rng.uniform(0.8, 1.2), 2)
+                    kind = 'sell' if quantity > qty and rng.random() < 0.2 else 'buy'
+                    quantity += -qty if kind == 'sell' else qty
+                    trades.append((uid, investment_id, kind, qty, price, round(qty * price, 2),
+                                   (today - timedelta(days=rng.randrange(60))).isoformat()))
+                positions.append((uid, investment_id, round(quantity, 4), round(base_price, 2)))
+
+            points = rng.randrange(0, 3000)
+            progress.append((uid, points, 1 + points // 500, points, rng.randrange(0, 30), today.isoformat()))
+            streaks.append((uid, rng.randrange(0, 30), rng.randrange(30, 60), today.isoformat()))
+            for _ in range(10):
+                activities.append((uid, 'transaction_added', 10, 'Logged a transaction'))
+
+            settings.append((uid,))
+            for _ in range(5):
+                notifications.append((uid, 'budget_warning', 'Budget Warning',
+                                      "You've used most of your weekly budget.", 'warning',
+                                      rng.random() < 0.5))
+
+        conn.executemany(
+            '''INSERT INTO transactions (user_id, transaction_type, category, amount, description, date)
+               VALUES (?, ?, ?, ?, ?, ?)''', transaction_rows)
+        conn.executemany(
+            '''INSERT INTO expenses (user_id, category, amount, description, date, created_by)
+               VALUES (?, ?, ?, ?, ?, ?)''', expense_rows)
+        conn.executemany(
+            '''INSERT INTO income (user_id, category_id, amount, source, date, created_by)
+               VALUES (?, ?, ?, ?, ?, ?)''', income_rows)
+        conn.executemany(
+            '''INSERT INTO budgets (user_id, total_amount, food_budget, transportation_budget,
+                                    entertainment_budget, other_budget, week_start_date)
+               VALUES (?, ?, ?, ?, ?, ?, ?)''', budgets)
+        conn.executemany(
+            '''INSERT INTO financial_goals (user_id, goal_name, target_amount, current_amount, category, target_date)
+               VALUES (?, ?, ?, ?, ?, ?)''', goals)
+        conn.executemany(
+            '''INSERT INTO subscriptions (user_id, name, amount, frequency, category, next_billing_date, start_date)
+               VALUES (?, ?, ?, ?, ?, ?, ?)''', subscriptions)
+        conn.executemany(
+            'INSERT INTO positions (user_id, investment_id, quantity, avg_cost) VALUES (?, ?, ?, ?)',
+            positions)
+        conn.executemany(
+            '''INSERT INTO investment_transactions (user_id, investment_id, type, quantity, price, total, date)
+               VALUES (?, ?, ?, ?, ?, ?, ?)''', trades)
+        conn.executemany(
+            '''INSERT INTO user_game_progress (user_id, total_points, current_level, experience_points,
+                                               streak_days, last_activity_date)
+               VALUES (?, ?, ?, ?, ?, ?)''', progress)
+        conn.executemany(
+            '''INSERT INTO user_streaks (user_id, current_streak, longest_streak, last_activity_date)
+               VALUES (?, ?, ?, ?)''', streaks)
+        conn.executemany(
+            'INSERT INTO game_activities (user_id, activity_type, points_earned, description) VALUES (?, ?, ?, ?)',
+            activities)
+        conn.executemany('INSERT OR IGNORE INTO notification_settings (user_id) VALUES (?)', settings)
+        conn.executemany(
+            '''INSERT INTO notifications (user_id, type, title, message, severity, is_read)
+               VALUES (?, ?, ?, ?, ?, ?)''', notifications)
+        conn.commit()
+    finally:
+        conn.close()
+
+    return {
+        'users': users,
+        'transactions': len(transaction_rows),
+        'investment_transactions': len(trades),
+        'notifications': len(notifications),
+        'seed': seed,
+        'today': today.isoformat(),
+    }
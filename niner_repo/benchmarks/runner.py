@@ -0,0 +1,233 @@
+"""
+Benchmark runner: issues scenarios against the Flask test client (default) or a
+running server (--url) and reports latency percentiles and queries per request.
+
+Queries per request come from the db Server-Timing entry written by db.py, so
+they are available from a real gunicorn as well as from the test client.
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks import datagen
+from benchmarks.scenarios import SCENARIOS, SCENARIOS_BY_NAME
+
+_SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries')
+
+
+def parse_server_timing(value):
+    """(db_ms, query_count) from a Server-Timing header, or (None, None)"""
+    match = _SERVER_TIMING_DB.search(value or '')
+    if not match:
+        return None, None
+    return float(match.group(1)), int(match.group(2))
+
+
+class TestClientTarget:
+    """In-process target using app.test_client(); one client (session) per user"""
+
+    def __init__(self, app, user_ids):
+        self.clients = {}
+        for user_id in user_ids:
+            client = app.test_client()
+            with client.session_transaction() as session:
+                session['user_id'] = user_id
+            self.clients[user_id] = client
+
+    def request(self, user_id, method, path, body=None):
+        response = self.clients[user_id].open(path, method=method, json=body)
+        return response.status_code, response.headers.get('Server-Timing')
+
+
+class HttpTarget:
+    """A running server (e.g. local gunicorn); logs every user in once"""
+
+    def __init__(self, base_url, user_ids):
+        import requests
+
+        self.base_url = base_url.rstrip('/')
+        self.sessions = {}
+        for user_id in user_ids:
+            session = requests.Session()
+            session.post(self.base_url + '/auth/login', data={
+                'username': f'bench{user_id}', 'password': datagen.PASSWORD
+            })
+            self.sessions[user_id] = session
+
+    def request(self, user_id, method, path, body=None):
+        response = self.sessions[user_id].request(
+            method, self.base_url + path, json=body, allow_redirects=False
+        )
+        return response.status_code, response.headers.get('Server-Timing')
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies_ms, query_counts, db_times_ms, errors, elapsed):
+    ordered = sorted(latencies_ms)
+    return {
+        'requests': len(ordered),
+        'errors': errors,
+        'rps': round(len(ordered) / elapsed, 1) if elapsed else None,
+        'mean_ms': round(statistics.fmean(ordered), 3) if ordered else None,
+        'p50_ms': round(percentile(ordered, 50), 3) if ordered else None,
+        'p95_ms': round(percentile(ordered, 95), 3) if ordered else None,
+        'p99_ms': round(percentile(ordered, 99), 3) if ordered else None,
+        'queries_per_request': round(statistics.fmean(query_counts), 2) if query_counts else None,
+        'db_ms_per_request': round(statistics.fmean(db_times_ms), 3) if db_times_ms else None,
+    }
+
+
+def run_scenario(target, scenario, user_ids, iterations, warmup=5, seed=0):
+    """Issue `iterations` requests round-robin over the users and summarize them"""
+    rng = random.Random(seed)
+    for i in range(warmup):
+        user_id = user_ids[i % len(user_ids)]
+        target.request(user_id, scenario.method, scenario.path,
+                       scenario.body(rng, user_id) if scenario.body else None)
+
+    latencies, queries, db_times = [], [], []
+    errors = 0
+    started = time.perf_counter()
+    for i in range(iterations):
+        user_id = user_ids[i % len(user_ids)]
+        body = scenario.body(rng, user_id) if scenario.body else None
+
+        start = time.perf_counter()
+        status, server_timing = target.request(user_id, scenario.method, scenario.path, body)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        if status >= 400:
+            errors += 1
+        db_ms, count = parse_server_timing(server_timing)
+        if count is not None:
+            queries.append(count)
+            db_times.append(db_ms)
+
+    return summarize(latencies, queries, db_times, errors, time.perf_counter() - started)
+
+
+def compare(baseline, current, tolerance=0.10):
+    """Rows of (scenario, metric, before, after, change) plus whether anything regressed
+
+    A metric regresses when it grew by more than `tolerance` (10% by default).
+    """
+    rows = []
+    regressed = False
+    for name, after in current['scenarios'].items():
+        before = baseline.get('scenarios', {}).get(name)
+        if not before:
+            continue
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms', 'queries_per_request'):
+            old, new = before.get(metric), after.get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old if old else 0.0
+            worse = change > tolerance
+            regressed = regressed or worse
+            rows.append((name, metric, old, new, change, worse))
+    return rows, regressed
+
+
+def print_results(results):
+    print(f"{'scenario':<20}{'req':>6}{'err':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'q/req':>8}")
+    for name, r in results['scenarios'].items():
+        fmt = lambda v: '-' if v is None else f'{v:.2f}'
+        print(f"{name:<20}{r['requests']:>6}{r['errors']:>5}{fmt(r['p50_ms']):>10}"
+              f"{fmt(r['p95_ms']):>10}{fmt(r['p99_ms']):>10}{fmt(r['queries_per_request']):>8}")
+
+
+def print_comparison(rows):
+    print(f"\n{'scenario':<20}{'metric':<22}{'before':>10}{'after':>10}{'change':>9}")
+    for name, metric, old, new, change, worse in rows:
+        flag = '  REGRESSED' if worse else ''
+        print(f'{name:<20}{metric:<22}{old:>10.2f}{new:>10.2f}{change:>+9.1%}{flag}')
+
+
+def build_app(db_path):
+    """The production app (app.py) pointed at the synthetic database"""
+    from app import create_app
+
+    return create_app({'DATABASE': db_path, 'TESTING': True})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Niner Finance benchmark runner')
+    parser.add_argument('--url', help='benchmark a running server instead of the test client')
+    parser.add_argument('--db', help='database to use (generated if it does not exist)')
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--transactions', type=int, default=200, help='transactions per user')
+    parser.add_argument('--iterations', type=int, default=100, help='requests per scenario')
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS_BY_NAME),
+                        help='run only these scenarios (repeatable)')
+    parser.add_argument('--save', help='write results as JSON to this file')
+    parser.add_argument('--compare', help='JSON baseline to diff against')
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help='allowed relative growth before a metric counts as regressed')
+    args = parser.parse_args(argv)
+
+    db_path = args.db or os.path.join(tempfile.gettempdir(), f'niner_bench_{args.users}x{args.transactions}.sqlite')
+    if args.db is None or not os.path.exists(db_path):
+        print(f'Generating {args.users} users x {args.transactions} transactions into {db_path}')
+        dataset = datagen.generate(db_path, users=args.users, transactions=args.transactions, seed=args.seed)
+    else:
+        dataset = {'users': args.users, 'path': db_path}
+
+    user_ids = list(range(1, args.users + 1))
+    if args.url:
+        target = HttpTarget(args.url, user_ids)
+    else:
+        target = TestClientTarget(build_app(db_path), user_ids)
+
+    scenarios = [SCENARIOS_BY_NAME[name] for name in args.scenario] if args.scenario else SCENARIOS
+    results = {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'target': args.url or 'test_client',
+            'iterations': args.iterations,
+            'dataset': dataset,
+            'python': sys.version.split()[0],
+        },
+        'scenarios': {},
+    }
+    for scenario in scenarios:
+        results['scenarios'][scenario.name] = run_scenario(
+            target, scenario, user_ids, args.iterations, args.warmup, args.seed
+        )
+
+    print_results(results)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f'\nSaved results to {args.save}')
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows, regressed = compare(baseline, results, args.tolerance)
+        print_comparison(rows)
+        return 1 if regressed else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,34 @@
+"""
+Scripted request scenarios.
+
+Each scenario is one logged-in request, issued round-robin across the synthetic
+users. `body` (if set) is called with (rng, user_id) and returns the JSON payload.
+"""
+
+from collections import namedtuple
+from datetime import date
+
+Scenario = namedtuple('Scenario', 'name method path body')
+
+
+def quick_expense_body(rng, user_id):
+    category = rng.choice(['Food', 'Transportation', 'Entertainment', 'Other'])
+    return {
+        'amount': round(rng.uniform(2, 60), 2),
+        'category': category,
+        'description': f'Benchmark {category.lower()} purchase',
+        'date': date.today().isoformat(),
+    }
+
+
+SCENARIOS = [
+    Scenario('dashboard', 'GET', '/dashboard', None),
+    Scenario('quick_expense', 'POST', '/api/expenses', quick_expense_body),
+    Scenario('transactions', 'GET', '/transactions', None),
+    Scenario('portfolio', 'GET', '/portfolio/', None),
+    Scenario('game_dashboard', 'GET', '/game/', None),
+    Scenario('notification_poll', 'GET', '/notifications/api/unread-count', None),
+    Scenario('notification_list', 'GET', '/notifications/api/list', None),
+]
+
+SCENARIOS_BY_NAME = {scenario.name: scenario for scenario in SCENARIOS}
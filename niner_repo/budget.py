@@ -1,28 +1,35 @@
-from datetime import datetime, timedelta
 from flask import Blueprint, flash, g, redirect, render_template, request, url_for, jsonify
 from werkzeug.exceptions import abort
 from auth import login_required
 from db import get_db
+from data_versions import etag_by_data_version
+from cache import cached_view_model, invalidates, request_memoized
+from dates import month_window, week_window
+from money import ZERO
+from rows import fetch_records
+from stats import get_stats
 import json
 from gamification import on_budget_created
 
 bp = Blueprint('budget', __name__, url_prefix='/budget')
 
+@request_memoized('ledger', 'budget')
 def get_financial_summary(user_id):
-    """Get comprehensive financial summary for consistent data across pages"""
+    """Get comprehensive financial summary for consistent data across pages
+
+    Shared by the dashboard, budget and goals pages; cached until the user's
+    ledger or budget changes, and computed once per request.
+    """
+    return cached_view_model('financial_summary', user_id, ('ledger', 'budget'),
+                             lambda: build_financial_summary(user_id))
+
+def build_financial_summary(user_id):
+    """Compute the financial summary from the database (uncached)"""
     db = get_db()
     
-    # Get current week dates
-    today = datetime.now().date()
-    week_start = today - timedelta(days=today.weekday())
-    week_end = week_start + timedelta(days=6)
-    
-    # Get current month dates  
-    month_start = today.replace(day=1)
-    if today.month == 12:
-        month_end = today.replace(year=today.year + 1, month=1, day=1) - timedelta(days=1)
-    else:
-        month_end = today.replace(month=today.month + 1, day=1) - timedelta(days=1)
+    # Current week and month
+    week_start, week_end = week_window()
+    month_start, month_end = month_window()
     
     # Current week budget
     current_budget_row = db.execute('''
@@ -30,16 +37,16 @@ def get_financial_summary(user_id):
         WHERE user_id = ? 
         AND week_start_date = ?
         ORDER BY created_at DESC LIMIT 1
-    ''', (user_id, week_start.isoformat())).fetchone()
+    ''', (user_id, week_start)).fetchone()
     
     # Convert Row to dict
     current_budget = dict(current_budget_row) if current_budget_row else None
     
     # Weekly spending by category
-    week_spending_rows = db.execute('''
+    week_spending = fetch_records(db.execute('''
         SELECT 
             COALESCE(e.category, 'Other') as category,
-            SUM(t.amount) as total
+            SUM(t.amount_cents) AS "total [money]"
         FROM transactions t
         LEFT JOIN expenses e ON t.user_id = e.user_id 
             AND t.description = e.description 
@@ -50,54 +57,29 @@ def get_financial_summary(user_id):
           AND t.transaction_type = 'expense'
           AND t.is_active = 1
         GROUP BY e.category
-    ''', (user_id, week_start, week_end)).fetchall()
-    
-    # Convert to list of dicts
-    week_spending = [dict(row) for row in week_spending_rows]
+    ''', (user_id, week_start, week_end)))
     
     # Total weekly spending
     total_weekly_spent_row = db.execute('''
-        SELECT COALESCE(SUM(amount), 0) as total
+        SELECT COALESCE(SUM(amount_cents), 0) AS "total [money]"
         FROM transactions 
         WHERE user_id = ? 
         AND transaction_type = 'expense'
         AND date >= ? AND date <= ?
-    ''', (user_id, week_start.isoformat(), week_end.isoformat())).fetchone()
+    ''', (user_id, week_start, week_end)).fetchone()
     
     total_weekly_spent = dict(total_weekly_spent_row) if total_weekly_spent_row else {'total': 0}
     
-    # Monthly income
-    monthly_income_row = db.execute('''
-        SELECT COALESCE(SUM(amount), 0) as total
-        FROM transactions 
-        WHERE user_id = ? 
-        AND transaction_type = 'income'
-        AND date >= ? AND date <= ?
-    ''', (user_id, month_start.isoformat(), month_end.isoformat())).fetchone()
-    
-    monthly_income = dict(monthly_income_row) if monthly_income_row else {'total': 0}
-    
-    # Monthly expenses
-    monthly_expenses_row = db.execute('''
-        SELECT COALESCE(SUM(amount), 0) as total
-        FROM transactions 
-        WHERE user_id = ? 
-        AND transaction_type = 'expense'
-        AND date >= ? AND date <= ?
-    ''', (user_id, month_start.isoformat(), month_end.isoformat())).fetchone()
-    
-    monthly_expenses = dict(monthly_expenses_row) if monthly_expenses_row else {'total': 0}
+    # Monthly income and expenses
+    monthly = get_stats(user_id, 'month')
     
     # Recent transactions
-    recent_transactions_rows = db.execute('''
+    recent_transactions = fetch_records(db.execute('''
         SELECT * FROM transactions 
         WHERE user_id = ? 
         ORDER BY date DESC, created_at DESC 
         LIMIT 5
-    ''', (user_id,)).fetchall()
-    
-    # Convert to list of dicts
-    recent_transactions = [dict(row) for row in recent_transactions_rows]
+    ''', (user_id,)))
     
     # Process budget data - Round to 2 decimal places
     total_budget = round(float(current_budget['total_amount']), 2) if current_budget else 0.0
@@ -134,10 +116,9 @@ def get_financial_summary(user_id):
             'week_progress': round((total_spent / total_budget * 100), 2) if total_budget > 0 else 0
         },
         'monthly': {
-            'income': round(float(monthly_income['total']), 2) if monthly_income else 0.0,
-            'expenses': round(float(monthly_expenses['total']), 2) if monthly_expenses else 0.0,
-            'net': round((float(monthly_income['total']) if monthly_income else 0.0) - 
-                   (float(monthly_expenses['total']) if monthly_expenses else 0.0), 2)
+            'income': float(monthly['income']),
+            'expenses': float(monthly['expenses']),
+            'net': float(monthly['net'])
         },
         'recent_transactions': recent_transactions,
         'week_dates': {
@@ -154,47 +135,47 @@ def get_financial_summary(user_id):
 @login_required
 def index():
     """Budget planning page"""
-    from db import get_db
-    from datetime import datetime, timedelta
-    
+    page = cached_view_model('budget_page', g.user['id'], ('ledger', 'budget'),
+                             lambda: build_budget_page(g.user['id']))
+    return render_template('home/budget.html', **page)
+
+def build_budget_page(user_id):
+    """Template context for the budget page (uncached)"""
     db = get_db()
-    user_id = g.user['id']
     
     # Get current week's budget
-    today = datetime.now()
-    week_start = today - timedelta(days=today.weekday())
-    week_end = week_start + timedelta(days=6)
+    week_start, week_end = week_window()
     
     current_budget = db.execute('''
         SELECT * FROM budgets 
         WHERE user_id = ? AND week_start_date = ?
         ORDER BY created_at DESC LIMIT 1
-    ''', (user_id, week_start.date())).fetchone()
+    ''', (user_id, week_start)).fetchone()
     
     # Get current week's expenses by category
     expenses = {}
     expense_rows = db.execute('''
-        SELECT category, SUM(amount) as total
+        SELECT category, SUM(amount_cents) AS "total [money]"
         FROM expenses
         WHERE user_id = ? 
         AND date >= ? 
         AND date <= ?
         AND is_active = 1
         GROUP BY category
-    ''', (user_id, week_start.date(), week_end.date())).fetchall()
+    ''', (user_id, week_start, week_end)).fetchall()
     
     for row in expense_rows:
         expenses[row['category']] = float(row['total'])
     
     # Get monthly income (sum of all income for current month)
-    current_month_start = today.replace(day=1)
+    current_month_start, _ = month_window()
     monthly_income = db.execute('''
-        SELECT COALESCE(SUM(amount), 0) as total
+        SELECT COALESCE(SUM(amount_cents), 0) AS "total [money]"
         FROM income
         WHERE user_id = ? 
         AND date >= ?
         AND is_active = 1
-    ''', (user_id, current_month_start.date())).fetchone()
+    ''', (user_id, current_month_start)).fetchone()
     
     monthly_income_value = float(monthly_income['total']) if monthly_income else 0.0
     
@@ -220,17 +201,17 @@ def index():
     # Get financial summary
     financial_summary = get_financial_summary(user_id)
     
-    return render_template('home/budget.html',
-                         current_budget=dict(current_budget) if current_budget else None,
-                         expenses=expenses,
-                         monthly_income=monthly_income_value,
-                         spending_patterns=spending_patterns,
-                         week_start=week_start.strftime('%Y-%m-%d'),
-                         week_end=week_end.strftime('%Y-%m-%d'),
-                         **financial_summary)
+    return dict(current_budget=dict(current_budget) if current_budget else None,
+                expenses=expenses,
+                monthly_income=monthly_income_value,
+                spending_patterns=spending_patterns,
+                week_start=week_start.strftime('%Y-%m-%d'),
+                week_end=week_end.strftime('%Y-%m-%d'),
+                **financial_summary)
 
 @bp.route('/create', methods=('GET', 'POST'))
 @login_required
+@invalidates('budget')
 def create():
     """Create a new budget"""
     if request.method == 'POST':
@@ -249,8 +230,7 @@ def create():
                 return render_template('home/budget-create.html')
             
             # Get current week start date
-            today = datetime.now().date()
-            week_start = today - timedelta(days=today.weekday())
+            week_start, _ = week_window()
             
             db = get_db()
             
@@ -258,7 +238,7 @@ def create():
             existing_budget = db.execute('''
                 SELECT id FROM budgets 
                 WHERE user_id = ? AND week_start_date = ?
-            ''', (g.user['id'], week_start.isoformat())).fetchone()
+            ''', (g.user['id'], week_start)).fetchone()
             
             if existing_budget:
                 # Update existing budget
@@ -277,7 +257,7 @@ def create():
                                        entertainment_budget, other_budget, week_start_date)
                     VALUES (?, ?, ?, ?, ?, ?, ?)
                 ''', (g.user['id'], total_amount, food_budget, transportation_budget,
-                     entertainment_budget, other_budget, week_start.isoformat()))
+                     entertainment_budget, other_budget, week_start))
                 flash('Weekly budget created successfully!', 'success')
             
             db.commit()
@@ -292,6 +272,7 @@ def create():
 
 @bp.route('/api/suggestions')
 @login_required
+@etag_by_data_version
 def get_budget_suggestions():
     """Get smart budget suggestions based on spending history"""
     db = get_db()
@@ -301,12 +282,12 @@ def get_budget_suggestions():
     suggestions_rows = db.execute('''
         SELECT 
             category,
-            AVG(weekly_total) as avg_amount
+            CAST(ROUND(AVG(weekly_total)) AS INTEGER) AS "avg_amount [money]"
         FROM (
             SELECT 
                 category,
                 strftime('%Y-%W', date) as week,
-                SUM(amount) as weekly_total
+                SUM(amount_cents) as weekly_total
             FROM transactions 
             WHERE user_id = ? 
             AND transaction_type = 'expense'
@@ -320,20 +301,21 @@ def get_budget_suggestions():
     
     # Calculate suggestions with 10% buffer
     result = {}
-    total_suggested = 0
+    total_suggested = ZERO
     
     for suggestion in suggestions:
         category = suggestion['category']
-        suggested_amount = float(suggestion['avg_amount']) * 1.1  # 10% buffer
-        result[category] = round(suggested_amount, 2)
+        suggested_amount = suggestion['avg_amount'] * 1.1  # 10% buffer
+        result[category] = float(suggested_amount)
         total_suggested += suggested_amount
     
-    result['total'] = round(total_suggested, 2)
+    result['total'] = float(total_suggested)
     
     return jsonify(result)
 
 @bp.route('/<int:budget_id>/delete', methods=('POST',))
 @login_required
+@invalidates('budget')
 def delete(budget_id):
     """Delete a budget"""
     db = get_db()
@@ -0,0 +1,311 @@
+"""
+View Cache Module
+Caches computed view models (the dicts a page hands to its template) for the
+expensive per-user pages: dashboard, budget, goals, portfolio and game.
+
+Every entry carries dependency tags such as `user:42:ledger` or `user:42:goals`.
+Each tag has a version number, and an entry remembers the versions its tags
+had when it was built. Invalidating a tag bumps its version, which makes every
+entry depending on it stale without having to find and delete those entries.
+Write routes do that through the `invalidates(...)` decorator.
+
+Backends (CACHE_BACKEND):
+    'lru'     in-process LRU, CACHE_MAX_ENTRIES entries (default). Each worker
+              has its own copy, so invalidations do not cross workers.
+    'sqlite'  a shared side database (CACHE_DB, default instance/cache.sqlite)
+              that every gunicorn worker reads and invalidates.
+    'none'    caching disabled.
+
+Read helpers that several parts of one request call (e.g. the financial
+summary, a user's game progress) are also memoized on g with
+`@request_memoized(...)`, under the same domains. Invalidating a user's
+domains drops their memoized values too; helpers that write in the middle
+of a request say so with `@forgets(...)`.
+"""
+
+import functools
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+
+from flask import current_app, g, has_app_context, request
+
+from metrics import CACHE_LOOKUPS
+
+DEFAULT_TTL = 300
+
+
+def user_tags(user_id, *domains):
+    return [f'user:{user_id}:{domain}' for domain in domains]
+
+
+class LRUBackend:
+    """Process-local LRU of entries plus a dict of tag versions"""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.versions = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def set(self, key, value, tag_versions, expires_at):
+        with self.lock:
+            self.entries[key] = (value, tag_versions, expires_at)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def tag_versions(self, tags):
+        with self.lock:
+            return {tag: self.versions.get(tag, 0) for tag in tags}
+
+    def bump(self, tags):
+        with self.lock:
+            for tag in tags:
+                self.versions[tag] = self.versions.get(tag, 0) + 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.versions.clear()
+
+
+class SQLiteBackend:
+    """Entries and tag versions in a side database shared by all workers"""
+
+    SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS cache_entries (
+        key TEXT PRIMARY KEY,
+        value BLOB NOT NULL,
+        tag_versions BLOB NOT NULL,
+        expires_at REAL NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS cache_tags (
+        tag TEXT PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    );
+    '''
+
+    # Expired entries are swept every this many writes
+    PRUNE_EVERY = 200
+
+    def __init__(self, path, max_entries=10000):
+        self.path = path
+        self.max_entries = max_entries
+        self.local = threading.local()
+        self.writes = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self.connect() as conn:
+            conn.executescript(self.SCHEMA)
+
+    def connect(self):
+        # One connection per thread, reopened after a fork
+        conn = getattr(self.local, 'conn', None)
+        if conn is None or self.local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self.local.conn, self.local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, key):
+        row = self.connect().execute(
+            'SELECT value, tag_versions, expires_at FROM cache_entries WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return pickle.loads(row[0]), pickle.loads(row[1]), row[2]
+
+    def set(self, key, value, tag_versions, expires_at):
+        conn = self.connect()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO cache_entries (key, value, tag_versions, expires_at) VALUES (?, ?, ?, ?)',
+                (key, pickle.dumps(value), pickle.dumps(tag_versions), expires_at)
+            )
+        self.writes += 1
+        if self.writes % self.PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(self):
+        conn = self.connect()
+        with conn:
+            conn.execute('DELETE FROM cache_entries WHERE expires_at < ?', (time.time(),))
+            conn.execute(
+                '''DELETE FROM cache_entries WHERE key NOT IN (
+                       SELECT key FROM cache_entries ORDER BY expires_at DESC LIMIT ?
+                   )''',
+                (self.max_entries,)
+            )
+
+    def tag_versions(self, tags):
+        if not tags:
+            return {}
+        rows = self.connect().execute(
+            f'SELECT tag, version FROM cache_tags WHERE tag IN ({",".join("?" * len(tags))})',
+            list(tags)
+        ).fetchall()
+        versions = dict(rows)
+        return {tag: versions.get(tag, 0) for tag in tags}
+
+    def bump(self, tags):
+        conn = self.connect()
+        with conn:
+            conn.executemany(
+                '''INSERT INTO cache_tags (tag, version) VALUES (?, 1)
+                   ON CONFLICT (tag) DO UPDATE SET version = version + 1''',
+                [(tag,) for tag in tags]
+            )
+
+    def clear(self):
+        conn = self.connect()
+        with conn:
+            conn.execute('DELETE FROM cache_entries')
+            conn.execute('DELETE FROM cache_tags')
+
+
+class Cache:
+    """Tag-versioned get-or-build on top of a backend (None disables caching)"""
+
+    def __init__(self, backend, default_ttl=DEFAULT_TTL):
+        self.backend = backend
+        self.default_ttl = default_ttl
+
+    def get_or_build(self, name, key, tags, builder, ttl=None):
+        if self.backend is None:
+            return builder()
+
+        tags = sorted(tags)
+        entry = self.backend.get(key)
+        if entry is not None:
+            value, built_versions, expires_at = entry
+            if expires_at > time.time() and built_versions == self.backend.tag_versions(tags):
+                CACHE_LOOKUPS.inc(cache=name, result='hit')
+                return value
+
+        CACHE_LOOKUPS.inc(cache=name, result='miss')
+        # Read the versions before building: a write racing the build leaves the entry stale
+        versions = self.backend.tag_versions(tags)
+        value = builder()
+        self.backend.set(key, value, versions, time.time() + (ttl or self.default_ttl))
+        return value
+
+    def invalidate(self, tags):
+        if self.backend is not None and tags:
+            self.backend.bump(sorted(set(tags)))
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+
+def create_backend(app):
+    kind = app.config.get('CACHE_BACKEND', os.environ.get('CACHE_BACKEND', 'lru'))
+    if kind == 'none':
+        return None
+    if kind == 'sqlite':
+        path = app.config.get('CACHE_DB') or os.path.join(app.instance_path, 'cache.sqlite')
+        return SQLiteBackend(path, app.config.get('CACHE_MAX_ENTRIES', 10000))
+    if kind == 'lru':
+        return LRUBackend(app.config.get('CACHE_MAX_ENTRIES', 1024))
+    raise ValueError(f'Unknown CACHE_BACKEND: {kind!r}')
+
+
+def get_cache():
+    """The current app's cache, created on first use"""
+    cache = current_app.extensions.get('view_cache')
+    if cache is None:
+        cache = current_app.extensions['view_cache'] = Cache(
+            create_backend(current_app),
+            current_app.config.get('CACHE_TTL', DEFAULT_TTL)
+        )
+    return cache
+
+
+def cached_view_model(name, user_id, domains, builder, *key_parts, ttl=None):
+    """Build or reuse a user's view model for page `name`
+
+    The key includes today's date, since most pages are computed relative to
+    the current week or month.
+    """
+    key = '|'.join(str(part) for part in (name, user_id, date.today().isoformat()) + key_parts)
+    return get_cache().get_or_build(name, key, user_tags(user_id, *domains), builder, ttl)
+
+
+def invalidate_user(user_id, *domains):
+    get_cache().invalidate(user_tags(user_id, *domains))
+    forget_request(user_id, *domains)
+
+
+def request_memoized(*domains):
+    """Memoize a read helper `func(user_id, *args)` on g for the rest of the request
+
+    The value is dropped when any of `domains` is invalidated for that user in
+    the same request. Outside an app context the helper just runs.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(user_id, *args):
+            if not has_app_context():
+                return func(user_id, *args)
+            if '_request_memo' not in g:
+                g._request_memo = {}
+            key = (func.__qualname__, user_id) + args
+            if key not in g._request_memo:
+                g._request_memo[key] = (frozenset(domains), func(user_id, *args))
+            return g._request_memo[key][1]
+        return wrapper
+    return decorator
+
+
+def forget_request(user_id, *domains):
+    """Drop the user's values memoized on g under any of `domains`"""
+    if not has_app_context() or '_request_memo' not in g:
+        return
+    stale = [key for key, (key_domains, _) in g._request_memo.items()
+             if key[1] == user_id and not key_domains.isdisjoint(domains)]
+    for key in stale:
+        del g._request_memo[key]
+
+
+def forgets(*domains):
+    """Drop the user's memoized `domains` after a helper `func(user_id, ...)` writes"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(user_id, *args, **kwargs):
+            try:
+                return func(user_id, *args, **kwargs)
+            finally:
+                forget_request(user_id, *domains)
+        return wrapper
+    return decorator
+
+
+def invalidates(*domains):
+    """Invalidate the logged in user's cached pages for `domains` after a write
+
+    Applied below @login_required on routes that change a user's data. GET
+    requests (e.g. the form half of a create route) leave the cache alone.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapped_view(**kwargs):
+            try:
+                return view(**kwargs)
+            finally:
+                if request.method not in ('GET', 'HEAD', 'OPTIONS') and g.get('user') is not None:
+                    invalidate_user(g.user['id'], *domains)
+        return wrapped_view
+    return decorator
@@ -0,0 +1,150 @@
+"""
+Per-user Data Versions
+Every user has a counter in user_data_versions that SQLite triggers bump on any
+write to a table holding that user's data (ledger, goals, subscriptions,
+notifications, investments, ...). Anything derived only from a user's data is
+unchanged as long as the counter is. Shared reference tables read by those
+views (SHARED_TABLES, e.g. income category names) bump a shared counter,
+stored under user_id 0, which counts toward every user's version.
+
+`etag_by_data_version` uses that to answer conditional GETs: the ETag is built
+from the version alone, so an `If-None-Match` poll is answered with 304 after a
+single primary-key lookup, without running the view.
+"""
+
+import functools
+import hashlib
+from datetime import date
+
+import click
+from flask import current_app, g, make_response, request
+
+from db import add_bootstrap_step, get_db
+
+# Tables with a user_id column whose writes change what a user sees
+VERSIONED_TABLES = [
+    'transactions',
+    'expenses',
+    'income',
+    'budgets',
+    'budget_categories',
+    'budget_allocations',
+    'financial_goals',
+    'goal_contributions',
+    'subscriptions',
+    'notifications',
+    'notification_settings',
+    'positions',
+    'investment_transactions',
+    'user_priorities',
+]
+
+# Tables without a user_id that per-user views read (joined for names)
+SHARED_TABLES = [
+    'income_category',
+]
+
+SHARED_VERSION_USER = 0
+
+VERSIONS_TABLE_SQL = '''
+CREATE TABLE IF NOT EXISTS user_data_versions (
+    user_id INTEGER PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+'''
+
+# Columns that other triggers maintain (amount_cents, and updated_at/updated_by
+# in the *_update_timestamp triggers). An UPDATE touching only these is the echo
+# of a write that was already counted.
+DERIVED_COLUMNS = {'amount_cents', 'updated_at', 'updated_by'}
+
+TRIGGER_SQL = '''
+CREATE TRIGGER bump_data_version_{table}_{event}
+AFTER {timing} ON {table}
+BEGIN
+    INSERT INTO user_data_versions (user_id, version, updated_at)
+    VALUES ({owner}, 1, CURRENT_TIMESTAMP)
+    ON CONFLICT (user_id) DO UPDATE
+    SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+END
+'''
+
+def install(db):
+    """Create the versions table and triggers for every versioned table present"""
+    db.execute(VERSIONS_TABLE_SQL)
+    existing = {row[0] for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    for table in VERSIONED_TABLES + SHARED_TABLES:
+        if table not in existing:
+            continue
+        columns = [row[1] for row in db.execute(f'PRAGMA table_info({table})') if row[1] not in DERIVED_COLUMNS]
+        for event, row in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')):
+            timing = 'UPDATE OF ' + ', '.join(columns) if event == 'UPDATE' else event
+            owner = SHARED_VERSION_USER if table in SHARED_TABLES else f'{row}.user_id'
+            # Recreated each time so the column list follows schema changes
+            db.execute(f'DROP TRIGGER IF EXISTS bump_data_version_{table}_{event}')
+            db.execute(TRIGGER_SQL.format(table=table, event=event, timing=timing, owner=owner))
+    db.commit()
+
+
+def get_data_version(user_id):
+    """(version, updated_at) for a user; (0, None) before their first write"""
+    row = get_db().execute(
+        '''SELECT SUM(version) AS version, MAX(updated_at) AS "updated_at [timestamp]"
+           FROM user_data_versions WHERE user_id IN (?, ?)''',
+        (user_id, SHARED_VERSION_USER)
+    ).fetchone()
+    if row['version'] is None:
+        return 0, None
+    return row['version'], row['updated_at']
+
+
+def etag_by_data_version(view):
+    """Serve a per-user read view with a strong ETag derived from the data version
+
+    The tag also covers the endpoint, its query string, the current date
+    (summaries are computed relative to "this week") and ETAG_SALT, which a
+    deploy can change to invalidate every cached payload.
+    """
+    @functools.wraps(view)
+    def wrapped_view(**kwargs):
+        if g.user is None:
+            return view(**kwargs)
+
+        version, updated_at = get_data_version(g.user['id'])
+        fingerprint = hashlib.sha1('|'.join([
+            request.endpoint or '',
+            request.query_string.decode('latin-1'),
+            repr(sorted(kwargs.items())),
+            date.today().isoformat(),
+            current_app.config.get('ETAG_SALT', ''),
+        ]).encode()).hexdigest()[:16]
+        etag = f"{g.user['id']}-{version}-{fingerprint}"
+
+        if request.if_none_match.contains(etag):
+            response = make_response('', 304)
+        else:
+            response = make_response(view(**kwargs))
+            if response.status_code != 200:
+                return response
+
+        response.set_etag(etag)
+        if updated_at is not None:
+            response.last_modified = updated_at
+        # Let the browser keep the body but always revalidate
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+    return wrapped_view
+
+
+@click.command('init-data-versions')
+def init_data_versions_command():
+    """Create the user_data_versions table and its triggers."""
+    install(get_db())
+    click.echo('Installed per-user data version triggers.')
+
+
+def init_app(app):
+    """Install the version triggers on first use and register the CLI command"""
+    add_bootstrap_step(app, install)
+    app.cli.add_command(init_data_versions_command)
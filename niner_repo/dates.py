@@ -0,0 +1,116 @@
+"""
+Dates
+Dates are stored as TEXT in one canonical form (normalized by migration 0005):
+    DATE columns       'YYYY-MM-DD'
+    TIMESTAMP columns  'YYYY-MM-DD HH:MM:SS'  (what CURRENT_TIMESTAMP writes)
+Both sort and compare correctly as text, so range filters stay in SQL.
+
+This module is the database boundary for them, registered on import:
+    * date and datetime parameters bind in the canonical form, so pass the
+      objects rather than calling isoformat();
+    * DATE and TIMESTAMP columns are read back as date / datetime (needs
+      PARSE_DECLTYPES, which db.get_db turns on);
+    * columns declared TEXT (financial_goals.target_date, subscriptions dates,
+      last_activity_date) can be converted by aliasing them with the type,
+      e.g. SELECT target_date AS "target_date [date]" (needs PARSE_COLNAMES).
+Views then work with date objects and never parse per row. In JSON responses
+(rows.RecordJSONProvider) dates are 'YYYY-MM-DD' and timestamps ISO 8601 UTC.
+"""
+
+import logging
+import sqlite3
+from datetime import date, datetime, timedelta, timezone
+
+logger = logging.getLogger(__name__)
+
+DATE_FORMAT = '%Y-%m-%d'
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def parse_date(value):
+    """date from a date, datetime or ISO text ('2024-05-01', '2024-05-01T10:00'); None if empty"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value).strip()[:10])
+
+
+def parse_timestamp(value):
+    """datetime from a datetime, date or ISO text (space or 'T' separated); None if empty"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return datetime.fromisoformat(str(value).strip())
+
+
+def format_date(value):
+    return parse_date(value).strftime(DATE_FORMAT)
+
+
+def format_timestamp(value):
+    return parse_timestamp(value).strftime(TIMESTAMP_FORMAT)
+
+
+def format_utc_timestamp(value):
+    """ISO 8601 in UTC with a 'Z' ('2024-05-01T09:30:15Z'); stored timestamps are UTC"""
+    moment = parse_timestamp(value)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def day_number(value):
+    """Integer day number (proleptic Gregorian ordinal) for range arithmetic"""
+    day = parse_date(value)
+    if day is None:
+        raise ValueError('No date given')
+    return day.toordinal()
+
+
+def days_until(value, today=None):
+    """Whole days from `today` to `value` (negative if past)"""
+    today = today or date.today()
+    return day_number(value) - day_number(today)
+
+
+def week_window(day=None):
+    """(Monday, Sunday) dates of the week containing `day`"""
+    day = parse_date(day) or date.today()
+    start = day - timedelta(days=day.weekday())
+    return start, start + timedelta(days=6)
+
+
+def month_window(day=None):
+    """(first, last) dates of the month containing `day`"""
+    day = parse_date(day) or date.today()
+    start = day.replace(day=1)
+    if day.month == 12:
+        end = date(day.year + 1, 1, 1) - timedelta(days=1)
+    else:
+        end = date(day.year, day.month + 1, 1) - timedelta(days=1)
+    return start, end
+
+
+def _converter(parse):
+    def convert(value):
+        text = value.decode()
+        try:
+            return parse(text)
+        except ValueError:
+            # Left as text rather than failing the whole query
+            logger.warning('Unparseable stored date %r', text)
+            return text
+    return convert
+
+
+sqlite3.register_adapter(date, format_date)
+sqlite3.register_adapter(datetime, format_timestamp)
+sqlite3.register_converter('date', _converter(parse_date))
+sqlite3.register_converter('timestamp', _converter(parse_timestamp))
+sqlite3.register_converter('datetime', _converter(parse_timestamp))
@@ -1,22 +1,232 @@
+import functools
+import logging
+import os
+import re
 import sqlite3
+import threading
+import time
 import click
-from flask import current_app, g
+from flask import current_app, g, request
+from flask.cli import with_appcontext
+
+import dates  # noqa: F401  registers the date/timestamp adapters and converters
+import money  # noqa: F401  registers the Money adapter and [money] converter
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger(__name__ + '.slow')
+
+# Keep at most this many statements per connection for end-of-request analysis
+MAX_RECORDED_STATEMENTS = 500
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+@functools.lru_cache(maxsize=2048)
+def normalize_sql(sql):
+    """Reduce a statement to its shape: literals become ?, whitespace collapsed"""
+    shape = _STRING_LITERAL.sub('?', sql)
+    shape = _NUMBER_LITERAL.sub('?', shape)
+    shape = _PLACEHOLDER_LIST.sub('(?)', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+class QueryStats:
+    """Statements executed on one connection (i.e. one request)"""
+    
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.rows = 0
+        self.shapes = {}
+        self.statements = []
+    
+    @property
+    def total_ms(self):
+        return self.total_time * 1000
+    
+    def record(self, sql, parameters, duration, rows):
+        shape = normalize_sql(sql)
+        self.count += 1
+        self.total_time += duration
+        self.rows += rows
+        self.shapes[shape] = self.shapes.get(shape, 0) + 1
+        
+        entry = [sql, parameters, duration, rows]
+        if len(self.statements) < MAX_RECORDED_STATEMENTS:
+            self.statements.append(entry)
+        return entry
+    
+    def add_fetch(self, entry, duration, rows):
+        """Charge time and rows spent fetching results to their statement"""
+        entry[2] += duration
+        entry[3] += rows
+        self.total_time += duration
+        self.rows += rows
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that times each statement and counts the rows it returns"""
+    
+    _entry = None
+    
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._entry = self.connection.stats.record(
+                sql, parameters, time.perf_counter() - start, max(self.rowcount, 0)
+            )
+    
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._entry = self.connection.stats.record(
+                sql, None, time.perf_counter() - start, max(self.rowcount, 0)
+            )
+    
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        if self._entry is not None:
+            self.connection.stats.add_fetch(self._entry, time.perf_counter() - start, row is not None)
+        return row
+    
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        if self._entry is not None:
+            self.connection.stats.add_fetch(self._entry, time.perf_counter() - start, len(rows))
+        return rows
+    
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        if self._entry is not None:
+            self.connection.stats.add_fetch(self._entry, time.perf_counter() - start, len(rows))
+        return rows
+    
+    def __next__(self):
+        start = time.perf_counter()
+        row = super().__next__()
+        if self._entry is not None:
+            self.connection.stats.add_fetch(self._entry, time.perf_counter() - start, 1)
+        return row
+
+class InstrumentedConnection(sqlite3.Connection):
+    """sqlite3 connection whose statements are recorded in self.stats"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = QueryStats()
+    
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+    
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+    
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+    
+    def executescript(self, sql_script):
+        start = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            self.stats.record(sql_script, None, time.perf_counter() - start, 0)
 
 def get_db():
     """Get database connection"""
     if 'db' not in g:
         try:
+            instrumented = current_app.config.get('QUERY_INSTRUMENTATION', True)
             g.db = sqlite3.connect(
                 current_app.config['DATABASE'],
-                detect_types=sqlite3.PARSE_DECLTYPES
+                detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+                factory=InstrumentedConnection if instrumented else sqlite3.Connection
             )
             g.db.row_factory = sqlite3.Row
-            print(f"Database connected: {current_app.config['DATABASE']}")
-        except Exception as e:
-            print(f"Database connection error: {e}")
+            logger.debug('Database connected: %s', current_app.config['DATABASE'])
+        except Exception:
+            logger.exception('Database connection error')
             raise
     return g.db
 
+def get_query_stats():
+    """QueryStats for the current request, or None if no instrumented DB was used"""
+    db = g.get('db')
+    return getattr(db, 'stats', None)
+
+def explain_query_plan(db, sql, parameters=()):
+    """EXPLAIN QUERY PLAN details for a statement, without recording it"""
+    rows = sqlite3.Connection.execute(db, 'EXPLAIN QUERY PLAN ' + sql, parameters or ()).fetchall()
+    return [row[3] for row in rows]
+
+def log_slow_queries(db, stats, threshold_ms):
+    """Write statements slower than threshold_ms, with their plans, to the slow-query log"""
+    for sql, parameters, duration, rows in stats.statements:
+        duration_ms = duration * 1000
+        if duration_ms < threshold_ms:
+            continue
+        
+        plan = []
+        if parameters is not None and sql.lstrip()[:6].upper() in ('SELECT', 'UPDATE', 'DELETE', 'INSERT'):
+            try:
+                plan = explain_query_plan(db, sql, parameters)
+            except sqlite3.Error as e:
+                plan = [f'(plan unavailable: {e})']
+        
+        slow_query_logger.warning(
+            '%.1fms %d rows %s %s\n%s',
+            duration_ms, rows,
+            request.method if request else '-', request.path if request else '-',
+            normalize_sql(sql) + ''.join(f'\n    {line}' for line in plan)
+        )
+
+def report_query_stats(response):
+    """Attach per-request query totals to g and the Server-Timing header"""
+    stats = get_query_stats()
+    if stats is None or stats.count == 0:
+        return response
+    
+    g.query_count = stats.count
+    g.query_time_ms = stats.total_ms
+    
+    server_timing = f'db;dur={stats.total_ms:.2f};desc="{stats.count} queries, {stats.rows} rows"'
+    existing = response.headers.get('Server-Timing')
+    response.headers['Server-Timing'] = f'{existing}, {server_timing}' if existing else server_timing
+    
+    threshold = current_app.config.get('N_PLUS_ONE_THRESHOLD', 10)
+    for shape, count in stats.shapes.items():
+        if count > threshold:
+            logger.warning(
+                'Possible N+1 on %s %s: %d executions of %s',
+                request.method, request.path, count, shape
+            )
+    
+    log_slow_queries(g.db, stats, current_app.config.get('SLOW_QUERY_MS', 100))
+    return response
+
+def configure_slow_query_log(app):
+    """Send slow-query records to SLOW_QUERY_LOG (default: instance/slow_queries.log)"""
+    path = os.path.abspath(app.config.get('SLOW_QUERY_LOG') or os.path.join(app.instance_path, 'slow_queries.log'))
+    for handler in list(slow_query_logger.handlers):
+        if isinstance(handler, logging.FileHandler):
+            if handler.baseFilename == path:
+                return
+            # One log per process; the most recently configured app wins
+            slow_query_logger.removeHandler(handler)
+            handler.close()
+    
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    handler = logging.FileHandler(path)
+    handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+    slow_query_logger.addHandler(handler)
+    slow_query_logger.setLevel(logging.WARNING)
+
 def close_db(e=None):
     """Close database connection"""
     db = g.pop('db', None)
@@ -24,50 +234,61 @@ def close_db(e=None):
         db.close()
 
 def init_db():
-    """Initialize database with schema"""
-    try:
-        db = get_db()
-        
-        # Change 'user' to 'users'
-        db.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL,
-                security_question_1 TEXT,
-                security_answer_1 TEXT,
-                security_question_2 TEXT,
-                security_answer_2 TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        db.execute('''
-            CREATE TABLE IF NOT EXISTS password_resets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                token TEXT NOT NULL UNIQUE,
-                expires_at TIMESTAMP NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        ''')
-        
-        db.commit()
-        print("✓ Database tables created successfully")
-        
-    except Exception as e:
-        print(f"❌ Database initialization error: {e}")
-        raise
+    """Create or upgrade the schema by applying pending migrations"""
+    import migrations
+
+    applied = migrations.upgrade(get_db(), current_app.config.get('MIGRATIONS_DIR', migrations.MIGRATIONS_DIR))
+    logger.info('Database schema at version %d', migrations.current_version(get_db()))
+    return applied
 
 @click.command('init-db')
+@with_appcontext
 def init_db_command():
-    """Clear the existing data and create new tables."""
+    """Create the tables, or upgrade an existing database."""
     init_db()
     click.echo('Initialized the database.')
 
+_bootstrapped = set()
+_bootstrap_lock = threading.Lock()
+
+def add_bootstrap_step(app, step):
+    """Have step(db) run once per process against the app's database
+
+    For idempotent fixups (data cleanup, triggers) that used to run at import
+    time or on every request.
+    """
+    app.extensions.setdefault('bootstrap_steps', []).append(step)
+
+def bootstrap_schema():
+    """Run the app's bootstrap steps not yet applied to this database"""
+    steps = current_app.extensions.get('bootstrap_steps', ())
+    path = current_app.config['DATABASE']
+    pending = [step for step in steps if (path, step) not in _bootstrapped]
+    if not pending:
+        return
+    with _bootstrap_lock:
+        for step in pending:
+            if (path, step) in _bootstrapped:
+                continue
+            try:
+                step(get_db())
+            except sqlite3.OperationalError as e:
+                # Schema not created yet; retried on the next request
+                logger.warning('Bootstrap step %s skipped: %s', step.__name__, e)
+                continue
+            _bootstrapped.add((path, step))
+
+def reset_bootstrap():
+    """Forget which databases were bootstrapped (tests, schema resets)"""
+    with _bootstrap_lock:
+        _bootstrapped.clear()
+
 def init_app(app):
     """Initialize app with database functions"""
     app.teardown_appcontext(close_db)
-    app.cli.add_command(init_db_command)
\ No newline at end of file
+    app.before_request(bootstrap_schema)
+    app.cli.add_command(init_db_command)
+    
+    if app.config.get('QUERY_INSTRUMENTATION', True):
+        configure_slow_query_log(app)
+        app.after_request(report_query_stats)
\ No newline at end of file
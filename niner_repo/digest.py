@@ -0,0 +1,239 @@
+"""
+Daily Digest Module
+Builds one summary notification per opted-in user (notification_settings.daily_digest)
+instead of writing every alert as its own row in real time.
+
+All users are aggregated together with a handful of set-based queries, so the
+cost of a run grows with the number of queries, not the number of users.
+Run it once a day with:  flask send-daily-digest
+"""
+
+from datetime import datetime, timedelta, timezone
+import json
+import sqlite3
+
+import click
+from dates import format_timestamp, week_window
+from db import get_db
+from metrics import NOTIFICATIONS_CREATED, register_collector
+from notifications import NotificationEngine
+
+# How far ahead subscription bills are included in the digest
+UPCOMING_BILL_DAYS = 7
+
+
+def get_digest_recipients(db, today):
+    """Get opted-in users who have not received today's digest yet"""
+    # created_at is CURRENT_TIMESTAMP (UTC); `today` starts at local midnight
+    today_start = datetime.combine(today, datetime.min.time()).astimezone(timezone.utc)
+
+    rows = db.execute(
+        '''SELECT ns.user_id, ns.budget_warning_threshold, ns.overspending_threshold
+           FROM notification_settings ns
+           WHERE ns.daily_digest = 1
+           AND NOT EXISTS (
+               SELECT 1 FROM notifications n
+               WHERE n.user_id = ns.user_id
+               AND n.type = ?
+               AND n.created_at >= ?
+           )''',
+        (NotificationEngine.TYPE_DAILY_DIGEST, format_timestamp(today_start))
+    ).fetchall()
+
+    return {row['user_id']: dict(row) for row in rows}
+
+
+def get_spending_by_user(db, today, week_start, week_end):
+    """Today's and this week's spending for every opted-in user"""
+    rows = db.execute(
+        '''SELECT t.user_id,
+                  COALESCE(SUM(CASE WHEN t.date = ? THEN t.amount_cents ELSE 0 END), 0) AS "spent_today [money]",
+                  COALESCE(SUM(t.amount_cents), 0) AS "spent_week [money]"
+           FROM transactions t
+           JOIN notification_settings ns ON ns.user_id = t.user_id AND ns.daily_digest = 1
+           WHERE t.transaction_type = 'expense'
+           AND t.is_active = 1
+           AND t.date >= ? AND t.date <= ?
+           GROUP BY t.user_id''',
+        (today, week_start, week_end)
+    ).fetchall()
+
+    return {row['user_id']: dict(row) for row in rows}
+
+
+def get_budgets_by_user(db, week_start):
+    """Current weekly budget for every opted-in user"""
+    rows = db.execute(
+        '''SELECT b.user_id, b.total_amount
+           FROM budgets b
+           JOIN notification_settings ns ON ns.user_id = b.user_id AND ns.daily_digest = 1
+           WHERE b.week_start_date = ?''',
+        (week_start,)
+    ).fetchall()
+
+    return {row['user_id']: float(row['total_amount'] or 0) for row in rows}
+
+
+def get_upcoming_bills_by_user(db, today, days=UPCOMING_BILL_DAYS):
+    """Active subscriptions billing within the next N days, per opted-in user"""
+    horizon = today + timedelta(days=days)
+    try:
+        rows = db.execute(
+            '''SELECT s.user_id,
+                      COUNT(*) as bill_count,
+                      COALESCE(SUM(s.amount), 0) as bill_total,
+                      MIN(s.next_billing_date) as next_billing_date
+               FROM subscriptions s
+               JOIN notification_settings ns ON ns.user_id = s.user_id AND ns.daily_digest = 1
+               WHERE s.is_active = 1
+               AND s.next_billing_date >= ? AND s.next_billing_date <= ?
+               GROUP BY s.user_id''',
+            (today, horizon)
+        ).fetchall()
+    except sqlite3.OperationalError:
+        # Subscriptions module not initialized
+        return {}
+
+    return {row['user_id']: dict(row) for row in rows}
+
+
+def get_goal_progress_by_user(db):
+    """Open financial goal totals per opted-in user"""
+    try:
+        rows = db.execute(
+            '''SELECT fg.user_id,
+                      COUNT(*) as goal_count,
+                      COALESCE(SUM(fg.current_amount), 0) as saved,
+                      COALESCE(SUM(fg.target_amount), 0) as target
+               FROM financial_goals fg
+               JOIN notification_settings ns ON ns.user_id = fg.user_id AND ns.daily_digest = 1
+               WHERE fg.is_completed = 0
+               GROUP BY fg.user_id'''
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return {}
+
+    return {row['user_id']: dict(row) for row in rows}
+
+
+def build_digest(recipient, spending, budget, bills, goals):
+    """Build (title, message, severity, metadata) for a single user's digest"""
+    spent_today = float(spending['spent_today']) if spending else 0.0
+    spent_week = float(spending['spent_week']) if spending else 0.0
+
+    lines = [f'Spent ${spent_today:.2f} today and ${spent_week:.2f} this week.']
+    severity = NotificationEngine.SEVERITY_INFO
+    metadata = {
+        'spent_today': spent_today,
+        'spent_week': spent_week
+    }
+
+    if budget:
+        percentage = spent_week / budget * 100
+        remaining = budget - spent_week
+        lines.append(f'Weekly budget: {percentage:.0f}% used, ${remaining:.2f} remaining.')
+        metadata.update({'budget': budget, 'percentage': percentage, 'remaining': remaining})
+
+        if percentage >= recipient['overspending_threshold']:
+            severity = NotificationEngine.SEVERITY_CRITICAL
+        elif percentage >= recipient['budget_warning_threshold']:
+            severity = NotificationEngine.SEVERITY_WARNING
+
+    if bills:
+        bill_total = float(bills['bill_total'])
+        lines.append(
+            f'{bills["bill_count"]} bill(s) due in the next {UPCOMING_BILL_DAYS} days '
+            f'(${bill_total:.2f}), next on {bills["next_billing_date"]}.'
+        )
+        metadata.update({
+            'bill_count': bills['bill_count'],
+            'bill_total': bill_total,
+            'next_billing_date': bills['next_billing_date']
+        })
+
+    if goals:
+        saved = float(goals['saved'])
+        target = float(goals['target'])
+        goal_percentage = (saved / target * 100) if target > 0 else 0
+        lines.append(
+            f'Goals: ${saved:.2f} of ${target:.2f} saved across '
+            f'{goals["goal_count"]} open goal(s) ({goal_percentage:.0f}%).'
+        )
+        metadata.update({
+            'goal_count': goals['goal_count'],
+            'goal_saved': saved,
+            'goal_target': target,
+            'goal_percentage': goal_percentage
+        })
+
+    return '📬 Your Daily Digest', ' '.join(lines), severity, metadata
+
+
+def generate_daily_digests(today=None):
+    """Write one digest notification per opted-in user. Returns the number written."""
+    if not NotificationEngine.check_table_exists():
+        return 0
+
+    db = get_db()
+    today = today or datetime.now().date()
+    week_start, week_end = week_window(today)
+
+    recipients = get_digest_recipients(db, today)
+    if not recipients:
+        return 0
+
+    spending = get_spending_by_user(db, today, week_start, week_end)
+    budgets = get_budgets_by_user(db, week_start)
+    bills = get_upcoming_bills_by_user(db, today)
+    goals = get_goal_progress_by_user(db)
+
+    rows = []
+    for user_id, recipient in recipients.items():
+        title, message, severity, metadata = build_digest(
+            recipient,
+            spending.get(user_id),
+            budgets.get(user_id),
+            bills.get(user_id),
+            goals.get(user_id)
+        )
+        metadata['digest_date'] = today.isoformat()
+        rows.append((
+            user_id, NotificationEngine.TYPE_DAILY_DIGEST, title, message,
+            severity, json.dumps(metadata)
+        ))
+
+    db.executemany(
+        '''INSERT INTO notifications
+           (user_id, type, title, message, severity, metadata)
+           VALUES (?, ?, ?, ?, ?, ?)''',
+        rows
+    )
+    db.commit()
+    NOTIFICATIONS_CREATED.inc(len(rows), type=NotificationEngine.TYPE_DAILY_DIGEST)
+
+    return len(rows)
+
+
+@register_collector
+def digest_queue_depth():
+    """Digest backlog for /metrics: opted-in users still waiting for today's digest"""
+    if not NotificationEngine.check_table_exists():
+        return []
+    try:
+        pending = len(get_digest_recipients(get_db(), datetime.now().date()))
+    except sqlite3.Error:
+        return []
+    return [('niner_digest_pending_recipients', 'gauge',
+             "Opted-in users who have not received today's digest", pending)]
+
+
+@click.command('send-daily-digest')
+def send_daily_digest_command():
+    """Generate today's digest notifications for opted-in users."""
+    count = generate_daily_digests()
+    click.echo(f'Sent {count} daily digest(s).')
+
+
+def init_app(app):
+    """Register digest CLI commands"""
+    app.cli.add_command(send_daily_digest_command)
@@ -3,18 +3,119 @@ Expenses API Blueprint
 Fast expense logging with validation and integration
 """
 
-from flask import Blueprint, jsonify, request, g
+from flask import Blueprint, current_app, jsonify, request, g
 from auth import login_required
 from db import get_db
+from data_versions import etag_by_data_version
+from cache import invalidates
 from datetime import datetime
-from decimal import Decimal, InvalidOperation
+import logging
+from money import Money
+from rows import fetch_records
 from notifications import NotificationEngine
 
 bp = Blueprint('expenses_api', __name__, url_prefix='/api/expenses')
 
+logger = logging.getLogger(__name__)
+
+
+VALID_CATEGORIES = ['Food', 'Transportation', 'Entertainment', 'Shopping',
+                    'Health', 'Utilities', 'Education', 'Other']
+
+# Most expenses one POST /api/expenses/batch may carry
+DEFAULT_BATCH_LIMIT = 50
+
+MAX_CLIENT_ID_LENGTH = 64
+
+# A client_id the user already sent is a retry: the insert does nothing
+INSERT_EXPENSE_SQL = '''INSERT INTO transactions 
+   (user_id, description, amount, amount_cents, category, transaction_type, date, client_id)
+   VALUES (?, ?, ?, ?, ?, 'expense', ?, ?)
+   ON CONFLICT DO NOTHING'''
+
+
+def validate_expense(data):
+    """(expense, errors) for one submitted expense; expense is None if invalid"""
+    # Extract and validate fields
+    amount = data.get('amount')
+    category = data.get('category')
+    description = (data.get('description') or '').strip()
+    date = data.get('date') or datetime.now().strftime('%Y-%m-%d')
+    client_id = data.get('client_id')
+    
+    # Validation
+    errors = []
+    
+    # Validate amount
+    if amount is None:
+        errors.append('Amount is required')
+    else:
+        try:
+            amount = Money.parse(amount)
+            if amount <= 0:
+                errors.append('Amount must be greater than 0')
+            elif amount > 999999:
+                errors.append('Amount is too large')
+        except ValueError:
+            errors.append('Invalid amount format')
+    
+    # Validate category
+    if not category:
+        errors.append('Category is required')
+    elif category not in VALID_CATEGORIES:
+        errors.append(f'Invalid category. Must be one of: {", ".join(VALID_CATEGORIES)}')
+    
+    # Validate date
+    try:
+        datetime.strptime(date, '%Y-%m-%d')
+    except (TypeError, ValueError):
+        errors.append('Invalid date format. Use YYYY-MM-DD')
+    
+    # Validate description length
+    if len(description) > 200:
+        errors.append('Description must be 200 characters or less')
+    
+    # Validate client_id (optional; identifies retries of the same expense)
+    if client_id is not None and not (isinstance(client_id, str) and 0 < len(client_id) <= MAX_CLIENT_ID_LENGTH):
+        errors.append(f'client_id must be a string of at most {MAX_CLIENT_ID_LENGTH} characters')
+    
+    if errors:
+        return None, errors
+    return {'amount': amount, 'category': category, 'description': description, 'date': date,
+            'client_id': client_id}, []
+
+
+def expense_params(user_id, expense):
+    return (user_id, expense['description'], float(expense['amount']), expense['amount'],
+            expense['category'], expense['date'], expense['client_id'])
+
+
+def save_expense(db, user_id, expense):
+    """(id, created) for a validated expense; a repeated client_id gets the row it created before"""
+    cursor = db.execute(INSERT_EXPENSE_SQL, expense_params(user_id, expense))
+    if cursor.rowcount:
+        return cursor.lastrowid, True
+    existing = db.execute(
+        'SELECT id FROM transactions WHERE user_id = ? AND client_id = ?',
+        (user_id, expense['client_id'])
+    ).fetchone()
+    return existing['id'], False
+
+
+def expense_to_dict(expense):
+    return {
+        'id': expense['id'],
+        'amount': float(expense['amount']),
+        'category': expense['category'],
+        'description': expense['description'],
+        'date': expense['date'],
+        'created_at': expense['created_at']
+    }
+
 
 @bp.route('', methods=['POST'])
 @login_required
+@invalidates('ledger')
 def create_expense():
     """
     Create a new expense
@@ -25,8 +126,12 @@ def create_expense():
         "amount": 25.50,
         "category": "Food",
         "description": "Lunch at McDonald's",
-        "date": "2025-11-12"
+        "date": "2025-11-12",
+        "client_id": "1731400000000-k3x9qa"
     }
+    
+    Resending an expense with the same client_id (e.g. after a lost
+    response) creates nothing and returns the stored expense with 200.
     """
     try:
         data = request.get_json()
@@ -37,45 +142,7 @@ def create_expense():
                 'error': 'No data provided'
             }), 400
         
-        # Extract and validate fields
-        amount = data.get('amount')
-        category = data.get('category')
-        description = data.get('description', '').strip()
-        date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
-        
-        # Validation
-        errors = []
-        
-        # Validate amount
-        if amount is None:
-            errors.append('Amount is required')
-        else:
-            try:
-                amount = Decimal(str(amount))
-                if amount <= 0:
-                    errors.append('Amount must be greater than 0')
-                elif amount > 999999:
-                    errors.append('Amount is too large')
-            except (InvalidOperation, ValueError):
-                errors.append('Invalid amount format')
-        
-        # Validate category
-        valid_categories = ['Food', 'Transportation', 'Entertainment', 'Shopping', 
-                          'Health', 'Utilities', 'Education', 'Other']
-        if not category:
-            errors.append('Category is required')
-        elif category not in valid_categories:
-            errors.append(f'Invalid category. Must be one of: {", ".join(valid_categories)}')
-        
-        # Validate date
-        try:
-            datetime.strptime(date, '%Y-%m-%d')
-        except ValueError:
-            errors.append('Invalid date format. Use YYYY-MM-DD')
-        
-        # Validate description length
-        if len(description) > 200:
-            errors.append('Description must be 200 characters or less')
+        expense, errors = validate_expense(data)
         
         # Return validation errors
         if errors:
@@ -89,46 +156,143 @@ def create_expense():
         db = get_db()
         user_id = g.user['id']
         
-        cursor = db.execute(
-            '''INSERT INTO transactions 
-               (user_id, description, amount, category, type, date)
-               VALUES (?, ?, ?, ?, ?, ?)''',
-            (user_id, description, float(amount), category, 'expense', date)
-        )
+        expense_id, created = save_expense(db, user_id, expense)
         db.commit()
         
-        expense_id = cursor.lastrowid
-        
         # Get the created expense
         expense = db.execute(
             'SELECT * FROM transactions WHERE id = ?',
             (expense_id,)
         ).fetchone()
         
+        if not created:
+            return jsonify({
+                'success': True,
+                'message': 'Expense already added',
+                'expense': expense_to_dict(expense)
+            }), 200
+        
         # Trigger notification checks (async, don't block response)
         try:
-            NotificationEngine.check_unusual_spending(user_id, category, float(amount))
+            NotificationEngine.check_unusual_spending(user_id, expense['category'], float(expense['amount']))
             NotificationEngine.check_budget_warning(user_id)
             NotificationEngine.check_overspending(user_id)
         except Exception as notif_error:
-            print(f"Notification error: {notif_error}")
+            logger.exception('Notification error')
         
         # Return success response
         return jsonify({
             'success': True,
             'message': 'Expense added successfully',
-            'expense': {
-                'id': expense['id'],
-                'amount': float(expense['amount']),
-                'category': expense['category'],
-                'description': expense['description'],
-                'date': expense['date'],
-                'created_at': expense['created_at']
-            }
+            'expense': expense_to_dict(expense)
         }), 201
         
     except Exception as e:
-        print(f"Error creating expense: {e}")
+        logger.exception('Error creating expense')
+        return jsonify({
+            'success': False,
+            'error': 'Internal server error'
+        }), 500
+
+
+@bp.route('/batch', methods=['POST'])
+@login_required
+@invalidates('ledger')
+def create_expenses_batch():
+    """
+    Create several expenses at once, e.g. an offline queue being flushed
+    POST /api/expenses/batch
+    
+    Body:
+    {
+        "expenses": [
+            {"client_id": "q1", "amount": 4.50, "category": "Food", "date": "2025-11-12"},
+            ...
+        ]
+    }
+    
+    Each expense is validated on its own; the valid ones are saved together
+    and the invalid ones are reported. `results` has one entry per submitted
+    expense, in order, echoing its client_id. An expense whose client_id was
+    already saved (a resent batch) is not saved again: its result carries the
+    stored expense and "duplicate": true, and it is not counted in `created`.
+    """
+    try:
+        data = request.get_json(silent=True)
+        items = data.get('expenses') if isinstance(data, dict) else None
+        
+        if not isinstance(items, list) or not items:
+            return jsonify({
+                'success': False,
+                'error': 'No expenses provided'
+            }), 400
+        
+        limit = current_app.config.get('EXPENSE_BATCH_LIMIT', DEFAULT_BATCH_LIMIT)
+        if len(items) > limit:
+            return jsonify({
+                'success': False,
+                'error': f'At most {limit} expenses per batch'
+            }), 400
+        
+        user_id = g.user['id']
+        results = []
+        valid = []
+        for item in items:
+            if isinstance(item, dict):
+                expense, errors = validate_expense(item)
+            else:
+                expense, errors = None, ['Expense must be an object']
+            result = {'client_id': item.get('client_id') if isinstance(item, dict) else None,
+                      'success': not errors}
+            if errors:
+                result['errors'] = errors
+            else:
+                valid.append((result, expense))
+            results.append(result)
+        
+        new = []
+        if valid:
+            db = get_db()
+            # One write transaction for the whole batch
+            saved = [(result, expense, *save_expense(db, user_id, expense)) for result, expense in valid]
+            db.commit()
+            
+            ids = [expense_id for _, _, expense_id, _ in saved]
+            rows = {row['id']: row for row in fetch_records(db.execute(
+                f'SELECT * FROM transactions WHERE user_id = ? AND id IN ({", ".join("?" * len(ids))})',
+                (user_id, *ids)
+            ))}
+            for result, expense, expense_id, created in saved:
+                result['expense'] = expense_to_dict(rows[expense_id])
+                if created:
+                    new.append(expense)
+                else:
+                    result['duplicate'] = True
+        
+        if new:
+            # Evaluate notifications once for the whole batch
+            try:
+                largest = {}
+                for expense in new:
+                    if expense['amount'] > largest.get(expense['category'], 0):
+                        largest[expense['category']] = expense['amount']
+                for category, amount in largest.items():
+                    NotificationEngine.check_unusual_spending(user_id, category, float(amount))
+                NotificationEngine.check_budget_warning(user_id)
+                NotificationEngine.check_overspending(user_id)
+            except Exception as notif_error:
+                logger.exception('Notification error')
+        
+        return jsonify({
+            'success': len(valid) == len(items),
+            'created': len(new),
+            'duplicates': len(valid) - len(new),
+            'failed': len(items) - len(valid),
+            'results': results
+        }), 200
+        
+    except Exception as e:
+        logger.exception('Error creating expense batch')
         return jsonify({
             'success': False,
             'error': 'Internal server error'
@@ -137,6 +301,7 @@ def create_expense():
 
 @bp.route('/recent', methods=['GET'])
 @login_required
+@etag_by_data_version
 def get_recent_expenses():
     """
     Get recent expenses for the user
@@ -152,7 +317,7 @@ def get_recent_expenses():
         
         expenses = db.execute(
             '''SELECT * FROM transactions 
-               WHERE user_id = ? AND type = 'expense'
+               WHERE user_id = ? AND transaction_type = 'expense'
                ORDER BY date DESC, created_at DESC
                LIMIT ?''',
             (user_id, limit)
@@ -175,7 +340,7 @@ def get_recent_expenses():
         })
         
     except Exception as e:
-        print(f"Error getting recent expenses: {e}")
+        logger.exception('Error getting recent expenses')
         return jsonify({
             'success': False,
             'error': 'Internal server error'
@@ -195,7 +360,7 @@ def get_expense(expense_id):
         
         expense = db.execute(
             '''SELECT * FROM transactions 
-               WHERE id = ? AND user_id = ? AND type = 'expense' ''',
+               WHERE id = ? AND user_id = ? AND transaction_type = 'expense' ''',
             (expense_id, user_id)
         ).fetchone()
         
@@ -218,7 +383,7 @@ def get_expense(expense_id):
         })
         
     except Exception as e:
-        print(f"Error getting expense: {e}")
+        logger.exception('Error getting expense %s', expense_id)
         return jsonify({
             'success': False,
             'error': 'Internal server error'
@@ -227,6 +392,7 @@ def get_expense(expense_id):
 
 @bp.route('/<int:expense_id>', methods=['PUT', 'PATCH'])
 @login_required
+@invalidates('ledger')
 def update_expense(expense_id):
     """
     Update an expense
@@ -239,7 +405,7 @@ def update_expense(expense_id):
         # Check expense exists and belongs to user
         expense = db.execute(
             '''SELECT * FROM transactions 
-               WHERE id = ? AND user_id = ? AND type = 'expense' ''',
+               WHERE id = ? AND user_id = ? AND transaction_type = 'expense' ''',
             (expense_id, user_id)
         ).fetchone()
         
@@ -262,18 +428,18 @@ def update_expense(expense_id):
         
         if 'amount' in data:
             try:
-                amount = Decimal(str(data['amount']))
+                amount = Money.parse(data['amount'])
                 if amount <= 0:
                     return jsonify({'success': False, 'error': 'Amount must be greater than 0'}), 400
                 update_fields.append('amount = ?')
                 params.append(float(amount))
-            except (InvalidOperation, ValueError):
+                update_fields.append('amount_cents = ?')
+                params.append(amount)
+            except ValueError:
                 return jsonify({'success': False, 'error': 'Invalid amount'}), 400
         
-        valid_categories = ['Food', 'Transportation', 'Entertainment', 'Shopping', 
-                          'Health', 'Utilities', 'Education', 'Other']
         if 'category' in data:
-            if data['category'] not in valid_categories:
+            if data['category'] not in VALID_CATEGORIES:
                 return jsonify({'success': False, 'error': 'Invalid category'}), 400
             update_fields.append('category = ?')
             params.append(data['category'])
@@ -326,7 +492,7 @@ def update_expense(expense_id):
         })
         
     except Exception as e:
-        print(f"Error updating expense: {e}")
+        logger.exception('Error updating expense %s', expense_id)
         return jsonify({
             'success': False,
             'error': 'Internal server error'
@@ -335,6 +501,7 @@ def update_expense(expense_id):
 
 @bp.route('/<int:expense_id>', methods=['DELETE'])
 @login_required
+@invalidates('ledger')
 def delete_expense(expense_id):
     """
     Delete an expense
@@ -347,7 +514,7 @@ def delete_expense(expense_id):
         # Check expense exists and belongs to user
         expense = db.execute(
             '''SELECT * FROM transactions 
-               WHERE id = ? AND user_id = ? AND type = 'expense' ''',
+               WHERE id = ? AND user_id = ? AND transaction_type = 'expense' ''',
             (expense_id, user_id)
         ).fetchone()
         
@@ -367,7 +534,7 @@ def delete_expense(expense_id):
         })
         
     except Exception as e:
-        print(f"Error deleting expense: {e}")
+        logger.exception('Error deleting expense %s', expense_id)
         return jsonify({
             'success': False,
             'error': 'Internal server error'
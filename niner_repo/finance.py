@@ -1,11 +1,16 @@
-from decimal import Decimal
 from datetime import datetime
+import logging
 from flask import Blueprint, g, render_template, redirect, jsonify, request, flash, url_for
 from auth import login_required
 from db import get_db
-from priorities import get_personalized_suggestions, get_user_financial_stats
+from data_versions import etag_by_data_version
+from cache import cached_view_model, invalidates
+from money import Money
+from priorities import get_personalized_suggestions
+from stats import get_stats
 from gamification import on_goal_created, on_goal_completed
 import budget
+from goals import contribution_history, load_goals, record_contribution
 
 try:
     from db import get_db
@@ -17,52 +22,22 @@ except ImportError:
     
 bp = Blueprint('finance', __name__)
 
+logger = logging.getLogger(__name__)
+
 def init_app(app):
     app.register_blueprint(bp)
 
 def calculate_total_income(user_id, start_date=None, end_date=None):
     """Calculate total income for a user within a date range."""
-    query = '''
-        SELECT COALESCE(SUM(amount), 0) as total_income
-        FROM v_active_income 
-        WHERE user_id = ?
-    '''
-    params = [user_id]
-    
-    if start_date:
-        query += ' AND date >= ?'
-        params.append(start_date)
-    if end_date:
-        query += ' AND date <= ?'
-        params.append(end_date)
-
-    result = get_db().execute(query, params).fetchone()
-    return Decimal(str(result['total_income']))
+    return get_stats(user_id, (start_date, end_date))['income']
 
 def calculate_total_expenses(user_id, start_date=None, end_date=None):
     """Calculate total expenses for a user within a date range."""
-    query = '''
-        SELECT COALESCE(SUM(amount), 0) as total_expenses
-        FROM expenses 
-        WHERE user_id = ? AND is_active = 1
-    '''
-    params = [user_id]
-    
-    if start_date:
-        query += ' AND date >= ?'
-        params.append(start_date)
-    if end_date:
-        query += ' AND date <= ?'
-        params.append(end_date)
-
-    result = get_db().execute(query, params).fetchone()
-    return Decimal(str(result['total_expenses']))
+    return get_stats(user_id, (start_date, end_date))['expenses']
 
 def calculate_savings(user_id, start_date=None, end_date=None):
     """Calculate total savings (income - expenses) for a user."""
-    total_income = calculate_total_income(user_id, start_date, end_date)
-    total_expenses = calculate_total_expenses(user_id, start_date, end_date)
-    return total_income - total_expenses
+    return get_stats(user_id, (start_date, end_date))['net']
 
 def calculate_budget_allocations(user_id):
     """Calculate budget allocations based on income and category settings."""
@@ -78,7 +53,7 @@ def calculate_budget_allocations(user_id):
             bc.id,
             bc.name,
             bc.allocation_percentage,
-            COALESCE(SUM(e.amount), 0) as spent_amount
+            COALESCE(SUM(e.amount_cents), 0) AS "spent_amount [money]"
         FROM budget_categories bc
         LEFT JOIN expenses e ON e.category_id = bc.id 
             AND e.user_id = bc.user_id 
@@ -90,8 +65,10 @@ def calculate_budget_allocations(user_id):
     
     allocations = []
     for category in categories:
-        allocated_amount = (monthly_income * Decimal(str(category['allocation_percentage']))) / 100
-        remaining_amount = allocated_amount - Decimal(str(category['spent_amount']))
+        # Percentages have two decimals, so scale by basis points
+        basis_points = int(round(category['allocation_percentage'] * 100))
+        allocated_amount = monthly_income.scale(basis_points, 10000)
+        remaining_amount = allocated_amount - category['spent_amount']
         
         allocations.append({
             'category_id': category['id'],
@@ -148,89 +125,11 @@ def dashboard():
 @login_required
 def goals():
     """Financial goals page with user's data"""
-    db_conn = get_db()
-    try:
-        # Check if financial_goals table exists
-        table_check = db_conn.execute('''
-            SELECT name FROM sqlite_master 
-            WHERE type='table' AND name='financial_goals'
-        ''').fetchone()
-        
-        user_goals = []
-        if table_check:
-            # Get user's goals from database
-            user_goals = db_conn.execute('''
-                SELECT * FROM financial_goals 
-                WHERE user_id = ? 
-                ORDER BY created_at DESC
-            ''', (g.user['id'],)).fetchall()
-        else:
-            # Create the table if it doesn't exist
-            db_conn.execute('''
-                CREATE TABLE IF NOT EXISTS financial_goals (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    goal_name TEXT NOT NULL,
-                    target_amount REAL NOT NULL,
-                    current_amount REAL DEFAULT 0,
-                    target_date TEXT,
-                    category TEXT,
-                    description TEXT,
-                    priority TEXT DEFAULT 'medium',
-                    is_completed BOOLEAN DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (id)
-                )
-            ''')
-            db_conn.commit()
-    except Exception as e:
-        print(f"Database error in goals: {e}")
-        user_goals = []
+    user_id = g.user['id']
+    goals_data = cached_view_model('goals', user_id, ('goals',), lambda: load_goals(user_id))
     
     # Get financial summary for the split view
-    financial_summary = budget.get_financial_summary(g.user['id'])
-    
-    # Convert goals to list of dicts for easier template access
-    goals_data = []
-    for goal in user_goals:
-        # Parse target_date from string to datetime object
-        target_date = None
-        if goal['target_date']:
-            try:
-                target_date = datetime.strptime(goal['target_date'], '%Y-%m-%d')
-            except (ValueError, TypeError):
-                try:
-                    # Try ISO format
-                    target_date = datetime.fromisoformat(goal['target_date'])
-                except:
-                    target_date = None
-        
-        # Parse created_at from string to datetime object
-        created_at = None
-        if goal['created_at']:
-            try:
-                created_at = datetime.strptime(goal['created_at'], '%Y-%m-%d %H:%M:%S')
-            except (ValueError, TypeError):
-                try:
-                    # Try ISO format
-                    created_at = datetime.fromisoformat(goal['created_at'])
-                except:
-                    created_at = datetime.now()
-        
-        goals_data.append({
-            'id': goal['id'],
-            'goal_name': goal['goal_name'],
-            'target_amount': float(goal['target_amount']),
-            'current_amount': float(goal['current_amount']),
-            'target_date': target_date,  # Now a datetime object
-            'target_date_str': goal['target_date'] if goal['target_date'] else '',  # Keep string for form
-            'category': goal['category'] if goal['category'] else 'other',
-            'description': goal['description'] if goal['description'] else '',
-            'priority': goal['priority'] if goal['priority'] else 'medium',
-            'is_completed': bool(goal['is_completed']),
-            'created_at': created_at  # Now a datetime object
-        })
+    financial_summary = budget.get_financial_summary(user_id)
     
     return render_template('home/finance-goals.html', 
                          goals=goals_data,
@@ -238,6 +137,7 @@ def goals():
 
 @bp.route('/goals/create', methods=['GET', 'POST'])
 @login_required
+@invalidates('goals', 'game')
 def create_goal():
     """Create a new financial goal - uses edit-goal.html as template"""
     if request.method == 'POST':
@@ -280,7 +180,7 @@ def create_goal():
             try:
                 on_goal_created(g.user['id'])
             except Exception as e:
-                print(f"Gamification error: {e}")
+                logger.exception('Gamification error')
             
             flash(f'Goal "{goal_name}" created successfully!', 'success')
             return redirect(url_for('finance.goals'))
@@ -306,6 +206,7 @@ def create_goal():
 
 @bp.route('/goals/<int:goal_id>/edit', methods=['GET', 'POST'])
 @login_required
+@invalidates('goals', 'game')
 def edit_goal(goal_id):
     """Edit an existing financial goal"""
     db_conn = get_db()
@@ -363,10 +264,11 @@ def edit_goal(goal_id):
 
 @bp.route('/goals/<int:goal_id>/contribute', methods=['POST'])
 @login_required
+@invalidates('goals', 'game')
 def add_contribution(goal_id):
     """Add contribution to a goal"""
     try:
-        contribution = float(request.form['contribution'])
+        contribution = Money.parse(request.form['contribution'])
         
         if contribution <= 0:
             flash('Contribution amount must be positive.', 'error')
@@ -384,26 +286,20 @@ def add_contribution(goal_id):
             flash('Goal not found.', 'error')
             return redirect(url_for('finance.goals'))
         
-        # Update current amount
-        new_amount = float(goal['current_amount']) + contribution
-        old_amount = float(goal['current_amount'])
-        target_amount = float(goal['target_amount']);
-        
-        db_conn.execute('''
-            UPDATE financial_goals SET
-                current_amount = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ? AND user_id = ?
-        ''', (new_amount, goal_id, g.user['id']))
-        db_conn.commit()
+        # The contribution triggers add it to current_amount
+        old_amount = float(goal['current_amount'] or 0)
+        new_amount = old_amount + float(contribution)
+        target_amount = float(goal['target_amount'])
+        record_contribution(goal_id, g.user['id'], contribution)
         
         # Check if goal just completed
         if new_amount >= target_amount and old_amount < target_amount:
             try:
                 on_goal_completed(g.user['id'])
             except Exception as e:
-                print(f"Gamification error: {e}")
+                logger.exception('Gamification error')
         
-        flash(f'Added ${contribution:.2f} to "{goal["goal_name"]}"!', 'success')
+        flash(f'Added ${contribution} to "{goal["goal_name"]}"!', 'success')
         
     except ValueError:
         flash('Please enter a valid contribution amount.', 'error')
@@ -412,8 +308,30 @@ def add_contribution(goal_id):
     
     return redirect(url_for('finance.goals'))
 
+@bp.route('/goals/<int:goal_id>/contributions', methods=['GET'])
+@login_required
+@etag_by_data_version
+def get_contributions(goal_id):
+    """A goal's contribution history, newest first"""
+    goal = get_db().execute(
+        'SELECT id FROM financial_goals WHERE id = ? AND user_id = ?',
+        (goal_id, g.user['id'])
+    ).fetchone()
+    if not goal:
+        return jsonify({'error': 'Goal not found'}), 404
+    
+    return jsonify({
+        'goal_id': goal_id,
+        'contributions': [{
+            'id': row['id'],
+            'amount': float(row['amount']),
+            'date': row['contributed_on'].isoformat(),
+        } for row in contribution_history(goal_id, g.user['id'])]
+    })
+
 @bp.route('/goals/<int:goal_id>/delete', methods=['POST'])
 @login_required
+@invalidates('goals', 'game')
 def delete_goal(goal_id):
     """Delete a financial goal"""
     try:
@@ -445,6 +363,7 @@ def delete_goal(goal_id):
 
 @bp.route('/goals/<int:goal_id>/toggle', methods=['POST'])
 @login_required
+@invalidates('goals', 'game')
 def toggle_goal_completion(goal_id):
     """Toggle goal completion status"""
     try:
@@ -481,6 +400,7 @@ def toggle_goal_completion(goal_id):
 # API ROUTES
 @bp.route('/finance/summary', methods=['GET'])
 @login_required
+@etag_by_data_version
 def get_financial_summary():
     """Get comprehensive financial summary including income, expenses, savings, and budget."""
     try:
@@ -493,9 +413,7 @@ def get_financial_summary():
         end_date = request.args.get('end_date')
 
         # Calculate all financial metrics
-        total_income = calculate_total_income(g.user['id'], start_date, end_date)
-        total_expenses = calculate_total_expenses(g.user['id'], start_date, end_date)
-        total_savings = calculate_savings(g.user['id'], start_date, end_date)
+        stats = get_stats(g.user['id'], (start_date, end_date))
         budget_allocations = calculate_budget_allocations(g.user['id'])
 
         # Get income breakdown by category
@@ -503,30 +421,26 @@ def get_financial_summary():
             SELECT 
                 ic.name as category_name,
                 COUNT(*) as entry_count,
-                SUM(i.amount) as total_amount,
-                AVG(i.amount) as average_amount
+                SUM(i.amount_cents) AS "total_amount [money]"
             FROM v_active_income i
             JOIN income_category ic ON i.category_id = ic.id
             WHERE i.user_id = ?
             GROUP BY ic.id, ic.name
-            ORDER BY total_amount DESC
+            ORDER BY SUM(i.amount_cents) DESC
         ''', (g.user['id'],)).fetchall()
 
-        # Calculate savings rate
-        savings_rate = (total_savings / total_income * 100) if total_income > 0 else 0
-
         return jsonify({
             'summary': {
-                'total_income': float(total_income),
-                'total_expenses': float(total_expenses),
-                'total_savings': float(total_savings),
-                'savings_rate': float(savings_rate)
+                'total_income': float(stats['income']),
+                'total_expenses': float(stats['expenses']),
+                'total_savings': float(stats['net']),
+                'savings_rate': float(stats['savings_rate'])
             },
             'income_breakdown': [{
                 'category': item['category_name'],
                 'count': item['entry_count'],
                 'total': float(item['total_amount']),
-                'average': float(item['average_amount'])
+                'average': float(item['total_amount'] / item['entry_count'])
             } for item in income_breakdown],
             'budget_allocations': budget_allocations,
             'date_range': {
@@ -540,6 +454,7 @@ def get_financial_summary():
 
 @bp.route('/budget/recalculate', methods=['POST'])
 @login_required
+@invalidates('budget')
 def recalculate_budget():
     """Force a budget recalculation based on current income."""
     try:
@@ -578,7 +493,7 @@ def get_projected_savings():
         # Get recurring income
         recurring_income = get_db().execute('''
             SELECT 
-                amount,
+                amount_cents,
                 recurrence_period
             FROM v_active_income
             WHERE user_id = ? AND is_recurring = 1
@@ -587,20 +502,20 @@ def get_projected_savings():
         # Get recurring expenses
         recurring_expenses = get_db().execute('''
             SELECT 
-                amount,
+                amount_cents,
                 recurrence_period
             FROM expenses
             WHERE user_id = ? AND is_recurring = 1 AND is_active = 1
         ''', (g.user['id'],)).fetchall()
 
         # Calculate monthly projections
-        monthly_recurring_income = sum(
-            calculate_monthly_amount(item['amount'], item['recurrence_period'])
+        monthly_recurring_income = Money.sum(
+            calculate_monthly_amount(Money(item['amount_cents']), item['recurrence_period'])
             for item in recurring_income
         )
         
-        monthly_recurring_expenses = sum(
-            calculate_monthly_amount(item['amount'], item['recurrence_period'])
+        monthly_recurring_expenses = Money.sum(
+            calculate_monthly_amount(Money(item['amount_cents']), item['recurrence_period'])
             for item in recurring_expenses
         )
 
@@ -623,15 +538,19 @@ def get_projected_savings():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Monthly equivalents as (numerator, denominator), so the conversion stays in integers
+MONTHLY_MULTIPLIERS = {
+    'daily': (3044, 100),
+    'weekly': (4348, 1000),
+    'biweekly': (2174, 1000),
+    'monthly': (1, 1),
+    'quarterly': (333, 1000),
+    'annually': (833, 10000),
+}
+
 def calculate_monthly_amount(amount, recurrence_period):
-    """Convert an amount to its monthly equivalent based on recurrence period."""
-    amount = Decimal(str(amount))
-    multipliers = {
-        'daily': Decimal('30.44'),
-        'weekly': Decimal('4.348'),
-        'biweekly': Decimal('2.174'),
-        'monthly': Decimal('1'),
-        'quarterly': Decimal('0.333'),
-        'annually': Decimal('0.0833')
-    }
-    return amount * multipliers.get(recurrence_period, Decimal('1'))
\ No newline at end of file
+    """Convert an amount (Money, or a plain number) to its monthly equivalent."""
+    if not isinstance(amount, Money):
+        amount = Money.parse(amount)
+    numerator, denominator = MONTHLY_MULTIPLIERS.get(recurrence_period, (1, 1))
+    return amount.scale(numerator, denominator)
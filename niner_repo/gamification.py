@@ -1,9 +1,10 @@
 from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for, g
-from db import get_db
+from db import add_bootstrap_step, get_db
+from metrics import GAMIFICATION_WORK
+from cache import cached_view_model, forgets, request_memoized
 from auth import login_required
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import json
-import sqlite3
 
 bp = Blueprint('gamification', __name__, url_prefix='/game')
 
@@ -15,24 +16,42 @@ bp = Blueprint('gamification', __name__, url_prefix='/game')
 @login_required
 def dashboard():
     """Main gamification dashboard"""
-    db = get_db()
-    
     # Get or create user progress
     progress = get_user_progress(g.user['id'])
     
+    # Achievements, badges and levels only change through the activity hooks;
+    # the leaderboard position depends on other users, so it stays live
+    page = cached_view_model('game_dashboard', g.user['id'], ('game',),
+                             lambda: build_dashboard(g.user['id'], progress['current_level']),
+                             progress['current_level'])
+    
+    # Get leaderboard position
+    leaderboard_position = get_leaderboard_position(g.user['id'])
+    
+    return render_template(
+        'game/dashboard.html',
+        progress=progress,
+        leaderboard_position=leaderboard_position,
+        **page
+    )
+
+def build_dashboard(user_id, current_level):
+    """Achievements, milestones, activities, badges and level info (uncached)"""
+    db = get_db()
+    
     # Get user achievements
-    achievements = db.execute(
+    achievements = [dict(row) for row in db.execute(
         '''SELECT ua.*, m.name, m.description, m.badge_icon, m.badge_color, 
                   m.points_reward, m.tier, m.criteria_value
            FROM user_achievements ua
            JOIN milestones m ON ua.milestone_id = m.id
            WHERE ua.user_id = ? AND ua.is_completed = 1
            ORDER BY ua.achieved_at DESC''',
-        (g.user['id'],)
-    ).fetchall()
+        (user_id,)
+    ).fetchall()]
     
     # Get in-progress milestones
-    in_progress = db.execute(
+    in_progress = [dict(row) for row in db.execute(
         '''SELECT ua.*, m.name, m.description, m.badge_icon, m.badge_color,
                   m.criteria_value, m.criteria_type
            FROM user_achievements ua
@@ -40,54 +59,48 @@ def dashboard():
            WHERE ua.user_id = ? AND ua.is_completed = 0
            ORDER BY (ua.progress_value / m.criteria_value) DESC
            LIMIT 5''',
-        (g.user['id'],)
-    ).fetchall()
+        (user_id,)
+    ).fetchall()]
     
     # Get recent activities
-    recent_activities = db.execute(
+    recent_activities = [dict(row) for row in db.execute(
         '''SELECT * FROM game_activities
            WHERE user_id = ?
            ORDER BY created_at DESC
            LIMIT 10''',
-        (g.user['id'],)
-    ).fetchall()
+        (user_id,)
+    ).fetchall()]
     
     # Get user badges
-    badges = db.execute(
+    badges = [dict(row) for row in db.execute(
         '''SELECT ub.*, b.name, b.description, b.icon, b.color, b.rarity
            FROM user_badges ub
            JOIN badges b ON ub.badge_id = b.id
            WHERE ub.user_id = ?
            ORDER BY ub.earned_at DESC''',
-        (g.user['id'],)
-    ).fetchall()
+        (user_id,)
+    ).fetchall()]
     
     # Get current level info
-    current_level = db.execute(
+    level = db.execute(
         'SELECT * FROM levels WHERE level_number = ?',
-        (progress['current_level'],)
+        (current_level,)
     ).fetchone()
     
     # Get next level info
     next_level = db.execute(
         'SELECT * FROM levels WHERE level_number = ?',
-        (progress['current_level'] + 1,)
+        (current_level + 1,)
     ).fetchone()
     
-    # Get leaderboard position
-    leaderboard_position = get_leaderboard_position(g.user['id'])
-    
-    return render_template(
-        'game/dashboard.html',
-        progress=progress,
-        achievements=achievements,
-        in_progress=in_progress,
-        recent_activities=recent_activities,
-        badges=badges,
-        current_level=current_level,
-        next_level=next_level,
-        leaderboard_position=leaderboard_position
-    )
+    return {
+        'achievements': achievements,
+        'in_progress': in_progress,
+        'recent_activities': recent_activities,
+        'badges': badges,
+        'current_level': dict(level) if level else None,
+        'next_level': dict(next_level) if next_level else None,
+    }
 
 @bp.route('/milestones')
 @login_required
@@ -131,7 +144,7 @@ def leaderboard():
     top_users = db.execute(
         '''SELECT u.id, u.username, ugp.total_points, ugp.current_level,
                   ugp.streak_days, COUNT(ua.id) as achievements_count
-           FROM user u
+           FROM users u
            JOIN user_game_progress ugp ON u.id = ugp.user_id
            LEFT JOIN user_achievements ua ON u.id = ua.user_id AND ua.is_completed = 1
            GROUP BY u.id
@@ -152,8 +165,9 @@ def leaderboard():
 # PROGRESS TRACKING & POINTS
 # ============================================================================
 
+@request_memoized('game')
 def get_user_progress(user_id):
-    """Get or create user game progress"""
+    """Get or create user game progress (read once per request)"""
     db = get_db()
     
     progress = db.execute(
@@ -284,6 +298,7 @@ def award_badge(user_id, badge_name):
     
     flash(json.dumps(badge_data), 'badge')
 
+@forgets('game')
 def award_points(user_id, points, activity_type, description):
     """Award points to user and check for level up"""
     db = get_db()
@@ -392,14 +407,16 @@ def check_milestone_progress(user_id, milestone_category, current_value):
                 complete_milestone(user_id, milestone['id'])
                 break  # Only complete ONE milestone per check to avoid spam
 
+@forgets('game')
 def update_streak(user_id):
     """Update user's activity streak"""
     db = get_db()
-    today = datetime.now().date().isoformat()
+    today = date.today()
     
-    # Get or create streak record
+    # Get or create streak record (last_activity_date is TEXT; the alias reads it as a date)
     streak = db.execute(
-        'SELECT * FROM user_streaks WHERE user_id = ?',
+        '''SELECT current_streak, longest_streak, last_activity_date AS "last_activity_date [date]"
+           FROM user_streaks WHERE user_id = ?''',
         (user_id,)
     ).fetchone()
     
@@ -419,10 +436,10 @@ def update_streak(user_id):
         db.commit()
         return 1
     
-    last_date = datetime.fromisoformat(streak['last_activity_date']).date() if streak['last_activity_date'] else None
-    yesterday = (datetime.now() - timedelta(days=1)).date()
+    last_date = streak['last_activity_date']
+    yesterday = today - timedelta(days=1)
     
-    if last_date == datetime.now().date():
+    if last_date == today:
         # Already logged today
         return streak['current_streak']
     elif last_date == yesterday:
@@ -487,6 +504,7 @@ def get_leaderboard_position(user_id):
 # ACTIVITY HOOKS (Called from other modules)
 # ============================================================================
 
+@GAMIFICATION_WORK.time(hook='budget_created')
 def on_budget_created(user_id):
     """Called when user creates a budget"""
     award_points(user_id, 50, 'budget_created', 'Created a new budget')
@@ -501,6 +519,7 @@ def on_budget_created(user_id):
     check_milestone_progress(user_id, 'budget', budget_count)
     update_streak(user_id)
 
+@GAMIFICATION_WORK.time(hook='transaction_added')
 def on_transaction_added(user_id):
     """Called when user logs a transaction"""
     award_points(user_id, 10, 'transaction_added', 'Logged a transaction')
@@ -515,6 +534,7 @@ def on_transaction_added(user_id):
     check_milestone_progress(user_id, 'transaction', transaction_count)
     update_streak(user_id)
 
+@GAMIFICATION_WORK.time(hook='investment_added')
 def on_investment_added(user_id):
     """Called when user adds an investment"""
     award_points(user_id, 150, 'investment_added', 'Added an investment')
@@ -529,6 +549,7 @@ def on_investment_added(user_id):
     check_milestone_progress(user_id, 'investment', investment_count)
     update_streak(user_id)
 
+@GAMIFICATION_WORK.time(hook='goal_created')
 def on_goal_created(user_id):
     """Called when user creates a financial goal"""
     award_points(user_id, 75, 'goal_created', 'Created a financial goal')
@@ -542,6 +563,7 @@ def on_goal_created(user_id):
     check_milestone_progress(user_id, 'goal', goal_count)
     update_streak(user_id)
 
+@GAMIFICATION_WORK.time(hook='goal_completed')
 def on_goal_completed(user_id):
     """Called when user completes a financial goal"""
     award_points(user_id, 250, 'goal_completed', 'Completed a financial goal!')
@@ -555,6 +577,7 @@ def on_goal_completed(user_id):
     
     check_milestone_progress(user_id, 'goal', completed_goals)
 
+@GAMIFICATION_WORK.time(hook='savings_milestone')
 def on_savings_milestone(user_id, total_savings):
     """Called when user's savings reach a milestone"""
     check_milestone_progress(user_id, 'savings', total_savings)
@@ -572,9 +595,9 @@ __all__ = [
     'update_streak'
 ]
 
-def remove_milestone_duplicates(db_path):
-    conn = sqlite3.connect(db_path)
-    conn.execute("""
+def remove_milestone_duplicates(db):
+    """Drop duplicate milestone rows left by repeated seeding (keeps the first of each)"""
+    db.execute("""
         DELETE FROM milestones
         WHERE rowid NOT IN (
             SELECT MIN(rowid)
@@ -582,8 +605,9 @@ def remove_milestone_duplicates(db_path):
             GROUP BY name, category
         );
     """)
-    conn.commit()
-    conn.close()
+    db.commit()
 
-# Call this after all milestone inserts
-remove_milestone_duplicates('instance/niner_finance.sqlite')
\ No newline at end of file
+@bp.record_once
+def _register_bootstrap(state):
+    # Once per process and database, instead of at import time
+    add_bootstrap_step(state.app, remove_milestone_duplicates)
@@ -0,0 +1,113 @@
+"""
+Goal Progress Module
+Contribution history for financial goals, and when each goal is projected to
+be reached at the pace the user has been saving.
+
+Contributions are rows in goal_contributions. Triggers (migration 0007) add
+each one to the goal's current_amount and keep running aggregates on the goal
+row (contributed_cents, contribution_count, first/last contribution date), so
+listing goals never sums the history.
+
+The projection takes a goal's last VELOCITY_WINDOW contributions (ranked with
+a window function), spreads their total over the days from the earliest of
+them to today, and divides the remaining amount by that daily pace. All of it
+is one query over the user's goals; finance.goals caches the result under the
+user's 'goals' tag.
+"""
+
+from datetime import date, datetime
+
+from db import get_db
+from money import Money
+
+# How many recent contributions set the pace for the projection
+VELOCITY_WINDOW = 10
+
+GOALS_SQL = '''
+    WITH ranked AS (
+        SELECT goal_id, amount_cents, contributed_on,
+               ROW_NUMBER() OVER (PARTITION BY goal_id ORDER BY contributed_on DESC, id DESC) AS recency
+        FROM goal_contributions
+        WHERE user_id = :user_id
+    ),
+    pace AS (
+        SELECT goal_id,
+               SUM(amount_cents) AS recent_cents,
+               CAST(julianday(:today) - julianday(MIN(contributed_on)) AS INTEGER) + 1 AS span_days
+        FROM ranked
+        WHERE recency <= :window
+        GROUP BY goal_id
+    ),
+    progress AS (
+        SELECT g.*,
+               CAST(ROUND(g.target_amount * 100) AS INTEGER)
+                   - CAST(ROUND(COALESCE(g.current_amount, 0) * 100) AS INTEGER) AS remaining_cents,
+               p.recent_cents, p.span_days
+        FROM financial_goals g
+        LEFT JOIN pace p ON p.goal_id = g.id
+        WHERE g.user_id = :user_id
+    )
+    SELECT *,
+           target_date AS "target_at [timestamp]",
+           CASE WHEN recent_cents > 0 THEN recent_cents * 30 / span_days END AS "monthly_pace [money]",
+           CASE WHEN recent_cents > 0 AND remaining_cents > 0
+                THEN date(:today, '+' || ((remaining_cents * span_days + recent_cents - 1) / recent_cents) || ' days')
+           END AS "projected_completion [date]"
+    FROM progress
+    ORDER BY created_at DESC
+'''
+
+
+def load_goals(user_id, today=None):
+    """User's goals as template-ready dicts, with contribution aggregates and projection (uncached)"""
+    rows = get_db().execute(GOALS_SQL, {
+        'user_id': user_id, 'today': today or date.today(), 'window': VELOCITY_WINDOW
+    }).fetchall()
+
+    goals_data = []
+    for goal in rows:
+        target_date = goal['target_at'] if isinstance(goal['target_at'], datetime) else None
+
+        goals_data.append({
+            'id': goal['id'],
+            'goal_name': goal['goal_name'],
+            'target_amount': float(goal['target_amount']),
+            'current_amount': float(goal['current_amount'] or 0),
+            'target_date': target_date,
+            'target_date_str': goal['target_date'] if goal['target_date'] else '',  # Keep string for form
+            'category': goal['category'] if goal['category'] else 'other',
+            'description': goal['description'] if goal['description'] else '',
+            'priority': goal['priority'] if goal['priority'] else 'medium',
+            'is_completed': bool(goal['is_completed']),
+            'created_at': goal['created_at'],
+            'contributed': float(Money(goal['contributed_cents'])),
+            'contribution_count': goal['contribution_count'],
+            'last_contribution_on': goal['last_contribution_on'],
+            'monthly_pace': float(goal['monthly_pace']) if goal['monthly_pace'] is not None else None,
+            'projected_completion': goal['projected_completion'],
+        })
+
+    return goals_data
+
+
+def record_contribution(goal_id, user_id, amount, contributed_on=None):
+    """Record a contribution (Money); the triggers update the goal's totals"""
+    db = get_db()
+    db.execute(
+        '''INSERT INTO goal_contributions (goal_id, user_id, amount_cents, contributed_on)
+           VALUES (?, ?, ?, ?)''',
+        (goal_id, user_id, amount, contributed_on or date.today())
+    )
+    db.commit()
+
+
+def contribution_history(goal_id, user_id, limit=100):
+    """A goal's most recent contributions, newest first"""
+    return get_db().execute(
+        '''SELECT id, amount_cents AS "amount [money]", contributed_on, created_at
+           FROM goal_contributions
+           WHERE user_id = ? AND goal_id = ?
+           ORDER BY contributed_on DESC, id DESC
+           LIMIT ?''',
+        (user_id, goal_id, limit)
+    ).fetchall()
@@ -0,0 +1,118 @@
+"""
+Password Hashing Service
+Runs werkzeug's password hashing (deliberately CPU-heavy) in a small process
+pool instead of on the request thread, so a burst of logins or sign-ups is
+capped at HASH_POOL_WORKERS cores per gunicorn worker and cannot starve the
+rest of the traffic.
+
+At most HASH_QUEUE_LIMIT hashes may be queued or running per worker process. A
+request that cannot get a slot within HASH_QUEUE_TIMEOUT seconds fails with
+HashingBusy, a 429 Too Many Requests with Retry-After.
+
+Each purpose has its own method/cost (HASH_METHODS overrides DEFAULT_METHODS):
+    'password'          account passwords
+    'security_answer'   answers to the recovery questions
+`verify` reports when a stored hash was made with other parameters, and
+callers store the fresh hash it returns (rehash on login).
+
+HASH_POOL_WORKERS = 0 hashes inline, still behind the queue limit.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from flask import current_app
+from werkzeug.exceptions import TooManyRequests
+from werkzeug.security import check_password_hash, generate_password_hash
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_METHODS = {
+    'password': 'scrypt:32768:8:1',
+    'security_answer': 'scrypt:32768:8:1',
+}
+
+DEFAULT_POOL_WORKERS = 1
+DEFAULT_QUEUE_LIMIT = 4
+DEFAULT_QUEUE_TIMEOUT = 0.5
+
+
+class HashingBusy(TooManyRequests):
+    description = 'The server is busy. Please try again in a moment.'
+
+    def __init__(self):
+        super().__init__(retry_after=1)
+
+
+class HashingPool:
+    """Process pool plus a semaphore bounding queued and running jobs"""
+
+    def __init__(self, workers, queue_limit):
+        self.workers = workers
+        self.slots = threading.BoundedSemaphore(queue_limit)
+        self.executor = ProcessPoolExecutor(max_workers=workers) if workers else None
+
+    def run(self, func, *args, timeout=DEFAULT_QUEUE_TIMEOUT):
+        if not self.slots.acquire(timeout=timeout):
+            logger.warning('Hashing queue full')
+            raise HashingBusy()
+        try:
+            if self.executor is None:
+                return func(*args)
+            return self.executor.submit(func, *args).result()
+        finally:
+            self.slots.release()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool():
+    """This process's pool (a pool does not survive a fork, so keyed by pid)"""
+    config = current_app.config
+    key = (os.getpid(),
+           config.get('HASH_POOL_WORKERS', DEFAULT_POOL_WORKERS),
+           config.get('HASH_QUEUE_LIMIT', DEFAULT_QUEUE_LIMIT))
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = HashingPool(key[1], key[2])
+    return pool
+
+
+def method_for(purpose):
+    methods = current_app.config.get('HASH_METHODS') or {}
+    return methods.get(purpose, DEFAULT_METHODS[purpose])
+
+
+def _run(func, *args):
+    timeout = current_app.config.get('HASH_QUEUE_TIMEOUT', DEFAULT_QUEUE_TIMEOUT)
+    return get_pool().run(func, *args, timeout=timeout)
+
+
+def hash_secret(secret, purpose='password'):
+    """Hash `secret` with the configured method for `purpose`"""
+    return _run(generate_password_hash, secret, method_for(purpose))
+
+
+def check_secret(pwhash, secret):
+    return _run(check_password_hash, pwhash, secret)
+
+
+def needs_rehash(pwhash, purpose='password'):
+    """True if `pwhash` was made with other parameters than `purpose` now uses"""
+    return pwhash.split('$', 1)[0] != method_for(purpose)
+
+
+def verify(pwhash, secret, purpose='password'):
+    """(matches, new_hash); new_hash is set when a match should be stored rehashed"""
+    if not check_secret(pwhash, secret):
+        return False, None
+    if needs_rehash(pwhash, purpose):
+        return True, hash_secret(secret, purpose)
+    return True, None
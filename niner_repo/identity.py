@@ -0,0 +1,113 @@
+"""
+Identity Cache
+Loads g.user without a users query on every request.
+
+At login the user's non-sensitive fields (IDENTITY_FIELDS) are written into
+the signed session cookie as session['identity'], stamped with the row's
+identity_version. Each worker keeps a small LRU of user_id -> identity_version
+as it last read it from the database. A request whose stamp matches a fresh
+LRU entry builds g.user from the session alone; anything else (no payload, a
+stale or unknown stamp, an expired entry) costs one primary-key query that
+reloads the fields and refreshes both the LRU and the session.
+
+identity_version is bumped by a trigger whenever the username, email, password
+or security questions change (migration 0006), so every writer invalidates, in
+any worker. Entries expire after IDENTITY_CACHE_TTL seconds, which bounds how
+long a worker trusts a stamp after another worker's change.
+
+g.user never holds the password or security-answer hashes; code that needs them
+reads them explicitly.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, session
+
+from db import get_db
+from metrics import CACHE_LOOKUPS
+
+IDENTITY_FIELDS = ('id', 'username', 'email')
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL = 30
+
+
+class VersionLRU:
+    """Process-local LRU of user_id -> (identity_version, read_at)"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, user_id, ttl):
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None:
+                return None
+            version, read_at = entry
+            if time.monotonic() - read_at > ttl:
+                del self.entries[user_id]
+                return None
+            self.entries.move_to_end(user_id)
+            return version
+
+    def set(self, user_id, version):
+        with self.lock:
+            self.entries[user_id] = (version, time.monotonic())
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def forget(self, user_id):
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+def get_versions():
+    """The current app's version LRU, created on first use"""
+    versions = current_app.extensions.get('identity_versions')
+    if versions is None:
+        versions = current_app.extensions['identity_versions'] = VersionLRU(
+            current_app.config.get('IDENTITY_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)
+        )
+    return versions
+
+
+def remember(row):
+    """Log `row` (a users row with identity_version) into the session"""
+    session['user_id'] = row['id']
+    session['identity'] = dict({field: row[field] for field in IDENTITY_FIELDS}, v=row['identity_version'])
+    get_versions().set(row['id'], row['identity_version'])
+
+
+def forget(user_id):
+    """Drop this worker's entry after changing the user; the next request reloads"""
+    get_versions().forget(user_id)
+
+
+def load(user_id):
+    """g.user for the session's user_id: from the session if its stamp is current, else the DB"""
+    payload = session.get('identity')
+    if payload and payload.get('id') == user_id:
+        ttl = current_app.config.get('IDENTITY_CACHE_TTL', DEFAULT_TTL)
+        if get_versions().get(user_id, ttl) == payload.get('v'):
+            CACHE_LOOKUPS.inc(cache='identity', result='hit')
+            return {field: payload[field] for field in IDENTITY_FIELDS}
+    CACHE_LOOKUPS.inc(cache='identity', result='miss')
+
+    row = get_db().execute(
+        'SELECT id, username, email, identity_version FROM users WHERE id = ?',
+        (user_id,)
+    ).fetchone()
+    if row is None:
+        session.pop('identity', None)
+        return None
+    remember(row)
+    return {field: row[field] for field in IDENTITY_FIELDS}
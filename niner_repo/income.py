@@ -1,11 +1,17 @@
 from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for, g
 from auth import login_required
 from db import get_db
+from data_versions import etag_by_data_version
+from cache import invalidates
 import sqlite3
+import logging
+from money import Money
 
 # Create the blueprint - this is crucial!
 bp = Blueprint('income', __name__, url_prefix='/income')
 
+logger = logging.getLogger(__name__)
+
 @bp.route('/')
 @login_required
 def index():
@@ -45,7 +51,7 @@ def index():
                              categories=categories)
         
     except Exception as e:
-        print(f"Error in income index: {e}")
+        logger.exception('Error in income index')
         flash(f'Error loading income data: {str(e)}', 'error')
         return render_template('home/index.html', 
                              income_records=[],
@@ -54,11 +60,12 @@ def index():
 
 @bp.route('/add', methods=['POST'])
 @login_required
+@invalidates('ledger')
 def add():
     """Add a new income record"""
     try:
         source = request.form['source']
-        amount = float(request.form['amount'])
+        amount = Money.parse(request.form['amount'])
         category_id = request.form.get('category_id', 1)
         description = request.form.get('description', '')
         date = request.form['date']
@@ -67,23 +74,24 @@ def add():
         
         db = get_db()
         db.execute('''
-            INSERT INTO income (user_id, category_id, amount, source, description, date, 
+            INSERT INTO income (user_id, category_id, amount, amount_cents, source, description, date, 
                               is_recurring, recurrence_period, created_by)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (g.user['id'], category_id, amount, source, description, date,
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (g.user['id'], category_id, float(amount), amount, source, description, date,
               is_recurring, recurrence_period, g.user['id']))
         db.commit()
         
         flash('Income record added successfully!', 'success')
         
     except Exception as e:
-        print(f"Error adding income: {e}")
+        logger.exception('Error adding income')
         flash(f'Error adding income: {str(e)}', 'error')
     
     return redirect(url_for('income.index'))
 
 @bp.route('/api')
 @login_required
+@etag_by_data_version
 def api():
     """API endpoint that returns JSON data"""
     try:
@@ -114,6 +122,7 @@ def test():
 
 @bp.route('/delete/<int:income_id>', methods=['POST'])
 @login_required
+@invalidates('ledger')
 def delete(income_id):
     """Delete an income record"""
     try:
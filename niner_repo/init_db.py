@@ -3,6 +3,8 @@ import sys
 import sqlite3
 from datetime import datetime, timedelta
 
+import migrations
+
 def seed_demo_data(db_path):
     """Add sample data for demo user"""
     print("\n📦 Seeding demo data...")
@@ -182,7 +184,7 @@ def seed_demo_data(db_path):
         return False
 
 def init_all_databases():
-    """Initialize all database schemas"""
+    """Bring the schema up to date and load the demo account"""
     print("\n" + "=" * 60)
     print("🔧 Niner Finance - Complete Database Initialization")
     print("=" * 60)
@@ -195,162 +197,22 @@ def init_all_databases():
     success_count = 0
     total_count = 0
     
-    # 1. Main schema (users, password_resets, positions, portfolio_history, subscriptions)
-    print("\n📊 Initializing main schema...")
-    total_count += 1
-    try:
-        conn = sqlite3.connect(db_path)
-        
-        # Create users table
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL,
-                security_question_1 TEXT,
-                security_answer_1 TEXT,
-                security_question_2 TEXT,
-                security_answer_2 TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS password_resets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                token TEXT NOT NULL UNIQUE,
-                expires_at TIMESTAMP NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        ''')
-        
-        # Create positions table for portfolio
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS positions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                investment_id INTEGER NOT NULL,
-                quantity REAL NOT NULL DEFAULT 0,
-                avg_cost REAL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id),
-                FOREIGN KEY (investment_id) REFERENCES investments (id),
-                UNIQUE(user_id, investment_id)
-            )
-        ''')
-        
-        # Create portfolio_history table
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS portfolio_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                total_value REAL NOT NULL,
-                date DATE NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        ''')
-        
-        # Create subscriptions table
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS subscriptions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                name TEXT NOT NULL,
-                amount REAL NOT NULL,
-                currency TEXT DEFAULT 'USD',
-                frequency TEXT NOT NULL CHECK(frequency IN ('daily', 'weekly', 'monthly', 'yearly')),
-                category TEXT,
-                next_billing_date TEXT NOT NULL,
-                start_date TEXT NOT NULL,
-                end_date TEXT,
-                is_active INTEGER DEFAULT 1,
-                auto_detected INTEGER DEFAULT 0,
-                transaction_id INTEGER,
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
-                FOREIGN KEY (transaction_id) REFERENCES transactions (id) ON DELETE SET NULL
-            )
-        ''')
-        
-        # Create subscription categories
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS subscription_categories (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL,
-                icon TEXT,
-                color TEXT
-            )
-        ''')
-        
-        # Insert default subscription categories
-        categories = [
-            ('Streaming', 'fa-tv', '#e74c3c'),
-            ('Music', 'fa-music', '#9b59b6'),
-            ('Software', 'fa-laptop-code', '#3498db'),
-            ('Gaming', 'fa-gamepad', '#e67e22'),
-            ('Fitness', 'fa-dumbbell', '#27ae60'),
-            ('News', 'fa-newspaper', '#34495e'),
-            ('Cloud Storage', 'fa-cloud', '#1abc9c'),
-            ('Utilities', 'fa-bolt', '#f39c12'),
-            ('Insurance', 'fa-shield-alt', '#16a085'),
-            ('Other', 'fa-ellipsis-h', '#95a5a6')
-        ]
-        
-        conn.executemany('''
-            INSERT OR IGNORE INTO subscription_categories (name, icon, color)
-            VALUES (?, ?, ?)
-        ''', categories)
-        
-        # Create indexes for subscriptions
-        conn.execute('CREATE INDEX IF NOT EXISTS idx_subscriptions_user_id ON subscriptions(user_id)')
-        conn.execute('CREATE INDEX IF NOT EXISTS idx_subscriptions_next_billing ON subscriptions(next_billing_date)')
-        conn.execute('CREATE INDEX IF NOT EXISTS idx_subscriptions_active ON subscriptions(is_active)')
-        
-        conn.commit()
-        conn.close()
-        print("✓ Main schema initialized")
-        success_count += 1
-    except Exception as e:
-        print(f"❌ Main schema error: {e}")
-        import traceback
-        traceback.print_exc()
-    
-    # 2. Budget schema
-    print("\n💰 Initializing budget tables...")
-    total_count += 1
-    try:
-        conn = sqlite3.connect(db_path)
-        with open('budget_schema.sql', 'r') as f:
-            conn.executescript(f.read())
-        conn.close()
-        print("✓ Budget tables initialized")
-        success_count += 1
-    except Exception as e:
-        print(f"❌ Budget error: {e}")
-    
-    # 3. Schema.sql (transactions, income, expenses, financial_goals)
-    print("\n📝 Initializing transaction/income/expense/goals tables...")
+    # 1. Schema (migrations/)
+    print("\n📊 Applying schema migrations...")
     total_count += 1
     try:
         conn = sqlite3.connect(db_path)
-        with open('schema.sql', 'r') as f:
-            conn.executescript(f.read())
+        applied = migrations.upgrade(conn)
+        print(f"✓ Schema at version {migrations.current_version(conn)} ({len(applied)} applied)")
         conn.close()
-        print("✓ Transaction tables initialized")
         success_count += 1
     except Exception as e:
-        print(f"❌ Schema error: {e}")
+        print(f"❌ Migration error: {e}")
         import traceback
         traceback.print_exc()
+        return False
     
-    # 4. Create demo user
+    # 2. Create demo user
     print("\n👤 Creating demo user...")
     total_count += 1
     try:
@@ -385,14 +247,11 @@ def init_all_databases():
     except Exception as e:
         print(f"❌ Demo user error: {e}")
     
-    # 5. Seed demo data
+    # 3. Seed demo data
     total_count += 1
     if seed_demo_data(db_path):
         success_count += 1
     
-    # Remove duplicate milestones
-    remove_milestone_duplicates(db_path)
-    
     print("\n" + "=" * 60)
     print(f"📊 Initialization Summary: {success_count}/{total_count} successful")
     print("=" * 60)
@@ -405,20 +264,6 @@ def init_all_databases():
     
     return success_count == total_count
 
-def remove_milestone_duplicates(db_path):
-    """Remove duplicate milestones, keeping the one with the earliest creation date"""
-    conn = sqlite3.connect(db_path)
-    conn.execute("""
-        DELETE FROM milestones
-        WHERE rowid NOT IN (
-            SELECT MIN(rowid)
-            FROM milestones
-            GROUP BY name, category
-        );
-    """)
-    conn.commit()
-    conn.close()
-
 if __name__ == '__main__':
     success = init_all_databases()
     sys.exit(0 if success else 1)
\ No newline at end of file
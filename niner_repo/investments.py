@@ -1,6 +1,8 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, g
 from db import get_db
 from auth import login_required
+from cache import invalidates
+from rows import fetch_records
 
 bp = Blueprint('investments', __name__, url_prefix='/investments')
 
@@ -11,21 +13,20 @@ def index():
     db = get_db()
     user_id = g.user['id']
     # List user's positions joined with investments
-    rows = db.execute('''
+    positions = fetch_records(db.execute('''
         SELECT p.id as position_id, p.quantity, p.avg_cost, i.id as investment_id, i.ticker, i.name, at.name as asset_type
         FROM positions p
         JOIN investments i ON p.investment_id = i.id
         JOIN asset_types at ON i.asset_type_id = at.id
         WHERE p.user_id = ?
         ORDER BY i.ticker
-    ''', (user_id,)).fetchall()
-
-    positions = [dict(r) for r in rows]
+    ''', (user_id,)))
     return render_template('home/investments.html', positions=positions)
 
 
 @bp.route('/create', methods=('GET', 'POST'))
 @login_required
+@invalidates('portfolio')
 def create():
     db = get_db()
     if request.method == 'POST':
@@ -76,6 +77,7 @@ def create():
 
 @bp.route('/<int:position_id>/edit', methods=('GET', 'POST'))
 @login_required
+@invalidates('portfolio')
 def edit(position_id):
     db = get_db()
     user_id = g.user['id']
@@ -100,6 +102,7 @@ def edit(position_id):
 
 @bp.route('/<int:position_id>/delete', methods=('POST',))
 @login_required
+@invalidates('portfolio')
 def delete(position_id):
     db = get_db()
     user_id = g.user['id']
@@ -0,0 +1,206 @@
+"""
+Logging Setup Module
+Structured JSON logging with per-module levels and a non-blocking handler.
+
+Request threads only put records on an in-memory queue (QueueHandler). A single
+QueueListener thread per process formats them and writes them to stderr, so the
+request path never waits on stdout/stderr I/O. Each record carries the request
+ID (taken from X-Request-ID or generated), which ties log lines from different
+blueprints to the same request.
+
+Config keys:
+    LOG_LEVEL   default level for the root logger (default INFO)
+    LOG_LEVELS  per-module levels, e.g. {'db': 'WARNING', 'auth': 'DEBUG'}
+                (the LOG_LEVELS env var accepts "db=WARNING,auth=DEBUG")
+    LOG_FORMAT  'json' (default) or 'text'
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import sys
+import traceback
+import uuid
+from datetime import datetime, timezone
+
+from flask import g, has_request_context, request
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+
+# Incoming request IDs are reused only if they look like an ID, not arbitrary input
+_VALID_REQUEST_ID = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+_CONTEXT_ATTRS = {'request_id', 'method', 'path', 'user_id'}
+
+_listener = None
+_output = None
+
+
+class StderrHandler(logging.StreamHandler):
+    """StreamHandler that writes to whatever sys.stderr is at emit time"""
+
+    @property
+    def stream(self):
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamp records with the current request's ID, method, path and user"""
+
+    def filter(self, record):
+        if has_request_context():
+            record.request_id = g.get('request_id')
+            record.method = request.method
+            record.path = request.path
+            user = g.get('user')
+            record.user_id = user['id'] if user else None
+        return True
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps the exception text apart from the message"""
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(record.__dict__)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = ''.join(traceback.format_exception(*record.exc_info)).rstrip()
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for attr in _CONTEXT_ATTRS:
+            value = getattr(record, attr, None)
+            if value is not None:
+                entry[attr] = value
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and key not in _CONTEXT_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)s [%(name)s] [%(request_id)s] %(message)s')
+
+    def format(self, record):
+        if not hasattr(record, 'request_id'):
+            record.request_id = '-'
+        return super().format(record)
+
+
+def parse_levels(value):
+    """Accept a dict or a "module=LEVEL,module=LEVEL" string"""
+    if not value:
+        return {}
+    if isinstance(value, dict):
+        return value
+    levels = {}
+    for item in value.split(','):
+        name, _, level = item.partition('=')
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def _start_listener(output_handler):
+    global _listener
+    log_queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, output_handler, respect_handler_level=True)
+    _listener.start()
+    return log_queue
+
+
+def stop_logging():
+    """Drain the queue and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def configure_logging(app):
+    """Route the root logger through a queue to a JSON (or text) stderr handler"""
+    global _output
+    output = _output = StderrHandler()
+    if app.config.get('LOG_FORMAT', os.environ.get('LOG_FORMAT', 'json')) == 'text':
+        output.setFormatter(TextFormatter())
+    else:
+        output.setFormatter(JsonFormatter())
+
+    stop_logging()
+    handler = StructuredQueueHandler(_start_listener(output))
+    handler.addFilter(RequestContextFilter())
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        if isinstance(existing, StructuredQueueHandler):
+            root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(app.config.get('LOG_LEVEL', os.environ.get('LOG_LEVEL', 'INFO')))
+
+    levels = parse_levels(os.environ.get('LOG_LEVELS'))
+    levels.update(parse_levels(app.config.get('LOG_LEVELS')))
+    for name, level in levels.items():
+        logging.getLogger(name).setLevel(level)
+
+    if not getattr(configure_logging, '_hooks_registered', False):
+        # Threads do not survive fork; give each forked worker its own listener
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=_restart_in_child)
+        atexit.register(stop_logging)
+        configure_logging._hooks_registered = True
+
+
+def _restart_in_child():
+    global _listener
+    if _listener is None:
+        return
+    _listener = None
+    for existing in logging.getLogger().handlers:
+        if isinstance(existing, StructuredQueueHandler):
+            existing.queue = _start_listener(_output)
+
+
+def assign_request_id():
+    incoming = request.headers.get(REQUEST_ID_HEADER, '')
+    g.request_id = incoming if _VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex
+
+
+def echo_request_id(response):
+    if 'request_id' in g:
+        response.headers[REQUEST_ID_HEADER] = g.request_id
+    return response
+
+
+def init_app(app):
+    """Configure logging and attach a request ID to every request"""
+    configure_logging(app)
+    app.before_request(assign_request_id)
+    app.after_request(echo_request_id)
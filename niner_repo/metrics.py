@@ -0,0 +1,356 @@
+"""
+Metrics Module
+Counters, histograms and gauges exposed at /metrics in the Prometheus text format.
+
+Updates only touch an in-process buffer. Buffered deltas are flushed to a small
+SQLite side database (METRICS_DB, default instance/metrics.sqlite) at most every
+METRICS_FLUSH_INTERVAL seconds and on every scrape. That keeps recording cheap, and
+lets each gunicorn worker add into shared totals, so /metrics shows the same
+numbers whichever worker answers it.
+"""
+
+import functools
+import math
+import os
+import sqlite3
+import threading
+import time
+
+from flask import Blueprint, Response, current_app, g, request
+
+bp = Blueprint('metrics', __name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Gauges from workers that have not flushed for this long are left out of the sum
+GAUGE_STALE_SECONDS = 300
+
+SIDE_DB_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS metric_samples (
+    name TEXT NOT NULL,
+    labels TEXT NOT NULL,
+    value REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (name, labels)
+);
+
+CREATE TABLE IF NOT EXISTS metric_gauges (
+    name TEXT NOT NULL,
+    labels TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    value REAL NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (name, labels, pid)
+);
+'''
+
+
+def format_labels(labels):
+    """Render a label dict as {a="1",b="2"} (sorted, so it doubles as a key)"""
+    if not labels:
+        return ''
+    parts = []
+    for key in sorted(labels):
+        value = str(labels[key]).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{key}="{value}"')
+    return '{' + ','.join(parts) + '}'
+
+
+class Registry:
+    """Metric definitions plus the buffered, not yet flushed, updates"""
+
+    def __init__(self):
+        self.metrics = {}
+        self.collectors = []
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.gauges = {}
+        self.last_flush = 0.0
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def add(self, name, labels, amount):
+        key = (name, labels)
+        with self.lock:
+            self.pending[key] = self.pending.get(key, 0.0) + amount
+
+    def set_gauge(self, name, labels, value):
+        with self.lock:
+            self.gauges[(name, labels)] = value
+
+    def add_gauge(self, name, labels, amount):
+        key = (name, labels)
+        with self.lock:
+            self.gauges[key] = self.gauges.get(key, 0.0) + amount
+
+    def flush(self, path):
+        """Move buffered deltas and current gauge values into the side DB"""
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            gauges = list(self.gauges.items())
+            self.last_flush = time.monotonic()
+
+        if not pending and not gauges:
+            return
+
+        conn = connect_side_db(path)
+        try:
+            with conn:
+                conn.executemany(
+                    '''INSERT INTO metric_samples (name, labels, value) VALUES (?, ?, ?)
+                       ON CONFLICT (name, labels) DO UPDATE SET value = value + excluded.value''',
+                    [(name, labels, value) for (name, labels), value in pending.items()]
+                )
+                now = time.time()
+                pid = os.getpid()
+                conn.executemany(
+                    '''INSERT INTO metric_gauges (name, labels, pid, value, updated_at)
+                       VALUES (?, ?, ?, ?, ?)
+                       ON CONFLICT (name, labels, pid) DO UPDATE
+                       SET value = excluded.value, updated_at = excluded.updated_at''',
+                    [(name, labels, pid, value, now) for (name, labels), value in gauges]
+                )
+        except sqlite3.Error:
+            # Put the deltas back so the next flush can retry them
+            with self.lock:
+                for key, value in pending.items():
+                    self.pending[key] = self.pending.get(key, 0.0) + value
+            raise
+        finally:
+            conn.close()
+
+    def maybe_flush(self, path, interval):
+        if time.monotonic() - self.last_flush >= interval:
+            self.flush(path)
+
+    def reset(self):
+        """Forget buffered values (tests)"""
+        with self.lock:
+            self.pending.clear()
+            self.gauges.clear()
+            self.last_flush = 0.0
+
+
+REGISTRY = Registry()
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, registry=REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.registry = registry
+        registry.register(self)
+
+
+class Counter(Metric):
+    """Monotonically increasing count"""
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        self.registry.add(self.name, format_labels(labels), amount)
+
+
+class Gauge(Metric):
+    """Per-worker value; the exposed value is the sum over live workers"""
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        self.registry.set_gauge(self.name, format_labels(labels), value)
+
+    def inc(self, amount=1, **labels):
+        self.registry.add_gauge(self.name, format_labels(labels), amount)
+
+    def dec(self, amount=1, **labels):
+        self.registry.add_gauge(self.name, format_labels(labels), -amount)
+
+
+class Histogram(Metric):
+    """Cumulative buckets plus _sum and _count"""
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, buckets=DEFAULT_BUCKETS, registry=REGISTRY):
+        super().__init__(name, documentation, registry)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        for bound in self.buckets:
+            if value <= bound:
+                self.registry.add(self.name + '_bucket', format_labels(dict(labels, le=bound)), 1)
+        self.registry.add(self.name + '_bucket', format_labels(dict(labels, le='+Inf')), 1)
+        self.registry.add(self.name + '_sum', format_labels(labels), value)
+        self.registry.add(self.name + '_count', format_labels(labels), 1)
+
+    def time(self, **labels):
+        """Decorator observing the wrapped call's duration in seconds"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(time.perf_counter() - start, **labels)
+            return wrapper
+        return decorator
+
+
+REQUEST_LATENCY = Histogram(
+    'niner_request_duration_seconds', 'Request latency by endpoint'
+)
+REQUESTS = Counter(
+    'niner_requests_total', 'Requests by endpoint, method and status'
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    'niner_requests_in_flight', 'Requests currently being handled'
+)
+DB_TIME = Histogram(
+    'niner_db_time_seconds', 'Time spent in SQLite per request, by endpoint'
+)
+DB_QUERIES = Histogram(
+    'niner_db_queries_per_request', 'Statements executed per request, by endpoint',
+    buckets=(1, 2, 5, 10, 20, 50, 100, 250)
+)
+DB_CONNECTIONS = Counter(
+    'niner_db_connections_opened_total', 'SQLite connections opened (one per request that touches the DB)'
+)
+NOTIFICATION_WORK = Histogram(
+    'niner_notification_check_seconds', 'Time spent running notification checks'
+)
+NOTIFICATIONS_CREATED = Counter(
+    'niner_notifications_created_total', 'Notifications written, by type'
+)
+GAMIFICATION_WORK = Histogram(
+    'niner_gamification_hook_seconds', 'Time spent in gamification activity hooks'
+)
+CACHE_LOOKUPS = Counter(
+    'niner_cache_lookups_total', 'Cache lookups by cache and result (hit or miss)'
+)
+
+
+def register_collector(func):
+    """Register func() -> [(name, kind, documentation, value)], evaluated at scrape time"""
+    REGISTRY.collectors.append(func)
+    return func
+
+
+def get_side_db_path():
+    return current_app.config.get('METRICS_DB') or os.path.join(current_app.instance_path, 'metrics.sqlite')
+
+
+def connect_side_db(path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=5)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.executescript(SIDE_DB_SCHEMA)
+    return conn
+
+
+def format_value(value):
+    """A sample value in full precision: integers exactly, other floats by repr"""
+    value = float(value)
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if value.is_integer() and abs(value) < 2 ** 53:
+        return str(int(value))
+    return repr(value)
+
+
+def render_metrics(path, registry=REGISTRY):
+    """Text exposition of every metric stored in the side DB"""
+    conn = connect_side_db(path)
+    try:
+        samples = conn.execute('SELECT name, labels, value FROM metric_samples ORDER BY name, labels').fetchall()
+        gauges = conn.execute(
+            '''SELECT name, labels, SUM(value) FROM metric_gauges
+               WHERE updated_at >= ?
+               GROUP BY name, labels ORDER BY name, labels''',
+            (time.time() - GAUGE_STALE_SECONDS,)
+        ).fetchall()
+    finally:
+        conn.close()
+
+    by_metric = {}
+    for name, labels, value in samples + gauges:
+        base = name
+        for suffix in ('_bucket', '_sum', '_count'):
+            if name.endswith(suffix) and name[:-len(suffix)] in registry.metrics:
+                base = name[:-len(suffix)]
+        by_metric.setdefault(base, []).append((name, labels, value))
+
+    lines = []
+    for base in sorted(by_metric):
+        metric = registry.metrics.get(base)
+        if metric:
+            lines.append(f'# HELP {base} {metric.documentation}')
+            lines.append(f'# TYPE {base} {metric.kind}')
+        for name, labels, value in by_metric[base]:
+            lines.append(f'{name}{labels} {format_value(value)}')
+
+    for collector in registry.collectors:
+        for name, kind, documentation, value in collector():
+            lines.append(f'# HELP {name} {documentation}')
+            lines.append(f'# TYPE {name} {kind}')
+            lines.append(f'{name} {format_value(value)}')
+
+    return '\n'.join(lines) + '\n'
+
+
+@bp.route('/metrics')
+def metrics_endpoint():
+    """Prometheus scrape target; requires `Authorization: Bearer <METRICS_TOKEN>` if set"""
+    token = current_app.config.get('METRICS_TOKEN')
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return Response('Forbidden\n', status=403, mimetype='text/plain')
+
+    path = get_side_db_path()
+    REGISTRY.flush(path)
+    return Response(render_metrics(path), mimetype='text/plain; version=0.0.4')
+
+
+def start_request_timer():
+    g._metrics_start = time.perf_counter()
+    REQUESTS_IN_FLIGHT.inc()
+
+
+def finish_request(e=None):
+    # Runs even when the view raised, so the in-flight gauge cannot drift
+    if g.pop('_metrics_start', None) is not None:
+        REQUESTS_IN_FLIGHT.dec()
+
+
+def record_request(response):
+    start = g.get('_metrics_start')
+    if start is None:
+        return response
+
+    endpoint = request.endpoint or 'unmatched'
+    if endpoint == 'metrics.metrics_endpoint':
+        return response
+
+    REQUEST_LATENCY.observe(time.perf_counter() - start, endpoint=endpoint)
+    REQUESTS.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+
+    stats = getattr(g.get('db'), 'stats', None)
+    if stats is not None:
+        DB_CONNECTIONS.inc()
+        DB_TIME.observe(stats.total_time, endpoint=endpoint)
+        DB_QUERIES.observe(stats.count, endpoint=endpoint)
+
+    try:
+        REGISTRY.maybe_flush(get_side_db_path(), current_app.config.get('METRICS_FLUSH_INTERVAL', 5))
+    except sqlite3.Error as e:
+        current_app.logger.warning('Could not flush metrics: %s', e)
+    return response
+
+
+def init_app(app):
+    """Register the /metrics endpoint and per-request hooks"""
+    app.register_blueprint(bp)
+    app.before_request(start_request_timer)
+    app.after_request(record_request)
+    app.teardown_request(finish_request)
@@ -0,0 +1,317 @@
+"""
+Schema Migrations
+The schema is defined by the numbered files in migrations/, applied in order
+of their NNNN_name prefix (e.g. 0001_baseline.sql, 0002_consolidate_users.py).
+
+A .sql migration is a list of statements. A .py migration defines
+`upgrade(db)`, which gets the open connection and must not commit.
+
+Each migration runs in its own transaction and is recorded in schema_version
+with the SHA-256 of its file, so a migration that was edited after it had been
+applied is reported instead of silently diverging. Upgrades are online: the
+transaction takes SQLite's write lock (BEGIN IMMEDIATE), so readers keep
+working and two workers starting at once apply each migration only once.
+
+On startup the app only compares MAX(version) with the newest file; see
+`check_schema`. After it upgrades a database, every table is compared with the
+same database migrated from scratch, and a table that still differs (e.g. an
+old definition no migration rebuilt) stops startup with MigrationError.
+
+    flask --app app db upgrade
+    flask --app app db status
+"""
+
+import hashlib
+import importlib.util
+import logging
+import os
+import re
+import sqlite3
+from collections import namedtuple
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from db import add_bootstrap_step, get_db
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+_FILENAME = re.compile(r'^(\d{4})_(\w+)\.(sql|py)$')
+
+SCHEMA_VERSION_SQL = '''
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    checksum TEXT NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+'''
+
+Migration = namedtuple('Migration', 'version name path checksum')
+
+
+class MigrationError(Exception):
+    """The database and the migration files disagree, or a migration failed"""
+
+
+def discover(directory=MIGRATIONS_DIR):
+    """All migrations in `directory`, ordered by version"""
+    migrations = []
+    for filename in sorted(os.listdir(directory)):
+        match = _FILENAME.match(filename)
+        if not match:
+            continue
+        path = os.path.join(directory, filename)
+        with open(path, 'rb') as f:
+            checksum = hashlib.sha256(f.read()).hexdigest()
+        migrations.append(Migration(int(match.group(1)), match.group(2), path, checksum))
+
+    versions = [m.version for m in migrations]
+    if len(set(versions)) != len(versions):
+        raise MigrationError(f'Duplicate migration version in {directory}')
+    return migrations
+
+
+def applied_migrations(db):
+    """{version: (name, checksum)} recorded in schema_version"""
+    db.execute(SCHEMA_VERSION_SQL)
+    rows = db.execute('SELECT version, name, checksum FROM schema_version').fetchall()
+    return {row[0]: (row[1], row[2]) for row in rows}
+
+
+def current_version(db):
+    """Highest applied version; 0 for a database that predates migrations"""
+    try:
+        row = db.execute('SELECT MAX(version) FROM schema_version').fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] or 0
+
+
+def verify(db, migrations):
+    """Raise MigrationError if an applied migration is missing or was edited"""
+    by_version = {m.version: m for m in migrations}
+    for version, (name, checksum) in sorted(applied_migrations(db).items()):
+        migration = by_version.get(version)
+        if migration is None:
+            raise MigrationError(f'Applied migration {version:04d}_{name} has no file')
+        if migration.checksum != checksum:
+            raise MigrationError(
+                f'Migration {version:04d}_{name} was changed after it was applied'
+            )
+
+
+def pending(db, directory=MIGRATIONS_DIR):
+    migrations = discover(directory)
+    verify(db, migrations)
+    applied = applied_migrations(db)
+    return [m for m in migrations if m.version not in applied]
+
+
+def split_statements(script):
+    """Split a SQL script into complete statements (trigger bodies stay whole)"""
+    statements = []
+    buffer = ''
+    for line in script.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statement = buffer.strip()
+            if statement.rstrip(';').strip():
+                statements.append(statement)
+            buffer = ''
+    if buffer.strip() and not all(
+        not line.strip() or line.strip().startswith('--') for line in buffer.splitlines()
+    ):
+        raise MigrationError('Incomplete statement at end of script: ' + buffer.strip()[:60])
+    return statements
+
+
+_CREATE_TABLE = re.compile(r'^\s*CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(["`]?)(\w+)\1', re.I)
+
+
+def rebuild_table(db, table, create_sql):
+    """Recreate `table` from `create_sql`, keeping its rows, indexes and triggers
+
+    SQLite cannot change a column's CHECK or REFERENCES clause in place, so
+    the table is rebuilt: create the new definition under a temporary name,
+    copy the columns both versions have, drop the old table and rename.
+    For use inside a migration (no commit).
+    """
+    dependents = db.execute(
+        """SELECT sql FROM sqlite_master
+           WHERE type IN ('index', 'trigger') AND tbl_name = ? AND sql IS NOT NULL""",
+        (table,)
+    ).fetchall()
+    old_columns = [row[1] for row in db.execute(f'PRAGMA table_info("{table}")')]
+
+    temporary = f'{table}__rebuild'
+    db.execute(_CREATE_TABLE.sub(f'CREATE TABLE "{temporary}"', create_sql, count=1))
+    new_columns = {row[1] for row in db.execute(f'PRAGMA table_info("{temporary}")')}
+    columns = ', '.join(f'"{c}"' for c in old_columns if c in new_columns)
+    db.execute(f'INSERT INTO "{temporary}" ({columns}) SELECT {columns} FROM "{table}"')
+    db.execute(f'DROP TABLE "{table}"')
+
+    # Views and other tables' triggers name `table`, which is briefly missing
+    db.execute('PRAGMA legacy_alter_table = ON')
+    try:
+        db.execute(f'ALTER TABLE "{temporary}" RENAME TO "{table}"')
+    finally:
+        db.execute('PRAGMA legacy_alter_table = OFF')
+
+    for (sql,) in dependents:
+        db.execute(sql)
+
+
+_SQL_COMMENT = re.compile(r'--[^\n]*')
+
+
+def normalize_table_sql(sql):
+    """A table definition without comments, quoting, IF NOT EXISTS and layout"""
+    shape = _SQL_COMMENT.sub(' ', sql)
+    shape = re.sub(r'["`]', '', shape)
+    shape = re.sub(r'\bIF\s+NOT\s+EXISTS\b', '', shape, flags=re.I)
+    shape = re.sub(r'\s*([(),])\s*', r'\1', shape)
+    return re.sub(r'\s+', ' ', shape).strip().lower()
+
+
+def reference_schema(directory=MIGRATIONS_DIR, target=None):
+    """{table: sql} of a fresh database migrated to `target` (default: latest)"""
+    reference = sqlite3.connect(':memory:')
+    try:
+        upgrade(reference, directory, target)
+        return dict(reference.execute(
+            """SELECT name, sql FROM sqlite_master
+               WHERE type = 'table' AND name NOT LIKE 'sqlite_%' AND name != 'schema_version'"""
+        ).fetchall())
+    finally:
+        reference.close()
+
+
+def schema_drift(db, reference):
+    """Tables whose definition in `db` differs from `reference` ({table: sql})"""
+    live = dict(db.execute("SELECT name, sql FROM sqlite_master WHERE type = 'table'").fetchall())
+    return sorted(
+        table for table, sql in reference.items()
+        if table not in live or normalize_table_sql(live[table]) != normalize_table_sql(sql)
+    )
+
+
+def _load_python_migration(migration):
+    spec = importlib.util.spec_from_file_location(
+        f'migration_{migration.version:04d}', migration.path
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.upgrade
+
+
+def apply(db, migration):
+    """Apply one migration in its own transaction
+
+    Returns False when another process applied it first.
+    """
+    if migration.path.endswith('.sql'):
+        with open(migration.path, encoding='utf-8') as f:
+            statements = split_statements(f.read())
+        upgrade_fn = None
+    else:
+        upgrade_fn = _load_python_migration(migration)
+
+    db.execute('BEGIN IMMEDIATE')
+    try:
+        # Re-check under the write lock
+        if db.execute(
+            'SELECT 1 FROM schema_version WHERE version = ?', (migration.version,)
+        ).fetchone():
+            db.rollback()
+            return False
+        if upgrade_fn is None:
+            for statement in statements:
+                db.execute(statement)
+        else:
+            upgrade_fn(db)
+        db.execute(
+            'INSERT INTO schema_version (version, name, checksum) VALUES (?, ?, ?)',
+            (migration.version, migration.name, migration.checksum)
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise MigrationError(f'Migration {migration.version:04d}_{migration.name} failed: {e}') from e
+    return True
+
+
+def upgrade(db, directory=MIGRATIONS_DIR, target=None):
+    """Apply pending migrations up to `target` (default: all); returns those applied"""
+    if db.in_transaction:
+        db.commit()
+    applied = []
+    for migration in pending(db, directory):
+        if target is not None and migration.version > target:
+            break
+        if apply(db, migration):
+            logger.info('Applied migration %04d_%s', migration.version, migration.name)
+            applied.append(migration)
+    return applied
+
+
+def check_schema(db):
+    """Startup check: one MAX(version) lookup, upgrading if the database is behind"""
+    directory = current_app.config.get('MIGRATIONS_DIR', MIGRATIONS_DIR)
+    migrations = discover(directory)
+    latest = migrations[-1].version if migrations else 0
+    if current_version(db) >= latest:
+        return
+    if current_app.config.get('AUTO_MIGRATE', True):
+        upgrade(db, directory)
+        # Tables the migrations could not bring in line would silently diverge
+        drifted = schema_drift(db, reference_schema(directory))
+        if drifted:
+            raise MigrationError(
+                'Schema differs from a freshly migrated database in: ' + ', '.join(drifted)
+            )
+    else:
+        logger.warning(
+            'Database schema is at version %d, code expects %d; run `flask db upgrade`',
+            current_version(db), latest
+        )
+
+
+db_cli = AppGroup('db', help='Schema migrations.')
+
+
+@db_cli.command('upgrade')
+@click.option('--target', type=int, default=None, help='Stop after this version')
+def upgrade_command(target):
+    """Apply pending migrations."""
+    applied = upgrade(get_db(), current_app.config.get('MIGRATIONS_DIR', MIGRATIONS_DIR), target)
+    for migration in applied:
+        click.echo(f'Applied {migration.version:04d}_{migration.name}')
+    click.echo(f'Schema at version {current_version(get_db())}.')
+
+
+@db_cli.command('status')
+def status_command():
+    """List migrations and whether they are applied."""
+    db = get_db()
+    directory = current_app.config.get('MIGRATIONS_DIR', MIGRATIONS_DIR)
+    applied = applied_migrations(db)
+    for migration in discover(directory):
+        recorded = applied.get(migration.version)
+        if recorded is None:
+            state = 'pending'
+        elif recorded[1] != migration.checksum:
+            state = 'CHANGED'
+        else:
+            state = 'applied'
+        click.echo(f'{migration.version:04d}_{migration.name:<30} {state}')
+    for table in schema_drift(db, reference_schema(directory)):
+        click.echo(f'table {table} differs from a freshly migrated database')
+
+
+def init_app(app):
+    add_bootstrap_step(app, check_schema)
+    app.cli.add_command(db_cli)
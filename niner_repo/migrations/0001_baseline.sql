@@ -0,0 +1,789 @@
+-- Baseline schema: everything the app used before versioned migrations,
+-- merged from schema.sql, budget_schema.sql, notifications_schema.sql,
+-- subscriptions_schema.sql, priorities_schema.sql, investments_schema.sql,
+-- gamification_schema.sql and db.init_db. Every statement is idempotent so
+-- it can be applied to a database created by the old init scripts.
+
+-- Users (auth.py; replaces the legacy `user` table, see 0002)
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT UNIQUE NOT NULL,
+    email TEXT UNIQUE NOT NULL,
+    password TEXT NOT NULL,
+    security_question_1 TEXT,
+    security_answer_1 TEXT,
+    security_question_2 TEXT,
+    security_answer_2 TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP,
+    is_active BOOLEAN NOT NULL DEFAULT 1
+);
+
+CREATE TABLE IF NOT EXISTS password_resets (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    token TEXT NOT NULL UNIQUE,
+    expires_at TIMESTAMP NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users (id)
+);
+
+-- Transactions table (enhanced with category column)
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    transaction_type VARCHAR(20) NOT NULL CHECK (transaction_type IN ('income', 'expense')),
+    category VARCHAR(50),  -- Added category column
+    category_id INTEGER,
+    amount DECIMAL(10, 2) NOT NULL CHECK (amount > 0),
+    description TEXT NOT NULL,
+    date DATE NOT NULL DEFAULT CURRENT_DATE,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP,
+    is_active BOOLEAN NOT NULL DEFAULT 1,
+    FOREIGN KEY (user_id) REFERENCES users (id)
+);
+
+-- Expenses table (separate from transactions for better organization)
+CREATE TABLE IF NOT EXISTS expenses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    category VARCHAR(50) NOT NULL CHECK (category IN ('food', 'transportation', 'entertainment', 'other')),
+    amount DECIMAL(10, 2) NOT NULL CHECK (amount > 0),
+    description TEXT NOT NULL,
+    date DATE NOT NULL DEFAULT CURRENT_DATE,
+    is_recurring BOOLEAN NOT NULL DEFAULT 0,
+    recurrence_period VARCHAR(20) CHECK (
+        recurrence_period IS NULL OR 
+        recurrence_period IN ('daily', 'weekly', 'biweekly', 'monthly', 'quarterly', 'annually')
+    ),
+    next_recurrence_date DATE,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP,
+    created_by INTEGER NOT NULL,
+    updated_by INTEGER,
+    is_active BOOLEAN NOT NULL DEFAULT 1,
+    FOREIGN KEY (user_id) REFERENCES users (id),
+    FOREIGN KEY (created_by) REFERENCES users (id),
+    FOREIGN KEY (updated_by) REFERENCES users (id)
+);
+
+-- Income Categories Table
+CREATE TABLE IF NOT EXISTS income_category (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name VARCHAR(50) NOT NULL,
+    description TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    created_by INTEGER NOT NULL,
+    is_active BOOLEAN NOT NULL DEFAULT 1,
+    FOREIGN KEY (created_by) REFERENCES users (id),
+    UNIQUE(name)
+);
+
+-- Create default income categories
+INSERT OR IGNORE INTO income_category (name, description, created_by) VALUES
+('Salary', 'Regular employment income', 1),
+('Freelance', 'Income from freelance work', 1),
+('Investment', 'Income from investments', 1),
+('Business', 'Business income', 1),
+('Rental', 'Rental property income', 1),
+('Other', 'Other sources of income', 1);
+
+-- Income Table
+CREATE TABLE IF NOT EXISTS income (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    category_id INTEGER NOT NULL,
+    amount DECIMAL(10, 2) NOT NULL CHECK (amount > 0),
+    source VARCHAR(100) NOT NULL,
+    description TEXT,
+    date DATE NOT NULL DEFAULT CURRENT_DATE,
+    is_recurring BOOLEAN NOT NULL DEFAULT 0,
+    recurrence_period VARCHAR(20) CHECK (
+        recurrence_period IS NULL OR 
+        recurrence_period IN ('daily', 'weekly', 'biweekly', 'monthly', 'quarterly', 'annually')
+    ),
+    next_recurrence_date DATE,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP,
+    created_by INTEGER NOT NULL,
+    updated_by INTEGER,
+    is_active BOOLEAN NOT NULL DEFAULT 1,
+    FOREIGN KEY (user_id) REFERENCES users (id),
+    FOREIGN KEY (category_id) REFERENCES income_category (id),
+    FOREIGN KEY (created_by) REFERENCES users (id),
+    FOREIGN KEY (updated_by) REFERENCES users (id)
+);
+
+-- Weekly budgets table
+CREATE TABLE IF NOT EXISTS weekly_budgets (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    week_start DATE NOT NULL,
+    week_end DATE NOT NULL,
+    total_budget DECIMAL(10,2) NOT NULL,
+    food_budget DECIMAL(10,2) NOT NULL DEFAULT 0,
+    transportation_budget DECIMAL(10,2) NOT NULL DEFAULT 0,
+    entertainment_budget DECIMAL(10,2) NOT NULL DEFAULT 0,
+    other_budget DECIMAL(10,2) NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users (id),
+    UNIQUE(user_id, week_start)
+);
+
+-- Financial Goals Table
+CREATE TABLE IF NOT EXISTS financial_goals (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    goal_name TEXT NOT NULL,
+    target_amount REAL NOT NULL CHECK (target_amount > 0),
+    current_amount REAL DEFAULT 0 CHECK (current_amount >= 0),
+    target_date TEXT,
+    category TEXT CHECK (category IN ('emergency', 'education', 'travel', 'technology', 'housing', 'transportation', 'other')),
+    description TEXT,
+    priority TEXT DEFAULT 'medium' CHECK (priority IN ('low', 'medium', 'high')),
+    is_completed BOOLEAN DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+
+-- Create indexes for better query performance
+CREATE INDEX IF NOT EXISTS idx_income_user_date ON income(user_id, date);
+CREATE INDEX IF NOT EXISTS idx_income_category ON income(category_id);
+CREATE INDEX IF NOT EXISTS idx_income_recurring ON income(is_recurring, next_recurrence_date) 
+    WHERE is_recurring = 1;
+CREATE INDEX IF NOT EXISTS idx_income_source ON income(source);
+CREATE INDEX IF NOT EXISTS idx_transactions_category ON transactions(category);
+CREATE INDEX IF NOT EXISTS idx_transactions_user_type ON transactions(user_id, transaction_type);
+CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(date);
+CREATE INDEX IF NOT EXISTS idx_financial_goals_user ON financial_goals(user_id);
+CREATE INDEX IF NOT EXISTS idx_financial_goals_completed ON financial_goals(is_completed);
+
+-- Create trigger to update the updated_at timestamp
+CREATE TRIGGER IF NOT EXISTS income_update_timestamp
+AFTER UPDATE ON income
+BEGIN
+    UPDATE income 
+    SET updated_at = CURRENT_TIMESTAMP,
+        updated_by = NEW.updated_by
+    WHERE id = NEW.id;
+END;
+
+-- Create trigger for financial goals updated_at
+CREATE TRIGGER IF NOT EXISTS financial_goals_update_timestamp
+AFTER UPDATE ON financial_goals
+BEGIN
+    UPDATE financial_goals 
+    SET updated_at = CURRENT_TIMESTAMP
+    WHERE id = NEW.id;
+END;
+
+-- Create trigger to validate recurrence data
+CREATE TRIGGER IF NOT EXISTS income_recurrence_validation
+BEFORE INSERT ON income
+BEGIN
+    SELECT
+        CASE
+            WHEN NEW.is_recurring = 1 AND NEW.recurrence_period IS NULL
+            THEN RAISE(ABORT, 'Recurrence period is required for recurring income')
+            WHEN NEW.is_recurring = 1 AND NEW.next_recurrence_date IS NULL
+            THEN RAISE(ABORT, 'Next recurrence date is required for recurring income')
+            WHEN NEW.is_recurring = 0 AND (NEW.recurrence_period IS NOT NULL OR NEW.next_recurrence_date IS NOT NULL)
+            THEN RAISE(ABORT, 'Recurrence fields must be NULL for non-recurring income')
+        END;
+END;
+
+-- Create view for active income records
+CREATE VIEW IF NOT EXISTS v_active_income AS
+SELECT 
+    i.id,
+    i.user_id,
+    u.username,
+    i.category_id,
+    ic.name as category_name,
+    i.amount,
+    i.source,
+    i.description,
+    i.date,
+    i.is_recurring,
+    i.recurrence_period,
+    i.next_recurrence_date,
+    i.created_at,
+    i.updated_at,
+    creator.username as created_by_username,
+    updater.username as updated_by_username
+FROM income i
+JOIN users u ON i.user_id = u.id
+JOIN income_category ic ON i.category_id = ic.id
+JOIN users creator ON i.created_by = creator.id
+LEFT JOIN users updater ON i.updated_by = updater.id
+WHERE i.is_active = 1 AND ic.is_active = 1;
+
+CREATE VIEW IF NOT EXISTS v_active_expenses AS
+SELECT 
+    e.id,
+    e.user_id,
+    u.username,
+    e.category,
+    e.amount,
+    e.description,
+    e.date,
+    e.is_recurring,
+    e.recurrence_period,
+    e.next_recurrence_date,
+    e.created_at,
+    e.updated_at,
+    creator.username as created_by_username,
+    updater.username as updated_by_username
+FROM expenses e
+JOIN users u ON e.user_id = u.id
+JOIN users creator ON e.created_by = creator.id
+LEFT JOIN users updater ON e.updated_by = updater.id
+WHERE e.is_active = 1;
+
+CREATE VIEW IF NOT EXISTS v_all_transactions AS
+SELECT 
+    'income' as type,
+    i.id,
+    i.user_id,
+    i.amount,
+    i.source as description,
+    ic.name as category,
+    i.date,
+    i.created_at
+FROM income i
+JOIN income_category ic ON i.category_id = ic.id
+WHERE i.is_active = 1
+UNION ALL
+SELECT 
+    'expense' as type,
+    e.id,
+    e.user_id,
+    e.amount,
+    e.description,
+    e.category,
+    e.date,
+    e.created_at
+FROM expenses e
+WHERE e.is_active = 1
+ORDER BY date DESC, created_at DESC;
+
+-- Budgets Table (Weekly budget tracking)
+CREATE TABLE IF NOT EXISTS budgets (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    total_amount DECIMAL(10,2) NOT NULL DEFAULT 0,
+    food_budget DECIMAL(10,2) NOT NULL DEFAULT 0,
+    transportation_budget DECIMAL(10,2) NOT NULL DEFAULT 0,
+    entertainment_budget DECIMAL(10,2) NOT NULL DEFAULT 0,
+    other_budget DECIMAL(10,2) NOT NULL DEFAULT 0,
+    week_start_date DATE NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_budgets_user ON budgets(user_id);
+CREATE INDEX IF NOT EXISTS idx_budgets_week ON budgets(week_start_date);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_budgets_user_week ON budgets(user_id, week_start_date);
+
+-- Budget Categories Table
+CREATE TABLE IF NOT EXISTS budget_categories (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    name VARCHAR(50) NOT NULL,
+    description TEXT,
+    allocation_percentage DECIMAL(5,2) NOT NULL CHECK (
+        allocation_percentage >= 0 AND 
+        allocation_percentage <= 100
+    ),
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP,
+    created_by INTEGER NOT NULL,
+    updated_by INTEGER,
+    is_active BOOLEAN NOT NULL DEFAULT 1,
+    FOREIGN KEY (user_id) REFERENCES users(id),
+    FOREIGN KEY (created_by) REFERENCES users(id),
+    FOREIGN KEY (updated_by) REFERENCES users(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_budget_categories_user ON budget_categories(user_id, is_active);
+
+-- Budget Allocations Table
+CREATE TABLE IF NOT EXISTS budget_allocations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    category_id INTEGER NOT NULL,
+    allocated_amount DECIMAL(10,2) NOT NULL CHECK (allocated_amount >= 0),
+    month_year DATE NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP,
+    created_by INTEGER NOT NULL,
+    updated_by INTEGER,
+    is_active BOOLEAN NOT NULL DEFAULT 1,
+    FOREIGN KEY (user_id) REFERENCES users(id),
+    FOREIGN KEY (category_id) REFERENCES budget_categories(id),
+    FOREIGN KEY (created_by) REFERENCES users(id),
+    FOREIGN KEY (updated_by) REFERENCES users(id),
+    UNIQUE(user_id, category_id, month_year)
+);
+
+CREATE INDEX IF NOT EXISTS idx_budget_allocations_user_month 
+ON budget_allocations(user_id, month_year, is_active);
+
+-- Create view for current budget status
+CREATE VIEW IF NOT EXISTS v_budget_status AS
+SELECT 
+    ba.user_id,
+    bc.id as category_id,
+    bc.name as category_name,
+    ba.month_year,
+    ba.allocated_amount,
+    COALESCE(SUM(e.amount), 0) as spent_amount,
+    ba.allocated_amount - COALESCE(SUM(e.amount), 0) as remaining_amount,
+    (COALESCE(SUM(e.amount), 0) / ba.allocated_amount * 100) as usage_percentage
+FROM budget_allocations ba
+JOIN budget_categories bc ON ba.category_id = bc.id
+LEFT JOIN expenses e ON e.category_id = bc.id 
+    AND e.user_id = ba.user_id 
+    AND strftime('%Y-%m', e.date) = strftime('%Y-%m', ba.month_year)
+    AND e.is_active = 1
+WHERE ba.is_active = 1 AND bc.is_active = 1
+GROUP BY ba.user_id, bc.id, bc.name, ba.month_year, ba.allocated_amount;
+
+-- Notifications Schema
+-- Manages user notifications for overspending alerts and other financial events
+
+-- Notifications table
+CREATE TABLE IF NOT EXISTS notifications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    type VARCHAR(50) NOT NULL CHECK (type IN ('overspending', 'budget_warning', 'goal_achieved', 'subscription_reminder', 'unusual_spending', 'daily_digest')),
+    title VARCHAR(200) NOT NULL,
+    message TEXT NOT NULL,
+    severity VARCHAR(20) NOT NULL CHECK (severity IN ('info', 'warning', 'critical')),
+    is_read BOOLEAN NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    read_at TIMESTAMP,
+    metadata TEXT,
+    FOREIGN KEY (user_id) REFERENCES users (id)
+);
+
+-- Create index for efficient queries
+CREATE INDEX IF NOT EXISTS idx_notifications_user_unread ON notifications(user_id, is_read, created_at DESC);
+
+-- Notification Settings table
+CREATE TABLE IF NOT EXISTS notification_settings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL UNIQUE,
+    enable_overspending BOOLEAN NOT NULL DEFAULT 1,
+    enable_budget_warning BOOLEAN NOT NULL DEFAULT 1,
+    enable_goal_achieved BOOLEAN NOT NULL DEFAULT 1,
+    enable_subscription_reminder BOOLEAN NOT NULL DEFAULT 1,
+    enable_unusual_spending BOOLEAN NOT NULL DEFAULT 1,
+    overspending_threshold INTEGER NOT NULL DEFAULT 100 CHECK (overspending_threshold >= 0 AND overspending_threshold <= 100),
+    budget_warning_threshold INTEGER NOT NULL DEFAULT 90 CHECK (budget_warning_threshold >= 0 AND budget_warning_threshold <= 100),
+    unusual_spending_multiplier DECIMAL(3,1) NOT NULL DEFAULT 2.0 CHECK (unusual_spending_multiplier >= 1.0),
+    method_in_app BOOLEAN NOT NULL DEFAULT 1,
+    method_email BOOLEAN NOT NULL DEFAULT 0,
+    method_push BOOLEAN NOT NULL DEFAULT 0,
+    daily_digest BOOLEAN NOT NULL DEFAULT 0,
+    max_daily_notifications INTEGER NOT NULL DEFAULT 10 CHECK (max_daily_notifications >= 1 AND max_daily_notifications <= 50),
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users (id)
+);
+
+-- Create views for easier querying
+CREATE VIEW IF NOT EXISTS v_unread_notification_counts AS
+SELECT 
+    user_id,
+    type,
+    COUNT(*) as count
+FROM notifications
+WHERE is_read = 0
+GROUP BY user_id, type;
+
+CREATE VIEW IF NOT EXISTS v_notification_summary AS
+SELECT 
+    n.user_id,
+    COUNT(*) as total_notifications,
+    SUM(CASE WHEN n.is_read = 0 THEN 1 ELSE 0 END) as unread_count,
+    SUM(CASE WHEN n.severity = 'critical' AND n.is_read = 0 THEN 1 ELSE 0 END) as critical_unread,
+    SUM(CASE WHEN n.severity = 'warning' AND n.is_read = 0 THEN 1 ELSE 0 END) as warning_unread,
+    MAX(n.created_at) as last_notification_at
+FROM notifications n
+GROUP BY n.user_id;
+
+-- Create trigger to create default settings for new users
+CREATE TRIGGER IF NOT EXISTS create_default_notification_settings
+AFTER INSERT ON users
+BEGIN
+    INSERT INTO notification_settings (user_id)
+    VALUES (NEW.id);
+END;
+
+-- Create trigger to prevent duplicate notifications within short time window
+CREATE TRIGGER IF NOT EXISTS prevent_duplicate_notifications
+BEFORE INSERT ON notifications
+WHEN EXISTS (
+    SELECT 1 FROM notifications
+    WHERE user_id = NEW.user_id
+    AND type = NEW.type
+    AND datetime(created_at) >= datetime('now', '-5 minutes')
+)
+BEGIN
+    SELECT RAISE(IGNORE);
+END;
+
+-- Create default settings for existing users
+INSERT OR IGNORE INTO notification_settings (user_id)
+SELECT id FROM users;
+
+-- Subscriptions and Recurring Payments Schema
+
+CREATE TABLE IF NOT EXISTS subscriptions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    amount REAL NOT NULL,
+    currency TEXT DEFAULT 'USD',
+    frequency TEXT NOT NULL, -- 'daily', 'weekly', 'monthly', 'yearly'
+    category TEXT,
+    next_billing_date TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT, -- NULL for ongoing subscriptions
+    is_active INTEGER DEFAULT 1,
+    auto_detected INTEGER DEFAULT 0, -- 1 if automatically detected from transactions
+    transaction_id INTEGER, -- Link to the transaction that created this
+    notes TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+    FOREIGN KEY (transaction_id) REFERENCES transactions (id) ON DELETE SET NULL
+);
+
+-- Index for faster queries
+CREATE INDEX IF NOT EXISTS idx_subscriptions_user_id ON subscriptions(user_id);
+CREATE INDEX IF NOT EXISTS idx_subscriptions_next_billing ON subscriptions(next_billing_date);
+CREATE INDEX IF NOT EXISTS idx_subscriptions_active ON subscriptions(is_active);
+
+-- Subscription categories lookup
+CREATE TABLE IF NOT EXISTS subscription_categories (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL,
+    icon TEXT,
+    color TEXT
+);
+
+-- Default categories
+INSERT OR IGNORE INTO subscription_categories (name, icon, color) VALUES
+('Streaming', 'fa-tv', '#e74c3c'),
+('Music', 'fa-music', '#9b59b6'),
+('Software', 'fa-laptop-code', '#3498db'),
+('Gaming', 'fa-gamepad', '#e67e22'),
+('Fitness', 'fa-dumbbell', '#27ae60'),
+('News', 'fa-newspaper', '#34495e'),
+('Cloud Storage', 'fa-cloud', '#1abc9c'),
+('Utilities', 'fa-bolt', '#f39c12'),
+('Insurance', 'fa-shield-alt', '#16a085'),
+('Other', 'fa-ellipsis-h', '#95a5a6');
+
+-- Financial Priorities Schema
+
+CREATE TABLE IF NOT EXISTS user_priorities (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    priority_type VARCHAR(50) NOT NULL,
+    importance_level INTEGER DEFAULT 1,
+    target_amount DECIMAL(10, 2),
+    target_date DATE,
+    notes TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS priority_suggestions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    priority_type VARCHAR(50) NOT NULL,
+    suggestion_text TEXT NOT NULL,
+    category VARCHAR(50),
+    min_amount DECIMAL(10, 2),
+    max_amount DECIMAL(10, 2),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS user_priority_actions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    priority_id INTEGER NOT NULL,
+    action_taken VARCHAR(100),
+    action_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    notes TEXT,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (priority_id) REFERENCES user_priorities(id) ON DELETE CASCADE
+);
+
+-- Insert default suggestions for each priority type
+INSERT INTO priority_suggestions (priority_type, suggestion_text, category, min_amount, max_amount)
+SELECT * FROM (VALUES
+-- Save More suggestions
+('Save More', 'Set up automatic transfers to savings account', 'automation', 50, 500),
+('Save More', 'Reduce dining out expenses by 20%', 'spending', 100, 300),
+('Save More', 'Cancel unused subscriptions', 'subscriptions', 10, 100),
+('Save More', 'Build an emergency fund covering 3-6 months of expenses', 'emergency', 3000, 15000),
+('Save More', 'Use the 50/30/20 budgeting rule', 'budgeting', NULL, NULL),
+
+-- Reduce Debt suggestions
+('Reduce Debt', 'Use the debt avalanche method - pay off highest interest debt first', 'strategy', NULL, NULL),
+('Reduce Debt', 'Make bi-weekly payments instead of monthly', 'payments', 100, 1000),
+('Reduce Debt', 'Consider debt consolidation for high-interest loans', 'consolidation', 1000, 50000),
+('Reduce Debt', 'Allocate windfalls (bonuses, tax refunds) to debt payoff', 'strategy', NULL, NULL),
+('Reduce Debt', 'Negotiate lower interest rates with creditors', 'negotiation', NULL, NULL),
+
+-- Invest More suggestions
+('Invest More', 'Max out your employer 401(k) match', 'retirement', 500, 19500),
+('Invest More', 'Open a Roth IRA and contribute regularly', 'retirement', 100, 6500),
+('Invest More', 'Start investing in low-cost index funds', 'investing', 100, 10000),
+('Invest More', 'Increase retirement contributions by 1% annually', 'retirement', NULL, NULL),
+('Invest More', 'Diversify portfolio across different asset classes', 'strategy', NULL, NULL),
+
+-- Control Spending suggestions
+('Control Spending', 'Track every expense for 30 days', 'tracking', NULL, NULL),
+('Control Spending', 'Set category budgets and stick to them', 'budgeting', NULL, NULL),
+('Control Spending', 'Implement the 24-hour rule for non-essential purchases', 'habits', 50, NULL),
+('Control Spending', 'Use cash envelopes for variable expenses', 'budgeting', 200, 1000),
+('Control Spending', 'Review and cut recurring expenses monthly', 'subscriptions', 10, 200))
+WHERE NOT EXISTS (SELECT 1 FROM priority_suggestions);
+
+CREATE INDEX IF NOT EXISTS idx_user_priorities_user_id ON user_priorities(user_id);
+CREATE INDEX IF NOT EXISTS idx_priority_suggestions_type ON priority_suggestions(priority_type);
+
+-- Investments schema
+-- Tables: asset_types, investments, positions, investment_transactions
+
+-- Asset types (equity, bond, crypto, cash, etf, etc.)
+CREATE TABLE IF NOT EXISTS asset_types (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    description TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Investments (a canonical definition of an asset / ticker)
+CREATE TABLE IF NOT EXISTS investments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticker TEXT NOT NULL,
+    name TEXT NOT NULL,
+    asset_type_id INTEGER NOT NULL,
+    exchange TEXT,
+    currency TEXT DEFAULT 'USD',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (ticker, exchange),
+    FOREIGN KEY (asset_type_id) REFERENCES asset_types (id) ON DELETE RESTRICT
+);
+
+CREATE INDEX IF NOT EXISTS idx_investments_ticker ON investments(ticker);
+
+-- Positions: the current holding per user + instrument (cached current qty and avg cost)
+CREATE TABLE IF NOT EXISTS positions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    investment_id INTEGER NOT NULL,
+    quantity REAL NOT NULL DEFAULT 0,
+    avg_cost REAL NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+    FOREIGN KEY (investment_id) REFERENCES investments (id) ON DELETE CASCADE,
+    UNIQUE (user_id, investment_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_positions_user ON positions(user_id);
+
+-- Investment transactions (buys, sells, dividends, splits, fees)
+CREATE TABLE IF NOT EXISTS investment_transactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    investment_id INTEGER NOT NULL,
+    type TEXT NOT NULL CHECK(type IN ('buy','sell','dividend','fee','split','transfer')),
+    quantity REAL NOT NULL,
+    price REAL NOT NULL,
+    fees REAL DEFAULT 0,
+    total REAL NOT NULL, -- computed: quantity * price +/- fees
+    date DATE NOT NULL,
+    notes TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+    FOREIGN KEY (investment_id) REFERENCES investments (id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_invtx_user ON investment_transactions(user_id);
+CREATE INDEX IF NOT EXISTS idx_invtx_investment ON investment_transactions(investment_id);
+
+-- Gamification Database Schema
+
+-- User Progress and Points
+CREATE TABLE IF NOT EXISTS user_game_progress (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL UNIQUE,
+    total_points INTEGER DEFAULT 0,
+    current_level INTEGER DEFAULT 1,
+    experience_points INTEGER DEFAULT 0,
+    streak_days INTEGER DEFAULT 0,
+    last_activity_date TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+
+-- Milestones/Achievements
+CREATE TABLE IF NOT EXISTS milestones (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    description TEXT NOT NULL,
+    category TEXT NOT NULL, -- 'budget', 'savings', 'investment', 'streak', 'transaction'
+    criteria_type TEXT NOT NULL, -- 'count', 'amount', 'streak', 'completion'
+    criteria_value REAL NOT NULL,
+    points_reward INTEGER NOT NULL,
+    badge_icon TEXT,
+    badge_color TEXT,
+    tier TEXT DEFAULT 'bronze', -- 'bronze', 'silver', 'gold', 'platinum'
+    is_active INTEGER DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- User Achievements (Many-to-Many)
+CREATE TABLE IF NOT EXISTS user_achievements (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    milestone_id INTEGER NOT NULL,
+    achieved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    progress_value REAL DEFAULT 0,
+    is_completed INTEGER DEFAULT 0,
+    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+    FOREIGN KEY (milestone_id) REFERENCES milestones (id) ON DELETE CASCADE,
+    UNIQUE(user_id, milestone_id)
+);
+
+-- Levels Configuration
+CREATE TABLE IF NOT EXISTS levels (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    level_number INTEGER NOT NULL UNIQUE,
+    level_name TEXT NOT NULL,
+    experience_required INTEGER NOT NULL,
+    points_multiplier REAL DEFAULT 1.0,
+    badge_icon TEXT,
+    perks TEXT -- JSON string of perks/benefits
+);
+
+-- Activity Log for Points
+CREATE TABLE IF NOT EXISTS game_activities (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    activity_type TEXT NOT NULL, -- 'budget_created', 'transaction_added', 'goal_achieved', etc.
+    points_earned INTEGER NOT NULL,
+    description TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+
+-- Streaks Tracking
+CREATE TABLE IF NOT EXISTS user_streaks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL UNIQUE,
+    current_streak INTEGER DEFAULT 0,
+    longest_streak INTEGER DEFAULT 0,
+    last_activity_date TEXT,
+    streak_type TEXT DEFAULT 'daily', -- 'daily', 'weekly'
+    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+
+-- Badges Collection
+CREATE TABLE IF NOT EXISTS badges (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    description TEXT,
+    icon TEXT NOT NULL,
+    color TEXT DEFAULT '#FFD700',
+    rarity TEXT DEFAULT 'common', -- 'common', 'rare', 'epic', 'legendary'
+    category TEXT
+);
+
+-- User Badges
+CREATE TABLE IF NOT EXISTS user_badges (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    badge_id INTEGER NOT NULL,
+    earned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+    FOREIGN KEY (badge_id) REFERENCES badges (id) ON DELETE CASCADE,
+    UNIQUE(user_id, badge_id)
+);
+
+-- Indexes for performance
+CREATE INDEX IF NOT EXISTS idx_user_progress_user ON user_game_progress(user_id);
+CREATE INDEX IF NOT EXISTS idx_achievements_user ON user_achievements(user_id);
+CREATE INDEX IF NOT EXISTS idx_achievements_milestone ON user_achievements(milestone_id);
+CREATE INDEX IF NOT EXISTS idx_activities_user ON game_activities(user_id);
+CREATE INDEX IF NOT EXISTS idx_activities_date ON game_activities(created_at);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_milestones_name_category
+ON milestones (name, category);
+
+-- Insert default levels
+INSERT OR IGNORE INTO levels (level_number, level_name, experience_required, points_multiplier, badge_icon) VALUES
+(1, 'Financial Rookie', 0, 1.0, 'fa-seedling'),
+(2, 'Money Manager', 100, 1.1, 'fa-chart-line'),
+(3, 'Budget Master', 250, 1.2, 'fa-coins'),
+(4, 'Savings Champion', 500, 1.3, 'fa-piggy-bank'),
+(5, 'Investment Guru', 1000, 1.5, 'fa-gem'),
+(6, 'Financial Wizard', 2000, 1.7, 'fa-crown'),
+(7, 'Wealth Builder', 3500, 2.0, 'fa-trophy'),
+(8, 'Money Mogul', 5000, 2.5, 'fa-star'),
+(9, 'Finance Legend', 7500, 3.0, 'fa-medal'),
+(10, 'Ultimate Niner', 10000, 4.0, 'fa-fire');
+
+-- Insert default milestones
+INSERT OR IGNORE INTO milestones (name, description, category, criteria_type, criteria_value, points_reward, badge_icon, badge_color, tier) VALUES
+-- Budget Milestones
+('First Budget', 'Create your first budget', 'budget', 'count', 1, 50, 'fa-file-invoice-dollar', '#3498db', 'bronze'),
+('Budget Veteran', 'Create 5 budgets', 'budget', 'count', 5, 200, 'fa-file-invoice-dollar', '#95a5a6', 'silver'),
+('Budget Master', 'Create 10 budgets', 'budget', 'count', 10, 500, 'fa-file-invoice-dollar', '#f39c12', 'gold'),
+('Budget Perfectionist', 'Stay within budget for 3 months', 'budget', 'streak', 3, 1000, 'fa-check-circle', '#e67e22', 'platinum'),
+
+-- Savings Milestones
+('Savings Starter', 'Save your first $100', 'savings', 'amount', 100, 100, 'fa-piggy-bank', '#3498db', 'bronze'),
+('Savings Pro', 'Save $1,000', 'savings', 'amount', 1000, 300, 'fa-piggy-bank', '#95a5a6', 'silver'),
+('Savings Champion', 'Save $5,000', 'savings', 'amount', 5000, 800, 'fa-piggy-bank', '#f39c12', 'gold'),
+('Savings Legend', 'Save $10,000', 'savings', 'amount', 10000, 2000, 'fa-piggy-bank', '#9b59b6', 'platinum'),
+
+-- Investment Milestones
+('First Investment', 'Make your first investment', 'investment', 'count', 1, 150, 'fa-chart-line', '#3498db', 'bronze'),
+('Portfolio Builder', 'Have 5 different investments', 'investment', 'count', 5, 400, 'fa-chart-line', '#95a5a6', 'silver'),
+('Investment Diversifier', 'Have 10 different investments', 'investment', 'count', 10, 1000, 'fa-chart-line', '#f39c12', 'gold'),
+
+-- Transaction Milestones
+('Transaction Tracker', 'Log 10 transactions', 'transaction', 'count', 10, 50, 'fa-exchange-alt', '#3498db', 'bronze'),
+('Finance Recorder', 'Log 50 transactions', 'transaction', 'count', 50, 200, 'fa-exchange-alt', '#95a5a6', 'silver'),
+('Transaction Master', 'Log 100 transactions', 'transaction', 'count', 100, 500, 'fa-exchange-alt', '#f39c12', 'gold'),
+
+-- Streak Milestones
+('Week Warrior', 'Log activity for 7 days straight', 'streak', 'streak', 7, 100, 'fa-fire', '#e74c3c', 'bronze'),
+('Month Master', 'Log activity for 30 days straight', 'streak', 'streak', 30, 500, 'fa-fire', '#e67e22', 'silver'),
+('Year Champion', 'Log activity for 365 days straight', 'streak', 'streak', 365, 5000, 'fa-fire', '#f39c12', 'gold'),
+
+-- Goal Milestones
+('Goal Setter', 'Create your first financial goal', 'goal', 'count', 1, 75, 'fa-bullseye', '#3498db', 'bronze'),
+('Goal Achiever', 'Complete your first financial goal', 'goal', 'completion', 1, 250, 'fa-check-circle', '#27ae60', 'silver'),
+('Goal Master', 'Complete 5 financial goals', 'goal', 'completion', 5, 1000, 'fa-trophy', '#f39c12', 'gold');
+
+-- Insert default badges
+INSERT OR IGNORE INTO badges (name, description, icon, color, rarity, category) VALUES
+('Welcome Niner', 'Join Niner Finance', 'fa-handshake', '#3498db', 'common', 'onboarding'),
+('First Steps', 'Complete your profile', 'fa-user-check', '#27ae60', 'common', 'profile'),
+('Budget Boss', 'Master of budgeting', 'fa-crown', '#f39c12', 'rare', 'budget'),
+('Savings Star', 'Exceptional saver', 'fa-star', '#FFD700', 'epic', 'savings'),
+('Investment Icon', 'Investment expert', 'fa-gem', '#9b59b6', 'epic', 'investment'),
+('Streak Legend', 'Maintained longest streak', 'fa-fire', '#e74c3c', 'legendary', 'streak'),
+('Financial Wizard', 'Reached level 10', 'fa-hat-wizard', '#8e44ad', 'legendary', 'level');
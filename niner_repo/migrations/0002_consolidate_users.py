@@ -0,0 +1,53 @@
+"""
+Fold the legacy `user` table into `users`.
+
+Databases created by setup_db.py or the old schema.sql have their accounts in
+`user`, while auth.py reads and writes `users`. Rows are copied with their ids,
+so existing user_id columns keep pointing at the same account; an account whose
+id, username or email is already taken in `users` is skipped and logged.
+
+Views and triggers that mention `user` are recreated against `users`, then
+`user` is dropped. FOREIGN KEY clauses on legacy tables still name `user`;
+SQLite only checks them with PRAGMA foreign_keys on, which the app never
+enables, so those tables are left alone rather than rebuilt.
+"""
+
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = [
+    'id', 'username', 'email', 'password',
+    'security_question_1', 'security_answer_1',
+    'security_question_2', 'security_answer_2',
+    'created_at',
+]
+
+_USER_REFERENCE = re.compile(r'\b(FROM|JOIN|INTO|UPDATE|ON|REFERENCES)(\s+)(["`]?)user\3(?=[\s(;,)]|$)', re.I)
+
+
+def upgrade(db):
+    if not db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'user'").fetchone():
+        return
+
+    legacy_columns = {row[1] for row in db.execute('PRAGMA table_info(user)')}
+    columns = ', '.join(c for c in COLUMNS if c in legacy_columns)
+    before = db.execute('SELECT COUNT(*) FROM users').fetchone()[0]
+    db.execute(f'INSERT OR IGNORE INTO users ({columns}) SELECT {columns} FROM user ORDER BY id')
+    copied = db.execute('SELECT COUNT(*) FROM users').fetchone()[0] - before
+    legacy = db.execute('SELECT COUNT(*) FROM user').fetchone()[0]
+    if copied < legacy:
+        logger.warning('Skipped %d legacy accounts that clash with existing users', legacy - copied)
+
+    dependents = db.execute(
+        """SELECT type, name, sql FROM sqlite_master
+           WHERE type IN ('view', 'trigger') AND tbl_name != 'user' AND sql IS NOT NULL"""
+    ).fetchall()
+    for kind, name, sql in dependents:
+        rewritten = _USER_REFERENCE.sub(r'\1\2\3users\3', sql)
+        if rewritten != sql:
+            db.execute(f'DROP {kind.upper()} "{name}"')
+            db.execute(rewritten)
+
+    db.execute('DROP TABLE user')
@@ -0,0 +1,57 @@
+-- Composite and covering indexes for the hot per-user queries, from
+-- scripts/index_advisor.py. Each replaces a single-column user_id index
+-- where the new one has it as a prefix.
+
+-- Ledger summaries: user + type + active, range on date
+DROP INDEX IF EXISTS idx_transactions_user_type;
+CREATE INDEX IF NOT EXISTS idx_transactions_user_type_active_date
+ON transactions(user_id, transaction_type, is_active, date);
+
+-- Transaction list (is_active = 1 / 0) ordered by date DESC, id DESC
+CREATE INDEX IF NOT EXISTS idx_transactions_user_active_date
+ON transactions(user_id, is_active, date, id);
+
+-- Dashboard "recent transactions"
+CREATE INDEX IF NOT EXISTS idx_transactions_user_date
+ON transactions(user_id, date, created_at);
+
+-- Expense totals by period and category, answered from the index alone
+CREATE INDEX IF NOT EXISTS idx_expenses_user_active_date
+ON expenses(user_id, is_active, date, category, amount);
+
+-- Notification list, newest first
+CREATE INDEX IF NOT EXISTS idx_notifications_user_created
+ON notifications(user_id, created_at);
+
+-- Leaderboard rank: COUNT(*) WHERE total_points > ?
+CREATE INDEX IF NOT EXISTS idx_user_progress_points
+ON user_game_progress(total_points);
+
+-- Latest price per investment, and a user's history in date order
+DROP INDEX IF EXISTS idx_invtx_investment;
+CREATE INDEX IF NOT EXISTS idx_invtx_investment_date
+ON investment_transactions(investment_id, date);
+DROP INDEX IF EXISTS idx_invtx_user;
+CREATE INDEX IF NOT EXISTS idx_invtx_user_date
+ON investment_transactions(user_id, date);
+
+-- Active subscriptions by next billing date (is_active alone is not selective)
+DROP INDEX IF EXISTS idx_subscriptions_user_id;
+DROP INDEX IF EXISTS idx_subscriptions_active;
+CREATE INDEX IF NOT EXISTS idx_subscriptions_user_active_billing
+ON subscriptions(user_id, is_active, next_billing_date);
+
+-- Game dashboard lists
+DROP INDEX IF EXISTS idx_activities_user;
+CREATE INDEX IF NOT EXISTS idx_activities_user_created
+ON game_activities(user_id, created_at);
+DROP INDEX IF EXISTS idx_achievements_user;
+CREATE INDEX IF NOT EXISTS idx_achievements_user_completed
+ON user_achievements(user_id, is_completed, achieved_at);
+CREATE INDEX IF NOT EXISTS idx_user_badges_user_earned
+ON user_badges(user_id, earned_at);
+
+-- Goals page, newest first
+DROP INDEX IF EXISTS idx_financial_goals_user;
+CREATE INDEX IF NOT EXISTS idx_financial_goals_user_created
+ON financial_goals(user_id, created_at);
@@ -0,0 +1,125 @@
+-- Integer cents for the ledger tables (see money.py).
+--
+-- amount_cents is what the app sums. The REAL amount column stays for the
+-- code and templates that still read it; the triggers below keep the two in
+-- step for writers that only set amount. The app's own writes set both, in
+-- which case the WHEN clauses skip the extra UPDATE.
+
+ALTER TABLE transactions ADD COLUMN amount_cents INTEGER;
+ALTER TABLE expenses ADD COLUMN amount_cents INTEGER;
+ALTER TABLE income ADD COLUMN amount_cents INTEGER;
+
+-- Backfill without touching income.updated_at
+DROP TRIGGER IF EXISTS income_update_timestamp;
+
+UPDATE transactions SET amount_cents = CAST(ROUND(amount * 100) AS INTEGER);
+UPDATE expenses SET amount_cents = CAST(ROUND(amount * 100) AS INTEGER);
+UPDATE income SET amount_cents = CAST(ROUND(amount * 100) AS INTEGER);
+
+CREATE TRIGGER IF NOT EXISTS income_update_timestamp
+AFTER UPDATE ON income
+BEGIN
+    UPDATE income
+    SET updated_at = CURRENT_TIMESTAMP,
+        updated_by = NEW.updated_by
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS transactions_amount_cents_insert
+AFTER INSERT ON transactions
+WHEN NEW.amount_cents IS NULL AND NEW.amount IS NOT NULL
+BEGIN
+    UPDATE transactions SET amount_cents = CAST(ROUND(NEW.amount * 100) AS INTEGER) WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS transactions_amount_cents_update
+AFTER UPDATE OF amount ON transactions
+WHEN NEW.amount_cents IS OLD.amount_cents AND NEW.amount IS NOT OLD.amount
+BEGIN
+    UPDATE transactions SET amount_cents = CAST(ROUND(NEW.amount * 100) AS INTEGER) WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS expenses_amount_cents_insert
+AFTER INSERT ON expenses
+WHEN NEW.amount_cents IS NULL AND NEW.amount IS NOT NULL
+BEGIN
+    UPDATE expenses SET amount_cents = CAST(ROUND(NEW.amount * 100) AS INTEGER) WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS expenses_amount_cents_update
+AFTER UPDATE OF amount ON expenses
+WHEN NEW.amount_cents IS OLD.amount_cents AND NEW.amount IS NOT OLD.amount
+BEGIN
+    UPDATE expenses SET amount_cents = CAST(ROUND(NEW.amount * 100) AS INTEGER) WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS income_amount_cents_insert
+AFTER INSERT ON income
+WHEN NEW.amount_cents IS NULL AND NEW.amount IS NOT NULL
+BEGIN
+    UPDATE income SET amount_cents = CAST(ROUND(NEW.amount * 100) AS INTEGER) WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS income_amount_cents_update
+AFTER UPDATE OF amount ON income
+WHEN NEW.amount_cents IS OLD.amount_cents AND NEW.amount IS NOT OLD.amount
+BEGIN
+    UPDATE income SET amount_cents = CAST(ROUND(NEW.amount * 100) AS INTEGER) WHERE id = NEW.id;
+END;
+
+-- The covering expenses index from 0003, now over cents
+DROP INDEX IF EXISTS idx_expenses_user_active_date;
+CREATE INDEX IF NOT EXISTS idx_expenses_user_active_date
+ON expenses(user_id, is_active, date, category, amount_cents);
+
+-- Views gain amount_cents
+DROP VIEW IF EXISTS v_active_income;
+CREATE VIEW v_active_income AS
+SELECT
+    i.id,
+    i.user_id,
+    u.username,
+    i.category_id,
+    ic.name as category_name,
+    i.amount,
+    i.amount_cents,
+    i.source,
+    i.description,
+    i.date,
+    i.is_recurring,
+    i.recurrence_period,
+    i.next_recurrence_date,
+    i.created_at,
+    i.updated_at,
+    creator.username as created_by_username,
+    updater.username as updated_by_username
+FROM income i
+JOIN users u ON i.user_id = u.id
+JOIN income_category ic ON i.category_id = ic.id
+JOIN users creator ON i.created_by = creator.id
+LEFT JOIN users updater ON i.updated_by = updater.id
+WHERE i.is_active = 1 AND ic.is_active = 1;
+
+DROP VIEW IF EXISTS v_active_expenses;
+CREATE VIEW v_active_expenses AS
+SELECT
+    e.id,
+    e.user_id,
+    u.username,
+    e.category,
+    e.amount,
+    e.amount_cents,
+    e.description,
+    e.date,
+    e.is_recurring,
+    e.recurrence_period,
+    e.next_recurrence_date,
+    e.created_at,
+    e.updated_at,
+    creator.username as created_by_username,
+    updater.username as updated_by_username
+FROM expenses e
+JOIN users u ON e.user_id = u.id
+JOIN users creator ON e.created_by = creator.id
+LEFT JOIN users updater ON e.updated_by = updater.id
+WHERE e.is_active = 1;
@@ -0,0 +1,71 @@
+"""
+Rewrite stored dates in the canonical text forms (see dates.py).
+
+Over time rows were written as '2024-05-01T10:00:00.123456' (isoformat),
+'2024-05-01 10:00:00' (CURRENT_TIMESTAMP) and, for DATE columns, sometimes with
+a time part. Columns declared DATE become 'YYYY-MM-DD' and TIMESTAMP/DATETIME
+columns 'YYYY-MM-DD HH:MM:SS', plus the date-only columns that were declared
+TEXT.
+
+Text values SQLite cannot parse are left untouched, and numbers are skipped
+(date() would read them as Julian days). Triggers on each table are dropped for
+the rewrite and recreated, so normalizing a row does not bump its updated_at.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+DATE_TYPES = {'DATE'}
+TIMESTAMP_TYPES = {'TIMESTAMP', 'DATETIME'}
+
+# Date-only columns declared TEXT
+TEXT_DATE_COLUMNS = {
+    'financial_goals': ['target_date'],
+    'subscriptions': ['next_billing_date', 'start_date'],
+    'user_game_progress': ['last_activity_date'],
+    'user_streaks': ['last_activity_date'],
+}
+
+
+def date_columns(db, table):
+    """[(column, sqlite function)] to normalize in `table`"""
+    columns = []
+    for row in db.execute(f'PRAGMA table_info("{table}")'):
+        name, declared = row[1], (row[2] or '').upper()
+        if declared in DATE_TYPES or name in TEXT_DATE_COLUMNS.get(table, ()):
+            columns.append((name, 'date'))
+        elif declared in TIMESTAMP_TYPES:
+            columns.append((name, 'datetime'))
+    return columns
+
+
+def upgrade(db):
+    tables = [row[0] for row in db.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' AND name != 'schema_version'"
+    )]
+    for table in tables:
+        columns = date_columns(db, table)
+        if not columns:
+            continue
+
+        triggers = db.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = ?",
+            (table,)
+        ).fetchall()
+        for name, _ in triggers:
+            db.execute(f'DROP TRIGGER "{name}"')
+
+        changed = 0
+        for column, function in columns:
+            changed += db.execute(
+                f'''UPDATE "{table}" SET "{column}" = {function}("{column}")
+                    WHERE typeof("{column}") = 'text'
+                    AND {function}("{column}") IS NOT NULL
+                    AND "{column}" IS NOT {function}("{column}")'''
+            ).rowcount
+
+        for _, sql in triggers:
+            db.execute(sql)
+        if changed:
+            logger.info('Normalized %d dates in %s', changed, table)
@@ -0,0 +1,14 @@
+-- Version stamp for the session identity cache (see identity.py).
+-- Any change to the fields a session carries, or to the credentials, bumps it
+-- so sessions stamped before the change reload the user.
+
+ALTER TABLE users ADD COLUMN identity_version INTEGER NOT NULL DEFAULT 1;
+
+CREATE TRIGGER IF NOT EXISTS users_identity_version
+AFTER UPDATE OF username, email, password,
+                security_question_1, security_answer_1,
+                security_question_2, security_answer_2 ON users
+WHEN NEW.identity_version IS OLD.identity_version
+BEGIN
+    UPDATE users SET identity_version = OLD.identity_version + 1 WHERE id = NEW.id;
+END;
@@ -0,0 +1,57 @@
+-- Contribution history for financial goals (see goals.py).
+--
+-- Each contribution is a row in goal_contributions. Triggers keep running
+-- aggregates on the goal row (contributed_cents, contribution_count and the
+-- first/last contribution dates) and add the amount to current_amount, so
+-- reading a goal never has to scan its history.
+
+CREATE TABLE IF NOT EXISTS goal_contributions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    goal_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    amount_cents INTEGER NOT NULL CHECK (amount_cents > 0),
+    contributed_on DATE NOT NULL DEFAULT CURRENT_DATE,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (goal_id) REFERENCES financial_goals (id) ON DELETE CASCADE,
+    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+
+-- The goals page ranks each goal's contributions by date
+CREATE INDEX IF NOT EXISTS idx_goal_contributions_user_goal_date
+ON goal_contributions(user_id, goal_id, contributed_on, amount_cents);
+
+ALTER TABLE financial_goals ADD COLUMN contributed_cents INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE financial_goals ADD COLUMN contribution_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE financial_goals ADD COLUMN first_contribution_on DATE;
+ALTER TABLE financial_goals ADD COLUMN last_contribution_on DATE;
+
+CREATE TRIGGER IF NOT EXISTS goal_contributions_insert
+AFTER INSERT ON goal_contributions
+BEGIN
+    UPDATE financial_goals
+    SET current_amount = COALESCE(current_amount, 0) + NEW.amount_cents / 100.0,
+        contributed_cents = contributed_cents + NEW.amount_cents,
+        contribution_count = contribution_count + 1,
+        first_contribution_on = MIN(COALESCE(first_contribution_on, NEW.contributed_on), NEW.contributed_on),
+        last_contribution_on = MAX(COALESCE(last_contribution_on, NEW.contributed_on), NEW.contributed_on)
+    WHERE id = NEW.goal_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS goal_contributions_delete
+AFTER DELETE ON goal_contributions
+BEGIN
+    UPDATE financial_goals
+    SET current_amount = MAX(0, COALESCE(current_amount, 0) - OLD.amount_cents / 100.0),
+        contributed_cents = contributed_cents - OLD.amount_cents,
+        contribution_count = contribution_count - 1,
+        first_contribution_on = (SELECT MIN(contributed_on) FROM goal_contributions WHERE goal_id = OLD.goal_id),
+        last_contribution_on = (SELECT MAX(contributed_on) FROM goal_contributions WHERE goal_id = OLD.goal_id)
+    WHERE id = OLD.goal_id;
+END;
+
+-- Foreign keys are not enforced on the app's connections, so cascade here
+CREATE TRIGGER IF NOT EXISTS financial_goals_delete_contributions
+AFTER DELETE ON financial_goals
+BEGIN
+    DELETE FROM goal_contributions WHERE goal_id = OLD.id;
+END;
@@ -0,0 +1,34 @@
+"""
+Let `notifications.type` hold 'daily_digest'.
+
+0001_baseline.sql widened the CHECK on notifications.type, but with CREATE
+TABLE IF NOT EXISTS, which leaves a table created by the old
+notifications_schema.sql as it was. On those databases every digest insert
+failed. The table is rebuilt with the baseline definition when its CHECK does
+not allow 'daily_digest' yet.
+"""
+
+from migrations import rebuild_table
+
+NOTIFICATIONS_SQL = '''
+CREATE TABLE notifications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    type VARCHAR(50) NOT NULL CHECK (type IN ('overspending', 'budget_warning', 'goal_achieved', 'subscription_reminder', 'unusual_spending', 'daily_digest')),
+    title VARCHAR(200) NOT NULL,
+    message TEXT NOT NULL,
+    severity VARCHAR(20) NOT NULL CHECK (severity IN ('info', 'warning', 'critical')),
+    is_read BOOLEAN NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    read_at TIMESTAMP,
+    metadata TEXT,
+    FOREIGN KEY (user_id) REFERENCES users (id)
+)
+'''
+
+
+def upgrade(db):
+    row = db.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'notifications'").fetchone()
+    if row is None or 'daily_digest' in row[0]:
+        return
+    rebuild_table(db, 'notifications', NOTIFICATIONS_SQL)
@@ -0,0 +1,10 @@
+-- Idempotent expense submission (see expenses_api.py).
+--
+-- Clients tag each expense with a client_id and resend it when a response is
+-- lost. The unique index makes a repeat a no-op (INSERT ... ON CONFLICT DO
+-- NOTHING); rows without a client_id (NULL) never conflict.
+
+ALTER TABLE transactions ADD COLUMN client_id TEXT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_transactions_user_client_id
+ON transactions(user_id, client_id);
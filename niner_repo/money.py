@@ -0,0 +1,166 @@
+"""
+Money
+Ledger amounts are stored as INTEGER cents (the `amount_cents` columns) and
+handled in Python as `Money`, a small immutable value holding those cents.
+Sums and differences are exact integer arithmetic; Decimal is only used when
+parsing user input, and float only when handing a value to a template or JSON.
+
+SQLite integration (registered on import):
+    * a Money parameter binds as its cents, so only pass it for *_cents columns
+      (use float(money) for the legacy REAL `amount` columns);
+    * a result column aliased with the `money` type is read back as Money, e.g.
+      SELECT COALESCE(SUM(amount_cents), 0) AS "total [money]" ...
+      (needs PARSE_COLNAMES, which db.get_db turns on).
+"""
+
+import functools
+import sqlite3
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+_CENT = Decimal('0.01')
+
+
+@functools.total_ordering
+class Money:
+    """An exact amount of money in integer cents"""
+
+    __slots__ = ('cents',)
+
+    def __init__(self, cents=0):
+        if isinstance(cents, bool) or not isinstance(cents, int):
+            raise TypeError(f'Money takes integer cents, not {type(cents).__name__}')
+        object.__setattr__(self, 'cents', cents)
+
+    @classmethod
+    def parse(cls, value):
+        """Money from a user-supplied amount ('12.5', 12.5, Decimal); ValueError if invalid"""
+        if isinstance(value, Money):
+            return value
+        try:
+            amount = Decimal(str(value).strip())
+        except (InvalidOperation, ValueError):
+            raise ValueError(f'Invalid amount: {value!r}') from None
+        if not amount.is_finite():
+            raise ValueError(f'Invalid amount: {value!r}')
+        return cls(int(amount.quantize(_CENT, rounding=ROUND_HALF_UP).scaleb(2)))
+
+    @classmethod
+    def sum(cls, values):
+        return cls(sum(value.cents for value in values))
+
+    @property
+    def amount(self):
+        """The amount as a Decimal with two places"""
+        return Decimal(self.cents).scaleb(-2)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Money is immutable')
+
+    __delattr__ = __setattr__
+
+    def __reduce__(self):
+        return Money, (self.cents,)
+
+    def __add__(self, other):
+        if isinstance(other, Money):
+            return Money(self.cents + other.cents)
+        if other == 0:
+            return self
+        return NotImplemented
+
+    __radd__ = __add__  # so sum() works
+
+    def __sub__(self, other):
+        if isinstance(other, Money):
+            return Money(self.cents - other.cents)
+        return NotImplemented
+
+    def __neg__(self):
+        return Money(-self.cents)
+
+    def __abs__(self):
+        return Money(abs(self.cents))
+
+    def __mul__(self, factor):
+        """Scale by a number, rounding half up to the cent"""
+        if isinstance(factor, int) and not isinstance(factor, bool):
+            return Money(self.cents * factor)
+        if isinstance(factor, (float, Decimal)):
+            scaled = Decimal(self.cents) * Decimal(str(factor))
+            return Money(int(scaled.to_integral_value(rounding=ROUND_HALF_UP)))
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def scale(self, numerator, denominator):
+        """self * numerator / denominator in integer arithmetic, rounding half up"""
+        quotient, remainder = divmod(self.cents * numerator, denominator)
+        if 2 * remainder >= denominator:
+            quotient += 1
+        return Money(quotient)
+
+    def __truediv__(self, other):
+        """Money / Money is a ratio (float); Money / number is Money"""
+        if isinstance(other, Money):
+            return self.cents / other.cents
+        if isinstance(other, (int, float, Decimal)) and not isinstance(other, bool):
+            return self * (1 / Decimal(str(other)))
+        return NotImplemented
+
+    def __eq__(self, other):
+        cents = _comparable_cents(other)
+        if cents is None:
+            return NotImplemented
+        return self.cents == cents
+
+    def __lt__(self, other):
+        cents = _comparable_cents(other)
+        if cents is None:
+            return NotImplemented
+        return self.cents < cents
+
+    def __hash__(self):
+        # Equal to the number of dollars it compares equal to (Money(100) == 1)
+        return hash(self.amount)
+
+    def __bool__(self):
+        return self.cents != 0
+
+    def __float__(self):
+        return self.cents / 100
+
+    def __str__(self):
+        sign = '-' if self.cents < 0 else ''
+        dollars, cents = divmod(abs(self.cents), 100)
+        return f'{sign}{dollars}.{cents:02d}'
+
+    def __format__(self, spec):
+        return format(float(self), spec) if spec else str(self)
+
+    def __repr__(self):
+        return f"Money('{self}')"
+
+
+ZERO = Money(0)
+
+
+def _comparable_cents(other):
+    """`other` in cents for comparisons; plain numbers are amounts (0, 12.5)"""
+    if isinstance(other, Money):
+        return other.cents
+    if isinstance(other, bool):
+        return None
+    if isinstance(other, int):
+        return other * 100
+    if isinstance(other, (float, Decimal)):
+        return Decimal(str(other)).scaleb(2)
+    return None
+
+
+def to_cents(value):
+    """Cents for an amount from a legacy REAL column or user input"""
+    return Money.parse(value).cents
+
+
+sqlite3.register_adapter(Money, lambda money: money.cents)
+sqlite3.register_converter('money', lambda value: Money(int(value)))
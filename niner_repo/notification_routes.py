@@ -7,6 +7,7 @@ from flask import Blueprint, jsonify, request, render_template, redirect, url_fo
 from auth import login_required
 from db import get_db
 from notifications import NotificationEngine
+from data_versions import etag_by_data_version
 import json
 
 bp = Blueprint('notifications', __name__, url_prefix='/notifications')
@@ -27,6 +28,7 @@ def index():
 
 @bp.route('/api/list')
 @login_required
+@etag_by_data_version
 def api_list():
     """API endpoint to get notifications as JSON"""
     from flask import g
@@ -45,6 +47,7 @@ def api_list():
 
 @bp.route('/api/unread-count')
 @login_required
+@etag_by_data_version
 def api_unread_count():
     """API endpoint to get unread notification count"""
     from flask import g
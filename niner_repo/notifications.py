@@ -5,9 +5,16 @@ Handles detection of overspending, budget warnings, and other financial alerts
 
 from datetime import datetime, timedelta
 from db import get_db
+from dates import week_window
+from rows import fetch_records
 import sqlite3
 import json
-from flask import g
+import threading
+import time
+from types import MappingProxyType
+from flask import current_app, g
+from metrics import CACHE_LOOKUPS, NOTIFICATION_WORK, NOTIFICATIONS_CREATED
+from money import Money
 
 
 class NotificationEngine:
@@ -19,50 +26,139 @@ class NotificationEngine:
     TYPE_GOAL_ACHIEVED = 'goal_achieved'
     TYPE_SUBSCRIPTION_REMINDER = 'subscription_reminder'
     TYPE_UNUSUAL_SPENDING = 'unusual_spending'
+    TYPE_DAILY_DIGEST = 'daily_digest'
     
     # Severity levels
     SEVERITY_INFO = 'info'
     SEVERITY_WARNING = 'warning'
     SEVERITY_CRITICAL = 'critical'
     
+    # Column defaults from the notification_settings table, used until a user's row exists
+    DEFAULT_SETTINGS = {
+        'enable_overspending': 1,
+        'enable_budget_warning': 1,
+        'enable_goal_achieved': 1,
+        'enable_subscription_reminder': 1,
+        'enable_unusual_spending': 1,
+        'overspending_threshold': 100,
+        'budget_warning_threshold': 90,
+        'unusual_spending_multiplier': 2.0,
+        'method_in_app': 1,
+        'method_email': 0,
+        'method_push': 0,
+        'daily_digest': 0,
+        'max_daily_notifications': 10
+    }
+    
+    # Seconds a process-cached settings row is trusted; bounds staleness
+    # when another gunicorn worker handled the update
+    SETTINGS_CACHE_TTL = 60
+    
+    # Process-wide caches, keyed by database path
+    _settings_cache = {}
+    _settings_cache_lock = threading.Lock()
+    _tables_present = set()
+    
     @staticmethod
     def check_table_exists():
         """Check if notifications tables exist"""
+        database = current_app.config['DATABASE']
+        if database in NotificationEngine._tables_present:
+            return True
+        
         db = get_db()
         try:
             db.execute("SELECT 1 FROM notifications LIMIT 1")
-            return True
         except sqlite3.OperationalError:
             return False
+        
+        # Only a positive answer is cached; the tables may be created later
+        NotificationEngine._tables_present.add(database)
+        return True
+    
+    @staticmethod
+    def _request_settings():
+        """Per-request settings cache stored on flask.g"""
+        if '_notification_settings' not in g:
+            g._notification_settings = {}
+        return g._notification_settings
     
     @staticmethod
     def get_user_settings(user_id):
-        """Get notification settings for a user"""
+        """Get notification settings for a user
+        
+        Reads at most once per request and once per SETTINGS_CACHE_TTL per
+        process, and returns a read-only mapping shared by those callers.
+        Users without a settings row get the schema defaults; the row itself
+        is only created when something is written to it.
+        """
+        request_cache = NotificationEngine._request_settings()
+        if user_id in request_cache:
+            CACHE_LOOKUPS.inc(cache='notification_settings', result='hit')
+            return request_cache[user_id]
+        
+        key = (current_app.config['DATABASE'], user_id)
+        with NotificationEngine._settings_cache_lock:
+            cached = NotificationEngine._settings_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            CACHE_LOOKUPS.inc(cache='notification_settings', result='hit')
+            request_cache[user_id] = cached[1]
+            return cached[1]
+        CACHE_LOOKUPS.inc(cache='notification_settings', result='miss')
+        
         if not NotificationEngine.check_table_exists():
             return None
             
         db = get_db()
         try:
-            settings = db.execute(
+            row = db.execute(
                 'SELECT * FROM notification_settings WHERE user_id = ?',
                 (user_id,)
             ).fetchone()
-            
-            if not settings:
-                # Create default settings if they don't exist
-                db.execute(
-                    'INSERT INTO notification_settings (user_id) VALUES (?)',
-                    (user_id,)
-                )
-                db.commit()
-                settings = db.execute(
-                    'SELECT * FROM notification_settings WHERE user_id = ?',
-                    (user_id,)
-                ).fetchone()
-            
-            return dict(settings) if settings else None
         except sqlite3.OperationalError:
             return None
+        
+        # Read-only: the same mapping is handed to every caller until it expires
+        if row:
+            settings = MappingProxyType(dict(row))
+        else:
+            settings = MappingProxyType(dict(NotificationEngine.DEFAULT_SETTINGS, user_id=user_id))
+        
+        with NotificationEngine._settings_cache_lock:
+            NotificationEngine._settings_cache[key] = (
+                time.monotonic() + NotificationEngine.SETTINGS_CACHE_TTL, settings
+            )
+        request_cache[user_id] = settings
+        return settings
+    
+    @staticmethod
+    def invalidate_settings(user_id):
+        """Drop a user's cached settings from the request and process caches"""
+        key = (current_app.config['DATABASE'], user_id)
+        with NotificationEngine._settings_cache_lock:
+            NotificationEngine._settings_cache.pop(key, None)
+        NotificationEngine._request_settings().pop(user_id, None)
+    
+    @staticmethod
+    def clear_settings_cache():
+        """Empty the process-wide caches (used by tests and after schema resets)"""
+        with NotificationEngine._settings_cache_lock:
+            NotificationEngine._settings_cache.clear()
+        NotificationEngine._tables_present.clear()
+    
+    @staticmethod
+    def ensure_default_settings(user_ids):
+        """Create default settings rows for any of the given users that lack one
+        
+        Done in a single statement, so callers with many users (or a write
+        that needs the row to exist) pay for one INSERT instead of one per user.
+        Does not commit.
+        """
+        db = get_db()
+        db.executemany(
+            'INSERT OR IGNORE INTO notification_settings (user_id) VALUES (?)',
+            [(user_id,) for user_id in user_ids]
+        )
     
     @staticmethod
     def create_notification(user_id, notification_type, title, message, severity, metadata=None):
@@ -76,6 +172,10 @@ class NotificationEngine:
         if not settings:
             return None
         
+        # Digest users get one summary a day (see digest.py) instead of per-event rows
+        if settings.get('daily_digest') and notification_type != NotificationEngine.TYPE_DAILY_DIGEST:
+            return None
+        
         # Check if this notification type is enabled
         enable_key = f'enable_{notification_type}'
         if not settings.get(enable_key, True):
@@ -86,7 +186,7 @@ class NotificationEngine:
         today_count = db.execute(
             '''SELECT COUNT(*) as count FROM notifications 
                WHERE user_id = ? AND created_at >= ?''',
-            (user_id, today_start.isoformat())
+            (user_id, today_start)
         ).fetchone()
         
         if today_count and today_count['count'] >= settings.get('max_daily_notifications', 10):
@@ -103,29 +203,29 @@ class NotificationEngine:
             (user_id, notification_type, title, message, severity, metadata_json)
         )
         db.commit()
+        NOTIFICATIONS_CREATED.inc(type=notification_type)
         
         return cursor.lastrowid
     
     @staticmethod
+    @NOTIFICATION_WORK.time(check='overspending')
     def check_overspending(user_id, category=None):
         """Check if user has exceeded budget and create notifications"""
         db = get_db()
         settings = NotificationEngine.get_user_settings(user_id)
         
-        if not settings.get('enable_overspending', True):
+        if not settings.get('enable_overspending', True) or settings.get('daily_digest'):
             return []
         
         # Get current week dates
-        today = datetime.now().date()
-        week_start = today - timedelta(days=today.weekday())
-        week_end = week_start + timedelta(days=6)
+        week_start, week_end = week_window()
         
         # Get current budget
         budget = db.execute(
             '''SELECT * FROM budgets 
                WHERE user_id = ? AND week_start_date = ?
                ORDER BY created_at DESC LIMIT 1''',
-            (user_id, week_start.isoformat())
+            (user_id, week_start)
         ).fetchone()
         
         if not budget:
@@ -137,11 +237,11 @@ class NotificationEngine:
         # Check overall budget
         total_budget = float(budget['total_amount'])
         total_spent_row = db.execute(
-            '''SELECT COALESCE(SUM(amount), 0) as total
+            '''SELECT COALESCE(SUM(amount_cents), 0) AS "total [money]"
                FROM transactions 
-               WHERE user_id = ? AND type = 'expense'
+               WHERE user_id = ? AND transaction_type = 'expense'
                AND date >= ? AND date <= ?''',
-            (user_id, week_start.isoformat(), week_end.isoformat())
+            (user_id, week_start, week_end)
         ).fetchone()
         
         total_spent = float(total_spent_row['total']) if total_spent_row else 0.0
@@ -178,11 +278,11 @@ class NotificationEngine:
                 continue
             
             category_spent_row = db.execute(
-                '''SELECT COALESCE(SUM(amount), 0) as total
+                '''SELECT COALESCE(SUM(amount_cents), 0) AS "total [money]"
                    FROM transactions 
-                   WHERE user_id = ? AND type = 'expense' AND category = ?
+                   WHERE user_id = ? AND transaction_type = 'expense' AND category = ?
                    AND date >= ? AND date <= ?''',
-                (user_id, category_name, week_start.isoformat(), week_end.isoformat())
+                (user_id, category_name, week_start, week_end)
             ).fetchone()
             
             category_spent = float(category_spent_row['total']) if category_spent_row else 0.0
@@ -208,25 +308,24 @@ class NotificationEngine:
         return notifications_created
     
     @staticmethod
+    @NOTIFICATION_WORK.time(check='budget_warning')
     def check_budget_warning(user_id):
         """Check if user is approaching budget limit (warning before overspending)"""
         db = get_db()
         settings = NotificationEngine.get_user_settings(user_id)
         
-        if not settings.get('enable_budget_warning', True):
+        if not settings.get('enable_budget_warning', True) or settings.get('daily_digest'):
             return []
         
         # Get current week dates
-        today = datetime.now().date()
-        week_start = today - timedelta(days=today.weekday())
-        week_end = week_start + timedelta(days=6)
+        week_start, week_end = week_window()
         
         # Get current budget
         budget = db.execute(
             '''SELECT * FROM budgets 
                WHERE user_id = ? AND week_start_date = ?
                ORDER BY created_at DESC LIMIT 1''',
-            (user_id, week_start.isoformat())
+            (user_id, week_start)
         ).fetchone()
         
         if not budget:
@@ -239,11 +338,11 @@ class NotificationEngine:
         # Check overall budget
         total_budget = float(budget['total_amount'])
         total_spent_row = db.execute(
-            '''SELECT COALESCE(SUM(amount), 0) as total
+            '''SELECT COALESCE(SUM(amount_cents), 0) AS "total [money]"
                FROM transactions 
-               WHERE user_id = ? AND type = 'expense'
+               WHERE user_id = ? AND transaction_type = 'expense'
                AND date >= ? AND date <= ?''',
-            (user_id, week_start.isoformat(), week_end.isoformat())
+            (user_id, week_start, week_end)
         ).fetchone()
         
         total_spent = float(total_spent_row['total']) if total_spent_row else 0.0
@@ -283,11 +382,11 @@ class NotificationEngine:
                 continue
             
             category_spent_row = db.execute(
-                '''SELECT COALESCE(SUM(amount), 0) as total
+                '''SELECT COALESCE(SUM(amount_cents), 0) AS "total [money]"
                    FROM transactions 
-                   WHERE user_id = ? AND type = 'expense' AND category = ?
+                   WHERE user_id = ? AND transaction_type = 'expense' AND category = ?
                    AND date >= ? AND date <= ?''',
-                (user_id, category_name, week_start.isoformat(), week_end.isoformat())
+                (user_id, category_name, week_start, week_end)
             ).fetchone()
             
             category_spent = float(category_spent_row['total']) if category_spent_row else 0.0
@@ -315,12 +414,13 @@ class NotificationEngine:
         return notifications_created
     
     @staticmethod
+    @NOTIFICATION_WORK.time(check='unusual_spending')
     def check_unusual_spending(user_id, category, amount):
         """Check if a transaction amount is unusually high compared to average"""
         db = get_db()
         settings = NotificationEngine.get_user_settings(user_id)
         
-        if not settings.get('enable_unusual_spending', True):
+        if not settings.get('enable_unusual_spending', True) or settings.get('daily_digest'):
             return None
         
         multiplier = settings.get('unusual_spending_multiplier', 2.0)
@@ -329,9 +429,9 @@ class NotificationEngine:
         thirty_days_ago = (datetime.now().date() - timedelta(days=30)).isoformat()
         
         avg_row = db.execute(
-            '''SELECT AVG(amount) as avg_amount, COUNT(*) as count
+            '''SELECT CAST(ROUND(AVG(amount_cents)) AS INTEGER) AS "avg_amount [money]", COUNT(*) as count
                FROM transactions 
-               WHERE user_id = ? AND type = 'expense' AND category = ?
+               WHERE user_id = ? AND transaction_type = 'expense' AND category = ?
                AND date >= ?''',
             (user_id, category, thirty_days_ago)
         ).fetchone()
@@ -339,10 +439,14 @@ class NotificationEngine:
         if not avg_row or avg_row['count'] < 3:  # Need at least 3 transactions for comparison
             return None
         
-        avg_amount = float(avg_row['avg_amount'])
+        # Compared in cents, like the budget and overspending checks
+        amount = Money.parse(amount)
+        avg_amount = avg_row['avg_amount']
+        if not avg_amount:
+            return None
         
         # Check if current transaction is unusually high
-        if amount >= (avg_amount * multiplier):
+        if amount >= avg_amount * multiplier:
             notification_id = NotificationEngine.create_notification(
                 user_id=user_id,
                 notification_type=NotificationEngine.TYPE_UNUSUAL_SPENDING,
@@ -350,8 +454,8 @@ class NotificationEngine:
                 message=f'Your ${amount:.2f} {category} expense is {(amount/avg_amount):.1f}x higher than your average (${avg_amount:.2f}).',
                 severity=NotificationEngine.SEVERITY_INFO,
                 metadata={
-                    'amount': amount,
-                    'average': avg_amount,
+                    'amount': float(amount),
+                    'average': float(avg_amount),
                     'multiplier': amount / avg_amount,
                     'category': category
                 }
@@ -360,6 +464,17 @@ class NotificationEngine:
         
         return None
     
+    @staticmethod
+    def client_row(notif):
+        """A notifications Record as clients get it, from /api/list or /api/sync:
+        metadata parsed from its JSON text"""
+        if notif['metadata']:
+            try:
+                notif['metadata'] = json.loads(notif['metadata'])
+            except ValueError:
+                notif['metadata'] = {}
+        return notif
+    
     @staticmethod
     def get_notifications(user_id, unread_only=False, limit=50):
         """Get notifications for a user"""
@@ -378,20 +493,9 @@ class NotificationEngine:
             query += ' ORDER BY created_at DESC LIMIT ?'
             params.append(limit)
             
-            notifications = db.execute(query, params).fetchall()
+            notifications = fetch_records(db.execute(query, params))
             
-            # Convert to list of dicts and parse metadata
-            result = []
-            for notif in notifications:
-                notif_dict = dict(notif)
-                if notif_dict['metadata']:
-                    try:
-                        notif_dict['metadata'] = json.loads(notif_dict['metadata'])
-                    except:
-                        notif_dict['metadata'] = {}
-                result.append(notif_dict)
-            
-            return result
+            return [NotificationEngine.client_row(notif) for notif in notifications]
         except sqlite3.OperationalError:
             return []
     
@@ -419,7 +523,7 @@ class NotificationEngine:
             '''UPDATE notifications 
                SET is_read = 1, read_at = ? 
                WHERE id = ? AND user_id = ?''',
-            (datetime.now().isoformat(), notification_id, user_id)
+            (datetime.now(), notification_id, user_id)
         )
         db.commit()
     
@@ -431,7 +535,7 @@ class NotificationEngine:
             '''UPDATE notifications 
                SET is_read = 1, read_at = ? 
                WHERE user_id = ? AND is_read = 0''',
-            (datetime.now().isoformat(), user_id)
+            (datetime.now(), user_id)
         )
         db.commit()
     
@@ -482,7 +586,7 @@ class NotificationEngine:
         
         # Add updated_at
         update_fields.append('updated_at = ?')
-        params.append(datetime.now().isoformat())
+        params.append(datetime.now().isoformat(' '))
         
         # Add user_id for WHERE clause
         params.append(user_id)
@@ -491,6 +595,10 @@ class NotificationEngine:
                     SET {', '.join(update_fields)}
                     WHERE user_id = ?'''
         
+        # Settings rows are created lazily, so make sure there is one to update
+        NotificationEngine.ensure_default_settings([user_id])
         db.execute(query, params)
         db.commit()
+        
+        NotificationEngine.invalidate_settings(user_id)
         return True
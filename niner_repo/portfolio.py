@@ -2,6 +2,9 @@ from flask import Blueprint, render_template
 from auth import login_required
 from db import get_db
 from flask import g
+from cache import cached_view_model
+from dates import parse_date
+from rows import fetch_records
 from datetime import datetime, timedelta, date
 
 bp = Blueprint('portfolio', __name__, url_prefix='/portfolio')
@@ -14,11 +17,67 @@ def _get_last_price_for_investment(db, investment_id):
     return None
 
 
+def build_performance_series(holdings, txs, today, days=30):
+    """Daily portfolio value for the last `days` days (oldest first)
+
+    For each holding, the quantity on a day is the running total of its
+    transactions up to that day (sells count negative) and the price is the
+    last traded price on or before it. Holdings without transactions are
+    assumed to have held their current quantity throughout.
+
+    Each transaction's date is parsed once and every investment's
+    transactions are swept a single time as the days advance, instead of
+    re-scanning (and re-parsing) them for every day.
+    """
+    inv_txs = {}
+    for t in txs:
+        inv_txs.setdefault(t['investment_id'], []).append(
+            (parse_date(t['date']), -float(t['quantity']) if t['type'] == 'sell' else float(t['quantity']), float(t['price']))
+        )
+    for entries in inv_txs.values():
+        entries.sort(key=lambda entry: entry[0])
+
+    # Per holding: [index of next unapplied transaction, quantity so far, last price]
+    state = [[0, 0.0, None] for _ in holdings]
+
+    series = []
+    for i in range(days - 1, -1, -1):
+        d = today - timedelta(days=i)
+        day_val = 0.0
+        for h, st in zip(holdings, state):
+            entries = inv_txs.get(h['investment_id'])
+            if entries is None:
+                day_val += h['qty'] * h['price']
+                continue
+
+            pos, qty, price = st
+            while pos < len(entries) and entries[pos][0] <= d:
+                qty += entries[pos][1]
+                price = entries[pos][2]
+                pos += 1
+            st[0], st[1], st[2] = pos, qty, price
+
+            day_val += qty * (price if price is not None else h['price'])
+
+        series.append({'date': d.isoformat(), 'value': round(day_val, 2)})
+    return series
+
+
+# Prices come from every user's trades, so portfolio entries also expire quickly
+PORTFOLIO_CACHE_TTL = 60
+
+
 @bp.route('/')
 @login_required
 def index():
+    page = cached_view_model('portfolio', g.user['id'], ('portfolio',),
+                             lambda: build_portfolio(g.user['id']), ttl=PORTFOLIO_CACHE_TTL)
+    return render_template('home/portfolio.html', **page)
+
+
+def build_portfolio(user_id):
+    """Holdings, allocation summary and 30-day performance series (uncached)"""
     db = get_db()
-    user_id = g.user['id']
 
     # Get positions and instrument metadata
     rows = db.execute('''
@@ -75,50 +134,9 @@ def index():
 
     # Build historical performance (last 30 days) by aggregating transactions
     # Fetch user's investment transactions
-    tx_rows = db.execute('SELECT investment_id, date, type, quantity, price FROM investment_transactions WHERE user_id = ? ORDER BY date', (user_id,)).fetchall()
-    txs = [dict(x) for x in tx_rows]
-
-    today = date.today()
-    days = 30
-    series = []
-
-    # Precompute transactions grouped by investment
-    inv_txs = {}
-    for t in txs:
-        inv_txs.setdefault(t['investment_id'], []).append(t)
+    txs = fetch_records(db.execute('SELECT investment_id, date, type, quantity, price FROM investment_transactions WHERE user_id = ? ORDER BY date', (user_id,)))
 
-    for i in range(days-1, -1, -1):
-        d = today - timedelta(days=i)
-        day_val = 0.0
-        # for each investment in holdings, compute cumulative qty up to date and price at or before date
-        for h in holdings:
-            inv_id = h['investment_id']
-            qty = 0.0
-            price = None
-            if inv_id in inv_txs:
-                for t in inv_txs[inv_id]:
-                    tdate = datetime.strptime(t['date'], '%Y-%m-%d').date() if isinstance(t['date'], str) else t['date']
-                    if tdate <= d:
-                        # treat sell as negative quantity
-                        if t['type'] == 'sell':
-                            qty -= float(t['quantity'])
-                        else:
-                            qty += float(t['quantity'])
-                        price = float(t['price'])
-            else:
-                # If there are no recorded transactions for this investment,
-                # assume the current quantity applies to all past dates up to today.
-                # (previous code used `d >= today` which produced zeros for historical
-                # dates and a single spike on today.)
-                qty = h['qty'] if d <= today else 0.0
-                price = h['price']
-
-            if price is None:
-                price = h['price']
-
-            day_val += qty * price
-
-        series.append({'date': d.isoformat(), 'value': round(day_val, 2)})
+    series = build_performance_series(holdings, txs, date.today())
 
     # compute daily change
     today_val = series[-1]['value'] if series else total_value
@@ -134,4 +152,4 @@ def index():
         'allocations': allocations
     }
 
-    return render_template('home/portfolio.html', summary=summary, holdings=holdings, performance_series=series)
+    return {'summary': summary, 'holdings': holdings, 'performance_series': series}
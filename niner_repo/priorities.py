@@ -1,11 +1,22 @@
-from flask import Blueprint, request, jsonify, render_template, g
+from flask import Blueprint, current_app, request, jsonify, render_template, g
 from db import get_db
 from auth import login_required
+from cache import cached_view_model
+from stats import get_stats
 from datetime import datetime
 import json
+import random
+import time
 
 bp = Blueprint('priorities', __name__, url_prefix='/finance/priorities')
 
+# Suggestions per priority, and how long a user keeps seeing the same ones
+SUGGESTION_SAMPLE_SIZE = 5
+SUGGESTION_TTL = 60
+
+# How long the suggestion catalog is kept before priority_suggestions is re-read
+SUGGESTION_CATALOG_TTL = 300
+
 PRIORITY_CATEGORIES = {
     'Save More': {
         'icon': '💰',
@@ -166,75 +177,74 @@ def get_all_suggestions():
     
     return jsonify(all_suggestions)
 
+def load_suggestion_catalog():
+    """priority_type -> tuple of (text, category, min_amount, max_amount)
+
+    Kept per database for SUGGESTION_CATALOG_TTL seconds, so edits to
+    priority_suggestions show up without a restart.
+    """
+    catalogs = current_app.extensions.setdefault('suggestion_catalog', {})
+    database = current_app.config['DATABASE']
+    cached = catalogs.get(database)
+    if cached and cached[0] > time.time():
+        return cached[1]
+
+    catalog = {}
+    rows = get_db().execute(
+        'SELECT priority_type, suggestion_text, category, min_amount, max_amount FROM priority_suggestions ORDER BY id'
+    ).fetchall()
+    for row in rows:
+        catalog.setdefault(row['priority_type'], []).append(tuple(row)[1:])
+    catalog = {priority_type: tuple(entries) for priority_type, entries in catalog.items()}
+    catalogs[database] = (time.time() + SUGGESTION_CATALOG_TTL, catalog)
+    return catalog
+
+def sample_suggestions(priority_type, user_id, k=SUGGESTION_SAMPLE_SIZE):
+    """Up to k catalog entries for the priority, the same for a user within one TTL window"""
+    entries = load_suggestion_catalog().get(priority_type, ())
+    window = int(time.time() // SUGGESTION_TTL)
+    rng = random.Random(f'{user_id}:{priority_type}:{window}')
+    return rng.sample(entries, min(k, len(entries)))
+
 def get_personalized_suggestions(priority_type, user_id):
     """Get personalized suggestions based on priority and user's financial data"""
-    db = get_db()
-    
-    # Get base suggestions
-    suggestions = db.execute(
-        '''SELECT suggestion_text, category, min_amount, max_amount 
-           FROM priority_suggestions 
-           WHERE priority_type = ?
-           ORDER BY RANDOM()
-           LIMIT 5''',
-        (priority_type,)
-    ).fetchall()
+    return cached_view_model(
+        'suggestions', user_id, ('ledger',),
+        lambda: build_suggestions(priority_type, user_id),
+        priority_type, ttl=SUGGESTION_TTL
+    )
+
+def build_suggestions(priority_type, user_id):
+    sampled = sample_suggestions(priority_type, user_id)
+    if not sampled:
+        return []
     
-    # Get user's financial stats
     stats = get_user_financial_stats(user_id)
+    # Relevance depends only on the user's stats, so it is scored once per set
+    relevance = calculate_relevance(None, stats, priority_type)
     
-    # Customize suggestions based on user's situation
     personalized = []
-    for suggestion in suggestions:
+    for text, category, min_amount, max_amount in sampled:
         custom_suggestion = {
-            'text': suggestion['suggestion_text'],
-            'category': suggestion['category'],
-            'relevance_score': calculate_relevance(suggestion, stats, priority_type)
+            'text': text,
+            'category': category,
+            'relevance_score': relevance
         }
-        
-        # Add specific amounts if applicable
-        if suggestion['min_amount'] and suggestion['max_amount']:
-            recommended_amount = calculate_recommended_amount(
-                suggestion['min_amount'], 
-                suggestion['max_amount'], 
-                stats
-            )
-            custom_suggestion['recommended_amount'] = recommended_amount
-        
+        if min_amount and max_amount:
+            custom_suggestion['recommended_amount'] = calculate_recommended_amount(min_amount, max_amount, stats)
         personalized.append(custom_suggestion)
     
-    # Sort by relevance
-    personalized.sort(key=lambda x: x['relevance_score'], reverse=True)
-    
     return personalized
 
 def get_user_financial_stats(user_id):
     """Get user's financial statistics"""
-    db = get_db()
-    
-    # Get total income
-    income = db.execute(
-        'SELECT COALESCE(SUM(amount), 0) as total FROM income WHERE user_id = ?',
-        (user_id,)
-    ).fetchone()
-    
-    # Get total expenses
-    expenses = db.execute(
-        'SELECT COALESCE(SUM(amount), 0) as total FROM transactions WHERE user_id = ? AND type = "expense"',
-        (user_id,)
-    ).fetchone()
-    
-    # Get savings/investments
-    savings = db.execute(
-        'SELECT COALESCE(SUM(amount), 0) as total FROM transactions WHERE user_id = ? AND category IN ("Savings", "Investment")',
-        (user_id,)
-    ).fetchone()
-    
+    stats = get_stats(user_id)
+    income = stats['income']
     return {
-        'monthly_income': income['total'] if income else 0,
-        'monthly_expenses': expenses['total'] if expenses else 0,
-        'total_savings': savings['total'] if savings else 0,
-        'savings_rate': (savings['total'] / income['total'] * 100) if income and income['total'] > 0 else 0
+        'monthly_income': float(income),
+        'monthly_expenses': float(stats['expenses']),
+        'total_savings': float(stats['saved']),
+        'savings_rate': stats['saved'] / income * 100 if income else 0
     }
 
 def calculate_relevance(suggestion, stats, priority_type):
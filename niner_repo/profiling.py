@@ -0,0 +1,202 @@
+"""
+Request Profiling Module
+WSGI middleware that runs selected requests under cProfile and keeps the
+results as .prof files, plus an admin page for browsing them.
+
+A request is profiled when
+    - it carries `X-Profile-Token: <PROFILE_TOKEN>` (only when PROFILE_TOKEN is set), or
+    - it is picked by sampling, with probability PROFILE_SAMPLE_RATE (default 0, off).
+
+Files go to PROFILE_DIR (default instance/profiles). Only the newest
+PROFILE_MAX_FILES (default 200) and nothing older than PROFILE_MAX_AGE_DAYS
+(default 7) are kept. The .prof files load into pstats, snakeviz or flameprof
+to get a flamegraph.
+"""
+
+import io
+import logging
+import os
+import random
+import re
+import secrets
+import time
+from datetime import datetime
+
+from flask import Blueprint, abort, current_app, render_template, send_from_directory
+
+from auth import admin_required
+
+logger = logging.getLogger(__name__)
+
+bp = Blueprint('profiling', __name__, url_prefix='/admin/profiles')
+
+PROFILE_HEADER = 'HTTP_X_PROFILE_TOKEN'
+
+# <timestamp>_<method>_<path slug>_<duration>ms_<id>.prof
+_PROFILE_NAME = re.compile(r'^(\d{8}T\d{6})_([A-Z]+)_(.*)_(\d+)ms_([0-9a-f]+)\.prof$')
+_SLUG = re.compile(r'[^A-Za-z0-9]+')
+
+
+def get_profile_dir(app):
+    return app.config.get('PROFILE_DIR') or os.path.join(app.instance_path, 'profiles')
+
+
+class ProfilerMiddleware:
+    """Profile sampled or explicitly requested requests; pass the rest straight through"""
+
+    def __init__(self, wsgi_app, flask_app):
+        self.wsgi_app = wsgi_app
+        self.flask_app = flask_app
+
+    def should_profile(self, environ):
+        config = self.flask_app.config
+        token = config.get('PROFILE_TOKEN')
+        if token and secrets.compare_digest(environ.get(PROFILE_HEADER, ''), token):
+            return True
+        rate = config.get('PROFILE_SAMPLE_RATE', 0)
+        return rate > 0 and random.random() < rate
+
+    def __call__(self, environ, start_response):
+        if not self.should_profile(environ):
+            return self.wsgi_app(environ, start_response)
+
+        import cProfile  # only needed once a request is actually profiled
+
+        profile_id = secrets.token_hex(4)
+
+        def profiled_start_response(status, headers, exc_info=None):
+            return start_response(status, list(headers) + [('X-Profile-Id', profile_id)], exc_info)
+
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            # Consume the body inside the profiler so streamed responses are included
+            app_iter = self.wsgi_app(environ, profiled_start_response)
+            try:
+                body = b''.join(app_iter)
+            finally:
+                if hasattr(app_iter, 'close'):
+                    app_iter.close()
+        finally:
+            profiler.disable()
+            self.save(profiler, environ, profile_id, (time.perf_counter() - start) * 1000)
+
+        return [body]
+
+    def save(self, profiler, environ, profile_id, elapsed_ms):
+        slug = _SLUG.sub('.', environ.get('PATH_INFO', '/')).strip('.')[:60] or 'root'
+        filename = '{}_{}_{}_{}ms_{}.prof'.format(
+            datetime.now().strftime('%Y%m%dT%H%M%S'),
+            environ.get('REQUEST_METHOD', 'GET'),
+            slug,
+            int(elapsed_ms),
+            profile_id
+        )
+        directory = get_profile_dir(self.flask_app)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            profiler.dump_stats(os.path.join(directory, filename))
+            prune_profiles(
+                directory,
+                self.flask_app.config.get('PROFILE_MAX_FILES', 200),
+                self.flask_app.config.get('PROFILE_MAX_AGE_DAYS', 7)
+            )
+        except OSError:
+            logger.exception('Could not save request profile')
+
+
+def prune_profiles(directory, max_files, max_age_days):
+    """Delete profiles beyond the newest `max_files` or older than `max_age_days`"""
+    entries = []
+    for filename in os.listdir(directory):
+        if filename.endswith('.prof'):
+            path = os.path.join(directory, filename)
+            entries.append((os.path.getmtime(path), path))
+    entries.sort(reverse=True)
+
+    cutoff = time.time() - max_age_days * 86400
+    for index, (mtime, path) in enumerate(entries):
+        if index >= max_files or mtime < cutoff:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+def list_profiles(directory):
+    """Saved profiles, newest first"""
+    if not os.path.isdir(directory):
+        return []
+
+    profiles = []
+    for filename in os.listdir(directory):
+        match = _PROFILE_NAME.match(filename)
+        if not match:
+            continue
+        stamp, method, slug, duration, profile_id = match.groups()
+        path = os.path.join(directory, filename)
+        profiles.append({
+            'name': filename,
+            'id': profile_id,
+            'captured_at': datetime.strptime(stamp, '%Y%m%dT%H%M%S'),
+            'method': method,
+            'path': '/' + slug.replace('.', '/') if slug != 'root' else '/',
+            'duration_ms': int(duration),
+            'size_kb': round(os.path.getsize(path) / 1024, 1),
+        })
+    profiles.sort(key=lambda p: p['name'], reverse=True)
+    return profiles
+
+
+def format_stats(path, sort='cumulative', limit=60):
+    """pstats report for one profile as text"""
+    import pstats
+
+    out = io.StringIO()
+    stats = pstats.Stats(path, stream=out)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
+
+
+def _profile_path(name):
+    if not _PROFILE_NAME.match(name):
+        abort(404)
+    path = os.path.join(get_profile_dir(current_app), name)
+    if not os.path.exists(path):
+        abort(404)
+    return path
+
+
+@bp.route('/')
+@admin_required
+def index():
+    """List captured profiles"""
+    return render_template('admin/profiles.html',
+                           profiles=list_profiles(get_profile_dir(current_app)),
+                           sample_rate=current_app.config.get('PROFILE_SAMPLE_RATE', 0),
+                           token_enabled=bool(current_app.config.get('PROFILE_TOKEN')))
+
+
+@bp.route('/<name>')
+@admin_required
+def view(name):
+    """Show the top functions of one profile"""
+    path = _profile_path(name)
+    return render_template('admin/profile_detail.html', name=name,
+                           cumulative=format_stats(path, 'cumulative'),
+                           tottime=format_stats(path, 'tottime'))
+
+
+@bp.route('/<name>/download')
+@admin_required
+def download(name):
+    """Download the raw .prof file"""
+    _profile_path(name)
+    return send_from_directory(get_profile_dir(current_app), name, as_attachment=True)
+
+
+def init_app(app):
+    """Wrap the WSGI app in the profiler and register the admin pages"""
+    app.wsgi_app = ProfilerMiddleware(app.wsgi_app, app)
+    app.register_blueprint(bp)
@@ -0,0 +1,190 @@
+"""
+Rate Limiting Module
+Token buckets for the credential endpoints (login, password recovery,
+registration), keyed by client IP and by the submitted username.
+
+A bucket holds up to `capacity` tokens and refills completely over `period`
+seconds; every attempt takes one token. LIMITS maps each scope to its buckets
+and RATE_LIMITS in the config overrides entries, e.g.
+    RATE_LIMITS = {'login': {'ip': (30, 60), 'username': (10, 300)}}
+
+Each worker keeps its buckets in memory, split over SHARDS lock-striped LRUs
+(RATE_LIMIT_MAX_KEYS keys in total), so an exhausted bucket is refused from
+memory alone. Granting a token goes through a shared side database
+(RATE_LIMIT_DB, default instance/rate_limits.sqlite) in one short
+transaction, which keeps the workers' counts consistent. If that database is
+unavailable the in-memory decision stands.
+
+`rate_limited(scope, *fields)` applies the check before the view runs, so a
+refused attempt never reaches the users table or the password hash.
+"""
+
+import functools
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, request
+from werkzeug.exceptions import TooManyRequests
+
+logger = logging.getLogger(__name__)
+
+# scope -> {key kind: (capacity, period in seconds)}
+LIMITS = {
+    'login': {'ip': (30, 60), 'username': (10, 300)},
+    'recovery': {'ip': (10, 300), 'username': (5, 900)},
+    'register': {'ip': (10, 3600)},
+}
+
+SHARDS = 16
+DEFAULT_MAX_KEYS = 50000
+
+SIDE_DB_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+    bucket TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+)
+'''
+
+
+class RateLimited(TooManyRequests):
+    description = 'Too many attempts. Please wait a moment and try again.'
+
+    def __init__(self, retry_after):
+        super().__init__(retry_after=max(1, int(retry_after + 0.999)))
+
+
+def refill(tokens, updated_at, now, capacity, period):
+    return min(capacity, tokens + (now - updated_at) * capacity / period)
+
+
+class RateLimiter:
+    def __init__(self, path, limits, max_keys=DEFAULT_MAX_KEYS):
+        self.path = path
+        self.limits = limits
+        self.max_keys_per_shard = max(1, max_keys // SHARDS)
+        self.shards = [(threading.Lock(), OrderedDict()) for _ in range(SHARDS)]
+        self.schema_ready = False
+
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=1, isolation_level=None)
+        if not self.schema_ready:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(SIDE_DB_SCHEMA)
+            self.schema_ready = True
+        return conn
+
+    def peek(self, scope, kind, value):
+        """Seconds until this worker's view of the bucket has a token (0 if it has one), taking nothing"""
+        limit = self.limits.get(scope, {}).get(kind)
+        if limit is None or not value:
+            return 0
+        capacity, period = limit
+        bucket = f'{scope}:{kind}:{value}'
+        lock, entries = self.shards[hash(bucket) % SHARDS]
+        with lock:
+            entry = entries.get(bucket)
+        if entry is None:
+            return 0
+        tokens = refill(*entry, time.time(), capacity, period)
+        return 0 if tokens >= 1 else (1 - tokens) * period / capacity
+
+    def hit(self, scope, kind, value):
+        """Take a token from the bucket; returns 0 if granted, else seconds until one is free"""
+        limit = self.limits.get(scope, {}).get(kind)
+        if limit is None or not value:
+            return 0
+        capacity, period = limit
+        bucket = f'{scope}:{kind}:{value}'
+        now = time.time()
+
+        lock, entries = self.shards[hash(bucket) % SHARDS]
+        with lock:
+            tokens, updated_at = entries.get(bucket, (capacity, now))
+            tokens = refill(tokens, updated_at, now, capacity, period)
+            if tokens < 1:
+                entries[bucket] = (tokens, now)
+                entries.move_to_end(bucket)
+                return (1 - tokens) * period / capacity
+
+        tokens = self.take_shared(bucket, now, capacity, period, fallback=tokens)
+        with lock:
+            entries[bucket] = (tokens - 1 if tokens >= 1 else tokens, now)
+            entries.move_to_end(bucket)
+            while len(entries) > self.max_keys_per_shard:
+                entries.popitem(last=False)
+        if tokens < 1:
+            return (1 - tokens) * period / capacity
+        return 0
+
+    def take_shared(self, bucket, now, capacity, period, fallback):
+        """Tokens the shared bucket held before this attempt, taking one if there was one"""
+        try:
+            conn = self.connect()
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                row = conn.execute(
+                    'SELECT tokens, updated_at FROM rate_limit_buckets WHERE bucket = ?', (bucket,)
+                ).fetchone()
+                tokens = refill(*row, now, capacity, period) if row else capacity
+                conn.execute(
+                    '''INSERT INTO rate_limit_buckets (bucket, tokens, updated_at) VALUES (?, ?, ?)
+                       ON CONFLICT (bucket) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at''',
+                    (bucket, tokens - 1 if tokens >= 1 else tokens, now)
+                )
+                conn.execute('COMMIT')
+                return tokens
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            logger.warning("Rate limit store unavailable; using this worker's count", exc_info=True)
+            return fallback
+
+
+def get_limiter():
+    """The current app's limiter, created on first use"""
+    limiter = current_app.extensions.get('rate_limiter')
+    if limiter is None:
+        limits = {scope: dict(buckets) for scope, buckets in LIMITS.items()}
+        for scope, buckets in (current_app.config.get('RATE_LIMITS') or {}).items():
+            limits.setdefault(scope, {}).update(buckets)
+        path = current_app.config.get('RATE_LIMIT_DB') or os.path.join(current_app.instance_path, 'rate_limits.sqlite')
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        limiter = current_app.extensions['rate_limiter'] = RateLimiter(
+            path, limits, current_app.config.get('RATE_LIMIT_MAX_KEYS', DEFAULT_MAX_KEYS)
+        )
+    return limiter
+
+
+def check(scope, username=None):
+    """Raise RateLimited if the client IP or `username` is out of attempts for `scope`"""
+    if not current_app.config.get('RATE_LIMIT_ENABLED', True):
+        return
+    limiter = get_limiter()
+    buckets = [('ip', request.remote_addr), ('username', (username or '').strip().lower())]
+    # A refused bucket must not cost the other one a token: a blocked IP would
+    # otherwise keep draining its target's username bucket, and vice versa
+    wait = max(limiter.peek(scope, kind, value) for kind, value in buckets)
+    for kind, value in buckets:
+        if wait:
+            break
+        wait = limiter.hit(scope, kind, value)
+    if wait:
+        logger.warning('Rate limited %s attempt from %s', scope, request.remote_addr)
+        raise RateLimited(wait)
+
+
+def rate_limited(scope, *fields):
+    """Check POSTs to the view against `scope`, keyed on the first of the form `fields` sent"""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapped_view(**kwargs):
+            if request.method == 'POST':
+                check(scope, next(filter(None, map(request.form.get, fields)), None))
+            return view(**kwargs)
+        return wrapped_view
+    return decorator
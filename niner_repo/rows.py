@@ -0,0 +1,116 @@
+"""
+Row Records Module
+Compact read-only-ish rows for list queries, instead of copying every
+sqlite3.Row into a dict.
+
+`fetch_records(cursor)` sets the cursor's row_factory to build Records. A
+Record holds the row tuple sqlite3 already produced, plus a {column: position}
+index shared by every row of the same query shape. No per-row dict is built.
+
+Records behave like the dicts they replace:
+- row['amount'], row.amount (so templates can use either), row.get('amount')
+- keys(), items(), dict(row), and == against a dict
+- row['metadata'] = ... to replace a column's value
+
+The JSON provider installed by init_app serializes them, and read-only
+mappings (types.MappingProxyType, e.g. cached notification settings), as
+objects. It also writes the date / datetime values DATE and TIMESTAMP columns
+come back as: 'YYYY-MM-DD' and ISO 8601 UTC ('2024-05-01T09:30:15Z'), rather
+than Flask's RFC 1123 dates at midnight GMT.
+"""
+
+import functools
+from collections.abc import Mapping
+from datetime import date, datetime
+from types import MappingProxyType
+
+from flask.json.provider import DefaultJSONProvider
+
+from dates import format_date, format_utc_timestamp
+
+
+@functools.lru_cache(maxsize=512)
+def shape_index(columns):
+    """{column: position} for a query shape (the first of duplicate names wins, as in sqlite3.Row)"""
+    index = {}
+    for position, column in enumerate(columns):
+        index.setdefault(column, position)
+    return index
+
+
+class Record(Mapping):
+    """One row: the values tuple plus its query shape's shared column index"""
+
+    __slots__ = ('_index', '_values')
+
+    def __init__(self, index, values):
+        self._index = index
+        self._values = values
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self._values[self._index[key]]
+        return self._values[key]
+
+    def __getattr__(self, name):
+        # Only reached for names that are not methods or slots
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self._values[self._index[name]]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setitem__(self, key, value):
+        values = list(self._values)
+        if key in self._index:
+            values[self._index[key]] = value
+        else:
+            # A new column: this row gets its own index
+            self._index = dict(self._index, **{key: len(values)})
+            values.append(value)
+        self._values = tuple(values)
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __repr__(self):
+        return f'Record({self._asdict()!r})'
+
+    def __reduce__(self):
+        # Cached view models are pickled by the sqlite cache backend
+        return Record, (self._index, self._values)
+
+    def _asdict(self):
+        return {column: self._values[position] for column, position in self._index.items()}
+
+
+def fetch_records(cursor):
+    """The remaining rows of an executed cursor, as Records"""
+    index = shape_index(tuple(column[0] for column in cursor.description))
+    cursor.row_factory = lambda _cursor, row: Record(index, row)
+    return cursor.fetchall()
+
+
+class RecordJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider, serializing Records and read-only mappings as objects
+    and dates in ISO form"""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, datetime):
+            return format_utc_timestamp(o)
+        if isinstance(o, date):
+            return format_date(o)
+        if isinstance(o, Record):
+            return o._asdict()
+        if isinstance(o, MappingProxyType):
+            return dict(o)
+        return DefaultJSONProvider.default(o)
+
+
+def init_app(app):
+    app.json = RecordJSONProvider(app)
@@ -0,0 +1,74 @@
+"""
+Cold-start budget check.
+
+Runs a fresh interpreter with `-X importtime`, imports app.py and builds the
+app with create_app(), then reports the slowest imports and fails (exit 1)
+when the whole thing takes longer than the budget.
+
+    python scripts/check_import_time.py                 # default 750 ms budget
+    python scripts/check_import_time.py --budget-ms 500 --top 25
+
+Timings vary with the machine and disk cache, so the budget is deliberately
+loose; it is there to catch a new module-level import of something heavy.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STARTUP_CODE = "import app; app.create_app({'TESTING': True, 'DATABASE': ':memory:'})"
+
+
+def parse_importtime(stderr):
+    """[(module, self_us, cumulative_us, depth)] from -X importtime output"""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return imports
+
+
+def measure(code=STARTUP_CODE):
+    """Wall time in ms and parsed import timings for running `code` in a new interpreter"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=REPO_DIR, capture_output=True, text=True
+    )
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return elapsed_ms, parse_importtime(result.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=750)
+    parser.add_argument('--top', type=int, default=15, help='slowest imports to list')
+    args = parser.parse_args(argv)
+
+    elapsed_ms, imports = measure()
+    top_level = [entry for entry in imports if entry[3] == 0]
+    import_ms = sum(cumulative for _, _, cumulative, _ in top_level) / 1000
+
+    print(f'startup: {elapsed_ms:.0f} ms wall, {import_ms:.0f} ms in imports (budget {args.budget_ms:.0f} ms)')
+    # Direct imports show which module pulled in the time
+    direct = [entry for entry in imports if entry[3] <= 1]
+    for name, _, cumulative, _ in sorted(direct, key=lambda e: e[2], reverse=True)[:args.top]:
+        print(f'  {cumulative / 1000:8.1f} ms  {name}')
+
+    if elapsed_ms > args.budget_ms:
+        print('Cold start is over budget.')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
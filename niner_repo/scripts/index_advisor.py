@@ -0,0 +1,178 @@
+"""
+Index advisor.
+
+Replays the app's SQL through EXPLAIN QUERY PLAN against a migrated database
+and reports the statements whose plan scans a whole table or builds a temp
+B-tree (for ORDER BY / GROUP BY / DISTINCT).
+
+The corpus comes from two places:
+  * the source: every string literal in the app modules that is a SELECT,
+    UPDATE or DELETE (parameters bound to NULL), and
+  * the instrumentation layer (--capture): the statements db.py recorded while
+    the benchmark scenarios ran against a synthetic dataset, with their real
+    parameters.
+
+    python scripts/index_advisor.py                  # source corpus only
+    python scripts/index_advisor.py --capture        # plus captured statements
+    python scripts/index_advisor.py --fail-on-scan   # exit 1 on any finding
+
+Small lookup tables (levels, milestones, ...) are expected to be scanned; the
+report lists them anyway and leaves the judgement to the reader.
+"""
+
+import argparse
+import ast
+import glob
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from collections import OrderedDict, namedtuple
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from db import normalize_sql  # noqa: E402
+
+Finding = namedtuple('Finding', 'shape sources details')
+
+_STATEMENT = re.compile(r'^\s*(SELECT|WITH|UPDATE|DELETE)\b', re.I)
+_NAMED_PARAM = re.compile(r'(?<!:):([A-Za-z_]\w*)')
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_PLAIN_SCAN = re.compile(r'^SCAN (\w+)(?: AS \w+)?$')
+
+
+def extract_sql(paths=None):
+    """[(sql, None, 'module.py:line')] for SQL string literals in the app modules"""
+    if paths is None:
+        paths = sorted(glob.glob(os.path.join(REPO_DIR, '*.py')))
+    statements = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            tree = ast.parse(f.read(), path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str) and _STATEMENT.match(node.value):
+                statements.append((node.value, None, f'{os.path.basename(path)}:{node.lineno}'))
+    return statements
+
+
+def capture_sql(db_path, iterations=3):
+    """[(sql, parameters, scenario)] recorded by db.py while the benchmark scenarios run"""
+    from flask import g
+
+    from benchmarks.runner import TestClientTarget, build_app, run_scenario
+    from benchmarks.scenarios import SCENARIOS
+
+    app = build_app(db_path)
+    captured = []
+    current = {}
+
+    @app.after_request
+    def collect(response):
+        if 'db' in g:
+            captured.extend(
+                (sql, parameters, current['scenario'])
+                for sql, parameters, _, _ in g.db.stats.statements
+                if parameters is not None
+            )
+        return response
+
+    user_ids = [1, 2]
+    target = TestClientTarget(app, user_ids)
+    for scenario in SCENARIOS:
+        current['scenario'] = 'captured:' + scenario.name
+        run_scenario(target, scenario, user_ids, iterations, warmup=0)
+    return captured
+
+
+def placeholder_parameters(sql):
+    """NULL parameters matching the statement's placeholders"""
+    bare = _STRING_LITERAL.sub("''", sql)
+    names = _NAMED_PARAM.findall(bare)
+    if names:
+        return {name: None for name in names}
+    return (None,) * bare.count('?')
+
+
+def explain(conn, sql, parameters=None):
+    """EXPLAIN QUERY PLAN detail lines, or None if the statement does not prepare"""
+    if parameters is None:
+        parameters = placeholder_parameters(sql)
+    try:
+        rows = conn.execute('EXPLAIN QUERY PLAN ' + sql, parameters).fetchall()
+    except (sqlite3.Error, ValueError):
+        return None
+    return [row[3] for row in rows]
+
+
+def plan_issues(details):
+    """Plan lines that read a whole table or sort through a temp B-tree"""
+    issues = []
+    for detail in details:
+        if _PLAIN_SCAN.match(detail) or detail.startswith('USE TEMP B-TREE'):
+            issues.append(detail)
+    return issues
+
+
+def advise(conn, corpus):
+    """Findings for `corpus` [(sql, parameters, source)], one per statement shape"""
+    findings = OrderedDict()
+    for sql, parameters, source in corpus:
+        shape = normalize_sql(sql)
+        if shape in findings:
+            findings[shape].sources.add(source)
+            continue
+        details = explain(conn, sql, parameters)
+        if details is None:
+            continue
+        issues = plan_issues(details)
+        if issues:
+            findings[shape] = Finding(shape, {source}, issues)
+    return list(findings.values())
+
+
+def migrated_database(path):
+    import migrations
+
+    conn = sqlite3.connect(path)
+    migrations.upgrade(conn)
+    return conn
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--db', help='database to explain against (default: a freshly migrated one)')
+    parser.add_argument('--capture', action='store_true',
+                        help='also replay statements captured from the benchmark scenarios')
+    parser.add_argument('--fail-on-scan', action='store_true', help='exit 1 if anything is reported')
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='index_advisor_')
+    if args.db:
+        conn = sqlite3.connect(args.db)
+    else:
+        conn = migrated_database(os.path.join(workdir, 'schema.sqlite'))
+
+    corpus = extract_sql()
+    if args.capture:
+        from benchmarks import datagen
+
+        bench_path = os.path.join(workdir, 'bench.sqlite')
+        datagen.generate(bench_path, users=2, transactions=50)
+        corpus += capture_sql(bench_path)
+
+    findings = advise(conn, corpus)
+    print(f'{len(corpus)} statements, {len(findings)} shapes with scans or temp B-trees\n')
+    for finding in findings:
+        print(finding.shape[:160])
+        print('    from: ' + ', '.join(sorted(finding.sources)[:5]))
+        for detail in finding.details:
+            print('    plan: ' + detail)
+        print()
+
+    return 1 if args.fail_on_scan and findings else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
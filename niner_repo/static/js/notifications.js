@@ -323,13 +323,33 @@ function updateNavbarBadge(count) {
 }
 
 /**
- * Start polling for new notifications
+ * Follow notification changes through the delta sync feed
  */
 function startPolling() {
-    // Poll every 30 seconds
-    setInterval(() => {
-        loadNotifications();
-    }, 30000);
+    if (typeof NinerSync === 'undefined') {
+        // Poll every 30 seconds
+        setInterval(() => {
+            loadNotifications();
+        }, 30000);
+        return;
+    }
+    
+    NinerSync.subscribe('notifications', delta => {
+        if (delta.reset) {
+            loadNotifications();
+            return;
+        }
+        
+        const changed = new Map(delta.upserted.map(n => [n.id, n]));
+        const removed = new Set(delta.deleted);
+        notifications = notifications
+            .filter(n => !changed.has(n.id) && !removed.has(n.id))
+            .concat([...changed.values()])
+            .sort((a, b) => new Date(b.created_at) - new Date(a.created_at));
+        
+        filterNotifications();
+        updateUnreadCount();
+    });
 }
 
 /**
@@ -8,6 +8,8 @@ const CONFIG = {
     MAX_DESCRIPTION_LENGTH: 200,
     SUGGESTION_DELAY: 200, // ms
     TOAST_DURATION: 3000, // ms
+    QUEUE_KEY: 'quickExpenseQueue', // localStorage key for expenses saved offline
+    BATCH_LIMIT: 50, // must not exceed the server's EXPENSE_BATCH_LIMIT
     CATEGORY_KEYWORDS: {
         'Food': ['food', 'lunch', 'dinner', 'breakfast', 'restaurant', 'cafe', 'coffee', 'mcdonald', 'burger', 'pizza', 'grocery', 'market'],
         'Transportation': ['uber', 'lyft', 'taxi', 'gas', 'fuel', 'parking', 'bus', 'train', 'metro', 'transport'],
@@ -42,6 +44,10 @@ document.addEventListener('DOMContentLoaded', function() {
     setupEventListeners();
     setDefaultDate();
     
+    // Send anything queued while offline, now and whenever we reconnect
+    window.addEventListener('online', flushOfflineQueue);
+    flushOfflineQueue();
+    
     // Record page load time
     const endTime = performance.now();
     performance_metrics.pageLoadTime = endTime - startTime;
@@ -362,7 +368,9 @@ async function handleFormSubmit(e) {
         amount: parseFloat(document.getElementById('amount').value),
         category: document.getElementById('category').value,
         description: document.getElementById('description').value.trim() || '',
-        date: document.getElementById('date').value
+        date: document.getElementById('date').value,
+        // Lets the server recognize a retry of this expense (offline queue)
+        client_id: newClientId()
     };
     
     // Show loading state
@@ -374,6 +382,14 @@ async function handleFormSubmit(e) {
     btnText.style.display = 'none';
     btnLoading.style.display = 'flex';
     
+    if (!navigator.onLine) {
+        queueOfflineExpense(formData);
+        submitBtn.disabled = false;
+        btnText.style.display = 'flex';
+        btnLoading.style.display = 'none';
+        return;
+    }
+    
     try {
         // Submit to API with timing
         const apiStart = performance.now();
@@ -415,8 +431,9 @@ async function handleFormSubmit(e) {
             showError(data.error || 'Failed to add expense');
         }
     } catch (error) {
+        // The request never got an answer: keep the expense and send it later
         console.error('Error submitting expense:', error);
-        showError('Network error. Please try again.');
+        queueOfflineExpense(formData);
     } finally {
         // Reset button state
         submitBtn.disabled = false;
@@ -425,16 +442,97 @@ async function handleFormSubmit(e) {
     }
 }
 
+/**
+ * Offline queue, kept in localStorage until the batch endpoint accepts it
+ */
+function readOfflineQueue() {
+    try {
+        return JSON.parse(localStorage.getItem(CONFIG.QUEUE_KEY)) || [];
+    } catch (error) {
+        return [];
+    }
+}
+
+function writeOfflineQueue(queue) {
+    if (queue.length) {
+        localStorage.setItem(CONFIG.QUEUE_KEY, JSON.stringify(queue));
+    } else {
+        localStorage.removeItem(CONFIG.QUEUE_KEY);
+    }
+}
+
+function newClientId() {
+    return `${Date.now()}-${Math.random().toString(36).slice(2, 8)}`;
+}
+
+function queueOfflineExpense(expense) {
+    const queue = readOfflineQueue();
+    // Keep the client_id of a send that may have reached the server
+    queue.push({ ...expense, client_id: expense.client_id || newClientId() });
+    writeOfflineQueue(queue);
+    
+    showSuccessToast(expense, 'saved offline, will sync when you reconnect');
+    clearForm();
+}
+
+let flushingQueue = false;
+
+/**
+ * Send queued expenses in one POST /api/expenses/batch per BATCH_LIMIT items
+ */
+async function flushOfflineQueue() {
+    if (flushingQueue || !navigator.onLine) return;
+    flushingQueue = true;
+    
+    let created = 0;
+    try {
+        let queue = readOfflineQueue();
+        while (queue.length) {
+            const batch = queue.slice(0, CONFIG.BATCH_LIMIT);
+            const response = await fetch('/api/expenses/batch', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json'
+                },
+                body: JSON.stringify({ expenses: batch })
+            });
+            if (!response.ok) break; // try again on the next reconnect
+            
+            const data = await response.json();
+            data.results.forEach((result, i) => {
+                if (!result.success) {
+                    console.error('Dropped queued expense', batch[i], result.errors);
+                }
+            });
+            created += data.created;
+            
+            // Every item got a final answer, so none of them stay queued
+            const sent = new Set(batch.map(item => item.client_id));
+            queue = readOfflineQueue().filter(item => !sent.has(item.client_id));
+            writeOfflineQueue(queue);
+        }
+    } catch (error) {
+        console.error('Error syncing offline expenses:', error);
+    } finally {
+        flushingQueue = false;
+    }
+    
+    if (created) {
+        loadRecentExpenses();
+        triggerBudgetUpdate();
+    }
+}
+
 /**
  * Show success toast notification
  */
-function showSuccessToast(expense) {
+function showSuccessToast(expense, note) {
     const toast = document.getElementById('successToast');
     const messageEl = toast.querySelector('.toast-message');
     
     if (!toast || !messageEl) return;
     
-    messageEl.textContent = `$${expense.amount.toFixed(2)} added to ${expense.category}`;
+    messageEl.textContent = `$${expense.amount.toFixed(2)} added to ${expense.category}` + (note ? ` (${note})` : '');
     toast.classList.add('show');
     
     setTimeout(() => {
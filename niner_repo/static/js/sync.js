@@ -0,0 +1,75 @@
+/**
+ * Delta Sync JavaScript
+ * Polls /api/sync for changes since the last cursor and hands them to the
+ * scripts that subscribed to an entity, instead of each script refetching its
+ * whole list on a timer.
+ *
+ *   NinerSync.subscribe('notifications', function(delta) {
+ *       // delta.reset: reload everything; otherwise apply
+ *       // delta.upserted (rows) and delta.deleted (ids)
+ *   });
+ */
+
+const NinerSync = (function() {
+    const POLL_INTERVAL = 30000; // ms
+    const handlers = {};
+    let cursor = null;
+    let timer = null;
+    let polling = false;
+
+    function dispatch(entity, delta) {
+        (handlers[entity] || []).forEach(handler => {
+            try {
+                handler(delta);
+            } catch (error) {
+                console.error(`Sync handler for ${entity} failed:`, error);
+            }
+        });
+    }
+
+    async function poll() {
+        if (polling) return;
+        polling = true;
+        try {
+            let more = true;
+            while (more) {
+                const query = cursor === null ? '' : `?since=${cursor}`;
+                const response = await fetch(`/api/sync${query}`, {
+                    headers: {'Accept': 'application/json'}
+                });
+                if (!response.ok) return;
+                const data = await response.json();
+
+                // The first answer only sets the cursor: the page has just loaded its data
+                if (data.reset && cursor !== null) {
+                    Object.keys(handlers).forEach(entity => dispatch(entity, {reset: true}));
+                }
+                Object.entries(data.changes || {}).forEach(([entity, delta]) => {
+                    dispatch(entity, {reset: false, upserted: delta.upserted, deleted: delta.deleted});
+                });
+
+                cursor = data.cursor;
+                more = data.more;
+            }
+        } catch (error) {
+            console.error('Error syncing changes:', error);
+        } finally {
+            polling = false;
+        }
+    }
+
+    function start() {
+        if (timer === null) {
+            poll();
+            timer = setInterval(poll, POLL_INTERVAL);
+        }
+    }
+
+    return {
+        subscribe(entity, handler) {
+            (handlers[entity] = handlers[entity] || []).push(handler);
+            start();
+        },
+        poll: poll
+    };
+})();
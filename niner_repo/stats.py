@@ -0,0 +1,83 @@
+"""
+Financial Stats Module
+One place to compute a user's income, expenses and savings over a window,
+shared by the finance summary, the budget page and priority suggestions.
+
+A window is a name from WINDOWS ('all', 'month', 'week') or an explicit
+(start, end) pair of dates, either end open (None). The figures come from one
+query:
+    income        active income records (v_active_income)
+    expenses      active expense transactions (every expense path writes one,
+                  quick expenses only that)
+    net           income - expenses
+    saved         transactions filed under SAVINGS_CATEGORIES
+    savings_rate  net as a percentage of income (0 without income)
+
+Snapshots are memoized for the rest of the request and in the view cache
+under the user's 'ledger' tag, so any write that invalidates the ledger
+rebuilds them.
+"""
+
+from cache import cached_view_model, request_memoized
+from dates import format_date, month_window, week_window
+from db import get_db
+from money import ZERO
+
+SAVINGS_CATEGORIES = ('Savings', 'Investment')
+
+WINDOWS = {
+    'all': lambda: (None, None),
+    'month': month_window,
+    'week': week_window,
+}
+
+STATS_SQL = '''
+    SELECT
+        (SELECT COALESCE(SUM(amount_cents), 0) FROM v_active_income
+         WHERE user_id = :user_id AND date >= :start AND date <= :end) AS "income [money]",
+        (SELECT COALESCE(SUM(amount_cents), 0) FROM transactions
+         WHERE user_id = :user_id AND is_active = 1 AND transaction_type = 'expense'
+           AND date >= :start AND date <= :end) AS "expenses [money]",
+        (SELECT COALESCE(SUM(amount_cents), 0) FROM transactions
+         WHERE user_id = :user_id AND is_active = 1 AND category IN ({categories})
+           AND date >= :start AND date <= :end) AS "saved [money]"
+'''.format(categories=', '.join(f"'{category}'" for category in SAVINGS_CATEGORIES))
+
+# Bounds standing in for an open end of a window
+EARLIEST = '0000-01-01'
+LATEST = '9999-12-31'
+
+
+def resolve_window(window):
+    """(start, end) ISO date strings, None for an open end"""
+    bounds = WINDOWS[window]() if isinstance(window, str) else window
+    return tuple(format_date(bound) if bound else None for bound in bounds)
+
+
+def build_stats(user_id, start, end):
+    """Compute a stats snapshot from the database (uncached)"""
+    row = get_db().execute(STATS_SQL, {
+        'user_id': user_id, 'start': start or EARLIEST, 'end': end or LATEST
+    }).fetchone()
+    income, expenses = row['income'], row['expenses']
+    net = income - expenses
+    return {
+        'income': income,
+        'expenses': expenses,
+        'net': net,
+        'saved': row['saved'],
+        'savings_rate': net / income * 100 if income > ZERO else 0.0,
+        'start': start,
+        'end': end,
+    }
+
+
+def get_stats(user_id, window='all'):
+    """The user's stats snapshot for `window`"""
+    return cached_stats(user_id, *resolve_window(window))
+
+
+@request_memoized('ledger')
+def cached_stats(user_id, start, end):
+    return cached_view_model('financial_stats', user_id, ('ledger',),
+                             lambda: build_stats(user_id, start, end), start, end)
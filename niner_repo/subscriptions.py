@@ -1,11 +1,16 @@
 from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for, g
 from db import get_db
 from auth import login_required
+from cache import invalidates
+from dates import days_until, parse_date
 from datetime import datetime, timedelta
 import re
+import logging
 
 bp = Blueprint('subscriptions', __name__, url_prefix='/subscriptions')
 
+logger = logging.getLogger(__name__)
+
 @bp.route('/')
 @login_required
 def index():
@@ -14,7 +19,7 @@ def index():
     
     # Get all active subscriptions
     subscriptions = db.execute(
-        '''SELECT s.*, sc.icon, sc.color
+        '''SELECT s.*, sc.icon, sc.color, s.next_billing_date AS "billing_day [date]"
            FROM subscriptions s
            LEFT JOIN subscription_categories sc ON s.category = sc.name
            WHERE s.user_id = ? AND s.is_active = 1
@@ -31,7 +36,7 @@ def index():
     total_monthly = calculate_total_monthly_cost(subscriptions)
     
     # Upcoming bills (next 30 days)
-    upcoming = [s for s in subscriptions if is_upcoming(s['next_billing_date'], 30)]
+    upcoming = [s for s in subscriptions if is_upcoming(s['billing_day'], 30)]
     
     return render_template(
         'subscriptions/index.html',
@@ -43,6 +48,7 @@ def index():
 
 @bp.route('/add', methods=['POST'])
 @login_required
+@invalidates('ledger')
 def add():
     """Manually add a subscription"""
     name = request.form.get('name')
@@ -128,7 +134,7 @@ def add():
             pass  # expenses table might not exist or have different schema
         
     except Exception as e:
-        print(f"Error creating transaction for subscription: {e}")
+        logger.exception('Error creating transaction for subscription')
     
     db.commit()
     
@@ -298,12 +304,10 @@ def calculate_total_monthly_cost(subscriptions):
     return round(total, 2)
 
 def is_upcoming(next_billing_date, days=30):
-    """Check if billing date is within next N days"""
+    """Check if billing date (a date, or ISO text) is within next N days"""
     try:
-        billing_date = datetime.fromisoformat(next_billing_date)
-        days_until = (billing_date - datetime.now()).days
-        return 0 <= days_until <= days
-    except:
+        return 0 <= days_until(next_billing_date) <= days
+    except (TypeError, ValueError):
         return False
 
 def find_recurring_patterns(user_id):
@@ -335,6 +339,10 @@ def find_recurring_patterns(user_id):
     
     transactions = db.execute(query, (user_id, six_months_ago)).fetchall()
     
+    return detect_recurring_patterns(transactions)
+
+def detect_recurring_patterns(transactions):
+    """Find recurring payments in expense rows (id, description, amount, date, category)"""
     patterns = []
     
     # Group by similar description and amount
@@ -353,8 +361,8 @@ def find_recurring_patterns(user_id):
     for key, txns in grouped.items():
         if len(txns) >= 3:
             # Calculate frequency
-            dates = [datetime.fromisoformat(t['date']) for t in txns]
-            dates.sort()
+            # Rows from the DB already hold dates; parse_date passes them through
+            dates = sorted(parse_date(t['date']) for t in txns)
             
             # Check if dates are evenly spaced
             intervals = [(dates[i+1] - dates[i]).days for i in range(len(dates)-1)]
@@ -384,18 +392,21 @@ def find_recurring_patterns(user_id):
                     'amount': txns[0]['amount'],
                     'category': txns[0].get('category', 'Other'),
                     'frequency': frequency,
-                    'next_date': next_date.date().isoformat(),
-                    'start_date': dates[0].date().isoformat(),
+                    'next_date': next_date.isoformat(),
+                    'start_date': dates[0].isoformat(),
                     'transaction_id': txns[-1]['id']
                 })
     
     return patterns
 
+_DIGITS = re.compile(r'\d+')
+_NON_LETTERS = re.compile(r'[^a-zA-Z\s]')
+
 def normalize_description(description):
     """Normalize transaction description for pattern matching"""
     # Remove dates, numbers, special chars
-    normalized = re.sub(r'\d+', '', description)
-    normalized = re.sub(r'[^a-zA-Z\s]', '', normalized)
+    normalized = _DIGITS.sub('', description)
+    normalized = _NON_LETTERS.sub('', normalized)
     normalized = normalized.strip().lower()
     return normalized
 
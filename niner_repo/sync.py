@@ -0,0 +1,187 @@
+"""
+Delta Sync
+An append-only change log that lets clients update incrementally instead of
+refetching whole lists.
+
+Triggers on the SYNCED_TABLES append a row to `changes` for every insert,
+update and delete: (seq, user_id, entity, entity_id, op), where entity is the
+table name and seq a global, increasing cursor. Updates that only touch
+derived columns (see data_versions.DERIVED_COLUMNS) are not logged.
+
+GET /api/sync?since=<seq> returns the user's changes after `since`, collapsed
+per record: the current row for anything inserted or updated, the id for
+anything deleted, and the cursor to pass next time. Without `since`, or when
+the log no longer reaches back that far (see `flask prune-changes`), the
+response has "reset": true and the client should reload in full, then sync
+from the returned cursor.
+"""
+
+import click
+from flask import Blueprint, current_app, g, jsonify, request
+
+from auth import login_required
+from data_versions import DERIVED_COLUMNS
+from db import add_bootstrap_step, get_db
+from notifications import NotificationEngine
+from rows import fetch_records
+
+bp = Blueprint('sync', __name__, url_prefix='/api/sync')
+
+# Tables (with id and user_id columns) whose changes clients can follow
+SYNCED_TABLES = [
+    'transactions',
+    'income',
+    'financial_goals',
+    'subscriptions',
+    'positions',
+    'notifications',
+]
+
+# Per-table row serializers shared with the table's list endpoint, so synced
+# rows merge into what the client already holds (dates are written by the
+# app's JSON provider)
+ROW_SERIALIZERS = {
+    'notifications': NotificationEngine.client_row,
+}
+
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_RETENTION_DAYS = 30
+
+CHANGES_TABLE_SQL = '''
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    entity TEXT NOT NULL,
+    entity_id INTEGER NOT NULL,
+    op TEXT NOT NULL CHECK (op IN ('insert', 'update', 'delete')),
+    changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_changes_user_seq ON changes(user_id, seq);
+'''
+
+TRIGGER_SQL = '''
+CREATE TRIGGER log_change_{table}_{event}
+AFTER {timing} ON {table}
+BEGIN
+    INSERT INTO changes (user_id, entity, entity_id, op)
+    VALUES ({row}.user_id, '{table}', {row}.id, '{op}');
+END
+'''
+
+
+def install(db):
+    """Create the changes table and triggers for every synced table present"""
+    db.executescript(CHANGES_TABLE_SQL)
+    existing = {row[0] for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    for table in SYNCED_TABLES:
+        if table not in existing:
+            continue
+        columns = [row[1] for row in db.execute(f'PRAGMA table_info({table})') if row[1] not in DERIVED_COLUMNS]
+        for event, row in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')):
+            timing = 'UPDATE OF ' + ', '.join(columns) if event == 'UPDATE' else event
+            # Recreated each time so the column list follows schema changes
+            db.execute(f'DROP TRIGGER IF EXISTS log_change_{table}_{event}')
+            db.execute(TRIGGER_SQL.format(table=table, event=event, timing=timing, row=row, op=event.lower()))
+    db.commit()
+
+
+def prune(db, days):
+    """Drop log entries older than `days`; clients behind them get a reset"""
+    cursor = db.execute(
+        "DELETE FROM changes WHERE changed_at < datetime('now', ?)", (f'-{int(days)} days',)
+    )
+    db.commit()
+    return cursor.rowcount
+
+
+def load_rows(db, table, user_id, ids):
+    rows = fetch_records(db.execute(
+        f'SELECT * FROM {table} WHERE user_id = ? AND id IN ({", ".join("?" * len(ids))})',
+        (user_id, *ids)
+    ))
+    serialize = ROW_SERIALIZERS.get(table, lambda row: row)
+    return {row['id']: serialize(row) for row in rows}
+
+
+def changes_since(user_id, since, limit):
+    """(changes by entity, next cursor, more) for the user's log entries after `since`"""
+    db = get_db()
+    entries = db.execute(
+        '''SELECT seq, entity, entity_id, op FROM changes
+           WHERE user_id = ? AND seq > ?
+           ORDER BY seq
+           LIMIT ?''',
+        (user_id, since, limit + 1)
+    ).fetchall()
+    more = len(entries) > limit
+    entries = entries[:limit]
+
+    # Last operation per record wins
+    latest = {}
+    for entry in entries:
+        latest[(entry['entity'], entry['entity_id'])] = entry['op']
+
+    changes = {}
+    for entity in SYNCED_TABLES:
+        touched = [entity_id for (name, entity_id), op in latest.items() if name == entity and op != 'delete']
+        deleted = [entity_id for (name, entity_id), op in latest.items() if name == entity and op == 'delete']
+        if not touched and not deleted:
+            continue
+        rows = load_rows(db, entity, user_id, touched) if touched else {}
+        # A record changed and then removed after our page ends is reported as deleted
+        deleted += [entity_id for entity_id in touched if entity_id not in rows]
+        changes[entity] = {'upserted': list(rows.values()), 'deleted': sorted(deleted)}
+
+    cursor = entries[-1]['seq'] if entries else since
+    return changes, cursor, more
+
+
+def latest_seq(user_id):
+    row = get_db().execute('SELECT MAX(seq) FROM changes WHERE user_id = ?', (user_id,)).fetchone()
+    return row[0] or 0
+
+
+def log_reaches(since):
+    """True if no entry after `since` has been pruned"""
+    oldest = get_db().execute('SELECT MIN(seq) FROM changes').fetchone()[0]
+    return oldest is None or since >= oldest - 1
+
+
+@bp.route('', methods=['GET'])
+@login_required
+def get_changes():
+    """
+    Changes since a cursor
+    GET /api/sync?since=<seq>
+    """
+    since = request.args.get('since', type=int)
+    user_id = g.user['id']
+
+    if since is None or since < 0 or not log_reaches(since):
+        return jsonify({'reset': True, 'cursor': latest_seq(user_id), 'more': False, 'changes': {}})
+
+    limit = current_app.config.get('SYNC_PAGE_SIZE', DEFAULT_PAGE_SIZE)
+    changes, cursor, more = changes_since(user_id, since, limit)
+    return jsonify({'reset': False, 'cursor': cursor, 'more': more, 'changes': changes})
+
+
+@click.command('init-sync')
+def init_sync_command():
+    """Create the changes table and its triggers."""
+    install(get_db())
+    click.echo('Installed change log triggers.')
+
+
+@click.command('prune-changes')
+@click.option('--days', default=DEFAULT_RETENTION_DAYS, show_default=True, help='Keep this many days of changes.')
+def prune_changes_command(days):
+    """Delete change log entries older than --days."""
+    removed = prune(get_db(), days)
+    click.echo(f'Pruned {removed} change log entries.')
+
+
+def init_app(app):
+    """Install the change log triggers on first use and register the CLI commands"""
+    add_bootstrap_step(app, install)
+    app.cli.add_command(init_sync_command)
+    app.cli.add_command(prune_changes_command)
@@ -9,9 +9,29 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
 from niner_repo import create_app
+from flask import Flask
+import db as db_module
 from db import get_db, init_db
 from werkzeug.security import generate_password_hash
 
+def pytest_addoption(parser):
+    parser.addoption('--benchmark-large', action='store_true',
+                     help='Also run the 100k-row microbenchmarks (tests marked large_input).')
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'large_input: slow microbenchmark size, run with --benchmark-large')
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--benchmark-large'):
+        return
+    skip = pytest.mark.skip(reason='100k-row benchmark; run with --benchmark-large')
+    for item in items:
+        if 'large_input' in item.keywords:
+            item.add_marker(skip)
+
+
 @pytest.fixture
 def app():
     """Create and configure a test app instance."""
@@ -21,24 +41,56 @@ def app():
         'TESTING': True,
         'DATABASE': db_path,
         'SECRET_KEY': 'test-secret-key',
-        'WTF_CSRF_ENABLED': False
+        'WTF_CSRF_ENABLED': False,
+        'SLOW_QUERY_LOG': db_path + '.slow.log',
+        'METRICS_DB': db_path + '.metrics',
+        'RATE_LIMIT_DB': db_path + '.ratelimit'
     })
     
     with app.app_context():
         init_db()
-        # Register additional blueprints used by tests (investments, portfolio)
-        try:
-            from niner_repo import investments, portfolio
-            app.register_blueprint(investments.bp)
-            app.register_blueprint(portfolio.bp)
-        except Exception:
-            # If those modules aren't available or require extra DB schema, tests will manage schema themselves
-            pass
         
     yield app
     
+    db_module.reset_bootstrap()
+    os.close(db_fd)
+    os.unlink(db_path)
+    for suffix in ('.slow.log', '.metrics', '.ratelimit', '.ratelimit-wal', '.ratelimit-shm'):
+        if os.path.exists(db_path + suffix):
+            os.unlink(db_path + suffix)
+
+@pytest.fixture
+def schema_app():
+    """Bare app (no blueprints) whose test DB is migrated to the current schema.
+
+    Useful for exercising module-level helpers against the full schema
+    without going through the blueprint registration in create_app.
+    """
+    db_fd, db_path = tempfile.mkstemp()
+    
+    app = Flask(__name__)
+    app.config.update(
+        TESTING=True,
+        DATABASE=db_path,
+        SECRET_KEY='test-secret-key',
+        SLOW_QUERY_LOG=db_path + '.slow.log'
+    )
+    db_module.init_app(app)
+    
+    with app.app_context():
+        init_db()
+    
+    yield app
+    
+    # Temp paths can be reused, so drop anything cached against this one
+    from notifications import NotificationEngine
+    NotificationEngine.clear_settings_cache()
+    db_module.reset_bootstrap()
+    
     os.close(db_fd)
     os.unlink(db_path)
+    if os.path.exists(db_path + '.slow.log'):
+        os.unlink(db_path + '.slow.log')
 
 @pytest.fixture
 def client(app):
@@ -65,7 +117,7 @@ def auth(client):
             with self._client.application.app_context():
                 db = get_db()
                 pw_hash = generate_password_hash(password)
-                db.execute('INSERT INTO user (username, email, password) VALUES (?,?,?)', (username, email, pw_hash))
+                db.execute('INSERT INTO users (username, email, password) VALUES (?,?,?)', (username, email, pw_hash))
                 db.commit()
             return None
             
@@ -0,0 +1,72 @@
+"""Tests for the application factory, blueprint manifest and schema bootstrap."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+from flask import Flask
+
+from app import BLUEPRINTS, BlueprintSpec, register_blueprints
+from db import add_bootstrap_step, get_db
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(REPO_DIR, 'scripts'))
+
+from check_import_time import parse_importtime  # noqa: E402
+
+
+def test_importing_app_does_not_import_blueprints():
+    code = ("import sys, app; "
+            "print(','.join(m for m in ('auth', 'budget', 'portfolio', 'investments', 'gamification') if m in sys.modules))")
+    result = subprocess.run([sys.executable, '-c', code], cwd=REPO_DIR, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ''
+
+
+def test_create_app_registers_the_manifest(app):
+    for spec in BLUEPRINTS:
+        module = __import__(spec.module)
+        assert getattr(module, spec.attr).name in app.blueprints
+    assert app.url_map.bind('localhost').match('/dashboard')[0] == 'dashboard'
+
+
+def test_optional_blueprints_may_be_missing():
+    app = Flask(__name__)
+    register_blueprints(app, [BlueprintSpec('no_such_blueprint_module', optional=True)])
+    with pytest.raises(ImportError):
+        register_blueprints(app, [BlueprintSpec('no_such_blueprint_module')])
+
+
+def test_bootstrap_steps_run_once_per_database(schema_app):
+    import gamification
+
+    calls = []
+    add_bootstrap_step(schema_app, lambda db: calls.append(db))
+    add_bootstrap_step(schema_app, gamification.remove_milestone_duplicates)
+    schema_app.add_url_rule('/ping', 'ping', lambda: 'pong')
+
+    with schema_app.app_context():
+        before = get_db().execute('SELECT COUNT(*) FROM milestones').fetchone()[0]
+
+    client = schema_app.test_client()
+    client.get('/ping')
+    client.get('/ping')
+    assert len(calls) == 1
+
+    with schema_app.app_context():
+        assert get_db().execute('SELECT COUNT(*) FROM milestones').fetchone()[0] == before
+
+
+def test_parse_importtime():
+    stderr = '\n'.join([
+        'import time: self [us] | cumulative | imported package',
+        'import time:       120 |        120 |     _weakref',
+        'import time:       300 |        420 |   flask',
+        'import time:      1000 |       1420 | app',
+    ])
+    assert parse_importtime(stderr) == [
+        ('_weakref', 120, 120, 2),
+        ('flask', 300, 420, 1),
+        ('app', 1000, 1420, 0),
+    ]
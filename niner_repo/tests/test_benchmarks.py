@@ -0,0 +1,45 @@
+"""Tests for the benchmark data generator and result handling."""
+
+import sqlite3
+from datetime import date
+
+from benchmarks import datagen, runner
+
+
+def table_rows(path, table, columns='*'):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(f'SELECT {columns} FROM {table} ORDER BY id').fetchall()
+    finally:
+        conn.close()
+
+
+def test_generate_is_deterministic(tmp_path):
+    today = date(2025, 3, 12)
+    first, second = str(tmp_path / 'a.sqlite'), str(tmp_path / 'b.sqlite')
+
+    summary = datagen.generate(first, users=2, transactions=20, seed=7, today=today)
+    datagen.generate(second, users=2, transactions=20, seed=7, today=today)
+
+    assert summary['transactions'] == 40
+    columns = 'user_id, transaction_type, category, amount, amount_cents, description, date'  # not created_at
+    assert table_rows(first, 'transactions', columns) == table_rows(second, 'transactions', columns)
+    assert len(table_rows(first, 'budgets')) == 2
+
+
+def test_parse_server_timing():
+    header = 'app;dur=3.1, db;dur=1.25;desc="7 queries, 40 rows"'
+    assert runner.parse_server_timing(header) == (1.25, 7)
+    assert runner.parse_server_timing(None) == (None, None)
+
+
+def test_percentiles_and_compare():
+    result = runner.summarize([float(ms) for ms in range(1, 101)], [5, 7], [1.0, 3.0], 0, 1.0)
+    assert (result['p50_ms'], result['p95_ms'], result['p99_ms']) == (50.0, 95.0, 99.0)
+    assert result['queries_per_request'] == 6
+
+    baseline = {'scenarios': {'dashboard': dict(result)}}
+    slower = {'scenarios': {'dashboard': dict(result, p95_ms=120.0)}}
+    rows, regressed = runner.compare(baseline, slower)
+    assert regressed
+    assert [row[1] for row in rows if row[5]] == ['p95_ms']
@@ -111,4 +111,18 @@ class TestBudget:
         
         response = logged_in_user.get('/budget')
         assert response.status_code == 200
-        # Should show spending vs budget
\ No newline at end of file
+        # Should show spending vs budget
+
+    def test_budget_suggestions_sum_cents(self, logged_in_user, app):
+        """Test that suggestions average exact weekly totals plus a 10% buffer."""
+        with app.app_context():
+            db = get_db()
+            for amount in ('0.10', '0.20'):
+                db.execute(
+                    "INSERT INTO transactions (user_id, transaction_type, category, amount, description, date)"
+                    " VALUES (1, 'expense', 'Food', ?, 'Snack', CURRENT_DATE)", (float(amount),)
+                )
+            db.commit()
+
+        data = logged_in_user.get('/budget/api/suggestions').get_json()
+        assert data == {'Food': 0.33, 'total': 0.33}
@@ -0,0 +1,116 @@
+"""Tests for the tag-versioned view cache."""
+
+import os
+
+from flask import g
+
+from cache import (
+    Cache, LRUBackend, SQLiteBackend, cached_view_model, forgets, invalidate_user, invalidates,
+    request_memoized, user_tags,
+)
+
+
+class Builder:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {'build': self.calls}
+
+
+def test_lru_backend_reuses_until_a_tag_is_invalidated():
+    cache = Cache(LRUBackend(max_entries=2))
+    build = Builder()
+    tags = user_tags(42, 'ledger', 'budget')
+
+    assert cache.get_or_build('summary', 'k1', tags, build) == {'build': 1}
+    assert cache.get_or_build('summary', 'k1', tags, build) == {'build': 1}
+
+    cache.invalidate(user_tags(42, 'goals'))
+    assert cache.get_or_build('summary', 'k1', tags, build) == {'build': 1}
+
+    cache.invalidate(user_tags(42, 'ledger'))
+    assert cache.get_or_build('summary', 'k1', tags, build) == {'build': 2}
+
+    # Oldest key is evicted once the LRU is full
+    cache.get_or_build('summary', 'k2', tags, Builder())
+    cache.get_or_build('summary', 'k3', tags, Builder())
+    assert cache.backend.get('k1') is None
+    assert cache.backend.get('k3') is not None
+
+
+def test_sqlite_backend_shares_entries_and_invalidations(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    worker_a = Cache(SQLiteBackend(path))
+    worker_b = Cache(SQLiteBackend(path))
+    build = Builder()
+    tags = user_tags(7, 'goals')
+
+    worker_a.get_or_build('goals', 'goals|7', tags, build)
+    assert worker_b.get_or_build('goals', 'goals|7', tags, build) == {'build': 1}
+
+    worker_b.invalidate(tags)
+    assert worker_a.get_or_build('goals', 'goals|7', tags, build) == {'build': 2}
+
+
+def test_write_routes_invalidate_the_users_pages(schema_app):
+    build = Builder()
+
+    @schema_app.before_request
+    def fake_login():
+        g.user = {'id': 1}
+
+    @schema_app.route('/page')
+    def page():
+        return cached_view_model('page', g.user['id'], ('ledger',), build)
+
+    @schema_app.route('/write', methods=['GET', 'POST'])
+    @invalidates('ledger')
+    def write():
+        return 'ok'
+
+    client = schema_app.test_client()
+    assert client.get('/page').json == {'build': 1}
+    client.get('/write')
+    assert client.get('/page').json == {'build': 1}
+    client.post('/write')
+    assert client.get('/page').json == {'build': 2}
+
+
+def test_cache_can_be_disabled(schema_app):
+    schema_app.config['CACHE_BACKEND'] = 'none'
+    build = Builder()
+    with schema_app.test_request_context():
+        cached_view_model('page', 1, ('ledger',), build)
+        cached_view_model('page', 1, ('ledger',), build)
+    assert build.calls == 2
+    assert not os.path.exists(os.path.join(schema_app.instance_path, 'cache.sqlite'))
+
+
+def test_request_memo_lasts_until_a_write_in_the_request(schema_app):
+    calls = []
+
+    @request_memoized('game')
+    def progress(user_id):
+        calls.append(user_id)
+        return {'calls': len(calls)}
+
+    @forgets('game')
+    def award(user_id):
+        pass
+
+    with schema_app.test_request_context():
+        assert progress(1) == progress(1) == {'calls': 1}
+        progress(2)
+        award(1)
+        assert progress(1) == {'calls': 3}
+        assert progress(2) == {'calls': 2}
+
+        invalidate_user(2, 'ledger')
+        progress(2)
+        invalidate_user(2, 'game')
+        assert progress(2) == {'calls': 4}
+
+    with schema_app.test_request_context():
+        assert progress(1) == {'calls': 5}
@@ -0,0 +1,112 @@
+"""Tests for per-user data versions and ETag revalidation."""
+
+import pytest
+
+import auth
+import data_versions
+import income
+from db import get_db
+
+
+@pytest.fixture
+def versioned_app(schema_app):
+    data_versions.init_app(schema_app)
+    schema_app.register_blueprint(auth.bp)
+    schema_app.register_blueprint(income.bp)
+
+    with schema_app.app_context():
+        db = get_db()
+        data_versions.install(db)
+        db.execute("INSERT INTO users (id, username, email, password) VALUES (7, 'sam', 's@uncc.edu', 'x')")
+        db.commit()
+    return schema_app
+
+
+@pytest.fixture
+def client(versioned_app):
+    client = versioned_app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = 7
+    return client
+
+
+def add_income(app, amount):
+    with app.app_context():
+        db = get_db()
+        db.execute(
+            '''INSERT INTO income (user_id, category_id, amount, source, date, created_by)
+               VALUES (7, 1, ?, 'Job', '2025-01-01', 7)''',
+            (amount,)
+        )
+        db.commit()
+
+
+def test_writes_bump_version(versioned_app):
+    # Creating the account already wrote its default notification settings
+    with versioned_app.app_context():
+        start = data_versions.get_data_version(7)[0]
+
+    add_income(versioned_app, 100)
+    with versioned_app.app_context():
+        db = get_db()
+        assert data_versions.get_data_version(7)[0] == start + 1
+        db.execute("UPDATE income SET amount = 120 WHERE user_id = 7")
+        db.commit()
+        assert data_versions.get_data_version(7)[0] == start + 2
+        db.execute("DELETE FROM income WHERE user_id = 7")
+        db.commit()
+        assert data_versions.get_data_version(7)[0] == start + 3
+        # Other users are untouched
+        assert data_versions.get_data_version(8)[0] == 0
+
+
+def test_if_none_match_returns_304_without_running_view(versioned_app, client):
+    add_income(versioned_app, 100)
+
+    first = client.get('/income/api')
+    assert first.status_code == 200
+    assert first.get_json()['total'] == 1
+    etag = first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+
+    second = client.get('/income/api', headers={'If-None-Match': etag})
+    assert second.status_code == 304
+    assert second.headers['ETag'] == etag
+    assert second.data == b''
+    # Only the version lookup ran; the user came from the session identity
+    assert '1 queries' in second.headers['Server-Timing']
+
+    add_income(versioned_app, 50)
+    third = client.get('/income/api', headers={'If-None-Match': etag})
+    assert third.status_code == 200
+    assert third.get_json()['total'] == 2
+    assert third.headers['ETag'] != etag
+
+
+def test_etag_depends_on_query_string(client):
+    plain = client.get('/income/api').headers['ETag']
+    assert client.get('/income/api?page=2').headers['ETag'] != plain
+
+
+def test_budget_tables_and_shared_categories_bump_version(versioned_app):
+    with versioned_app.app_context():
+        db = get_db()
+        start = data_versions.get_data_version(7)[0]
+        category_id = db.execute(
+            """INSERT INTO budget_categories (user_id, name, allocation_percentage, created_by)
+               VALUES (7, 'Rent', 40, 7)"""
+        ).lastrowid
+        db.execute(
+            """INSERT INTO budget_allocations (user_id, category_id, allocated_amount, month_year, created_by)
+               VALUES (7, ?, 800, '2025-01-01', 7)""",
+            (category_id,)
+        )
+        db.execute('UPDATE budget_allocations SET allocated_amount = 900 WHERE user_id = 7')
+        db.commit()
+        assert data_versions.get_data_version(7)[0] == start + 3
+
+        # Category names are shared, so renaming one changes every user's version
+        db.execute("UPDATE income_category SET name = 'Salary' WHERE id = 1")
+        db.commit()
+        assert data_versions.get_data_version(7)[0] == start + 4
+        assert data_versions.get_data_version(8)[0] == 1
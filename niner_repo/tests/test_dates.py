@@ -0,0 +1,88 @@
+"""Tests for the date boundary: adapters, converters, windows and normalization."""
+
+import sqlite3
+from datetime import date, datetime
+
+from dates import day_number, days_until, month_window, parse_date, week_window
+from db import get_db
+from migrations import upgrade
+from notifications import NotificationEngine
+from subscriptions import is_upcoming
+
+
+def test_windows():
+    assert week_window(date(2024, 5, 1)) == (date(2024, 4, 29), date(2024, 5, 5))
+    assert week_window('2024-05-05T23:00:00') == (date(2024, 4, 29), date(2024, 5, 5))
+    assert month_window(date(2024, 2, 10)) == (date(2024, 2, 1), date(2024, 2, 29))
+    assert month_window(date(2024, 12, 31)) == (date(2024, 12, 1), date(2024, 12, 31))
+
+
+def test_day_numbers():
+    assert day_number('2024-03-01') - day_number(date(2024, 2, 28)) == 2
+    assert days_until('2024-05-10', today=date(2024, 5, 1)) == 9
+    assert parse_date(datetime(2024, 5, 1, 10, 30)) == date(2024, 5, 1)
+    assert is_upcoming(date.today())
+    assert not is_upcoming(None)
+
+
+def test_adapters_and_converters_round_trip(schema_app):
+    with schema_app.app_context():
+        db = get_db()
+        db.execute(
+            "INSERT INTO transactions (user_id, transaction_type, amount, description, date, created_at)"
+            " VALUES (1, 'expense', 5, 'x', ?, ?)",
+            (date(2024, 5, 1), datetime(2024, 5, 1, 9, 30, 15, 123456))
+        )
+        raw = db.execute('SELECT CAST(date AS TEXT), CAST(created_at AS TEXT) FROM transactions').fetchone()
+        row = db.execute('SELECT date, created_at FROM transactions').fetchone()
+        aliased = db.execute('SELECT \'2024-05-01\' AS "d [date]"').fetchone()
+
+    assert tuple(raw) == ('2024-05-01', '2024-05-01 09:30:15')
+    assert row['date'] == date(2024, 5, 1)
+    assert row['created_at'] == datetime(2024, 5, 1, 9, 30, 15)
+    assert aliased['d'] == date(2024, 5, 1)
+
+
+def test_read_notifications_can_be_listed(schema_app):
+    with schema_app.app_context():
+        db = get_db()
+        db.execute(
+            "INSERT INTO notifications (user_id, type, title, message, severity)"
+            " VALUES (1, 'daily_digest', 't', 'm', 'info')"
+        )
+        NotificationEngine.mark_all_as_read(1)
+        row = db.execute('SELECT read_at FROM notifications').fetchone()
+
+    assert isinstance(row['read_at'], datetime)
+
+
+def test_migration_normalizes_stored_dates(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'dates.sqlite'))
+    upgrade(conn, target=4)
+    conn.execute(
+        "INSERT INTO income_category (name, created_by) VALUES ('Job', 1)"
+    )
+    conn.execute(
+        "INSERT INTO income (user_id, category_id, amount, amount_cents, source, date, created_by, created_at, updated_at)"
+        " VALUES (1, 1, 10, 1000, 's', '2024-05-01T08:00:00', 1, '2024-05-01T08:00:00.5', '2024-05-02 00:00:00')"
+    )
+    conn.execute(
+        "INSERT INTO financial_goals (user_id, goal_name, target_amount, target_date) VALUES (1, 'g', 5, 'soon')"
+    )
+    conn.commit()
+
+    upgrade(conn)
+
+    income = conn.execute('SELECT date, created_at, updated_at FROM income').fetchone()
+    assert income == ('2024-05-01', '2024-05-01 08:00:00', '2024-05-02 00:00:00')
+    assert conn.execute('SELECT target_date FROM financial_goals').fetchone() == ('soon',)
+    triggers = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+    assert 'income_update_timestamp' in triggers
+
+
+def test_utc_timestamps_for_json():
+    from datetime import timedelta, timezone
+    from dates import format_utc_timestamp
+    assert format_utc_timestamp('2024-05-01 09:30:15') == '2024-05-01T09:30:15Z'
+    eastern = timezone(timedelta(hours=-4))
+    assert format_utc_timestamp(datetime(2024, 5, 1, 20, 0, tzinfo=eastern)) == '2024-05-02T00:00:00Z'
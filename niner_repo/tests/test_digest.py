@@ -0,0 +1,96 @@
+"""
+Tests for the daily digest batch generator
+"""
+
+import json
+from datetime import date, timedelta
+
+from db import get_db
+from digest import generate_daily_digests
+from notifications import NotificationEngine
+
+
+def _add_user(db, username, daily_digest):
+    cursor = db.execute(
+        'INSERT INTO users (username, email, password) VALUES (?, ?, ?)',
+        (username, f'{username}@uncc.edu', 'x')
+    )
+    user_id = cursor.lastrowid
+    db.execute(
+        'UPDATE notification_settings SET daily_digest = ? WHERE user_id = ?',
+        (daily_digest, user_id)
+    )
+    return user_id
+
+
+def _add_expense(db, user_id, amount, date):
+    db.execute(
+        '''INSERT INTO transactions (user_id, transaction_type, category, amount, description, date)
+           VALUES (?, 'expense', 'food', ?, 'Lunch', ?)''',
+        (user_id, amount, date.isoformat())
+    )
+
+
+def test_digest_written_once_per_opted_in_user(schema_app):
+    today = date(2026, 10, 14)  # a Wednesday
+    week_start = date(2026, 10, 12)
+
+    with schema_app.app_context():
+        db = get_db()
+        digest_user = _add_user(db, 'digester', 1)
+        realtime_user = _add_user(db, 'realtime', 0)
+
+        db.execute(
+            '''INSERT INTO budgets (user_id, total_amount, week_start_date)
+               VALUES (?, 100, ?)''',
+            (digest_user, week_start.isoformat())
+        )
+        _add_expense(db, digest_user, 25.0, today)
+        _add_expense(db, digest_user, 70.0, week_start)
+        _add_expense(db, realtime_user, 10.0, today)
+        db.execute(
+            '''INSERT INTO subscriptions (user_id, name, amount, frequency, next_billing_date, start_date)
+               VALUES (?, 'Netflix', 15.99, 'monthly', ?, ?)''',
+            (digest_user, (today + timedelta(days=3)).isoformat(), today.isoformat())
+        )
+        db.execute(
+            '''INSERT INTO financial_goals (user_id, goal_name, target_amount, current_amount)
+               VALUES (?, 'Laptop', 1000, 250)''',
+            (digest_user,)
+        )
+        db.commit()
+
+        assert generate_daily_digests(today) == 1
+
+        rows = db.execute('SELECT * FROM notifications').fetchall()
+        assert len(rows) == 1
+        assert rows[0]['user_id'] == digest_user
+        assert rows[0]['type'] == NotificationEngine.TYPE_DAILY_DIGEST
+        assert rows[0]['severity'] == NotificationEngine.SEVERITY_WARNING
+
+        metadata = json.loads(rows[0]['metadata'])
+        assert metadata['spent_week'] == 95.0
+        assert metadata['spent_today'] == 25.0
+        assert metadata['bill_count'] == 1
+        assert metadata['goal_saved'] == 250.0
+
+        # A second run on the same day is a no-op
+        assert generate_daily_digests(today) == 0
+
+
+def test_digest_users_skip_realtime_alerts(schema_app):
+    with schema_app.app_context():
+        db = get_db()
+        user_id = _add_user(db, 'digester', 1)
+        db.commit()
+
+        notification_id = NotificationEngine.create_notification(
+            user_id=user_id,
+            notification_type=NotificationEngine.TYPE_BUDGET_WARNING,
+            title='Budget Warning',
+            message='Test',
+            severity=NotificationEngine.SEVERITY_WARNING
+        )
+
+        assert notification_id is None
+        assert NotificationEngine.check_budget_warning(user_id) == []
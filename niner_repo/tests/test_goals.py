@@ -195,4 +195,65 @@ class TestFinancialGoals:
         # Check the goals page shows correct progress
         response = logged_in_user.get('/goals')
         assert response.status_code == 200
-        assert b'25%' in response.data or b'25.0%' in response.data
\ No newline at end of file
+        assert b'25%' in response.data or b'25.0%' in response.data
+
+    def test_contributions_keep_history_and_aggregates(self, logged_in_user, app):
+        """Test that contributions are recorded and totalled on the goal row."""
+        with app.app_context():
+            db = get_db()
+            goal_id = db.execute(
+                "INSERT INTO financial_goals (user_id, goal_name, target_amount, current_amount)"
+                " SELECT id, 'Emergency Fund', 1000, 250 FROM users WHERE username = 'testuser'"
+            ).lastrowid
+            db.commit()
+        
+        for amount in ('20.00', '30.50'):
+            logged_in_user.post(f'/goals/{goal_id}/contribute', data={'contribution': amount})
+        with logged_in_user.session_transaction() as session:
+            assert ('success', 'Added $30.50 to "Emergency Fund"!') in session['_flashes']
+        
+        with app.app_context():
+            goal = get_db().execute(
+                'SELECT current_amount, contributed_cents, contribution_count, last_contribution_on'
+                ' FROM financial_goals WHERE id = ?', (goal_id,)
+            ).fetchone()
+        assert float(goal['current_amount']) == 300.50  # 250 + 20 + 30.50
+        assert (goal['contributed_cents'], goal['contribution_count']) == (5050, 2)
+        assert goal['last_contribution_on'] == date.today()
+        
+        history = logged_in_user.get(f'/goals/{goal_id}/contributions').get_json()
+        assert [c['amount'] for c in history['contributions']] == [30.50, 20.00]
+
+
+def test_projection_follows_recent_pace(schema_app):
+    """A goal is projected to finish at the pace of its recent contributions."""
+    from goals import load_goals, record_contribution
+    from money import Money
+    
+    today = date(2024, 6, 30)
+    with schema_app.app_context():
+        db = get_db()
+        db.execute("INSERT INTO users (username, email, password) VALUES ('saver', 's@uncc.edu', 'x')")
+        db.execute(
+            "INSERT INTO financial_goals (user_id, goal_name, target_amount, current_amount)"
+            " VALUES (1, 'Laptop', 1000, 0)"
+        )
+        db.execute(
+            "INSERT INTO financial_goals (user_id, goal_name, target_amount, current_amount)"
+            " VALUES (1, 'Untouched', 500, 0)"
+        )
+        db.commit()
+        # $10 on each day of June
+        for day in range(1, 31):
+            record_contribution(1, 1, Money.parse('10'), date(2024, 6, day))
+        
+        goals = {goal['goal_name']: goal for goal in load_goals(1, today)}
+    
+    laptop = goals['Laptop']
+    assert laptop['current_amount'] == 300.0
+    assert laptop['contribution_count'] == 30
+    # Pace from the last 10 contributions (June 21-30): $100 over 10 days
+    assert laptop['monthly_pace'] == 300.0
+    # $700 to go at $10 a day
+    assert laptop['projected_completion'] == today + timedelta(days=70)
+    assert goals['Untouched']['projected_completion'] is None
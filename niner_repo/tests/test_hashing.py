@@ -0,0 +1,67 @@
+"""Tests for the password hashing service."""
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+import hashing
+from db import get_db
+from hashing import HashingBusy, HashingPool
+
+
+def test_hashes_in_the_pool_with_the_purpose_method(app):
+    app.config['HASH_METHODS'] = {'security_answer': 'pbkdf2:sha256:1000'}
+    with app.app_context():
+        answer = hashing.hash_secret('rover', 'security_answer')
+
+        assert answer.startswith('pbkdf2:sha256:1000$')
+        assert hashing.check_secret(answer, 'rover')
+        assert not hashing.check_secret(answer, 'fluffy')
+        assert hashing.needs_rehash(answer, 'password')
+
+
+def test_full_queue_raises_429():
+    pool = HashingPool(0, 1)
+    pool.slots.acquire()
+
+    with pytest.raises(HashingBusy) as excinfo:
+        pool.run(len, 'x', timeout=0)
+
+    assert excinfo.value.code == 429
+    assert excinfo.value.get_response().headers['Retry-After'] == '1'
+    pool.slots.release()
+    assert pool.run(len, 'x', timeout=0) == 1
+
+
+def test_login_rehashes_when_the_method_changes(app, client, auth):
+    auth.register()
+    app.config['HASH_METHODS'] = {'password': 'pbkdf2:sha256:1000'}
+
+    assert auth.login().status_code == 302
+    with app.app_context():
+        stored = get_db().execute("SELECT password FROM users WHERE username = 'testuser'").fetchone()[0]
+    assert stored.startswith('pbkdf2:sha256:1000$')
+
+    auth.logout()
+    assert auth.login().status_code == 302
+
+
+def test_login_is_refused_while_hashing_is_saturated(app, client, auth):
+    with app.app_context():
+        db = get_db()
+        db.execute(
+            "INSERT INTO users (username, email, password) VALUES ('busy', 'b@uncc.edu', ?)",
+            (generate_password_hash('testpassword'),)
+        )
+        db.commit()
+    app.config.update(HASH_QUEUE_LIMIT=1, HASH_QUEUE_TIMEOUT=0)
+
+    with app.app_context():
+        pool = hashing.get_pool()
+    pool.slots.acquire()
+    try:
+        response = auth.login(username='busy')
+    finally:
+        pool.slots.release()
+
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '1'
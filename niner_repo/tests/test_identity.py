@@ -0,0 +1,71 @@
+"""Tests for the session identity cache behind g.user."""
+
+from flask import g, session
+
+import identity
+from db import get_db
+
+
+def uses_db(response):
+    return 'db;' in response.headers.get('Server-Timing', '')
+
+
+def test_logged_in_requests_skip_the_user_query(client, auth):
+    auth.register()
+    auth.login()
+
+    with client:
+        response = client.get('/quick-expense')
+        assert response.status_code == 200
+        assert not uses_db(response)
+        assert g.user == {'id': 1, 'username': 'testuser', 'email': 'test@uncc.edu'}
+        assert set(session['identity']) == {'id', 'username', 'email', 'v'}
+
+
+def test_session_without_identity_is_loaded_once(client, auth):
+    auth.register()
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+
+    assert uses_db(client.get('/quick-expense'))
+    assert not uses_db(client.get('/quick-expense'))
+
+
+def test_changed_user_is_reloaded(app, client, auth):
+    auth.register()
+    auth.login()
+    with app.app_context():
+        db = get_db()
+        db.execute("UPDATE users SET email = 'new@uncc.edu' WHERE id = 1")
+        db.commit()
+        assert db.execute('SELECT identity_version FROM users WHERE id = 1').fetchone()[0] == 2
+        # What another worker's entry looks like once it expires
+        identity.get_versions().clear()
+
+    with client:
+        assert uses_db(client.get('/quick-expense'))
+        assert g.user['email'] == 'new@uncc.edu'
+        assert session['identity']['v'] == 2
+
+
+def test_profile_update_refreshes_the_session(client, auth):
+    auth.register()
+    auth.login()
+
+    client.post('/auth/profile', data={'email': 'changed@uncc.edu'})
+
+    with client:
+        assert not uses_db(client.get('/quick-expense'))
+        assert g.user['email'] == 'changed@uncc.edu'
+
+
+def test_health_check_skips_loading(client):
+    client.get('/healthz')  # the first request runs the schema bootstrap
+    with client.session_transaction() as sess:
+        sess['user_id'] = 12345
+
+    with client:
+        response = client.get('/healthz')
+        assert response.get_json() == {'status': 'ok'}
+        assert g.user is None
+        assert not uses_db(response)
@@ -136,4 +136,20 @@ class TestIncome:
         with app.app_context():
             db = get_db()
             updated = db.execute('SELECT * FROM income WHERE id = ?', (income_id,)).fetchone()
-            assert updated['is_active'] == 0  # Should be inactive now
\ No newline at end of file
+            assert updated['is_active'] == 0  # Should be inactive now
+
+def test_income_api_writes_iso_dates(logged_in_user, app):
+    """Dates come out as YYYY-MM-DD and timestamps as ISO 8601 UTC, not HTTP dates"""
+    with app.app_context():
+        db = get_db()
+        db.execute(
+            "INSERT INTO income (user_id, category_id, amount, source, date, created_at, created_by)"
+            " VALUES (1, 1, 10, 'Job', ?, ?, 1)",
+            (date(2026, 10, 1), datetime(2026, 10, 1, 9, 30, 15))
+        )
+        db.commit()
+
+    record = logged_in_user.get('/income/api').get_json()['data'][0]
+
+    assert record['date'] == '2026-10-01'
+    assert record['created_at'] == '2026-10-01T09:30:15Z'
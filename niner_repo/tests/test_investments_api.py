@@ -1,20 +1,12 @@
 """Unit tests for investments and portfolio endpoints."""
 
-import os
-import sqlite3
 import pytest
 from db import get_db
 
 
-def _apply_investments_schema(app):
-    """Helper to apply investments schema to the test DB."""
-    schema_path = os.path.join(os.path.dirname(__file__), '..', 'investments_schema.sql')
-    schema_path = os.path.abspath(schema_path)
-    with open(schema_path, 'r') as f:
-        schema = f.read()
+def _add_asset_type(app):
+    """Helper to add a default asset type to the (migrated) test DB."""
     db = get_db()
-    db.executescript(schema)
-    # insert a default asset type
     db.execute("INSERT OR IGNORE INTO asset_types (id, name) VALUES (1, 'Equity')")
     db.commit()
 
@@ -24,9 +16,9 @@ def test_create_investment_and_position(client, auth, app):
     auth.register(username='invtester')
     auth.login(username='invtester')
 
-    # prepare DB schema for investments
+    # prepare an asset type for investments
     with app.app_context():
-        _apply_investments_schema(app)
+        _add_asset_type(app)
 
     # create a new investment via the form
     resp = client.post('/investments/create', data={
@@ -48,15 +40,15 @@ def test_create_investment_and_position(client, auth, app):
 
 
 def test_portfolio_shows_position(logged_in_user, app):
-    # ensure investments schema and a sample position exist
+    # ensure an asset type and a sample position exist
     with app.app_context():
-        _apply_investments_schema(app)
+        _add_asset_type(app)
         db = get_db()
         # create an investment
         cur = db.execute("INSERT INTO investments (ticker, name, asset_type_id, exchange) VALUES (?,?,?,?)", ('PFTEST', 'PF Test Co', 1, 'NYSE'))
         inv_id = cur.lastrowid
         # create a position for the logged in user
-        user = db.execute("SELECT id FROM user WHERE username = ?", ('testuser',)).fetchone()
+        user = db.execute("SELECT id FROM users WHERE username = ?", ('testuser',)).fetchone()
         uid = user['id']
         db.execute('INSERT INTO positions (user_id, investment_id, quantity, avg_cost) VALUES (?,?,?,?)', (uid, inv_id, 10, 5.0))
         db.commit()
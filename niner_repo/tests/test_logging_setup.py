@@ -0,0 +1,65 @@
+"""Tests for structured logging and request ID correlation."""
+
+import json
+import logging
+
+import pytest
+from flask import jsonify
+
+import logging_setup
+
+
+@pytest.fixture
+def logged_app(schema_app):
+    schema_app.config['LOG_LEVELS'] = {'tests.quiet': 'ERROR'}
+    logging_setup.init_app(schema_app)
+
+    @schema_app.route('/hello')
+    def hello():
+        logging.getLogger('tests.loud').info('hello', extra={'items': 3})
+        logging.getLogger('tests.quiet').info('suppressed')
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            logging.getLogger('tests.loud').exception('failed')
+        return jsonify(ok=True)
+
+    yield schema_app
+
+    logging_setup.stop_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, logging_setup.StructuredQueueHandler):
+            root.removeHandler(handler)
+
+
+def read_records(capsys):
+    logging_setup.stop_logging()
+    return [json.loads(line) for line in capsys.readouterr().err.splitlines() if line.startswith('{')]
+
+
+def test_records_are_json_with_request_id(capsys, logged_app):
+    response = logged_app.test_client().get('/hello', headers={'X-Request-ID': 'abc-123'})
+    assert response.headers['X-Request-ID'] == 'abc-123'
+
+    records = [r for r in read_records(capsys) if r['logger'].startswith('tests.')]
+    assert [r['message'] for r in records] == ['hello', 'failed']
+
+    hello, failed = records
+    assert hello['request_id'] == 'abc-123'
+    assert hello['path'] == '/hello'
+    assert hello['items'] == 3
+    assert 'ZeroDivisionError' in failed['exception']
+
+
+def test_invalid_request_id_is_replaced(logged_app):
+    response = logged_app.test_client().get('/hello', headers={'X-Request-ID': 'bad id; <script>'})
+    request_id = response.headers['X-Request-ID']
+
+    assert request_id != 'bad id; <script>'
+    assert len(request_id) == 32
+
+
+def test_parse_levels():
+    assert logging_setup.parse_levels('db=warning, auth=DEBUG') == {'db': 'WARNING', 'auth': 'DEBUG'}
+    assert logging_setup.parse_levels(None) == {}
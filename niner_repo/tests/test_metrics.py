@@ -0,0 +1,90 @@
+"""Tests for the metrics registry and the /metrics endpoint."""
+
+import pytest
+from flask import jsonify
+
+import metrics
+from db import get_db
+
+
+@pytest.fixture
+def metrics_app(schema_app, tmp_path):
+    schema_app.config['METRICS_DB'] = str(tmp_path / 'metrics.sqlite')
+    metrics.REGISTRY.reset()
+    metrics.init_app(schema_app)
+
+    @schema_app.route('/ping')
+    def ping():
+        get_db().execute('SELECT 1').fetchone()
+        return jsonify(ok=True)
+
+    yield schema_app
+    metrics.REGISTRY.reset()
+
+
+def test_histogram_buckets_are_cumulative(tmp_path):
+    registry = metrics.Registry()
+    histogram = metrics.Histogram('test_seconds', 'Test', buckets=(0.1, 1.0), registry=registry)
+    histogram.observe(0.5, endpoint='x')
+    histogram.observe(0.05, endpoint='x')
+
+    path = str(tmp_path / 'm.sqlite')
+    registry.flush(path)
+    text = metrics.render_metrics(path, registry)
+
+    assert '# TYPE test_seconds histogram' in text
+    assert 'test_seconds_bucket{endpoint="x",le="0.1"} 1' in text
+    assert 'test_seconds_bucket{endpoint="x",le="1.0"} 2' in text
+    assert 'test_seconds_bucket{endpoint="x",le="+Inf"} 2' in text
+    assert 'test_seconds_count{endpoint="x"} 2' in text
+
+
+def test_flushes_from_separate_workers_add_up(tmp_path):
+    path = str(tmp_path / 'm.sqlite')
+    workers = [metrics.Registry(), metrics.Registry()]
+    for registry in workers:
+        counter = metrics.Counter('test_total', 'Test', registry=registry)
+        counter.inc(3, kind='a')
+        registry.flush(path)
+
+    assert 'test_total{kind="a"} 6' in metrics.render_metrics(path, workers[0])
+
+
+def test_large_values_keep_every_digit(tmp_path):
+    registry = metrics.Registry()
+    metrics.Counter('test_total', 'Test', registry=registry).inc(1_234_567, kind='a')
+    histogram = metrics.Histogram('test_seconds', 'Test', buckets=(1.0,), registry=registry)
+    histogram.observe(1_234_567.25)
+
+    path = str(tmp_path / 'm.sqlite')
+    registry.flush(path)
+    text = metrics.render_metrics(path, registry)
+
+    assert 'test_total{kind="a"} 1234567' in text.splitlines()
+    assert 'test_seconds_sum 1234567.25' in text.splitlines()
+    assert metrics.format_value(float('inf')) == '+Inf'
+
+
+def test_metrics_endpoint_reports_requests_and_db_time(metrics_app):
+    client = metrics_app.test_client()
+    client.get('/ping')
+    client.get('/ping')
+
+    response = client.get('/metrics')
+    text = response.get_data(as_text=True)
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    assert 'niner_requests_total{endpoint="ping",method="GET",status="200"} 2' in text
+    assert 'niner_db_queries_per_request_count{endpoint="ping"} 2' in text
+    assert 'niner_db_connections_opened_total 2' in text
+    assert 'niner_requests_in_flight 1' in text
+
+
+def test_metrics_token_required_when_configured(metrics_app):
+    metrics_app.config['METRICS_TOKEN'] = 'secret'
+    client = metrics_app.test_client()
+
+    assert client.get('/metrics').status_code == 403
+    response = client.get('/metrics', headers={'Authorization': 'Bearer secret'})
+    assert response.status_code == 200
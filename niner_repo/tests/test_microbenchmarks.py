@@ -0,0 +1,115 @@
+"""Microbenchmarks for pure helper functions (requires pytest-benchmark, see
+requirements-dev.txt).
+
+Each helper runs at 1k and 10k input rows, and at 100k with --benchmark-large,
+so scaling problems show up as a jump between sizes. Save a baseline and fail
+on regressions with:
+
+    pytest tests/test_microbenchmarks.py --benchmark-large --benchmark-autosave
+    pytest tests/test_microbenchmarks.py --benchmark-large --benchmark-compare --benchmark-compare-fail=mean:15%
+
+Skip them during normal runs with --benchmark-skip.
+"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+import portfolio
+import priorities
+import subscriptions
+
+SIZES = [1_000, 10_000, pytest.param(100_000, marks=pytest.mark.large_input)]
+TODAY = date(2025, 6, 30)
+
+MERCHANTS = ['NETFLIX.COM', 'Spotify USA', 'CATS Transit #4411', 'Harris Teeter 0231',
+             'Chipotle 1187', 'AMZN Mktp US*2K4', 'Planet Fitness', 'Shell Oil 5734']
+FREQUENCIES = ['daily', 'weekly', 'monthly', 'yearly']
+PERIODS = ['daily', 'weekly', 'biweekly', 'monthly', 'quarterly', 'annually']
+PRIORITY_TYPES = ['Save More', 'Reduce Debt', 'Invest More', 'Control Spending']
+
+
+def make_transactions(n, seed=0):
+    """Expense rows: a recurring core (monthly/weekly bills) plus random noise"""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        merchant = rng.choice(MERCHANTS)
+        if i % 4 == 0:
+            # Bills: fixed amount on a fixed cadence
+            amount = 15.49 if 'NETFLIX' in merchant else 9.99
+            day = TODAY - timedelta(days=30 * (i // 4 % 6))
+        else:
+            amount = round(rng.uniform(3, 80), 2)
+            day = TODAY - timedelta(days=rng.randrange(180))
+        rows.append({
+            'id': i, 'description': f'{merchant} {day:%m/%d}', 'amount': amount,
+            'date': day.isoformat(), 'category': 'other'
+        })
+    return rows
+
+
+def make_portfolio(n, seed=0):
+    """Holdings and n investment transactions spread over 10 instruments"""
+    rng = random.Random(seed)
+    holdings = [{'investment_id': k, 'qty': rng.uniform(1, 50), 'price': rng.uniform(10, 500)}
+                for k in range(10)]
+    txs = sorted((
+        {'investment_id': rng.randrange(12), 'date': (TODAY - timedelta(days=rng.randrange(90))).isoformat(),
+         'type': 'sell' if rng.random() < 0.2 else 'buy',
+         'quantity': rng.uniform(0.1, 5), 'price': rng.uniform(10, 500)}
+        for _ in range(n)
+    ), key=lambda t: t['date'])
+    return holdings, txs
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_detect_recurring_patterns(benchmark, size):
+    rows = make_transactions(size)
+    patterns = benchmark(subscriptions.detect_recurring_patterns, rows)
+    assert patterns
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_normalize_description(benchmark, size):
+    descriptions = [row['description'] for row in make_transactions(size)]
+    result = benchmark(lambda: [subscriptions.normalize_description(d) for d in descriptions])
+    assert len(result) == size
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_calculate_total_monthly_cost(benchmark, size):
+    rng = random.Random(0)
+    subs = [{'amount': round(rng.uniform(1, 100), 2), 'frequency': rng.choice(FREQUENCIES)}
+            for _ in range(size)]
+    assert benchmark(subscriptions.calculate_total_monthly_cost, subs) > 0
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_calculate_monthly_amount(benchmark, size):
+    finance = pytest.importorskip('finance')
+    rng = random.Random(0)
+    items = [(round(rng.uniform(1, 2000), 2), rng.choice(PERIODS)) for _ in range(size)]
+    result = benchmark(lambda: [finance.calculate_monthly_amount(a, p) for a, p in items])
+    assert len(result) == size
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_calculate_relevance(benchmark, size):
+    rng = random.Random(0)
+    cases = [({}, {
+        'savings_rate': rng.uniform(-20, 60), 'total_savings': rng.uniform(0, 10000),
+        'monthly_expenses': rng.uniform(0, 4000), 'monthly_income': rng.uniform(0, 5000)
+    }, rng.choice(PRIORITY_TYPES)) for _ in range(size)]
+    result = benchmark(lambda: [priorities.calculate_relevance(*case) for case in cases])
+    assert all(50 <= score <= 100 for score in result)
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_build_performance_series(benchmark, size):
+    holdings, txs = make_portfolio(size)
+    series = benchmark(portfolio.build_performance_series, holdings, txs, TODAY)
+    assert len(series) == 30
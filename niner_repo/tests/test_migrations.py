@@ -0,0 +1,164 @@
+"""Tests for the versioned schema migrations."""
+
+import sqlite3
+
+import pytest
+from flask import Flask
+
+import db as db_module
+import migrations
+from migrations import MigrationError, current_version, discover, split_statements, upgrade
+
+
+def write(directory, name, text):
+    (directory / name).write_text(text)
+
+
+def test_upgrade_applies_each_migration_once(tmp_path):
+    write(tmp_path, '0001_items.sql', 'CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT);\n')
+    write(tmp_path, '0002_seed.sql', "INSERT INTO items (name) VALUES ('a');\n")
+    conn = sqlite3.connect(':memory:')
+
+    assert [m.version for m in upgrade(conn, str(tmp_path), target=1)] == [1]
+    assert current_version(conn) == 1
+    assert [m.name for m in upgrade(conn, str(tmp_path))] == ['seed']
+    assert upgrade(conn, str(tmp_path)) == []
+    assert conn.execute('SELECT COUNT(*) FROM items').fetchone()[0] == 1
+
+
+def test_edited_migration_is_rejected(tmp_path):
+    write(tmp_path, '0001_items.sql', 'CREATE TABLE items (id INTEGER PRIMARY KEY);\n')
+    conn = sqlite3.connect(':memory:')
+    upgrade(conn, str(tmp_path))
+
+    write(tmp_path, '0001_items.sql', 'CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT);\n')
+    with pytest.raises(MigrationError, match='changed after it was applied'):
+        upgrade(conn, str(tmp_path))
+
+
+def test_failed_migration_rolls_back(tmp_path):
+    write(tmp_path, '0001_items.sql', 'CREATE TABLE items (id INTEGER PRIMARY KEY);\n')
+    write(tmp_path, '0002_broken.py', (
+        'def upgrade(db):\n'
+        '    db.execute("CREATE TABLE half_done (id INTEGER)")\n'
+        '    db.execute("INSERT INTO no_such_table VALUES (1)")\n'
+    ))
+    conn = sqlite3.connect(':memory:')
+
+    with pytest.raises(MigrationError, match='0002_broken'):
+        upgrade(conn, str(tmp_path))
+    assert current_version(conn) == 1
+    assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'half_done'").fetchone() is None
+
+
+def test_split_statements_keeps_trigger_bodies_whole():
+    script = (
+        '-- comment\n'
+        'CREATE TABLE t (id INTEGER);\n'
+        'CREATE TRIGGER tr AFTER INSERT ON t\n'
+        'BEGIN\n'
+        '    UPDATE t SET id = id;\n'
+        'END;\n'
+    )
+    statements = split_statements(script)
+    assert len(statements) == 2
+    assert statements[1].endswith('END;')
+
+
+def test_baseline_consolidates_legacy_user_table(tmp_path):
+    path = str(tmp_path / 'legacy.sqlite')
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE user (id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT UNIQUE NOT NULL,
+                           email TEXT UNIQUE NOT NULL, password TEXT NOT NULL);
+        INSERT INTO user (id, username, email, password) VALUES (7, 'legacy', 'legacy@uncc.edu', 'x');
+        CREATE TABLE income_sources (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL,
+                                     FOREIGN KEY (user_id) REFERENCES user (id));
+        CREATE VIEW v_income_sources AS
+            SELECT s.id, u.username FROM income_sources s JOIN user u ON s.user_id = u.id;
+    ''')
+
+    upgrade(conn)
+
+    assert current_version(conn) == discover()[-1].version
+    assert conn.execute("SELECT id FROM users WHERE username = 'legacy'").fetchone() == (7,)
+    assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'user'").fetchone() is None
+    conn.execute('INSERT INTO income_sources (user_id) VALUES (7)')
+    assert conn.execute('SELECT username FROM v_income_sources').fetchall() == [('legacy',)]
+
+
+def test_first_request_brings_the_schema_up_to_date(tmp_path):
+    app = Flask(__name__)
+    app.config.update(TESTING=True, DATABASE=str(tmp_path / 'app.sqlite'), QUERY_INSTRUMENTATION=False)
+    db_module.init_app(app)
+    migrations.init_app(app)
+    app.add_url_rule('/ping', 'ping', lambda: 'pong')
+
+    try:
+        app.test_client().get('/ping')
+        with app.app_context():
+            conn = db_module.get_db()
+            assert current_version(conn) == discover()[-1].version
+            assert conn.execute('SELECT COUNT(*) FROM financial_goals').fetchone()[0] == 0
+    finally:
+        db_module.reset_bootstrap()
+
+
+def test_legacy_notifications_table_accepts_digests(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'legacy.sqlite'))
+    conn.executescript('''
+        CREATE TABLE notifications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL,
+            type VARCHAR(50) NOT NULL CHECK (type IN ('overspending', 'budget_warning')),
+            title VARCHAR(200) NOT NULL, message TEXT NOT NULL,
+            severity VARCHAR(20) NOT NULL, is_read BOOLEAN NOT NULL DEFAULT 0,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP, read_at TIMESTAMP, metadata TEXT
+        );
+        INSERT INTO notifications (user_id, type, title, message, severity)
+        VALUES (1, 'overspending', 'Old', 'Kept', 'warning');
+    ''')
+
+    upgrade(conn)
+
+    conn.execute(
+        "INSERT INTO notifications (user_id, type, title, message, severity)"
+        " VALUES (1, 'daily_digest', 'Digest', 'New', 'info')"
+    )
+    assert [row[0] for row in conn.execute('SELECT title FROM notifications ORDER BY id')] == ['Old', 'Digest']
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE tbl_name = 'notifications'")}
+    assert {'idx_notifications_user_unread', 'prevent_duplicate_notifications'} <= names
+    assert conn.execute('SELECT COUNT(*) FROM v_notification_summary').fetchone()[0] == 1
+
+
+def test_legacy_tables_match_a_fresh_database(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'legacy.sqlite'))
+    conn.executescript('''
+        CREATE TABLE user (id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT UNIQUE NOT NULL,
+                           email TEXT UNIQUE NOT NULL, password TEXT NOT NULL);
+        CREATE TABLE user_badges (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL, badge_id INTEGER NOT NULL,
+            earned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES user(id) ON DELETE CASCADE,
+            FOREIGN KEY (badge_id) REFERENCES badges(id) ON DELETE CASCADE,
+            UNIQUE(user_id, badge_id)
+        );
+        INSERT INTO user_badges (user_id, badge_id) VALUES (3, 4);
+    ''')
+
+    upgrade(conn)
+
+    assert migrations.schema_drift(conn, migrations.reference_schema()) == []
+    assert conn.execute('SELECT user_id, badge_id FROM user_badges').fetchall() == [(3, 4)]
+
+
+def test_startup_refuses_a_schema_that_still_differs(tmp_path):
+    write(tmp_path, '0001_items.sql', 'CREATE TABLE IF NOT EXISTS items (id INTEGER PRIMARY KEY, name TEXT);\n')
+    app = Flask(__name__)
+    app.config.update(TESTING=True, DATABASE=str(tmp_path / 'app.sqlite'), MIGRATIONS_DIR=str(tmp_path))
+    conn = sqlite3.connect(app.config['DATABASE'])
+    conn.execute('CREATE TABLE items (id INTEGER PRIMARY KEY)')
+    conn.commit()
+
+    with app.app_context():
+        with pytest.raises(MigrationError, match='items'):
+            migrations.check_schema(db_module.get_db())
@@ -0,0 +1,126 @@
+"""Tests for integer-cents money and the amount_cents ledger columns."""
+
+import pickle
+import sqlite3
+
+import pytest
+
+from db import get_db
+from finance import calculate_monthly_amount, calculate_total_expenses
+from migrations import upgrade
+from money import ZERO, Money
+
+
+def test_arithmetic_is_exact():
+    assert Money.sum([Money.parse('0.10')] * 3) == Money.parse('0.30')
+    assert Money.parse('0.1') + Money.parse('0.2') == Money(30)
+    assert Money(1000) - Money(1) == Money.parse('9.99')
+    assert sum([Money(5), Money(7)]) == Money(12)
+    assert Money(1000) * 3 == Money(3000)
+    assert Money(1000) / Money(4000) == 0.25
+
+
+def test_parse_rounds_half_up_and_rejects_garbage():
+    assert Money.parse('12.345').cents == 1235
+    assert Money.parse(12.5).cents == 1250
+    assert Money.parse(' 7 ').cents == 700
+    for bad in ('abc', '', 'NaN', 'inf', None):
+        with pytest.raises(ValueError):
+            Money.parse(bad)
+    with pytest.raises(TypeError):
+        Money(1.5)
+
+
+def test_scale_rounds_half_up_in_integers():
+    assert Money(1000).scale(1, 3) == Money(333)
+    assert Money(5).scale(1, 2) == Money(3)
+    assert Money(100000).scale(2500, 10000) == Money(25000)
+
+
+def test_comparisons_formatting_and_immutability():
+    assert Money(1250) > 12
+    assert Money(1250) == 12.5
+    assert not ZERO and ZERO == 0
+    assert str(Money(-5)) == '-0.05'
+    assert f'${Money(2050)}' == '$20.50'  # no currency sign of its own
+    assert f'{Money(123456):,.2f}' == '1,234.56'
+    assert repr(Money(100)) == "Money('1.00')"
+    with pytest.raises(AttributeError):
+        Money(1).cents = 2
+    assert pickle.loads(pickle.dumps(Money(42))) == Money(42)
+
+
+def test_hash_agrees_with_equality():
+    assert hash(Money(100)) == hash(1) and {Money(100): 'a'}.get(1) == 'a'
+    assert {Money(1250): 'b'}.get(12.5) == 'b'
+    assert len({Money(100), Money.parse('1.00'), 1}) == 1
+
+
+def test_monthly_amount_uses_integer_multipliers():
+    assert calculate_monthly_amount(Money.parse('100'), 'weekly') == Money.parse('434.80')
+    assert calculate_monthly_amount('1200', 'annually') == Money.parse('99.96')
+    assert calculate_monthly_amount(Money(999), 'unknown') == Money(999)
+
+
+def test_migration_backfills_cents(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'ledger.sqlite'))
+    upgrade(conn, target=3)
+    conn.execute(
+        "INSERT INTO transactions (user_id, transaction_type, amount, description) VALUES (1, 'expense', 19.99, 'x')"
+    )
+    conn.commit()
+
+    upgrade(conn)
+
+    assert conn.execute('SELECT amount_cents FROM transactions').fetchone()[0] == 1999
+
+
+def test_triggers_keep_cents_in_step_with_amount(schema_app):
+    with schema_app.app_context():
+        db = get_db()
+        db.execute(
+            "INSERT INTO expenses (user_id, category, amount, description, created_by) VALUES (1, 'food', 0.1, 'a', 1)"
+        )
+        db.execute(
+            "INSERT INTO expenses (user_id, category, amount, amount_cents, description, created_by)"
+            " VALUES (1, 'food', 0.2, ?, 'b', 1)",
+            (Money(20),)
+        )
+        db.execute("UPDATE expenses SET amount = 2.675 WHERE description = 'a'")
+        rows = db.execute('SELECT description, amount_cents FROM expenses ORDER BY id').fetchall()
+
+        assert [tuple(row) for row in rows] == [('a', 268), ('b', 20)]
+
+
+def test_sums_come_back_as_money(schema_app):
+    with schema_app.app_context():
+        db = get_db()
+        for amount in ('0.10', '0.20', '0.30'):
+            db.execute(
+                "INSERT INTO transactions (user_id, transaction_type, category, amount, amount_cents, description, date)"
+                " VALUES (1, 'expense', 'Food', ?, ?, 'x', CURRENT_DATE)",
+                (float(Money.parse(amount)), Money.parse(amount))
+            )
+
+        total = calculate_total_expenses(1)
+
+    assert isinstance(total, Money)
+    assert total == Money(60)
+
+
+def test_unusual_spending_compares_cents(schema_app):
+    from notifications import NotificationEngine
+    with schema_app.test_request_context():
+        db = get_db()
+        for _ in range(3):
+            # amount_cents is the ledger value; the legacy REAL column is ignored
+            db.execute(
+                "INSERT INTO transactions (user_id, transaction_type, category, amount, amount_cents, description, date)"
+                " VALUES (1, 'expense', 'Food', 0.1, 1000, 'x', CURRENT_DATE)"
+            )
+
+        assert NotificationEngine.check_unusual_spending(1, 'Food', 19.99) is None
+        assert NotificationEngine.check_unusual_spending(1, 'Food', 20.0) is not None
+        metadata = db.execute('SELECT metadata FROM notifications').fetchone()[0]
+
+    assert '"average": 10.0' in metadata
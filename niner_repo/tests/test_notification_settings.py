@@ -0,0 +1,97 @@
+"""
+Tests for the notification settings cache
+"""
+
+import pytest
+
+from db import get_db
+from notifications import NotificationEngine
+
+
+def _add_user(db, username='cached'):
+    cursor = db.execute(
+        'INSERT INTO users (username, email, password) VALUES (?, ?, ?)',
+        (username, f'{username}@uncc.edu', 'x')
+    )
+    # Drop the trigger-created row so the lazy-default path is exercised
+    db.execute('DELETE FROM notification_settings WHERE user_id = ?', (cursor.lastrowid,))
+    db.commit()
+    return cursor.lastrowid
+
+
+def test_missing_settings_use_defaults_without_writing(schema_app):
+    with schema_app.test_request_context():
+        db = get_db()
+        user_id = _add_user(db)
+
+        settings = NotificationEngine.get_user_settings(user_id)
+
+        assert settings['user_id'] == user_id
+        assert settings['overspending_threshold'] == 100
+        assert settings['daily_digest'] == 0
+        row = db.execute(
+            'SELECT 1 FROM notification_settings WHERE user_id = ?', (user_id,)
+        ).fetchone()
+        assert row is None
+
+
+def test_settings_read_once_per_request(schema_app):
+    with schema_app.app_context():
+        user_id = _add_user(get_db())
+
+    with schema_app.test_request_context():
+        first = NotificationEngine.get_user_settings(user_id)
+        # Changes made behind the cache's back are not seen within the request
+        get_db().execute('INSERT INTO notification_settings (user_id, daily_digest) VALUES (?, 1)', (user_id,))
+        get_db().commit()
+        assert NotificationEngine.get_user_settings(user_id) is first
+
+
+def test_cached_settings_cannot_be_mutated(schema_app):
+    with schema_app.app_context():
+        user_id = _add_user(get_db())
+
+    with schema_app.test_request_context():
+        with pytest.raises(TypeError):
+            NotificationEngine.get_user_settings(user_id)['daily_digest'] = 1
+
+    with schema_app.test_request_context():
+        assert NotificationEngine.get_user_settings(user_id)['daily_digest'] == 0
+
+
+def test_update_settings_invalidates_cache(schema_app):
+    with schema_app.test_request_context():
+        user_id = _add_user(get_db())
+        assert NotificationEngine.get_user_settings(user_id)['budget_warning_threshold'] == 90
+
+        assert NotificationEngine.update_settings(user_id, {'budget_warning_threshold': 75})
+
+        assert NotificationEngine.get_user_settings(user_id)['budget_warning_threshold'] == 75
+
+    # A later request sees the update through the process cache
+    with schema_app.test_request_context():
+        assert NotificationEngine.get_user_settings(user_id)['budget_warning_threshold'] == 75
+
+
+def test_ensure_default_settings_bulk(schema_app):
+    with schema_app.app_context():
+        db = get_db()
+        user_ids = [_add_user(db, f'bulk{i}') for i in range(3)]
+
+        NotificationEngine.ensure_default_settings(user_ids)
+        NotificationEngine.ensure_default_settings(user_ids)
+        db.commit()
+
+        count = db.execute(
+            'SELECT COUNT(*) FROM notification_settings WHERE user_id IN (?, ?, ?)', user_ids
+        ).fetchone()[0]
+        assert count == 3
+
+
+def test_settings_api_serializes_the_cached_settings(client, auth):
+    auth.register()
+    auth.login()
+
+    data = client.get('/notifications/api/settings').get_json()
+
+    assert data['settings']['budget_warning_threshold'] == 90
@@ -126,4 +126,51 @@ def test_log_priority_action(client, auth):
 def test_unauthorized_access(client):
     """Test that unauthorized users cannot access priorities"""
     response = client.get('/finance/priorities')
-    assert response.status_code == 302  # Redirect to login
\ No newline at end of file
+    assert response.status_code == 302  # Redirect to login
+
+def test_suggestions_sample_the_catalog_once(app, auth):
+    """Suggestions come from the in-memory catalog, stable for a user within the TTL"""
+    import priorities
+    from unittest import mock
+    auth.register()
+    
+    with app.test_request_context(), mock.patch('priorities.time.time', return_value=1_000_000):
+        first = priorities.get_personalized_suggestions('Save More', 1)
+        get_db().execute('DELETE FROM priority_suggestions')
+        app.extensions['view_cache'].clear()
+        again = priorities.get_personalized_suggestions('Save More', 1)
+        
+        assert len(first) == 5
+        assert again == first
+        assert {s['relevance_score'] for s in first} == {80}
+
+
+def test_suggestions_are_memoized_until_the_ledger_changes(app, auth):
+    """A user's suggestions are reused until their transactions change"""
+    import priorities
+    from cache import invalidate_user
+    auth.register()
+    
+    with app.test_request_context():
+        first = priorities.get_personalized_suggestions('Invest More', 1)
+        assert priorities.get_personalized_suggestions('Invest More', 1) is first
+        
+        invalidate_user(1, 'ledger')
+        assert priorities.get_personalized_suggestions('Invest More', 1) is not first
+
+
+def test_suggestion_catalog_expires_and_is_kept_per_database(app, auth):
+    """Edits to priority_suggestions show up once the catalog expires"""
+    import priorities
+    from unittest import mock
+    auth.register()
+
+    with app.test_request_context():
+        with mock.patch('priorities.time.time', return_value=1_000_000):
+            assert priorities.load_suggestion_catalog()['Save More']
+            get_db().execute("DELETE FROM priority_suggestions WHERE priority_type = 'Save More'")
+            assert priorities.load_suggestion_catalog()['Save More']
+        with mock.patch('priorities.time.time', return_value=1_000_000 + priorities.SUGGESTION_CATALOG_TTL):
+            assert 'Save More' not in priorities.load_suggestion_catalog()
+
+        assert list(app.extensions['suggestion_catalog']) == [app.config['DATABASE']]
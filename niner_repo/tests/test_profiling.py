@@ -0,0 +1,97 @@
+"""Tests for the request profiling middleware and admin listing."""
+
+import os
+import time
+
+import pytest
+from flask import jsonify
+
+import auth
+import profiling
+from db import get_db
+
+
+@pytest.fixture
+def profiled_app(schema_app, tmp_path):
+    schema_app.config.update(
+        PROFILE_DIR=str(tmp_path / 'profiles'),
+        PROFILE_TOKEN='let-me-profile',
+        ADMIN_USERNAMES='root_admin'
+    )
+    schema_app.register_blueprint(auth.bp)
+    profiling.init_app(schema_app)
+
+    @schema_app.route('/slow/page')
+    def slow_page():
+        get_db().execute('SELECT 1').fetchone()
+        return jsonify(ok=True)
+
+    with schema_app.app_context():
+        db = get_db()
+        db.executemany(
+            'INSERT INTO users (username, email, password) VALUES (?, ?, ?)',
+            [('root_admin', 'a@uncc.edu', 'x'), ('regular', 'r@uncc.edu', 'x')]
+        )
+        db.commit()
+    return schema_app
+
+
+def login(client, app, username):
+    with app.app_context():
+        user_id = get_db().execute('SELECT id FROM users WHERE username = ?', (username,)).fetchone()['id']
+    with client.session_transaction() as session:
+        session['user_id'] = user_id
+
+
+def test_token_header_captures_profile(profiled_app):
+    client = profiled_app.test_client()
+
+    assert 'X-Profile-Id' not in client.get('/slow/page').headers
+    assert profiling.list_profiles(profiled_app.config['PROFILE_DIR']) == []
+
+    response = client.get('/slow/page', headers={'X-Profile-Token': 'let-me-profile'})
+    assert response.get_json() == {'ok': True}
+
+    [profile] = profiling.list_profiles(profiled_app.config['PROFILE_DIR'])
+    assert profile['id'] == response.headers['X-Profile-Id']
+    assert profile['method'] == 'GET'
+    assert profile['path'] == '/slow/page'
+    report = profiling.format_stats(os.path.join(profiled_app.config['PROFILE_DIR'], profile['name']))
+    assert 'slow_page' in report
+
+
+def test_wrong_token_is_not_profiled(profiled_app):
+    response = profiled_app.test_client().get('/slow/page', headers={'X-Profile-Token': 'guess'})
+    assert 'X-Profile-Id' not in response.headers
+
+
+def test_prune_keeps_newest_and_drops_old(tmp_path):
+    now = time.time()
+    for index in range(5):
+        path = tmp_path / f'20250101T00000{index}_GET_x_1ms_{index:04x}.prof'
+        path.write_bytes(b'')
+        os.utime(path, (now - index, now - index))
+    stale = tmp_path / '20240101T000000_GET_x_1ms_ffff.prof'
+    stale.write_bytes(b'')
+    os.utime(stale, (now - 30 * 86400, now - 30 * 86400))
+
+    profiling.prune_profiles(str(tmp_path), max_files=3, max_age_days=7)
+
+    assert sorted(p.name[-9:-5] for p in tmp_path.iterdir()) == ['0000', '0001', '0002']
+
+
+def test_admin_pages_require_admin(profiled_app):
+    client = profiled_app.test_client()
+    client.get('/slow/page', headers={'X-Profile-Token': 'let-me-profile'})
+    [profile] = profiling.list_profiles(profiled_app.config['PROFILE_DIR'])
+    url = f"/admin/profiles/{profile['name']}/download"
+
+    assert client.get(url).status_code == 302
+
+    login(client, profiled_app, 'regular')
+    assert client.get(url).status_code == 403
+
+    login(client, profiled_app, 'root_admin')
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.data
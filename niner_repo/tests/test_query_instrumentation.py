@@ -0,0 +1,67 @@
+"""Tests for the per-request query instrumentation in db.py."""
+
+import logging
+
+from flask import jsonify
+
+import db as db_module
+from db import get_db, get_query_stats, normalize_sql
+
+
+def test_normalize_sql_collapses_literals_and_in_lists():
+    sql = """SELECT * FROM transactions
+             WHERE user_id = 42 AND category = 'Food' AND id IN (?, ?, ?)"""
+    assert normalize_sql(sql) == (
+        'SELECT * FROM transactions WHERE user_id = ? AND category = ? AND id IN (?)'
+    )
+
+
+def test_stats_count_statements_and_rows(schema_app):
+    with schema_app.app_context():
+        db = get_db()
+        db.execute('SELECT 1')
+        db.execute('SELECT 1').fetchone()
+        rows = db.execute('SELECT id FROM users').fetchall()
+
+        stats = get_query_stats()
+        assert stats.count == 3
+        assert stats.rows == 1 + len(rows)
+        assert stats.shapes['SELECT ?'] == 2
+
+
+def test_server_timing_header_and_n_plus_one_warning(schema_app, caplog):
+    schema_app.config['N_PLUS_ONE_THRESHOLD'] = 3
+
+    @schema_app.route('/many')
+    def many():
+        db = get_db()
+        for user_id in range(5):
+            db.execute('SELECT * FROM users WHERE id = ?', (user_id,)).fetchone()
+        return jsonify(ok=True)
+
+    with caplog.at_level(logging.WARNING, logger=db_module.logger.name):
+        response = schema_app.test_client().get('/many')
+
+    timing = response.headers['Server-Timing']
+    assert timing.startswith('db;dur=')
+    assert '5 queries' in timing
+    assert any('Possible N+1' in r.getMessage() for r in caplog.records)
+
+
+def test_slow_queries_logged_with_plan(schema_app):
+    schema_app.config['SLOW_QUERY_MS'] = 0
+
+    @schema_app.route('/slow')
+    def slow():
+        get_db().execute('SELECT * FROM users WHERE id = ?', (1,)).fetchone()
+        return jsonify(ok=True)
+
+    schema_app.test_client().get('/slow')
+    for handler in db_module.slow_query_logger.handlers:
+        handler.flush()
+
+    with open(schema_app.config['SLOW_QUERY_LOG']) as f:
+        contents = f.read()
+    assert 'GET /slow' in contents
+    assert 'SELECT * FROM users WHERE id = ?' in contents
+    assert 'SEARCH user' in contents
@@ -0,0 +1,97 @@
+"""Query plan tests: the hot per-user queries are answered from indexes."""
+
+import os
+import sys
+
+import pytest
+
+from db import get_db
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from index_advisor import advise, explain, extract_sql, plan_issues  # noqa: E402
+
+HOT_QUERIES = {
+    'ledger_summary': (
+        '''SELECT COALESCE(SUM(amount), 0) FROM transactions
+           WHERE user_id = ? AND transaction_type = 'expense' AND is_active = 1
+           AND date >= ? AND date <= ?''',
+        'idx_transactions_user_type_active_date',
+    ),
+    'transaction_list': (
+        '''SELECT id, description, amount, date FROM transactions
+           WHERE user_id = ? AND is_active = 1
+           ORDER BY date DESC, id DESC LIMIT 50''',
+        'idx_transactions_user_active_date',
+    ),
+    'recent_transactions': (
+        'SELECT * FROM transactions WHERE user_id = ? ORDER BY date DESC, created_at DESC LIMIT 5',
+        'idx_transactions_user_date',
+    ),
+    'expense_total': (
+        'SELECT COALESCE(SUM(amount_cents), 0) FROM expenses WHERE user_id = ? AND is_active = 1',
+        'COVERING INDEX idx_expenses_user_active_date',
+    ),
+    'expenses_by_period': (
+        '''SELECT category, SUM(amount_cents) FROM expenses
+           WHERE user_id = ? AND is_active = 1 AND date >= ? AND date <= ?''',
+        'COVERING INDEX idx_expenses_user_active_date',
+    ),
+    'notification_list': (
+        'SELECT * FROM notifications WHERE user_id = ? ORDER BY created_at DESC LIMIT 20',
+        'idx_notifications_user_created',
+    ),
+    'leaderboard_rank': (
+        '''SELECT COUNT(*) + 1 FROM user_game_progress WHERE total_points > (
+               SELECT total_points FROM user_game_progress WHERE user_id = ?)''',
+        'idx_user_progress_points',
+    ),
+    'latest_price': (
+        'SELECT price, date FROM investment_transactions WHERE investment_id = ? ORDER BY date DESC LIMIT 1',
+        'idx_invtx_investment_date',
+    ),
+    'investment_history': (
+        'SELECT investment_id, date, type, quantity, price FROM investment_transactions WHERE user_id = ? ORDER BY date',
+        'idx_invtx_user_date',
+    ),
+    'active_subscriptions': (
+        'SELECT * FROM subscriptions WHERE user_id = ? AND is_active = 1 ORDER BY next_billing_date ASC',
+        'idx_subscriptions_user_active_billing',
+    ),
+    'recent_activities': (
+        'SELECT * FROM game_activities WHERE user_id = ? ORDER BY created_at DESC LIMIT 10',
+        'idx_activities_user_created',
+    ),
+}
+
+
+@pytest.mark.parametrize('name', sorted(HOT_QUERIES))
+def test_hot_query_uses_index(schema_app, name):
+    sql, index = HOT_QUERIES[name]
+    with schema_app.app_context():
+        details = explain(get_db(), sql)
+
+    assert details is not None
+    assert any(index in detail for detail in details), details
+    assert plan_issues(details) == []
+
+
+def test_advisor_reports_scans_and_temp_btrees(schema_app):
+    corpus = [
+        ('SELECT * FROM notifications WHERE type = ?', None, 'a.py:1'),
+        ('SELECT * FROM notifications WHERE type = :kind', None, 'b.py:2'),
+        ("SELECT * FROM notifications WHERE user_id = ? AND title = 'x?' ORDER BY severity", None, 'c.py:3'),
+        ('SELECT * FROM notifications WHERE user_id = ? ORDER BY created_at DESC', (1,), 'captured'),
+    ]
+    with schema_app.app_context():
+        findings = advise(get_db(), corpus)
+
+    assert [sorted(f.sources) for f in findings] == [['a.py:1'], ['b.py:2'], ['c.py:3']]
+    assert findings[0].details == ['SCAN notifications']
+    assert findings[2].details == ['USE TEMP B-TREE FOR ORDER BY']
+
+
+def test_extract_sql_finds_module_queries():
+    corpus = extract_sql()
+    sources = {source.split(':')[0] for _, _, source in corpus}
+    assert {'budget.py', 'transactions.py', 'gamification.py'} <= sources
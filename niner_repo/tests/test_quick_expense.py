@@ -414,3 +414,98 @@ def test_concurrent_expense_creation(client, auth):
     for response in responses:
         assert response.status_code == 201
         assert response.get_json()['success'] is True
+
+
+def test_batch_creates_valid_expenses_and_reports_invalid_ones(client, auth, app):
+    """Test flushing an offline queue through the batch endpoint"""
+    auth.register()
+    auth.login()
+    today = datetime.now().strftime('%Y-%m-%d')
+    
+    response = client.post('/api/expenses/batch', json={'expenses': [
+        {'client_id': 'a', 'amount': 4.50, 'category': 'Food', 'description': 'Coffee', 'date': today},
+        {'client_id': 'b', 'amount': -1, 'category': 'Food', 'date': today},
+        {'client_id': 'c', 'amount': '12.25', 'category': 'Transportation', 'date': today},
+    ]})
+    
+    assert response.status_code == 200
+    data = response.get_json()
+    assert (data['success'], data['created'], data['failed']) == (False, 2, 1)
+    assert [r['client_id'] for r in data['results']] == ['a', 'b', 'c']
+    assert data['results'][1]['errors'] == ['Amount must be greater than 0']
+    assert data['results'][0]['expense']['date'] == today
+    
+    with app.app_context():
+        from db import get_db
+        rows = get_db().execute(
+            "SELECT id, amount_cents, category FROM transactions WHERE transaction_type = 'expense' ORDER BY id"
+        ).fetchall()
+    assert [(row['id'], row['amount_cents'], row['category']) for row in rows] == [
+        (data['results'][0]['expense']['id'], 450, 'Food'),
+        (data['results'][2]['expense']['id'], 1225, 'Transportation'),
+    ]
+
+
+def test_batch_rejects_empty_and_oversized_payloads(client, auth, app):
+    """Test batch size limits"""
+    auth.register()
+    auth.login()
+    app.config['EXPENSE_BATCH_LIMIT'] = 2
+    expense = {'amount': 1, 'category': 'Other'}
+    
+    assert client.post('/api/expenses/batch', json={'expenses': []}).status_code == 400
+    assert client.post('/api/expenses/batch', json={'expenses': [expense] * 3}).status_code == 400
+    assert client.post('/api/expenses/batch', json={'expenses': [expense] * 2}).get_json()['created'] == 2
+
+
+def test_single_and_batch_responses_format_dates_alike(client, auth):
+    """The offline queue reads `date` from both endpoints as YYYY-MM-DD"""
+    auth.register()
+    auth.login()
+    expense = {'amount': 3, 'category': 'Food', 'date': '2026-10-19'}
+    
+    single = client.post('/api/expenses', json=expense).get_json()
+    batch = client.post('/api/expenses/batch', json={'expenses': [expense]}).get_json()
+    
+    assert single['expense']['date'] == '2026-10-19'
+    assert batch['results'][0]['expense']['date'] == '2026-10-19'
+
+
+def test_resent_batch_is_saved_once(client, auth, app):
+    """A batch resent after a lost response creates no second set of rows"""
+    auth.register()
+    auth.login()
+    batch = {'expenses': [
+        {'client_id': 'q1', 'amount': 4.50, 'category': 'Food', 'date': '2026-10-19'},
+        {'client_id': 'q2', 'amount': 9, 'category': 'Other', 'date': '2026-10-19'},
+    ]}
+    
+    first = client.post('/api/expenses/batch', json=batch).get_json()
+    again = client.post('/api/expenses/batch', json=batch).get_json()
+    
+    assert (first['created'], first['duplicates']) == (2, 0)
+    assert (again['success'], again['created'], again['duplicates']) == (True, 0, 2)
+    assert all(result['duplicate'] for result in again['results'])
+    assert [r['expense'] for r in again['results']] == [r['expense'] for r in first['results']]
+    with app.app_context():
+        from db import get_db
+        rows = get_db().execute(
+            "SELECT client_id FROM transactions WHERE transaction_type = 'expense' ORDER BY id"
+        ).fetchall()
+    assert [row['client_id'] for row in rows] == ['q1', 'q2']
+
+
+def test_single_expense_retry_returns_the_stored_row(client, auth):
+    """The quick-expense form's client_id makes a resent POST a no-op"""
+    auth.register()
+    auth.login()
+    expense = {'client_id': 'form-1', 'amount': 7, 'category': 'Food', 'date': '2026-10-19'}
+    
+    first = client.post('/api/expenses', json=expense)
+    again = client.post('/api/expenses', json=expense)
+    queued = client.post('/api/expenses/batch', json={'expenses': [expense]}).get_json()
+    
+    assert (first.status_code, again.status_code) == (201, 200)
+    assert again.get_json()['expense'] == first.get_json()['expense']
+    assert queued['results'][0]['expense']['id'] == first.get_json()['expense']['id']
+    assert queued['created'] == 0
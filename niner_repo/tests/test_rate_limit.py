@@ -0,0 +1,84 @@
+"""Tests for the credential endpoint rate limiter."""
+
+from unittest import mock
+
+import pytest
+
+import rate_limit
+from rate_limit import RateLimited, RateLimiter
+
+
+def test_bucket_refuses_when_empty_and_refills(tmp_path):
+    limiter = RateLimiter(str(tmp_path / 'limits.sqlite'), {'login': {'ip': (2, 60)}})
+
+    with mock.patch('time.time', return_value=1000.0):
+        assert limiter.hit('login', 'ip', '10.0.0.1') == 0
+        assert limiter.hit('login', 'ip', '10.0.0.1') == 0
+        assert limiter.hit('login', 'ip', '10.0.0.1') == pytest.approx(30)
+        assert limiter.hit('login', 'ip', '10.0.0.2') == 0
+
+    with mock.patch('time.time', return_value=1030.0):
+        assert limiter.hit('login', 'ip', '10.0.0.1') == 0
+
+
+def test_workers_share_counts_through_the_side_db(tmp_path):
+    path = str(tmp_path / 'limits.sqlite')
+    limits = {'login': {'username': (3, 300)}}
+    first, second = RateLimiter(path, limits), RateLimiter(path, limits)
+
+    assert first.hit('login', 'username', 'alice') == 0
+    assert first.hit('login', 'username', 'alice') == 0
+    assert second.hit('login', 'username', 'alice') == 0
+    assert second.hit('login', 'username', 'alice') > 0
+    assert first.hit('login', 'username', 'alice') > 0
+
+
+def test_login_burst_is_refused_before_the_password_check(app, client, auth):
+    auth.register()
+    app.config['RATE_LIMITS'] = {'login': {'username': (3, 300)}}
+
+    with mock.patch('auth.verify') as verify:
+        verify.return_value = (False, None)
+        statuses = [auth.login(password='wrong').status_code for _ in range(5)]
+
+    assert statuses == [200, 200, 200, 429, 429]
+    assert verify.call_count == 3
+    response = auth.login(username='TestUser ')
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) > 0
+
+
+def test_recovery_answers_are_limited_per_account(app, client):
+    app.config['RATE_LIMITS'] = {'recovery': {'username': (2, 900)}}
+    data = {'step': '2', 'user_id': '1', 'answer1': 'x', 'answer2': 'y'}
+
+    statuses = [client.post('/auth/forgot-password-questions', data=data).status_code for _ in range(3)]
+
+    assert statuses[-1] == 429
+
+
+def test_store_errors_fail_open(app):
+    app.extensions['rate_limiter'] = RateLimiter('/nonexistent/dir/limits.sqlite', {'register': {'ip': (1, 3600)}})
+
+    with app.test_request_context('/auth/register', method='POST', environ_base={'REMOTE_ADDR': '10.0.0.1'}):
+        rate_limit.check('register')
+        with pytest.raises(RateLimited):
+            rate_limit.check('register')
+
+
+def test_refused_bucket_does_not_drain_the_other(app, tmp_path):
+    limiter = app.extensions['rate_limiter'] = RateLimiter(
+        str(tmp_path / 'limits.sqlite'), {'login': {'ip': (1, 60), 'username': (3, 300)}}
+    )
+
+    with app.test_request_context('/auth/login', method='POST', environ_base={'REMOTE_ADDR': '10.0.0.9'}):
+        rate_limit.check('login', 'victim')
+        for _ in range(5):
+            with pytest.raises(RateLimited):
+                rate_limit.check('login', 'victim')
+
+    # The blocked IP only ever took the victim's first token
+    assert limiter.peek('login', 'username', 'victim') == 0
+    assert limiter.hit('login', 'username', 'victim') == 0
+    assert limiter.hit('login', 'username', 'victim') == 0
+    assert limiter.hit('login', 'username', 'victim') > 0
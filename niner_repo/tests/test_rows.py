@@ -0,0 +1,48 @@
+"""Tests for row records returned by the list queries."""
+
+import json
+import pickle
+
+from flask import render_template_string
+
+from db import get_db
+from rows import RecordJSONProvider, fetch_records
+
+
+def test_records_read_like_dicts(schema_app):
+    with schema_app.app_context():
+        rows = fetch_records(get_db().execute(
+            "SELECT 1 AS id, 'Coffee' AS description UNION ALL SELECT 2, 'Lunch'"
+        ))
+
+        first, second = rows
+        assert first['description'] == first.description == 'Coffee'
+        assert first._index is second._index
+        assert dict(first) == {'id': 1, 'description': 'Coffee'} == first
+        assert first.get('category', 'none') == 'none' and 'id' in first
+
+        second['description'] = 'Dinner'
+        second['category'] = 'Food'
+        assert second == {'id': 2, 'description': 'Dinner', 'category': 'Food'}
+        assert first == {'id': 1, 'description': 'Coffee'}
+
+        assert pickle.loads(pickle.dumps(second)) == second
+        assert render_template_string('{{ r.description }} {{ r["id"] }}', r=first) == 'Coffee 1'
+        assert json.loads(RecordJSONProvider(schema_app).dumps(rows)) == [dict(first), dict(second)]
+
+
+def test_notification_list_is_served_from_records(client, auth, app):
+    auth.register()
+    auth.login()
+    with app.app_context():
+        db = get_db()
+        db.execute(
+            "INSERT INTO notifications (user_id, type, title, message, severity, metadata)"
+            " VALUES (1, 'overspending', 'Heads up', 'Over budget', 'warning', '{\"spent\": 120}')"
+        )
+        db.commit()
+
+    data = client.get('/notifications/api/list').get_json()
+
+    assert data['notifications'][0]['title'] == 'Heads up'
+    assert data['notifications'][0]['metadata'] == {'spent': 120}
@@ -0,0 +1,76 @@
+"""Tests for the shared financial stats snapshot."""
+
+from datetime import date
+
+from cache import invalidate_user
+from db import get_db, get_query_stats
+from money import Money
+from stats import get_stats, resolve_window
+
+
+def add_ledger(db):
+    db.execute("INSERT INTO users (username, email, password) VALUES ('saver', 's@uncc.edu', 'x')")
+    db.execute(
+        "INSERT INTO income (user_id, category_id, amount, amount_cents, source, date, created_by)"
+        " VALUES (1, 1, 1000, ?, 'Job', '2024-05-03', 1)", (Money.parse('1000'),)
+    )
+    db.execute(
+        "INSERT INTO transactions (user_id, transaction_type, category, amount, amount_cents, description, date)"
+        " VALUES (1, 'expense', 'Food', 250, ?, 'Groceries', '2024-05-04')", (Money.parse('250'),)
+    )
+    db.execute(
+        "INSERT INTO transactions (user_id, transaction_type, category, amount, amount_cents, description, date)"
+        " VALUES (1, 'expense', 'Savings', 100, ?, 'Transfer', '2024-04-20')", (Money.parse('100'),)
+    )
+    db.commit()
+
+
+def test_windows_resolve_to_iso_bounds():
+    assert resolve_window('all') == (None, None)
+    assert resolve_window((date(2024, 5, 1), '2024-05-31')) == ('2024-05-01', '2024-05-31')
+    assert resolve_window(('2024-05-01', None)) == ('2024-05-01', None)
+
+
+def test_snapshot_covers_the_window(schema_app):
+    with schema_app.test_request_context():
+        add_ledger(get_db())
+
+        overall = get_stats(1)
+        may = get_stats(1, ('2024-05-01', '2024-05-31'))
+
+    assert overall['saved'] == Money.parse('100')
+    assert may['income'] == Money.parse('1000')
+    assert may['net'] == Money.parse('750')
+    assert may['savings_rate'] == 75.0
+    assert may['saved'] == Money(0)
+
+
+def test_snapshot_is_reused_until_the_ledger_changes(schema_app):
+    with schema_app.app_context():
+        add_ledger(get_db())
+
+    with schema_app.test_request_context():
+        get_stats(1)
+        queries = get_query_stats().count
+        assert get_stats(1)['income'] == Money.parse('1000')
+        assert get_query_stats().count == queries
+
+    with schema_app.test_request_context():
+        get_stats(1)
+        assert get_query_stats() is None
+
+        invalidate_user(1, 'ledger')
+        get_db().execute("DELETE FROM transactions WHERE category = 'Food'")
+        get_db().commit()
+    with schema_app.test_request_context():
+        assert get_stats(1)['expenses'] == Money.parse('100')
+
+
+def test_quick_expenses_count_toward_the_month(client, auth, app):
+    auth.register()
+    auth.login()
+    response = client.post('/api/expenses', json={'amount': '24.44', 'category': 'Food', 'description': 'Lunch'})
+    assert response.status_code == 201
+
+    with app.test_request_context():
+        assert get_stats(1, 'month')['expenses'] == Money.parse('24.44')
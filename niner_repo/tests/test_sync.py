@@ -0,0 +1,107 @@
+"""Tests for the change log behind /api/sync."""
+
+from db import get_db
+import sync
+
+
+def add_transaction(db, amount=10, description='Coffee'):
+    cursor = db.execute(
+        "INSERT INTO transactions (user_id, transaction_type, category, amount, description, date)"
+        " VALUES (1, 'expense', 'Food', ?, ?, '2024-05-01')", (amount, description)
+    )
+    db.commit()
+    return cursor.lastrowid
+
+
+def test_first_sync_returns_a_cursor_to_start_from(client, auth, app):
+    auth.register()
+    auth.login()
+    with app.app_context():
+        add_transaction(get_db())
+
+    data = client.get('/api/sync').get_json()
+
+    assert data['reset'] is True
+    assert data['changes'] == {}
+    assert client.get(f"/api/sync?since={data['cursor']}").get_json()['changes'] == {}
+
+
+def test_changes_are_collapsed_per_record(client, auth, app):
+    auth.register()
+    auth.login()
+    cursor = client.get('/api/sync').get_json()['cursor']
+    with app.app_context():
+        db = get_db()
+        kept = add_transaction(db)
+        gone = add_transaction(db, description='Refunded')
+        db.execute("UPDATE transactions SET description = 'Latte' WHERE id = ?", (kept,))
+        db.execute('DELETE FROM transactions WHERE id = ?', (gone,))
+        db.commit()
+
+    data = client.get(f'/api/sync?since={cursor}').get_json()
+
+    assert data['reset'] is False
+    delta = data['changes']['transactions']
+    assert [row['description'] for row in delta['upserted']] == ['Latte']
+    assert delta['upserted'][0]['date'] == '2024-05-01'
+    assert delta['deleted'] == [gone]
+
+    again = client.get(f"/api/sync?since={data['cursor']}").get_json()
+    assert again['changes'] == {} and again['cursor'] == data['cursor']
+
+
+def test_pages_and_derived_column_updates(client, auth, app):
+    auth.register()
+    auth.login()
+    app.config['SYNC_PAGE_SIZE'] = 2
+    cursor = client.get('/api/sync').get_json()['cursor']
+    with app.app_context():
+        db = get_db()
+        for amount in (1, 2, 3):
+            add_transaction(db, amount)
+        before = db.execute('SELECT COUNT(*) FROM changes').fetchone()[0]
+        db.execute('UPDATE transactions SET amount_cents = amount_cents')
+        db.commit()
+        assert db.execute('SELECT COUNT(*) FROM changes').fetchone()[0] == before
+
+    first = client.get(f'/api/sync?since={cursor}').get_json()
+    second = client.get(f"/api/sync?since={first['cursor']}").get_json()
+
+    assert first['more'] is True and second['more'] is False
+    assert len(first['changes']['transactions']['upserted']) == 2
+    assert len(second['changes']['transactions']['upserted']) == 1
+
+
+def test_pruned_log_asks_for_a_reset(client, auth, app):
+    auth.register()
+    auth.login()
+    with app.app_context():
+        db = get_db()
+        add_transaction(db)
+        add_transaction(db)
+        db.execute("UPDATE changes SET changed_at = datetime('now', '-60 days')")
+        db.commit()
+        assert sync.prune(db, 30) == 2
+        add_transaction(db)
+
+    assert client.get('/api/sync?since=0').get_json()['reset'] is True
+
+
+def test_synced_notifications_match_the_list_endpoint(client, auth, app):
+    """The client merges /api/sync rows into /notifications/api/list rows"""
+    from notifications import NotificationEngine
+    auth.register()
+    auth.login()
+    cursor = client.get('/api/sync').get_json()['cursor']
+    with app.test_request_context():
+        NotificationEngine.create_notification(
+            1, NotificationEngine.TYPE_UNUSUAL_SPENDING, 'Unusual', 'Big spend',
+            NotificationEngine.SEVERITY_INFO, metadata={'category': 'Food'}
+        )
+
+    listed = client.get('/notifications/api/list').get_json()['notifications']
+    synced = client.get(f'/api/sync?since={cursor}').get_json()['changes']['notifications']['upserted']
+
+    assert synced == listed
+    assert synced[0]['metadata'] == {'category': 'Food'}
+    assert synced[0]['created_at'].endswith('Z')
@@ -1,14 +1,17 @@
 from flask import Blueprint, flash, g, redirect, render_template, request, url_for
 from werkzeug.exceptions import abort
 from datetime import datetime, timedelta
-from decimal import Decimal, InvalidOperation
+import logging
 from gamification import on_transaction_added
+from money import Money
 
 # Use local imports (same directory)
 try:
     from auth import login_required
     from db import get_db
     from notifications import NotificationEngine
+    from cache import invalidates
+    from rows import fetch_records
 except ImportError:
     # Fallback if auth/db modules don't exist
     def login_required(f):
@@ -29,6 +32,8 @@ except ImportError:
 
 bp = Blueprint('transactions', __name__)
 
+logger = logging.getLogger(__name__)
+
 @bp.route('/visuals')
 @login_required
 def show_visuals():
@@ -101,8 +106,7 @@ def index():
                 """
             
             # Get active transactions
-            cursor = db.execute(query, (user_id,))
-            transactions = [dict(row) for row in cursor.fetchall()]
+            transactions = fetch_records(db.execute(query, (user_id,)))
             
             # Build query for DELETED transactions
             if has_is_active:
@@ -136,12 +140,11 @@ def index():
                     """
                 
                 # Get deleted transactions
-                cursor = db.execute(deleted_query, (user_id,))
-                deleted_transactions = [dict(row) for row in cursor.fetchall()]
+                deleted_transactions = fetch_records(db.execute(deleted_query, (user_id,)))
             
             # Calculate total income (only active)
             income_query = f"""
-                SELECT COALESCE(SUM(amount), 0) as total 
+                SELECT COALESCE(SUM(amount_cents), 0) AS "total [money]" 
                 FROM transactions 
                 WHERE user_id = ? AND {type_column} = 'income'
                 {'AND is_active = 1' if has_is_active else ''}
@@ -151,7 +154,7 @@ def index():
             
             # Calculate total expenses (only active)
             expense_query = f"""
-                SELECT COALESCE(SUM(amount), 0) as total 
+                SELECT COALESCE(SUM(amount_cents), 0) AS "total [money]" 
                 FROM transactions 
                 WHERE user_id = ? AND {type_column} = 'expense'
                 {'AND is_active = 1' if has_is_active else ''}
@@ -164,7 +167,7 @@ def index():
                 category_query = f"""
                     SELECT 
                         category, 
-                        COALESCE(SUM(amount), 0) as total 
+                        COALESCE(SUM(amount_cents), 0) AS "total [money]" 
                     FROM transactions 
                     WHERE user_id = ? AND {type_column} = 'expense' AND category IS NOT NULL
                     {'AND is_active = 1' if has_is_active else ''}
@@ -182,7 +185,7 @@ def index():
                     expenses_query = """
                         SELECT 
                             category, 
-                            COALESCE(SUM(amount), 0) as total 
+                            COALESCE(SUM(amount_cents), 0) AS "total [money]" 
                         FROM expenses 
                         WHERE user_id = ? AND is_active = 1
                         GROUP BY category
@@ -198,8 +201,7 @@ def index():
                 
     except Exception as e:
         flash(f'Error loading transactions: {str(e)}', 'error')
-        import traceback
-        traceback.print_exc()
+        logger.exception('Error loading transactions')
     
     # Calculate net income
     net_income = total_income - total_expenses
@@ -226,6 +228,7 @@ def add():
 
 @bp.route('/transactions/create', methods=('GET', 'POST'))
 @login_required
+@invalidates('ledger', 'game')
 def create():
     """Create a new transaction"""
     if request.method == 'POST':
@@ -246,10 +249,10 @@ def create():
             error = 'Category is required for expenses.'
         else:
             try:
-                amount = Decimal(amount)
+                amount = Money.parse(amount)
                 if amount <= 0:
                     error = 'Amount must be greater than 0.'
-            except (InvalidOperation, ValueError):
+            except ValueError:
                 error = 'Invalid amount format.'
         
         if error is not None:
@@ -268,17 +271,17 @@ def create():
                     # Insert into transactions table WITH category and is_active
                     if has_is_active:
                         db.execute(
-                            'INSERT INTO transactions (user_id, transaction_type, category, amount, description, date, is_active)'
-                            ' VALUES (?, ?, ?, ?, ?, ?, 1)',
+                            'INSERT INTO transactions (user_id, transaction_type, category, amount, amount_cents, description, date, is_active)'
+                            ' VALUES (?, ?, ?, ?, ?, ?, ?, 1)',
                             (user_id, transaction_type, category if transaction_type == 'expense' else None, 
-                             float(amount), description, date)
+                             float(amount), amount, description, date)
                         )
                     else:
                         db.execute(
-                            'INSERT INTO transactions (user_id, transaction_type, category, amount, description, date)'
-                            ' VALUES (?, ?, ?, ?, ?, ?)',
+                            'INSERT INTO transactions (user_id, transaction_type, category, amount, amount_cents, description, date)'
+                            ' VALUES (?, ?, ?, ?, ?, ?, ?)',
                             (user_id, transaction_type, category if transaction_type == 'expense' else None, 
-                             float(amount), description, date)
+                             float(amount), amount, description, date)
                         )
                     db.commit()
                     
@@ -286,13 +289,13 @@ def create():
                     if transaction_type == 'expense':
                         try:
                             db.execute(
-                                'INSERT INTO expenses (user_id, category, amount, description, date, created_by, is_active)'
-                                ' VALUES (?, ?, ?, ?, ?, ?, 1)',
-                                (user_id, category, float(amount), description, date, user_id)
+                                'INSERT INTO expenses (user_id, category, amount, amount_cents, description, date, created_by, is_active)'
+                                ' VALUES (?, ?, ?, ?, ?, ?, ?, 1)',
+                                (user_id, category, float(amount), amount, description, date, user_id)
                             )
                             db.commit()
                         except Exception as e:
-                            print(f"Could not insert into expenses table: {e}")
+                            logger.warning('Could not insert into expenses table: %s', e)
                     elif transaction_type == 'income':
                         try:
                             # Get default income category
@@ -300,19 +303,19 @@ def create():
                             if cat_result:
                                 category_id = cat_result[0]
                                 db.execute(
-                                    'INSERT INTO income (user_id, category_id, amount, source, date, created_by, is_active)'
-                                    ' VALUES (?, ?, ?, ?, ?, ?, 1)',
-                                    (user_id, category_id, float(amount), description, date, user_id)
+                                    'INSERT INTO income (user_id, category_id, amount, amount_cents, source, date, created_by, is_active)'
+                                    ' VALUES (?, ?, ?, ?, ?, ?, ?, 1)',
+                                    (user_id, category_id, float(amount), amount, description, date, user_id)
                                 )
                                 db.commit()
                         except Exception as e:
-                            print(f"Could not insert into income table: {e}")
+                            logger.warning('Could not insert into income table: %s', e)
                     
                     # GAMIFICATION: Award points for logging transaction
                     try:
                         on_transaction_added(g.user['id'])
                     except Exception as e:
-                        print(f"Gamification error: {e}")
+                        logger.exception('Gamification error')
                     
                     # Trigger notification checks for expenses
                     if transaction_type == 'expense':
@@ -321,7 +324,7 @@ def create():
                             NotificationEngine.check_budget_warning(user_id)
                             NotificationEngine.check_overspending(user_id)
                         except Exception as notif_error:
-                            print(f"Notification error: {notif_error}")
+                            logger.exception('Notification error')
                     
                     flash('Transaction added successfully!', 'success')
                     return redirect(url_for('transactions.index'))
@@ -329,13 +332,13 @@ def create():
                     flash('Database not available', 'error')
             except Exception as e:
                 flash(f'Error saving transaction: {str(e)}', 'error')
-                import traceback
-                traceback.print_exc()
+                logger.exception('Error saving transaction')
     
     return render_template('home/update.html')
 
 @bp.route('/transactions/<int:id>/delete', methods=('POST',))
 @login_required
+@invalidates('ledger', 'game')
 def delete(id):
     """Soft delete a transaction"""
     try:
@@ -385,8 +388,7 @@ def delete(id):
             flash('Database not available', 'error')
     except Exception as e:
         flash(f'Error deleting transaction: {str(e)}', 'error')
-        import traceback
-        traceback.print_exc()
+        logger.exception('Error deleting transaction')
     
     return redirect(url_for('transactions.index'))
 
@@ -402,6 +404,7 @@ def deleted():
 
 @bp.route('/transactions/<int:id>/restore', methods=('POST',))
 @login_required
+@invalidates('ledger', 'game')
 def restore(id):
     """Restore a deleted transaction"""
     try:
@@ -451,14 +454,14 @@ def restore(id):
             flash('Database not available', 'error')
     except Exception as e:
         flash(f'Error restoring transaction: {str(e)}', 'error')
-        import traceback
-        traceback.print_exc()
+        logger.exception('Error restoring transaction')
     
     return redirect(url_for('transactions.index'))
 
 
 @bp.route('/transactions/<int:id>/permanent-delete', methods=('POST',))
 @login_required
+@invalidates('ledger', 'game')
 def permanent_delete(id):
     """Permanently delete a transaction"""
     try:
@@ -499,14 +502,14 @@ def permanent_delete(id):
             flash('Database not available', 'error')
     except Exception as e:
         flash(f'Error permanently deleting transaction: {str(e)}', 'error')
-        import traceback
-        traceback.print_exc()
+        logger.exception('Error permanently deleting transaction')
     
     return redirect(url_for('transactions.index'))
 
 
 @bp.route('/transactions/permanent-delete-all', methods=('GET', 'POST'))
 @login_required
+@invalidates('ledger', 'game')
 def permanent_delete_all():
     """Permanently delete all deleted transactions"""
     try:
@@ -550,8 +553,7 @@ def permanent_delete_all():
             flash('Database not available', 'error')
     except Exception as e:
         flash(f'Error permanently deleting transactions: {str(e)}', 'error')
-        import traceback
-        traceback.print_exc()
+        logger.exception('Error permanently deleting transactions')
     
     return redirect(url_for('transactions.index'))
 